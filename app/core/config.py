@@ -23,6 +23,161 @@ class Settings(BaseSettings):
     GLOBAL_INSTRUCTION_PATH: str = Field(
         default="storage/prompts/global_instruction.jinja"
     )
+    # global_instruction の current_date をどの粒度で更新するか (second/minute/hour/day)
+    GLOBAL_INSTRUCTION_TIME_GRANULARITY: str = Field(default="minute")
+
+    # ExecuteTaskNode を同時に実行するタスク数の上限
+    EXECUTE_TASK_MAX_CONCURRENCY: int = Field(default=4)
+    # 優先度が BuildResearchPlanNode の target_priority より低いタスクは、優先度の高いタスクの後に実行する
+    # 指定した場合は、この秒数以内に実行を開始できないタスクを保留（pending）とし、レポート末尾に記載する
+    EXECUTE_TASK_OPTIONAL_WAIT_SECONDS: float | None = Field(default=None)
+    # タスク 1 件あたりの見積もり（開始時にレート上限から予約する）
+    EXECUTE_TASK_ESTIMATED_TOKENS: int = Field(default=20_000)
+    EXECUTE_TASK_ESTIMATED_SEARCHES: int = Field(default=3)
+    # ExecuteTaskNode のエージェントがモデルに送る会話履歴のトークン数の上限（概算）と、圧縮対象外とする直近のメッセージ数
+    EXECUTE_TASK_CONTEXT_TOKEN_BUDGET: int = Field(default=8_000)
+    EXECUTE_TASK_CONTEXT_KEEP_RECENT: int = Field(default=4)
+
+    # search_web ツールの検索バックエンド (perplexity/fake)
+    SEARCH_BACKEND: str = Field(default="perplexity")
+    FAKE_SEARCH_LATENCY_SECONDS: float = Field(default=0.0)
+    SEARCH_CACHE_ENABLED: bool = Field(default=True)
+    SEARCH_CACHE_TTL_SECONDS: float | None = Field(default=60 * 60 * 24)
+    SEARCH_CACHE_MAX_SIZE: int = Field(default=1024)
+    # 設定した場合のみ SQLite によるディスクキャッシュを併用する
+    SEARCH_CACHE_SQLITE_PATH: str | None = Field(default=None)
+    SEARCH_CACHE_SQLITE_MAX_SIZE: int = Field(default=100_000)
+    # 助詞・語順・表記だけが異なる言い換えのクエリには、過去の検索結果を返す (オプトイン)
+    # (内容語が両方向に閾値以上の割合で含まれ、数値と否定・反意の表現が一致する場合)
+    SEARCH_NEAR_DUPLICATE_ENABLED: bool = Field(default=False)
+    SEARCH_NEAR_DUPLICATE_THRESHOLD: float = Field(default=0.9)
+    SEARCH_NEAR_DUPLICATE_MAX_SIZE: int = Field(default=200_000)
+    # LSH のバンド数と 1 バンドあたりの行数（MinHash の長さはその積）
+    SEARCH_NEAR_DUPLICATE_BANDS: int = Field(default=16)
+    SEARCH_NEAR_DUPLICATE_ROWS: int = Field(default=4)
+    # 検索結果を文書として保持し、タスク間で再利用する
+    # DOCUMENT_STORE_LOCAL_FIRST の場合は外部検索の前に保持している文書を検索し、足りれば外部検索を省略する (オプトイン)
+    DOCUMENT_STORE_LOCAL_FIRST: bool = Field(default=False)
+    # クエリの語をこの割合以上含む文書が検索件数分あれば、外部検索を省略する
+    DOCUMENT_STORE_MIN_COVERAGE: float = Field(default=0.8)
+    # 設定した場合は全セッションで共有し、JSONL に永続化する（None の場合はセッションごとにメモリ上に保持する）
+    DOCUMENT_STORE_PATH: str | None = Field(default=None)
+    DOCUMENT_STORE_MAX_SESSIONS: int = Field(default=64)
+
+    # submit_content の審査結果キャッシュの最大件数
+    SUBMIT_CONTENT_CACHE_MAX_SIZE: int = Field(default=1024)
+
+    # LLM 応答キャッシュを有効化するノード名 (例: ["GatherRequirementsNode"], "*" で全ノード)
+    # プロンプトには current_date が含まれるため、再実行時に再利用する場合は
+    # GLOBAL_INSTRUCTION_TIME_GRANULARITY を "day" にするとヒットしやすい
+    LLM_RESPONSE_CACHE_NODES: list[str] = Field(default_factory=list)
+    LLM_RESPONSE_CACHE_PATH: str = Field(default="storage/cache/llm_responses.sqlite3")
+    LLM_RESPONSE_CACHE_MAX_SIZE: int = Field(default=10_000)
+    LLM_RESPONSE_CACHE_MAX_BYTES: int | None = Field(default=256 * 1024 * 1024)
+
+    # 外部呼び出しの記録・再生 (off/record/replay)
+    CASSETTE_MODE: str = Field(default="off")
+    CASSETTE_PATH: str = Field(default="storage/cassettes/default.jsonl")
+    # 再生時のレイテンシ（秒）。未設定の場合は記録時のレイテンシを再現する
+    CASSETTE_REPLAY_LATENCY_SECONDS: float | None = Field(default=None)
+    # 記録時にこの件数ごとにまとめてカセットへ追記する（残りは終了時に追記する）
+    CASSETTE_FLUSH_ENTRIES: int = Field(default=32)
+
+    # 最終レポートの出力先。REPORT_STREAMING が有効な場合は生成されたチャンクから順次書き込む
+    # {thread_id} はセッション（スレッド）ごとに置き換え、同時に実行するセッションが同じファイルに書き込まないようにする
+    REPORT_OUTPUT_PATH: str = Field(default="storage/outputs/{thread_id}/research_report.md")
+    REPORT_STREAMING: bool = Field(default=True)
+    # 調査結果の文字数がこの値を超える場合は、セクションごとに並行して執筆してから統合する (None で無効化)
+    REPORT_MAP_REDUCE_THRESHOLD_CHARS: int | None = Field(default=60_000)
+    REPORT_SECTION_MAX_CONCURRENCY: int = Field(default=4)
+    # 1 セクションの執筆に使う調査結果（タスク）の上限
+    REPORT_SECTION_MAX_TASKS: int = Field(default=8)
+    # 指定した場合は、レポート生成の前にタスク横断で出典を番号付きの一覧にまとめ、ほぼ同じ段落を参照に置き換える (オプトイン)
+    # (類似度は文字 bi-gram の Jaccard 類似度。MIN_CHARS 未満の段落と、数値や否定・反意の表現が異なる段落は比較しない)
+    REPORT_DEDUP_THRESHOLD: float | None = Field(default=None)
+    REPORT_DEDUP_MIN_CHARS: int = Field(default=40)
+
+    # 外部 API のレート上限（分あたり）。OpenAI はモデル名ごとに指定する
+    OPENAI_REQUESTS_PER_MINUTE: dict[str, int] = Field(
+        default_factory=lambda: {
+            "gpt-4o-mini": 500,
+            "gpt-4o": 500,
+            "gpt-5": 500,
+            "gpt-5-mini": 500,
+            "gpt-5-nano": 500,
+        }
+    )
+    OPENAI_TOKENS_PER_MINUTE: dict[str, int] = Field(
+        default_factory=lambda: {
+            "gpt-4o-mini": 200_000,
+            "gpt-4o": 30_000,
+            "gpt-5": 30_000,
+            "gpt-5-mini": 200_000,
+            "gpt-5-nano": 200_000,
+        }
+    )
+    PERPLEXITY_REQUESTS_PER_MINUTE: int = Field(default=50)
+
+    # 外部 API 呼び出しの再試行（指数バックオフ + ジッター。Retry-After がある場合はそれに従う）
+    OUTBOUND_MAX_ATTEMPTS: int = Field(default=5)
+    OUTBOUND_BACKOFF_BASE_SECONDS: float = Field(default=0.5)
+    OUTBOUND_BACKOFF_MAX_SECONDS: float = Field(default=30.0)
+    # エンドポイントごとのサーキットブレーカー（連続失敗回数と、遮断してから試行を再開するまでの秒数）
+    OUTBOUND_CIRCUIT_FAILURE_THRESHOLD: int = Field(default=5)
+    OUTBOUND_CIRCUIT_RESET_SECONDS: float = Field(default=30.0)
+
+    # グラフのチェックポインター (memory/sqlite)。sqlite の場合は thread_id を指定して再開できる
+    CHECKPOINTER_BACKEND: str = Field(default="memory")
+    CHECKPOINTER_SQLITE_PATH: str = Field(default="storage/checkpoints/checkpoints.sqlite3")
+    CHECKPOINTER_COMPRESSION_LEVEL: int = Field(default=6)
+
+    # 複数セッションを扱う HTTP サーバー (server.py) の待ち受けアドレス
+    SESSION_SERVER_HOST: str = Field(default="127.0.0.1")
+    SESSION_SERVER_PORT: int = Field(default=8000)
+    # 開始・再開のリクエストで、次の中断（回答待ち）または完了まで応答を待つ最大秒数（超えた場合は running を返す）
+    SESSION_WAIT_SECONDS: float = Field(default=30.0)
+
+    # バッチ実行 (main.py --batch) の出力先・並列数、要件収集の質問への自動回答の方針 (skip/no_answer/request)
+    BATCH_OUTPUT_DIR: str = Field(default="storage/outputs/batch")
+    BATCH_WORKERS: int = Field(default=4)
+    BATCH_AUTO_ANSWER_POLICY: str = Field(default="skip")
+    # 自動回答の回数の上限（超えた場合は skip として要件収集を打ち切る）
+    BATCH_MAX_INTERRUPTS: int = Field(default=2)
+
+    # 成果物（レポート・カセット等）の保存先 (local/cas)。cas は内容ハッシュで重複排除し、zstd で圧縮する
+    BLOB_BACKEND: str = Field(default="local")
+    CAS_ROOT_DIR: str = Field(default="storage/blobs")
+    CAS_COMPRESSION_LEVEL: int = Field(default=3)
+    # BLOB_BACKEND=s3 の接続先（S3 互換。認証情報がない場合は署名しない）
+    S3_ENDPOINT_URL: str = Field(default="http://127.0.0.1:9000")
+    S3_BUCKET: str = Field(default="research-agent")
+    S3_PREFIX: str = Field(default="")
+    S3_REGION: str = Field(default="us-east-1")
+    S3_ACCESS_KEY_ID: str | None = Field(default=None)
+    S3_SECRET_ACCESS_KEY: str | None = Field(default=None)
+    # 読み込んだブロブのキャッシュ先と、オブジェクトストレージではなくローカルから読むパス
+    S3_CACHE_DIR: str = Field(default="storage/cache/s3")
+    S3_LOCAL_PREFIXES: list[str] = Field(default_factory=lambda: ["storage/prompts"])
+    # コネクションプールの大きさと、この大きさ以上のブロブを S3_PART_BYTES ごとに並列で転送する際の並列数
+    S3_MAX_CONNECTIONS: int = Field(default=32)
+    S3_MULTIPART_THRESHOLD_BYTES: int = Field(default=16 * 1024 * 1024)
+    S3_PART_BYTES: int = Field(default=8 * 1024 * 1024)
+    S3_MAX_CONCURRENCY: int = Field(default=8)
+    # この大きさ以上のブロブはメモリマップで読み、BLOB_MMAP_RELEASE_BYTES ごとに読み終えたページを手放す
+    BLOB_MMAP_MIN_BYTES: int = Field(default=16 * 1024 * 1024)
+    BLOB_MMAP_RELEASE_BYTES: int = Field(default=64 * 1024 * 1024)
+    # JSONL の追記時に、まとめて書き込む大きさ
+    BLOB_WRITE_BUFFER_BYTES: int = Field(default=1024 * 1024)
+    # コンパイル済みテンプレートの保持数と、バイトコードの保存先（None の場合は保存しない）
+    TEMPLATE_CACHE_MAX_SIZE: int = Field(default=256)
+    TEMPLATE_BYTECODE_CACHE_DIR: str | None = Field(default="storage/cache/jinja")
+    # 起動時に事前コンパイルするテンプレートのディレクトリ（None の場合は初回の読み込み時にコンパイルする）
+    TEMPLATE_WARMUP_DIR: str | None = Field(default="storage/prompts")
+
+    # 設定した場合のみ、メトリクスを Prometheus 形式で公開する (GET /metrics)
+    METRICS_PORT: int | None = Field(default=None)
+    # 実行ごとのメトリクスの集計結果 (JSON) の保存先
+    METRICS_SUMMARY_DIR: str = Field(default="storage/outputs/metrics")
 
 
 settings = Settings()
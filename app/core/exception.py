@@ -20,3 +20,22 @@ class ChainError(Exception):
     def __init__(self, chain_name: str, message: str) -> None:
         error_message = f"{chain_name} | {message}"
         super().__init__(error_message)
+
+
+class CircuitOpenError(Exception):
+    """Custom exception for calls rejected by an open circuit breaker."""
+
+    def __init__(self, endpoint: str, retry_in: float) -> None:
+        error_message = f"{endpoint} | circuit open | retry in {retry_in:.1f}s"
+        super().__init__(error_message)
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class HTTPStatusError(Exception):
+    """Custom exception for errors returned to HTTP clients."""
+
+    def __init__(self, status_code: int, message: str) -> None:
+        super().__init__(f"{status_code} | {message}")
+        self.status_code = int(status_code)
+        self.message = message
@@ -1,7 +1,13 @@
+from .coalesce_tool_calls import CoalesceToolCallsMiddleware, coalesce_tool_calls, tool_call_flight
+from .compact_context import compact_context
 from .handle_tool_errors import handle_tool_errors
 from .validate_output import validate_output
 
 __all__ = [
+    "CoalesceToolCallsMiddleware",
+    "coalesce_tool_calls",
+    "compact_context",
     "handle_tool_errors",
+    "tool_call_flight",
     "validate_output",
 ]
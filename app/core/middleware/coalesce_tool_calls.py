@@ -0,0 +1,110 @@
+import json
+from collections.abc import Awaitable, Callable
+
+from langchain.agents.middleware import AgentMiddleware
+from langchain_core.messages import ToolMessage
+from langchain.tools.tool_node import ToolCallRequest
+from langgraph.types import Command
+
+from app.core.logging import LogLevel, log
+from app.core.utils.single_flight import SingleFlight
+from app.infrastructure.metrics import MetricsRegistry, metrics
+
+# 全エージェントで共有し、並列タスク間の同一ツール呼び出しを合流させる
+tool_call_flight = SingleFlight()
+
+
+def tool_call_key(request: ToolCallRequest) -> str:
+    tool_call = request.tool_call
+    return json.dumps(
+        [tool_call.get("name", ""), tool_call.get("args", {})],
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+
+
+def rebind_response(
+    request: ToolCallRequest,
+    response: ToolMessage | Command,
+    coalesced: bool,
+) -> ToolMessage | Command:
+    if not coalesced:
+        return response
+    log(
+        log_level=LogLevel.DEBUG,
+        subject=request.tool_call["id"],
+        object=request.tool_call.get("name", "") + " #coalesced",
+        message=tool_call_flight.stats,
+    )
+    # 合流した呼び出し元には、自身の tool_call_id を付け替えた結果を返す
+    if isinstance(response, ToolMessage):
+        return response.model_copy(update={"tool_call_id": request.tool_call["id"]})
+    return response
+
+
+class CoalesceToolCallsMiddleware(AgentMiddleware):
+    """同時に発生した同一引数のツール呼び出しを 1 回の実行にまとめる."""
+
+    def __init__(
+        self,
+        tool_names: set[str] | None = None,
+        single_flight: SingleFlight = tool_call_flight,
+        on_coalesced: dict[str, Callable[[ToolMessage], None]] | None = None,
+        registry: MetricsRegistry = metrics,
+    ) -> None:
+        super().__init__()
+        self.tool_names = tool_names
+        self.single_flight = single_flight
+        self.registry = registry
+        # ツール名ごとに、合流した呼び出し元のコンテキストで結果を受け取る処理
+        # （ツール本体の副作用は実行した呼び出し元にしか起きないため）
+        self.on_coalesced = on_coalesced or {}
+
+    def _is_target(self, request: ToolCallRequest) -> bool:
+        return self.tool_names is None or request.tool_call.get("name") in self.tool_names
+
+    def _rebind(
+        self,
+        request: ToolCallRequest,
+        response: ToolMessage | Command,
+        coalesced: bool,
+    ) -> ToolMessage | Command:
+        response = rebind_response(request, response, coalesced)
+        if coalesced:
+            self.registry.inc("tool_calls_coalesced_total", {"tool": request.tool_call.get("name", "")})
+        if (
+            coalesced
+            and isinstance(response, ToolMessage)
+            and response.status == "success"
+            and (hook := self.on_coalesced.get(request.tool_call.get("name", "")))
+        ):
+            hook(response)
+        return response
+
+    def wrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], ToolMessage | Command],
+    ) -> ToolMessage | Command:
+        if not self._is_target(request):
+            return handler(request)
+        response, coalesced = self.single_flight.do(
+            tool_call_key(request), lambda: handler(request)
+        )
+        return self._rebind(request, response, coalesced)
+
+    async def awrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Awaitable[ToolMessage | Command]],
+    ) -> ToolMessage | Command:
+        if not self._is_target(request):
+            return await handler(request)
+        response, coalesced = await self.single_flight.ado(
+            tool_call_key(request), lambda: handler(request)
+        )
+        return self._rebind(request, response, coalesced)
+
+
+coalesce_tool_calls = CoalesceToolCallsMiddleware()
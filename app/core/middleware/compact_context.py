@@ -0,0 +1,180 @@
+import json
+from collections.abc import Awaitable, Callable
+
+from langchain.agents.middleware import AgentMiddleware, ModelRequest, ModelResponse
+from langchain_core.messages import AIMessage, AnyMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from app.core.config import settings
+from app.core.logging import LogLevel, log
+
+# 日本語が中心のため、英語（約 4 文字/トークン）より小さい値で概算する
+CHARS_PER_TOKEN = 1.5
+
+OMITTED_DRAFT = "（以前の提出物のため省略。最新の提出物を参照してください）"
+OMITTED_FEEDBACK = "（以前の提出物に対する審査結果のため省略）"
+OMITTED_TOOL_OUTPUT = "（古いツール出力のため省略）"
+
+
+def count_tokens(messages: list[AnyMessage]) -> int:
+    return count_tokens_approximately(messages, chars_per_token=CHARS_PER_TOKEN)
+
+
+def _load_search_results(content: str) -> list[dict] | None:
+    try:
+        results = json.loads(content)
+    except (TypeError, json.JSONDecodeError):
+        return None
+    return results if isinstance(results, list) else None
+
+
+class CompactContextMiddleware(AgentMiddleware):
+    """モデルに送る会話履歴を圧縮し、ターンごとのプロンプトサイズを一定に保つ.
+
+    エージェントの状態（会話履歴そのもの）は変更せず、モデル呼び出し時のメッセージのみを差し替える。
+
+    1. 検索結果のうち、既出の URL の結果を除く
+    2. submit_content は最新の提出物とその審査結果のみを残す
+    3. トークン数が予算を超える場合は、古い検索結果をタイトルと URL に要約し、それでも超える場合は省略する
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 8_000,
+        keep_recent: int = 4,
+        stale_snippet_chars: int = 80,
+        search_tool_names: frozenset[str] = frozenset({"search_web"}),
+        submit_tool_name: str = "submit_content",
+    ) -> None:
+        super().__init__()
+        self.token_budget = token_budget
+        # 直近のメッセージは要約・省略の対象外とする
+        self.keep_recent = keep_recent
+        self.stale_snippet_chars = stale_snippet_chars
+        self.search_tool_names = search_tool_names
+        self.submit_tool_name = submit_tool_name
+
+    def _dedupe_search_results(self, message: ToolMessage, seen_urls: set[str]) -> ToolMessage:
+        if (results := _load_search_results(str(message.content))) is None:
+            return message
+        unique_results = []
+        for result in results:
+            url = result.get("url") if isinstance(result, dict) else None
+            if url and url in seen_urls:
+                continue
+            if url:
+                seen_urls.add(url)
+            unique_results.append(result)
+        if len(unique_results) == len(results):
+            return message
+        content = json.dumps(unique_results, ensure_ascii=False) if unique_results else "[]"
+        note = f"（既出の検索結果 {len(results) - len(unique_results)} 件を省略）"
+        return message.model_copy(update={"content": f"{content}\n{note}"})
+
+    def _summarize_search_results(self, message: ToolMessage) -> ToolMessage:
+        if (results := _load_search_results(str(message.content).split("\n")[0])) is None:
+            return message
+        summary = [
+            {
+                "title": result.get("title"),
+                "url": result.get("url"),
+                "snippet": str(result.get("snippet", ""))[: self.stale_snippet_chars],
+            }
+            for result in results
+            if isinstance(result, dict)
+        ]
+        return message.model_copy(
+            update={"content": json.dumps(summary, ensure_ascii=False) + "\n（要約済み）"}
+        )
+
+    def compact(self, messages: list[AnyMessage]) -> list[AnyMessage]:
+        tool_names = {
+            tool_call["id"]: tool_call["name"]
+            for message in messages
+            if isinstance(message, AIMessage)
+            for tool_call in message.tool_calls
+        }
+        submit_call_ids = [
+            tool_call_id
+            for tool_call_id, name in tool_names.items()
+            if name == self.submit_tool_name
+        ]
+        stale_submit_ids = set(submit_call_ids[:-1])
+
+        compacted: list[AnyMessage] = []
+        seen_urls: set[str] = set()
+        for message in messages:
+            if isinstance(message, AIMessage) and any(
+                tool_call["id"] in stale_submit_ids for tool_call in message.tool_calls
+            ):
+                message = message.model_copy(  # noqa: PLW2901
+                    update={
+                        "tool_calls": [
+                            {**tool_call, "args": {"content": OMITTED_DRAFT}}
+                            if tool_call["id"] in stale_submit_ids
+                            else tool_call
+                            for tool_call in message.tool_calls
+                        ]
+                    }
+                )
+            elif isinstance(message, ToolMessage):
+                name = tool_names.get(message.tool_call_id)
+                if message.tool_call_id in stale_submit_ids:
+                    message = message.model_copy(update={"content": OMITTED_FEEDBACK})  # noqa: PLW2901
+                elif name in self.search_tool_names:
+                    message = self._dedupe_search_results(message, seen_urls)  # noqa: PLW2901
+            compacted.append(message)
+
+        stale_indices = [
+            idx
+            for idx, message in enumerate(compacted[: -self.keep_recent or None])
+            if isinstance(message, ToolMessage)
+            and message.content not in (OMITTED_FEEDBACK, OMITTED_TOOL_OUTPUT)
+        ]
+        num_tokens = count_tokens(compacted)
+        # 古いツール出力から順に、要約 → 省略 の 2 段階で予算内に収める
+        for summarize in (True, False):
+            for idx in stale_indices:
+                if num_tokens <= self.token_budget:
+                    return compacted
+                message = compacted[idx]
+                if summarize:
+                    if tool_names.get(message.tool_call_id) not in self.search_tool_names:
+                        continue
+                    compacted[idx] = self._summarize_search_results(message)
+                else:
+                    compacted[idx] = message.model_copy(update={"content": OMITTED_TOOL_OUTPUT})
+                num_tokens += count_tokens([compacted[idx]]) - count_tokens([message])
+        return compacted
+
+    def _compact_request(self, request: ModelRequest) -> ModelRequest:
+        if not request.messages:
+            return request
+        messages = self.compact(request.messages)
+        log(
+            log_level=LogLevel.TRACE,
+            subject=self.__class__.__name__,
+            object="compact",
+            message=f"{count_tokens(request.messages)} -> {count_tokens(messages)} tokens",
+        )
+        return request.override(messages=messages)
+
+    def wrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], ModelResponse],
+    ) -> ModelResponse:
+        return handler(self._compact_request(request))
+
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> ModelResponse:
+        return await handler(self._compact_request(request))
+
+
+compact_context = CompactContextMiddleware(
+    token_budget=settings.EXECUTE_TASK_CONTEXT_TOKEN_BUDGET,
+    keep_recent=settings.EXECUTE_TASK_CONTEXT_KEEP_RECENT,
+)
@@ -1,6 +1,9 @@
-from langchain.agents.middleware import wrap_tool_call
+from collections.abc import Awaitable, Callable
+
+from langchain.agents.middleware import AgentMiddleware
 from langchain_core.messages import ToolMessage
 from langchain.tools.tool_node import ToolCallRequest
+from langgraph.types import Command
 
 from app.core.logging import LogLevel, log
 
@@ -24,16 +27,38 @@ def log_tool_response(response: ToolMessage) -> None:
     )
 
 
-@wrap_tool_call
-def handle_tool_errors(
-    request: ToolCallRequest,
-    handler: callable,  # type: ignore
-) -> ToolMessage:
-    try:
-        log_tool_call(request)
-        tool_response = handler(request)  # type: ignore
-        log_tool_response(tool_response)
-        return tool_response
-    except Exception as e:  # noqa: BLE001
-        error_message = f"Tool error: Please check your input and try again. ({e!s})"
-        return ToolMessage(content=error_message, tool_call_id=request.tool_call["id"])
+def to_error_message(request: ToolCallRequest, e: Exception) -> ToolMessage:
+    error_message = f"Tool error: Please check your input and try again. ({e!s})"
+    return ToolMessage(content=error_message, tool_call_id=request.tool_call["id"])
+
+
+class HandleToolErrorsMiddleware(AgentMiddleware):
+    # 同期（invoke）・非同期（ainvoke）の両方のエージェント実行に対応する
+    def wrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], ToolMessage | Command],
+    ) -> ToolMessage | Command:
+        try:
+            log_tool_call(request)
+            tool_response = handler(request)
+            log_tool_response(tool_response)  # type: ignore
+            return tool_response  # noqa: TRY300
+        except Exception as e:  # noqa: BLE001
+            return to_error_message(request, e)
+
+    async def awrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Awaitable[ToolMessage | Command]],
+    ) -> ToolMessage | Command:
+        try:
+            log_tool_call(request)
+            tool_response = await handler(request)
+            log_tool_response(tool_response)  # type: ignore
+            return tool_response  # noqa: TRY300
+        except Exception as e:  # noqa: BLE001
+            return to_error_message(request, e)
+
+
+handle_tool_errors = HandleToolErrorsMiddleware()
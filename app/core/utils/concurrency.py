@@ -0,0 +1,42 @@
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from weakref import WeakKeyDictionary
+
+
+class ConcurrencyLimiter:
+    """同時実行数を制限するリミッター.
+
+    同期処理はスレッド間で共有するセマフォ、非同期処理はイベントループごとの
+    asyncio.Semaphore で制限する（asyncio.Semaphore はループを跨いで共有できないため）。
+    """
+
+    def __init__(self, limit: int) -> None:
+        if limit < 1:
+            error_message = f"limit must be >= 1 (got {limit})"
+            raise ValueError(error_message)
+        self.limit = limit
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._async_semaphores: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _get_async_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if (semaphore := self._async_semaphores.get(loop)) is None:
+                semaphore = asyncio.Semaphore(self.limit)
+                self._async_semaphores[loop] = semaphore
+            return semaphore
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        with self._semaphore:
+            yield
+
+    @asynccontextmanager
+    async def ahold(self) -> AsyncIterator[None]:
+        async with self._get_async_semaphore():
+            yield
@@ -2,6 +2,23 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 
 from app.core.config import settings
+from app.domain.enums.base import BaseEnum
+
+
+class TimeGranularity(BaseEnum):
+    SECOND = "second"
+    MINUTE = "minute"
+    HOUR = "hour"
+    DAY = "day"
+
+    @property
+    def fmt(self) -> str:
+        return {
+            TimeGranularity.SECOND: "%Y-%m-%d %H:%M:%S",
+            TimeGranularity.MINUTE: "%Y-%m-%d %H:%M",
+            TimeGranularity.HOUR: "%Y-%m-%d %H:00",
+            TimeGranularity.DAY: "%Y-%m-%d",
+        }[self]
 
 
 def get_current_time(
@@ -9,3 +26,11 @@ def get_current_time(
     fmt: str = "%Y-%m-%d %H:%M:%S",
 ) -> str:
     return datetime.now(ZoneInfo(timezone)).strftime(fmt)
+
+
+def get_current_time_bucket(
+    granularity: TimeGranularity,
+    timezone: str = settings.TIMEZONE,
+) -> str:
+    # 粒度に切り詰めた現在時刻。同一バケット内では同じ文字列を返す
+    return get_current_time(timezone=timezone, fmt=granularity.fmt)
@@ -0,0 +1,29 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:  # noqa: ANN401
+    """JSON を UTF-8 のバイト列にする. orjson があれば使い、扱えない値は標準の json に任せる."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            # 64 bit を超える整数など
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
+def dumps(obj: Any, indent: bool = False) -> str:  # noqa: ANN401
+    return dumps_bytes(obj, indent).decode("utf-8")
+
+
+def loads(data: str | bytes) -> Any:  # noqa: ANN401
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,37 @@
+import hashlib
+import random
+from collections.abc import Iterable
+
+MERSENNE_PRIME = (1 << 61) - 1
+
+
+class MinHasher:
+    """n-gram 集合の MinHash. 2 つの集合のシグネチャが一致する割合は、Jaccard 類似度の推定値になる.
+
+    並べ替えには、独立に選んだ (a * x + b) mod p のハッシュ関数を使う。
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 0) -> None:
+        rng = random.Random(seed)
+        self.permutations = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, shingles: Iterable[str]) -> tuple[int, ...]:
+        hashes = [
+            int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+            for shingle in shingles
+        ]
+        return tuple(
+            min([(a * value + b) % MERSENNE_PRIME for value in hashes])
+            for a, b in self.permutations
+        )
+
+    def bands(self, shingles: Iterable[str], rows: int) -> list[tuple[int, tuple[int, ...]]]:
+        """LSH のバンド (バンド番号, シグネチャの部分列). いずれかが一致する集合を類似の候補とする."""
+        signature = self.signature(shingles)
+        return [
+            (idx, signature[start : start + rows])
+            for idx, start in enumerate(range(0, len(signature), rows))
+        ]
@@ -1,9 +1,26 @@
-import nanoid
+import random
+import threading
 from typing import NewType
 
+import nanoid
+from nanoid.resources import alphabet
+
 NanoID = NewType("NanoID", str)
 
+_lock = threading.Lock()
+_random: random.Random | None = None
+
+
+def seed_ids(seed: int | None) -> None:
+    """generate_id が返す ID の系列を seed で固定する（None で乱数に戻す）. カセットの記録・再生で使う."""
+    global _random  # noqa: PLW0603
+    with _lock:
+        _random = None if seed is None else random.Random(seed)  # noqa: S311
+
 
 def generate_id(size: int = 5) -> NanoID:
+    with _lock:
+        if _random is not None:
+            return NanoID("".join(_random.choice(alphabet) for _ in range(size)))
     id_: str = nanoid.generate(size=size)
     return NanoID(id_)
@@ -0,0 +1,61 @@
+import re
+import unicodedata
+from collections import Counter
+
+# 否定・反意の表現と、その極性のラベル. 長い表現から順に照合する（「デメリット」を「メリット」より先に）
+POLARITY_MARKERS = {
+    "デメリット": "demerit",
+    "メリット": "merit",
+    "短所": "demerit",
+    "長所": "merit",
+    "欠点": "demerit",
+    "利点": "merit",
+    "disadvantages": "demerit",
+    "disadvantage": "demerit",
+    "advantages": "merit",
+    "advantage": "merit",
+    "cons": "demerit",
+    "pros": "merit",
+    "増加": "increase",
+    "上昇": "increase",
+    "拡大": "increase",
+    "減少": "decrease",
+    "下落": "decrease",
+    "低下": "decrease",
+    "縮小": "decrease",
+    "increase": "increase",
+    "decrease": "decrease",
+    "成功": "success",
+    "失敗": "failure",
+    "賛成": "pro",
+    "反対": "con",
+    "なかっ": "negation",
+    "ません": "negation",
+    "ない": "negation",
+    "なし": "negation",
+    "無し": "negation",
+    "せず": "negation",
+    "ず": "negation",
+    "ぬ": "negation",
+    "不": "negation",
+    "非": "negation",
+    "未": "negation",
+    "無": "negation",
+    "without": "negation",
+    "not": "negation",
+    "n't": "negation",
+    "no": "negation",
+}
+POLARITY_PATTERN = re.compile(
+    "|".join(
+        # 英語は単語単位で照合する（"no" が "note" に一致しないように）
+        rf"\b{re.escape(marker)}\b" if marker.isascii() and marker.isalpha() else re.escape(marker)
+        for marker in sorted(POLARITY_MARKERS, key=len, reverse=True)
+    )
+)
+
+
+def polarity(text: str) -> Counter[str]:
+    """否定・反意の表現の出現回数. 文面が似ていても、これが異なる 2 つの文は同じ意味とはみなさない."""
+    normalized = unicodedata.normalize("NFKC", text).lower()
+    return Counter(POLARITY_MARKERS[match.group()] for match in POLARITY_PATTERN.finditer(normalized))
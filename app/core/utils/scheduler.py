@@ -0,0 +1,149 @@
+import asyncio
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+
+from app.core.utils.token_bucket import TokenBucket
+
+Costs = Sequence[tuple[TokenBucket, float]]
+
+
+@dataclass(order=True)
+class _Waiter:
+    rank: int
+    seq: int
+    costs: Costs = field(compare=False)
+    wake: Callable[[], None] = field(compare=False)
+
+
+class PriorityScheduler:
+    """優先度順に実行を開始させるスケジューラー.
+
+    同時実行数の上限に加え、開始時に各トークンバケットから見積もりコストを予約する。
+    待機中のタスクは rank の小さい順（同じ rank は到着順）に開始し、先頭のタスクが予算待ちの間は
+    後続のタスクも待たせる（優先度の逆転を防ぐため）。同期（スレッド）・非同期の両方から利用できる。
+    """
+
+    def __init__(self, limit: int) -> None:
+        if limit < 1:
+            error_message = f"limit must be >= 1 (got {limit})"
+            raise ValueError(error_message)
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._active = 0
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _wake_head(self) -> None:
+        if self._waiters:
+            self._waiters[0].wake()
+
+    def _try_admit(self, waiter: _Waiter) -> float | None:
+        """開始できた場合は None、できない場合は再確認までの待機秒数を返す（lock 内で呼ぶ）."""
+        if self._waiters[0] is not waiter or self._active >= self.limit:
+            return math.inf
+        wait = max((bucket.wait_time(amount) for bucket, amount in waiter.costs), default=0.0)
+        if wait > 0:
+            return wait
+        for bucket, amount in waiter.costs:
+            bucket.consume(min(amount, bucket.capacity))
+        heapq.heappop(self._waiters)
+        self._active += 1
+        # 次の先頭のタスクも開始できる可能性がある
+        self._wake_head()
+        return None
+
+    def _register(self, rank: int, costs: Costs, wake: Callable[[], None]) -> _Waiter:
+        waiter = _Waiter(rank=rank, seq=next(self._seq), costs=costs, wake=wake)
+        with self._lock:
+            heapq.heappush(self._waiters, waiter)
+        return waiter
+
+    def _cancel(self, waiter: _Waiter) -> None:
+        self._waiters.remove(waiter)
+        heapq.heapify(self._waiters)
+        self._wake_head()
+
+    def release(self) -> None:
+        with self._lock:
+            self._active -= 1
+            self._wake_head()
+
+    def acquire(self, rank: int, costs: Costs = (), timeout: float | None = None) -> bool:
+        """開始できた場合は True、timeout 秒以内に開始できなかった場合は False を返す."""
+        event = threading.Event()
+        waiter = self._register(rank, costs, event.set)
+        deadline = math.inf if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if (wait := self._try_admit(waiter)) is None:
+                    return True
+                if (remaining := deadline - time.monotonic()) <= 0:
+                    self._cancel(waiter)
+                    return False
+                event.clear()
+            wait = min(wait, remaining)
+            event.wait(None if math.isinf(wait) else wait)
+
+    async def aacquire(self, rank: int, costs: Costs = (), timeout: float | None = None) -> bool:
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = self._register(rank, costs, lambda: loop.call_soon_threadsafe(event.set))
+        deadline = math.inf if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if (wait := self._try_admit(waiter)) is None:
+                    return True
+                if (remaining := deadline - time.monotonic()) <= 0:
+                    self._cancel(waiter)
+                    return False
+                event.clear()
+            wait = min(wait, remaining)
+            try:
+                await asyncio.wait_for(event.wait(), None if math.isinf(wait) else wait)
+            except TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                with self._lock:
+                    self._cancel(waiter)
+                raise
+
+    @staticmethod
+    def settle(bucket: TokenBucket, estimate: float, actual: float) -> None:
+        """開始時に予約した見積もり estimate を、実際の使用量 actual で精算する."""
+        bucket.consume(actual - min(estimate, bucket.capacity))
+
+    @contextmanager
+    def hold(self, rank: int, costs: Costs = (), timeout: float | None = None) -> Iterator[bool]:
+        if not (admitted := self.acquire(rank, costs, timeout)):
+            yield False
+            return
+        try:
+            yield admitted
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def ahold(
+        self, rank: int, costs: Costs = (), timeout: float | None = None
+    ) -> AsyncIterator[bool]:
+        if not (admitted := await self.aacquire(rank, costs, timeout)):
+            yield False
+            return
+        try:
+            yield admitted
+        finally:
+            self.release()
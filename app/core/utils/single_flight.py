@@ -0,0 +1,119 @@
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+from concurrent.futures import CancelledError, Future
+from typing import TypeVar
+from weakref import WeakKeyDictionary
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """同一キーの呼び出しが同時に実行中であれば、その結果を共有する（リクエストの合流）.
+
+    同期呼び出しはスレッド間、非同期呼び出しは同一イベントループ内のコルーチン間で合流する。
+    完了した呼び出しの結果は保持しない（キャッシュではない）。実行していた呼び出しがキャンセルされた場合は、
+    合流していた呼び出し元が改めて実行する。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+        self._async_calls: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, asyncio.Future]
+        ] = WeakKeyDictionary()
+        self.num_calls = 0
+        self.num_executions = 0
+        self.num_coalesced = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "calls": self.num_calls,
+            "executions": self.num_executions,
+            "coalesced": self.num_coalesced,
+        }
+
+    def do(self, key: str, fn: Callable[[], T]) -> tuple[T, bool]:
+        """fn を実行して (結果, 合流したかどうか) を返す."""
+        with self._lock:
+            self.num_calls += 1
+        while True:
+            with self._lock:
+                if (future := self._calls.get(key)) is not None and not future.cancelled():
+                    self.num_coalesced += 1
+                    is_leader = False
+                else:
+                    future = Future()
+                    self._calls[key] = future
+                    self.num_executions += 1
+                    is_leader = True
+            if is_leader:
+                break
+            try:
+                return future.result(), True
+            except CancelledError:
+                # 実行していた呼び出しが中断された場合は、結果を共有せずに実行し直す
+                with self._lock:
+                    self.num_coalesced -= 1
+        try:
+            result = fn()
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                if self._calls.get(key) is future:
+                    del self._calls[key]
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Awaitable を返す fn を実行して (結果, 合流したかどうか) を返す."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.num_calls += 1
+        while True:
+            with self._lock:
+                calls = self._async_calls.setdefault(loop, {})
+                if (future := calls.get(key)) is not None and not future.cancelled():
+                    self.num_coalesced += 1
+                    is_leader = False
+                else:
+                    future = loop.create_future()
+                    calls[key] = future
+                    self.num_executions += 1
+                    is_leader = True
+            if is_leader:
+                break
+            try:
+                # 待機側がキャンセルされても実行中の呼び出しには影響させない
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                # 待機側自身のキャンセルはそのまま伝え、実行していた呼び出しのキャンセルは実行し直す
+                task = asyncio.current_task()
+                if not future.cancelled() or (task is not None and task.cancelling()):
+                    raise
+                with self._lock:
+                    self.num_coalesced -= 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 待機者がいない場合に "exception was never retrieved" を出さない
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                if calls.get(key) is future:
+                    del calls[key]
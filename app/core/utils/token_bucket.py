@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+
+
+class TokenBucket:
+    """一定速度で補充されるトークンバケット. リクエスト数やトークン数の分あたりの上限を表す.
+
+    capacity を超える量の要求は capacity に切り詰める（永遠に待たないようにするため）。
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate_per_second <= 0 or capacity <= 0:
+            error_message = (
+                f"rate_per_second and capacity must be > 0 (got {rate_per_second}, {capacity})"
+            )
+            raise ValueError(error_message)
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, amount: float) -> "TokenBucket":
+        return cls(rate_per_second=amount / 60, capacity=amount)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second
+        )
+        self._updated_at = now
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def wait_time(self, amount: float) -> float:
+        """amount を消費できるようになるまでの秒数を返す（0 の場合は即座に消費できる）."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            return max(0.0, (amount - self._tokens) / self.rate_per_second)
+
+    def try_consume(self, amount: float) -> bool:
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens < amount:
+                return False
+            self._tokens -= amount
+            return True
+
+    def consume(self, amount: float) -> None:
+        """残量に関わらず消費する（見積もりとの差分の精算用. 負の値は返却として capacity まで戻す）."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+    def acquire(self, amount: float) -> None:
+        while not self.try_consume(amount):
+            time.sleep(self.wait_time(amount))
+
+    async def aacquire(self, amount: float) -> None:
+        while not self.try_consume(amount):
+            await asyncio.sleep(self.wait_time(amount))
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from functools import partial
 
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph.state import CompiledStateGraph
 
 from app.core.logging import LogLevel, log
@@ -11,7 +11,7 @@ class LangGraphAgent(ABC):
     def __init__(
         self,
         log_level: LogLevel,
-        checkpointer: MemorySaver | None,
+        checkpointer: BaseCheckpointSaver | None,
         recursion_limit: int,
     ) -> None:
         self.log = partial(log, log_level=log_level, subject=self.__name__)
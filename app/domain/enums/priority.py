@@ -6,6 +6,11 @@ class Priority(BaseEnum):
     MEDIUM = "medium"
     LOW = "low"
 
+    @property
+    def rank(self) -> int:
+        """優先度が高いほど小さい値（スケジューラーでの並び順）."""
+        return [Priority.HIGH, Priority.MEDIUM, Priority.LOW].index(self)
+
     @classmethod
     def up_to(cls, target: "Priority") -> list["Priority"]:
         priorities = [cls.HIGH, cls.MEDIUM, cls.LOW]
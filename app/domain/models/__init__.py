@@ -1,6 +1,8 @@
 from app.domain.models.document import Document, ManagedDocument
+from app.domain.models.search_result import SearchResult
 
 __all__ = [
     "Document",
     "ManagedDocument",
+    "SearchResult",
 ]
@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+
+
+class SearchResult(BaseModel):
+    title: str = Field(title="タイトル")
+    url: str = Field(title="URL")
+    snippet: str = Field(title="スニペット", default="")
@@ -1,4 +1,22 @@
-from app.infrastructure.blob_manager.base import BaseBlobManager
-from app.infrastructure.blob_manager.local import LocalBlobManager
+from app.infrastructure.blob_manager.base import BaseBlobManager, BaseBlobWriter
+from app.infrastructure.blob_manager.content_addressed import (
+    ContentAddressedBlobManager,
+    ContentAddressedBlobWriter,
+)
+from app.infrastructure.blob_manager.factory import create_blob_manager
+from app.infrastructure.blob_manager.local import LocalBlobManager, LocalBlobWriter
+from app.infrastructure.blob_manager.s3 import S3BlobManager, S3BlobWriter
+from app.infrastructure.blob_manager.template_registry import TemplateRegistry
 
-__all__ = ["BaseBlobManager", "LocalBlobManager"]
+__all__ = [
+    "BaseBlobManager",
+    "BaseBlobWriter",
+    "ContentAddressedBlobManager",
+    "ContentAddressedBlobWriter",
+    "LocalBlobManager",
+    "LocalBlobWriter",
+    "S3BlobManager",
+    "S3BlobWriter",
+    "TemplateRegistry",
+    "create_blob_manager",
+]
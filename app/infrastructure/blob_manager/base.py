@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
 from functools import partial
 
 from jinja2 import Template
@@ -7,6 +8,24 @@ from pydantic import BaseModel
 from app.core.logging import log, LogLevel
 
 
+class BaseBlobWriter(ABC):
+    """ブロブに文字列を逐次書き込むライター. with 文を抜けると書き込みを確定する."""
+
+    @abstractmethod
+    def write(self, chunk: str) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "BaseBlobWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
 class BaseBlobManager(ABC):
     def __init__(self, log_level: LogLevel = LogLevel.DEBUG) -> None:
         self.log = partial(log, log_level=log_level, subject=self.__name__)
@@ -29,16 +48,23 @@ class BaseBlobManager(ABC):
 
     @abstractmethod
     def read_blob_as_json(
-        self, blob_path: str, schema: BaseModel | None = None
+        self, blob_path: str, schema: type[BaseModel] | None = None
     ) -> dict | list | BaseModel:
         pass
 
     @abstractmethod
     def read_blob_as_jsonl(
-        self, blob_path: str, schema: BaseModel | None = None
+        self, blob_path: str, schema: type[BaseModel] | None = None
     ) -> list[dict] | list[BaseModel]:
         pass
 
+    @abstractmethod
+    def iter_blob_as_jsonl(
+        self, blob_path: str, schema: type[BaseModel] | None = None
+    ) -> Iterator[dict | BaseModel]:
+        """JSONL を 1 行ずつ返す. ファイル全体をメモリに載せない."""
+        pass
+
     @abstractmethod
     def save_blob_as_bytes(self, content: bytes, blob_path: str) -> None:
         pass
@@ -48,15 +74,32 @@ class BaseBlobManager(ABC):
         pass
 
     @abstractmethod
-    def save_blob_as_json(self, content: dict, blob_path: str) -> None:
+    def save_blob_as_json(self, content: dict | list, blob_path: str, indent: bool = True) -> None:
         pass
 
     @abstractmethod
     def save_blob_as_jsonl(
-        self, content: list[dict], blob_path: str, schema: BaseModel | None = None
+        self,
+        content: Iterable[dict | BaseModel],
+        blob_path: str,
+        schema: type[BaseModel] | None = None,
     ) -> None:
         pass
 
+    @abstractmethod
+    def append_blob_as_jsonl(
+        self,
+        content: Iterable[dict | BaseModel],
+        blob_path: str,
+        schema: type[BaseModel] | None = None,
+    ) -> int:
+        """JSONL の末尾に追記し、追記した行数を返す."""
+        pass
+
+    @abstractmethod
+    def open_blob_writer(self, blob_path: str) -> BaseBlobWriter:
+        pass
+
     @abstractmethod
     def mkdir(self, blob_dir_path: str) -> None:
         pass
@@ -68,3 +111,7 @@ class BaseBlobManager(ABC):
     @abstractmethod
     def exists(self, blob_path: str) -> bool:
         pass
+
+    @abstractmethod
+    def get_blob_mtime(self, blob_path: str) -> float:
+        pass
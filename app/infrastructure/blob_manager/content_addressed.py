@@ -0,0 +1,403 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from jinja2 import Template
+from pydantic import BaseModel
+
+from app.core.logging import LogLevel, log
+from app.core.utils import json_codec
+from app.infrastructure.blob_manager.base import BaseBlobManager, BaseBlobWriter
+from app.infrastructure.blob_manager.local import encode_jsonl_line
+from app.infrastructure.blob_manager.template_registry import template_registry
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+CHUNK_BYTES = 1024 * 1024
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS blobs ("
+    " path TEXT PRIMARY KEY,"
+    " digest TEXT NOT NULL,"
+    " size INTEGER NOT NULL,"
+    " mtime REAL NOT NULL"
+    ")",
+    "CREATE INDEX IF NOT EXISTS blobs_digest ON blobs (digest)",
+    # 追記分のオブジェクト。blobs のオブジェクトに seq の順につなげて読む
+    "CREATE TABLE IF NOT EXISTS segments ("
+    " path TEXT NOT NULL,"
+    " seq INTEGER NOT NULL,"
+    " digest TEXT NOT NULL,"
+    " size INTEGER NOT NULL,"
+    " PRIMARY KEY (path, seq)"
+    ")",
+)
+
+
+def normalize_path(blob_path: str) -> str:
+    return Path(os.path.normpath(blob_path)).as_posix()
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    buffer = b""
+    for chunk in chunks:
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            yield line + b"\n"
+    if buffer:
+        yield buffer
+
+
+class ObjectWriter:
+    """内容を圧縮しながら一時ファイルに書き込み、commit でハッシュ名のオブジェクトとして確定する."""
+
+    def __init__(self, objects_dir: Path, compression_level: int) -> None:
+        fd, temp_path = tempfile.mkstemp(dir=objects_dir, suffix=".tmp")
+        self._file = open(fd, "wb")  # noqa: SIM115
+        self._temp_path = temp_path
+        self._objects_dir = objects_dir
+        # zstandard がない環境では zlib で圧縮する（読み込み時は先頭のマジックナンバーで判別する）
+        self._compressor = (
+            zstandard.ZstdCompressor(level=compression_level).compressobj()
+            if zstandard is not None
+            else zlib.compressobj(min(compression_level, 9))
+        )
+        self._hasher = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk: bytes) -> None:
+        self._hasher.update(chunk)
+        self.size += len(chunk)
+        self._file.write(self._compressor.compress(chunk))
+
+    def commit(self) -> tuple[str, bool]:
+        """(内容ハッシュ, 新規オブジェクトか) を返す. 同じ内容が保存済みの場合は一時ファイルを捨てる."""
+        self._file.write(self._compressor.flush())
+        self._file.close()
+        digest = self._hasher.hexdigest()
+        object_path = self._objects_dir / digest[:2] / digest
+        if object_path.exists():
+            os.unlink(self._temp_path)
+            return digest, False
+        object_path.parent.mkdir(exist_ok=True)
+        os.chmod(self._temp_path, 0o644)
+        os.replace(self._temp_path, object_path)
+        return digest, True
+
+    def abort(self) -> None:
+        self._file.close()
+        Path(self._temp_path).unlink(missing_ok=True)
+
+
+class ContentAddressedBlobWriter(BaseBlobWriter):
+    """close 時に 1 つのオブジェクトとして確定する. 書き込み中の内容は他から読めない."""
+
+    def __init__(self, blob_manager: "ContentAddressedBlobManager", blob_path: str) -> None:
+        self._blob_manager = blob_manager
+        self._blob_path = blob_path
+        self._writer = blob_manager.open_object_writer()
+
+    def write(self, chunk: str) -> None:
+        self._writer.write(chunk.encode("utf-8"))
+
+    def close(self) -> None:
+        self._blob_manager.commit_object(self._writer, self._blob_path)
+
+
+class ContentAddressedBlobManager(BaseBlobManager):
+    """内容のハッシュ (SHA-256) をキーに、zstd で圧縮したオブジェクトとして保存するブロブマネージャー.
+
+    root_dir/objects/ab/abcd... に内容ごとに 1 つだけ保存し、呼び出し元のパスとハッシュの対応を
+    root_dir/index.sqlite3 に保持する。同じ内容のレポート・検索結果・カセットは 1 度しか保存されない。
+    オブジェクトは不変のため、追記 (append_blob_as_jsonl) は追記分だけを新しいオブジェクト（セグメント）として
+    保存し、読み込み時に順につなげる（追記のたびに既存の内容を書き直さない）。
+    索引にないパスの読み込みは fallback（プロンプトテンプレート等）に委ねる。
+    """
+
+    def __init__(
+        self,
+        root_dir: str,
+        compression_level: int = 3,
+        fallback: BaseBlobManager | None = None,
+        log_level: LogLevel = LogLevel.TRACE,
+    ) -> None:
+        super().__init__(log_level)
+        self.root_dir = Path(root_dir)
+        self.objects_dir = self.root_dir / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.compression_level = compression_level
+        self.fallback = fallback
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.root_dir / "index.sqlite3", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+        self.deduplicated = 0
+        if zstandard is None:
+            log(
+                LogLevel.WARNING,
+                subject=self.__class__.__name__,
+                object="zstandard",
+                message="zstandard is not installed; new objects are compressed with zlib",
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _lookup(self, blob_path: str) -> tuple[str, int, float] | None:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT digest, size, mtime FROM blobs WHERE path = ?", (normalize_path(blob_path),)
+            ).fetchone()
+
+    def _digests(self, blob_path: str) -> list[str]:
+        """ブロブを構成するオブジェクトのハッシュを、読む順に返す."""
+        path = normalize_path(blob_path)
+        with self._lock:
+            if (row := self._lookup(blob_path)) is None:
+                raise FileNotFoundError(blob_path)
+            segments = self._conn.execute(
+                "SELECT digest FROM segments WHERE path = ? ORDER BY seq", (path,)
+            ).fetchall()
+        return [row[0], *(digest for (digest,) in segments)]
+
+    def _use_fallback(self, blob_path: str) -> bool:
+        return self.fallback is not None and self._lookup(blob_path) is None
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _iter_object(self, digest: str) -> Iterator[bytes]:
+        with open(self.object_path(digest), "rb") as fi:
+            is_zstd = fi.read(4) == ZSTD_MAGIC
+            fi.seek(0)
+            decompressor = (
+                zstandard.ZstdDecompressor().decompressobj() if is_zstd else zlib.decompressobj()
+            )
+            while chunk := fi.read(CHUNK_BYTES):
+                yield decompressor.decompress(chunk)
+            if not is_zstd:
+                yield decompressor.flush()
+
+    def _iter_blob(self, blob_path: str) -> Iterator[bytes]:
+        for digest in self._digests(blob_path):
+            yield from self._iter_object(digest)
+
+    def open_object_writer(self) -> ObjectWriter:
+        return ObjectWriter(self.objects_dir, self.compression_level)
+
+    def commit_object(self, writer: ObjectWriter, blob_path: str) -> str:
+        digest, created = writer.commit()
+        path = normalize_path(blob_path)
+        with self._lock:
+            # 上書きする場合は、それまでの追記分も取り除く
+            self._conn.execute("DELETE FROM segments WHERE path = ?", (path,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO blobs (path, digest, size, mtime) VALUES (?, ?, ?, ?)",
+                (path, digest, writer.size, time.time()),
+            )
+            self._conn.commit()
+            self.deduplicated += not created
+        return digest
+
+    def _write_object(self, chunks: Iterable[bytes]) -> ObjectWriter:
+        writer = self.open_object_writer()
+        try:
+            for chunk in chunks:
+                writer.write(chunk)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer
+
+    def _store(self, chunks: Iterable[bytes], blob_path: str) -> str:
+        return self.commit_object(self._write_object(chunks), blob_path)
+
+    def _store_segment(self, chunks: Iterable[bytes], blob_path: str) -> str:
+        writer = self._write_object(chunks)
+        digest, created = writer.commit()
+        path = normalize_path(blob_path)
+        with self._lock:
+            if self._lookup(blob_path) is None:
+                # 存在しないブロブへの追記は、追記分をそのままブロブとする
+                self._conn.execute(
+                    "INSERT INTO blobs (path, digest, size, mtime) VALUES (?, ?, ?, ?)",
+                    (path, digest, writer.size, time.time()),
+                )
+            else:
+                self._conn.execute(
+                    "INSERT INTO segments (path, seq, digest, size)"
+                    " SELECT ?, COALESCE(MAX(seq), 0) + 1, ?, ? FROM segments WHERE path = ?",
+                    (path, digest, writer.size, path),
+                )
+                self._conn.execute(
+                    "UPDATE blobs SET mtime = ? WHERE path = ?", (time.time(), path)
+                )
+            self._conn.commit()
+            self.deduplicated += not created
+        return digest
+
+    def read_blob_as_bytes(self, blob_path: str) -> bytes:
+        if self._use_fallback(blob_path):
+            return self.fallback.read_blob_as_bytes(blob_path)  # type: ignore
+        self.log(object="read_blob_as_bytes", message=blob_path)
+        return b"".join(self._iter_blob(blob_path))
+
+    def read_blob_as_str(self, blob_path: str) -> str:
+        if self._use_fallback(blob_path):
+            return self.fallback.read_blob_as_str(blob_path)  # type: ignore
+        self.log(object="read_blob_as_str", message=blob_path)
+        return b"".join(self._iter_blob(blob_path)).decode("utf-8")
+
+    def read_blob_as_template(self, blob_path: str) -> Template:
+        self.log(object="read_blob_as_template", message=blob_path)
+        return template_registry.get(self, blob_path)
+
+    def read_blob_as_json(
+        self, blob_path: str, schema: type[BaseModel] | None = None
+    ) -> dict | list | BaseModel:
+        if self._use_fallback(blob_path):
+            return self.fallback.read_blob_as_json(blob_path, schema)  # type: ignore
+        self.log(object="read_blob_as_json", message=blob_path)
+        content = b"".join(self._iter_blob(blob_path))
+        if schema:
+            return schema.model_validate_json(content)
+        return json_codec.loads(content)  # type: ignore
+
+    def read_blob_as_jsonl(
+        self, blob_path: str, schema: type[BaseModel] | None = None
+    ) -> list[dict] | list[BaseModel]:
+        self.log(object="read_blob_as_jsonl", message=blob_path)
+        return list(self.iter_blob_as_jsonl(blob_path, schema))  # type: ignore
+
+    def iter_blob_as_jsonl(
+        self, blob_path: str, schema: type[BaseModel] | None = None
+    ) -> Iterator[dict | BaseModel]:
+        if self._use_fallback(blob_path):
+            yield from self.fallback.iter_blob_as_jsonl(blob_path, schema)  # type: ignore
+            return
+        self.log(object="iter_blob_as_jsonl", message=blob_path)
+        for line in iter_lines(self._iter_blob(blob_path)):
+            if not line.strip():
+                continue
+            yield schema.model_validate_json(line) if schema else json_codec.loads(line)
+
+    def save_blob_as_bytes(self, content: bytes, blob_path: str) -> None:
+        self.log(object="save_blob_as_bytes", message=blob_path)
+        self._store([content], blob_path)
+
+    def save_blob_as_str(self, content: str, blob_path: str) -> None:
+        self.log(object="save_blob_as_str", message=blob_path)
+        self._store([content.encode("utf-8")], blob_path)
+
+    def save_blob_as_json(self, content: dict | list, blob_path: str, indent: bool = True) -> None:
+        self.log(object="save_blob_as_json", message=blob_path)
+        self._store([json_codec.dumps_bytes(content, indent=indent)], blob_path)
+
+    def save_blob_as_jsonl(
+        self,
+        content: Iterable[dict | BaseModel],
+        blob_path: str,
+        schema: type[BaseModel] | None = None,
+    ) -> None:
+        self.log(object="save_blob_as_jsonl", message=blob_path)
+        self._store((encode_jsonl_line(item, schema) for item in content), blob_path)
+
+    def append_blob_as_jsonl(
+        self,
+        content: Iterable[dict | BaseModel],
+        blob_path: str,
+        schema: type[BaseModel] | None = None,
+    ) -> int:
+        self.log(object="append_blob_as_jsonl", message=blob_path)
+        lines = [encode_jsonl_line(item, schema) for item in content]
+        if lines or self._lookup(blob_path) is None:
+            self._store_segment(lines, blob_path)
+        return len(lines)
+
+    def open_blob_writer(self, blob_path: str) -> ContentAddressedBlobWriter:
+        self.log(object="open_blob_writer", message=blob_path)
+        return ContentAddressedBlobWriter(self, blob_path)
+
+    def mkdir(self, blob_dir_path: str) -> None:
+        # ディレクトリはパスの接頭辞として扱うため、作成するものはない
+        self.log(object="mkdir", message=blob_dir_path)
+
+    def list_blobs(self, blob_dir_path: str) -> list[str]:
+        self.log(object="list_blobs", message=blob_dir_path)
+        prefix = normalize_path(blob_dir_path).rstrip("/") + "/"
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path FROM blobs WHERE path LIKE ? ESCAPE '\\'", (escaped + "%",)
+            ).fetchall()
+        # 直下のブロブと、さらに下にブロブを持つディレクトリを返す
+        children = {prefix + path[len(prefix) :].split("/", 1)[0] for (path,) in rows}
+        if self.fallback is not None and self.fallback.exists(blob_dir_path):
+            children.update(str(path) for path in self.fallback.list_blobs(blob_dir_path))
+        return sorted(children)
+
+    def exists(self, blob_path: str) -> bool:
+        self.log(object="exists", message=blob_path)
+        if self._lookup(blob_path) is not None or self.list_blobs(blob_path):
+            return True
+        return self.fallback is not None and self.fallback.exists(blob_path)
+
+    def get_blob_mtime(self, blob_path: str) -> float:
+        if self._use_fallback(blob_path):
+            return self.fallback.get_blob_mtime(blob_path)  # type: ignore
+        self.log(object="get_blob_mtime", message=blob_path)
+        if (row := self._lookup(blob_path)) is None:
+            raise FileNotFoundError(blob_path)
+        return row[2]
+
+    def stats(self) -> dict[str, int]:
+        """パス数・オブジェクト数と、論理サイズ・重複排除後のサイズ・圧縮後（ディスク上）のサイズ."""
+        with self._lock:
+            (num_blobs,) = self._conn.execute("SELECT COUNT(*) FROM blobs").fetchone()
+            (logical_bytes,) = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM"
+                " (SELECT size FROM blobs UNION ALL SELECT size FROM segments)"
+            ).fetchone()
+            objects = self._conn.execute(
+                "SELECT digest, size FROM blobs UNION SELECT digest, size FROM segments"
+            ).fetchall()
+        return {
+            "blobs": num_blobs,
+            "objects": len(objects),
+            "logical_bytes": logical_bytes,
+            "unique_bytes": sum(size for _, size in objects),
+            "stored_bytes": sum(self.object_path(digest).stat().st_size for digest, _ in objects),
+        }
+
+    def collect_garbage(self, min_age_seconds: float = 3600) -> int:
+        """どのパスからも参照されないオブジェクトを削除し、件数を返す.
+
+        書き込み途中（索引への登録前）のオブジェクトを消さないよう、新しいものは残す。
+        """
+        with self._lock:
+            referenced = {
+                row[0]
+                for row in self._conn.execute("SELECT digest FROM blobs UNION SELECT digest FROM segments")
+            }
+        deadline = time.time() - min_age_seconds
+        removed = 0
+        for object_path in self.objects_dir.glob("*/*"):
+            if object_path.name not in referenced and object_path.stat().st_mtime < deadline:
+                object_path.unlink(missing_ok=True)
+                removed += 1
+        self.log(object="collect_garbage", message=f"{removed} objects")
+        return removed
@@ -0,0 +1,3 @@
+from .blob_backend import BlobBackend
+
+__all__ = ["BlobBackend"]
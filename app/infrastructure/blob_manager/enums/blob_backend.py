@@ -0,0 +1,7 @@
+from app.domain.enums.base import BaseEnum
+
+
+class BlobBackend(BaseEnum):
+    LOCAL = "local"  # 呼び出し元が指定したパスにそのまま保存する
+    CAS = "cas"  # 内容ハッシュをキーに圧縮・重複排除して保存する
+    S3 = "s3"  # S3 互換のオブジェクトストレージに保存する（複数ノードで共有する）
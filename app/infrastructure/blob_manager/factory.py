@@ -0,0 +1,35 @@
+from app.core.config import settings
+from app.infrastructure.blob_manager.base import BaseBlobManager
+from app.infrastructure.blob_manager.content_addressed import ContentAddressedBlobManager
+from app.infrastructure.blob_manager.enums import BlobBackend
+from app.infrastructure.blob_manager.local import LocalBlobManager
+from app.infrastructure.blob_manager.s3 import S3BlobManager
+
+
+def create_blob_manager() -> BaseBlobManager:
+    """設定（BLOB_BACKEND）に従い、成果物（レポート・カセット等）を保存するブロブマネージャーを作成する."""
+    match BlobBackend(settings.BLOB_BACKEND):
+        case BlobBackend.CAS:
+            return ContentAddressedBlobManager(
+                root_dir=settings.CAS_ROOT_DIR,
+                compression_level=settings.CAS_COMPRESSION_LEVEL,
+                # プロンプトテンプレートなど、索引にないファイルはローカルから読む
+                fallback=LocalBlobManager(),
+            )
+        case BlobBackend.S3:
+            return S3BlobManager(
+                endpoint_url=settings.S3_ENDPOINT_URL,
+                bucket=settings.S3_BUCKET,
+                prefix=settings.S3_PREFIX,
+                region=settings.S3_REGION,
+                access_key_id=settings.S3_ACCESS_KEY_ID,
+                secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+                cache_dir=settings.S3_CACHE_DIR,
+                local_prefixes=settings.S3_LOCAL_PREFIXES,
+                max_connections=settings.S3_MAX_CONNECTIONS,
+                multipart_threshold=settings.S3_MULTIPART_THRESHOLD_BYTES,
+                part_size=settings.S3_PART_BYTES,
+                max_concurrency=settings.S3_MAX_CONCURRENCY,
+            )
+        case _:
+            return LocalBlobManager()
@@ -1,11 +1,62 @@
-import json
+import mmap
+import os
+import stat
+import tempfile
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
+from typing import IO, TextIO
 
 from jinja2 import Template
 from pydantic import BaseModel
 
+from app.core.config import settings
 from app.core.logging import LogLevel
-from app.infrastructure.blob_manager.base import BaseBlobManager
+from app.core.utils import json_codec
+from app.infrastructure.blob_manager.base import BaseBlobManager, BaseBlobWriter
+from app.infrastructure.blob_manager.template_registry import template_registry
+
+
+class LocalBlobWriter(BaseBlobWriter):
+    def __init__(self, blob_path: str) -> None:
+        self._file: TextIO = open(blob_path, "w", encoding="utf-8")  # noqa: SIM115
+
+    def write(self, chunk: str) -> None:
+        self._file.write(chunk)
+        # 書き込み中のファイルを他のプロセスから逐次読めるようにする
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+@contextmanager
+def atomic_open(blob_path: str, mode: str = "w") -> Iterator[IO]:
+    """同じディレクトリの一時ファイルに書き込み、完了後に rename で置き換える.
+
+    書き込み中に停止しても、読み手が書きかけのファイルを読むことはない。
+    """
+    path = Path(blob_path)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        # mkstemp は 0o600 で作成するため、既存ファイル（なければ通常の 0o644）の権限に揃える
+        os.chmod(temp_path, stat.S_IMODE(path.stat().st_mode) if path.exists() else 0o644)
+        with open(fd, mode, encoding=None if "b" in mode else "utf-8") as fo:
+            yield fo
+            fo.flush()
+            os.fsync(fo.fileno())
+        os.replace(temp_path, blob_path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+def encode_jsonl_line(item: dict | BaseModel, schema: type[BaseModel] | None = None) -> bytes:
+    if schema is not None and not isinstance(item, schema):
+        item = schema.model_validate(item)
+    if isinstance(item, BaseModel):
+        return item.model_dump_json().encode("utf-8") + b"\n"
+    return json_codec.dumps_bytes(item) + b"\n"
 
 
 class LocalBlobManager(BaseBlobManager):
@@ -24,52 +75,100 @@ class LocalBlobManager(BaseBlobManager):
 
     def read_blob_as_template(self, blob_path: str) -> Template:
         self.log(object="read_blob_as_template", message=blob_path)
-        return Template(source=self.read_blob_as_str(blob_path))
+        return template_registry.get(self, blob_path)
 
     def read_blob_as_json(
-        self, blob_path: str, schema: BaseModel | None = None
-    ) -> dict | list:
+        self, blob_path: str, schema: type[BaseModel] | None = None
+    ) -> dict | list | BaseModel:
         self.log(object="read_blob_as_json", message=blob_path)
-        with open(blob_path, encoding="utf-8") as fi:
+        with open(blob_path, "rb") as fi:
             if schema:
-                return schema.model_validate_json(fi.read())  # type: ignore
-            return json.load(fi)  # type: ignore
+                return schema.model_validate_json(fi.read())
+            return json_codec.loads(fi.read())  # type: ignore
 
     def read_blob_as_jsonl(
-        self, blob_path: str, schema: BaseModel | None = None
+        self, blob_path: str, schema: type[BaseModel] | None = None
     ) -> list[dict] | list[BaseModel]:
         self.log(object="read_blob_as_jsonl", message=blob_path)
-        with open(blob_path, encoding="utf-8") as fi:
-            if isinstance(schema, BaseModel):
-                return [schema.model_validate_json(line) for line in fi]
-            return [json.loads(line) for line in fi]
+        return list(self.iter_blob_as_jsonl(blob_path, schema))  # type: ignore
+
+    def _iter_lines(self, blob_path: str) -> Iterator[bytes]:
+        with open(blob_path, "rb") as fi:
+            size = os.fstat(fi.fileno()).st_size
+            if size < settings.BLOB_MMAP_MIN_BYTES:
+                yield from fi
+                return
+            # 大きなファイルはメモリマップで読み、読み終えたページはすぐに手放す
+            with mmap.mmap(fi.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+                released = 0
+                while line := mm.readline():
+                    yield line
+                    if (position := mm.tell()) - released >= settings.BLOB_MMAP_RELEASE_BYTES:
+                        end = position - position % mmap.PAGESIZE
+                        mm.madvise(mmap.MADV_DONTNEED, released, end - released)
+                        released = end
+
+    def iter_blob_as_jsonl(
+        self, blob_path: str, schema: type[BaseModel] | None = None
+    ) -> Iterator[dict | BaseModel]:
+        self.log(object="iter_blob_as_jsonl", message=blob_path)
+        for line in self._iter_lines(blob_path):
+            if not line.strip():
+                continue
+            yield schema.model_validate_json(line) if schema else json_codec.loads(line)
 
     def save_blob_as_bytes(self, content: bytes, blob_path: str) -> None:
         self.log(object="save_blob_as_bytes", message=blob_path)
-        with open(blob_path, "wb") as fo:
+        with atomic_open(blob_path, "wb") as fo:
             fo.write(content)
 
     def save_blob_as_str(self, content: str, blob_path: str) -> None:
         self.log(object="save_blob_as_str", message=blob_path)
-        with open(blob_path, "w", encoding="utf-8") as fo:
+        with atomic_open(blob_path, "w") as fo:
             fo.write(content)
 
-    def save_blob_as_json(self, content: dict, blob_path: str) -> None:
+    def save_blob_as_json(self, content: dict | list, blob_path: str, indent: bool = True) -> None:
         self.log(object="save_blob_as_json", message=blob_path)
-        with open(blob_path, "w", encoding="utf-8") as fo:
-            json.dump(content, fo, ensure_ascii=False, indent=4)
+        with atomic_open(blob_path, "wb") as fo:
+            fo.write(json_codec.dumps_bytes(content, indent=indent))
 
     def save_blob_as_jsonl(
-        self, content: list[dict], blob_path: str, schema: BaseModel | None = None
+        self,
+        content: Iterable[dict | BaseModel],
+        blob_path: str,
+        schema: type[BaseModel] | None = None,
     ) -> None:
         self.log(object="save_blob_as_jsonl", message=blob_path)
-        with open(blob_path, "w", encoding="utf-8") as fo:
-            for line in content:
-                if schema:
-                    obj = schema.model_validate(line)
-                    fo.write(obj.model_dump_json(ensure_ascii=False) + "\n")
-                else:
-                    fo.write(json.dumps(line, ensure_ascii=False) + "\n")
+        with atomic_open(blob_path, "wb") as fo:
+            for item in content:
+                fo.write(encode_jsonl_line(item, schema))
+
+    def append_blob_as_jsonl(
+        self,
+        content: Iterable[dict | BaseModel],
+        blob_path: str,
+        schema: type[BaseModel] | None = None,
+    ) -> int:
+        self.log(object="append_blob_as_jsonl", message=blob_path)
+        num_lines, buffer = 0, bytearray()
+        # 行の途中で分割しないよう、行単位でまとめてから 1 回の write で追記する
+        # （他のプロセスの追記と行が混ざらないようにする）
+        with open(blob_path, "ab", buffering=0) as fo:
+            for item in content:
+                buffer += encode_jsonl_line(item, schema)
+                num_lines += 1
+                if len(buffer) >= settings.BLOB_WRITE_BUFFER_BYTES:
+                    fo.write(buffer)
+                    buffer.clear()
+            if buffer:
+                fo.write(buffer)
+        return num_lines
+
+    def open_blob_writer(self, blob_path: str) -> LocalBlobWriter:
+        self.log(object="open_blob_writer", message=blob_path)
+        # 書き込み中のファイルを逐次読めるようにするため、一時ファイルは使わない
+        return LocalBlobWriter(blob_path)
 
     def mkdir(self, blob_dir_path: str) -> None:
         self.log(object="mkdir", message=blob_dir_path)
@@ -82,3 +181,7 @@ class LocalBlobManager(BaseBlobManager):
     def exists(self, blob_path: str) -> bool:
         self.log(object="exists", message=blob_path)
         return Path(blob_path).exists()
+
+    def get_blob_mtime(self, blob_path: str) -> float:
+        self.log(object="get_blob_mtime", message=blob_path)
+        return Path(blob_path).stat().st_mtime
@@ -0,0 +1,515 @@
+import datetime
+import email.utils
+import hashlib
+import hmac
+import itertools
+import os
+import secrets
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote
+
+import httpx
+from jinja2 import Template
+from pydantic import BaseModel
+
+from app.core.logging import LogLevel
+from app.infrastructure.blob_manager.base import BaseBlobManager, BaseBlobWriter
+from app.infrastructure.blob_manager.content_addressed import normalize_path
+from app.infrastructure.blob_manager.local import LocalBlobManager, LocalBlobWriter
+from app.infrastructure.blob_manager.template_registry import template_registry
+from app.infrastructure.rate_limit import get_outbound_guard
+
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+SEGMENTS_SUFFIX = ".segments"
+
+
+def _quote(value: str, safe: str = "-_.~") -> str:
+    return quote(value, safe=safe)
+
+
+def canonical_query(params: dict[str, str]) -> str:
+    return "&".join(f"{_quote(k)}={_quote(v)}" for k, v in sorted(params.items()))
+
+
+def sign_v4(
+    method: str,
+    host: str,
+    path: str,
+    query: str,
+    access_key_id: str,
+    secret_access_key: str,
+    region: str,
+    now: datetime.datetime,
+) -> dict[str, str]:
+    """AWS Signature Version 4 の署名ヘッダーを返す（本文は署名しない: UNSIGNED-PAYLOAD）."""
+    amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+    scope = f"{amz_date[:8]}/{region}/s3/aws4_request"
+    headers = {"host": host, "x-amz-content-sha256": UNSIGNED_PAYLOAD, "x-amz-date": amz_date}
+    signed_headers = ";".join(sorted(headers))
+    canonical_request = "\n".join(
+        [
+            method,
+            path,
+            query,
+            "".join(f"{key}:{headers[key]}\n" for key in sorted(headers)),
+            signed_headers,
+            UNSIGNED_PAYLOAD,
+        ]
+    )
+    string_to_sign = "\n".join(
+        [
+            "AWS4-HMAC-SHA256",
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+        ]
+    )
+    key = f"AWS4{secret_access_key}".encode("utf-8")
+    for part in [amz_date[:8], region, "s3", "aws4_request"]:
+        key = hmac.new(key, part.encode("utf-8"), hashlib.sha256).digest()
+    signature = hmac.new(key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+    headers["authorization"] = (
+        f"AWS4-HMAC-SHA256 Credential={access_key_id}/{scope},"
+        f" SignedHeaders={signed_headers}, Signature={signature}"
+    )
+    del headers["host"]
+    return headers
+
+
+def _local_name(tag: str) -> str:
+    # 名前空間 {http://s3.amazonaws.com/doc/2006-03-01/} を取り除く
+    return tag.rsplit("}", 1)[-1]
+
+
+def _find_text(element: ET.Element, name: str) -> str | None:
+    for child in element:
+        if _local_name(child.tag) == name:
+            return child.text
+    return None
+
+
+class S3BlobWriter(BaseBlobWriter):
+    """ローカルのキャッシュに逐次書き込み、close 時にアップロードする."""
+
+    def __init__(self, blob_manager: "S3BlobManager", blob_path: str, cache_path: Path) -> None:
+        self._blob_manager = blob_manager
+        self._blob_path = blob_path
+        self._cache_path = cache_path
+        self._writer = LocalBlobWriter(str(cache_path))
+
+    def write(self, chunk: str) -> None:
+        self._writer.write(chunk)
+
+    def close(self) -> None:
+        self._writer.close()
+        self._blob_manager.upload(self._blob_path, self._cache_path)
+
+
+class S3BlobManager(BaseBlobManager):
+    """S3 互換のオブジェクトストレージに保存するブロブマネージャー（複数ノードのワーカーで共有する）.
+
+    - HTTP コネクションは 1 つの httpx.Client でプールして再利用する
+    - multipart_threshold 以上のブロブは part_size ごとに並列でアップロード・ダウンロード（Range）する
+    - 読み込んだブロブは cache_dir に保存し、次回は ETag で変更がないこと (304) を確認して再利用する
+    - local_prefixes 以下のパス（プロンプトテンプレート等）はローカルのファイルを読む
+    - オブジェクトには追記できないため、append_blob_as_jsonl は追記分を <キー>.segments/ 以下の別の
+      オブジェクト（セグメント）としてアップロードし、JSONL として読む際に名前順につなげる
+      （追記のたびに全体を再アップロードしない。セグメントは書き換えないため、キャッシュを確認せずに使う）
+    """
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        bucket: str,
+        prefix: str = "",
+        region: str = "us-east-1",
+        access_key_id: str | None = None,
+        secret_access_key: str | None = None,
+        cache_dir: str = "storage/cache/s3",
+        local_prefixes: Sequence[str] = (),
+        max_connections: int = 32,
+        multipart_threshold: int = 16 * 1024 * 1024,
+        part_size: int = 8 * 1024 * 1024,
+        max_concurrency: int = 8,
+        log_level: LogLevel = LogLevel.TRACE,
+    ) -> None:
+        super().__init__(log_level)
+        url = httpx.URL(endpoint_url)
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.host = url.netloc.decode("ascii")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.region = region
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self.cache_dir = Path(cache_dir) / bucket
+        self.local_prefixes = [normalize_path(prefix).rstrip("/") + "/" for prefix in local_prefixes]
+        self.multipart_threshold = multipart_threshold
+        self.part_size = part_size
+        self.guard_endpoint = f"s3:{bucket}"
+        self._client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._local = LocalBlobManager()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        self._executor.shutdown()
+        self._client.close()
+
+    def key_of(self, blob_path: str) -> str:
+        return self.prefix + normalize_path(blob_path).lstrip("/")
+
+    def _is_local(self, blob_path: str) -> bool:
+        path = normalize_path(blob_path)
+        return any(path.startswith(prefix) for prefix in self.local_prefixes)
+
+    def _request(
+        self,
+        method: str,
+        key: str = "",
+        params: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
+        content: bytes | None = None,
+    ) -> httpx.Response:
+        path = f"/{_quote(self.bucket)}/{_quote(key, safe='/-_.~')}" if key else f"/{_quote(self.bucket)}"
+        query = canonical_query(params or {})
+        request_headers = dict(headers or {})
+        if self.access_key_id and self.secret_access_key:
+            request_headers |= sign_v4(
+                method,
+                self.host,
+                path,
+                query,
+                self.access_key_id,
+                self.secret_access_key,
+                self.region,
+                datetime.datetime.now(datetime.UTC),
+            )
+        url = f"{self.endpoint_url}{path}" + (f"?{query}" if query else "")
+
+        def send() -> httpx.Response:
+            response = self._client.request(method, url, headers=request_headers, content=content)
+            # 304（キャッシュが有効）と 416（空のオブジェクトへの Range）は呼び出し元で扱う
+            if response.status_code not in (304, 416):
+                response.raise_for_status()
+            return response
+
+        return get_outbound_guard().call(self.guard_endpoint, send)
+
+    def _request_object(self, blob_path: str, method: str, **kwargs: object) -> httpx.Response:
+        try:
+            return self._request(method, self.key_of(blob_path), **kwargs)  # type: ignore
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                raise FileNotFoundError(blob_path) from e
+            raise
+
+    def _cache_path(self, blob_path: str) -> Path:
+        return self.cache_dir / self.key_of(blob_path)
+
+    def _etag_path(self, cache_path: Path) -> Path:
+        # キャッシュの ETag はキーと衝突しないよう、別のディレクトリに保存する
+        return self.cache_dir.parent / f"{self.bucket}.etags" / cache_path.relative_to(self.cache_dir)
+
+    def _read_etag(self, cache_path: Path) -> str | None:
+        etag_path = self._etag_path(cache_path)
+        if not cache_path.exists() or not etag_path.exists():
+            return None
+        return etag_path.read_text()
+
+    def _write_etag(self, cache_path: Path, etag: str | None) -> None:
+        etag_path = self._etag_path(cache_path)
+        if etag is None:
+            etag_path.unlink(missing_ok=True)
+            return
+        etag_path.parent.mkdir(parents=True, exist_ok=True)
+        etag_path.write_text(etag)
+
+    def read_range(self, blob_path: str, start: int, end: int) -> bytes:
+        """[start, end] バイト目（end を含む）を読む."""
+        response = self._request_object(
+            blob_path, "GET", headers={"range": f"bytes={start}-{end}"}
+        )
+        return b"" if response.status_code == 416 else response.content
+
+    def fetch(self, blob_path: str) -> Path:
+        """ブロブをキャッシュに取得し、そのパスを返す. キャッシュが最新の場合はダウンロードしない."""
+        cache_path = self._cache_path(blob_path)
+        headers = {"range": f"bytes=0-{self.part_size - 1}"}
+        if (etag := self._read_etag(cache_path)) is not None:
+            headers["if-none-match"] = etag
+        response = self._request_object(blob_path, "GET", headers=headers)
+        if response.status_code == 304:
+            with self._lock:
+                self.hits += 1
+            return cache_path
+        with self._lock:
+            self.misses += 1
+        if response.status_code == 416:
+            # 空のオブジェクト
+            etag, total, first = self._request_object(blob_path, "HEAD").headers.get("etag"), 0, b""
+        else:
+            etag, first = response.headers.get("etag"), response.content
+            content_range = response.headers.get("content-range")
+            total = int(content_range.rsplit("/", 1)[1]) if content_range else len(first)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_etag(cache_path, None)
+        temp_path = cache_path.with_name(f".{cache_path.name}.{threading.get_ident()}.tmp")
+        with open(temp_path, "wb") as fo:
+            fo.write(first)
+            fo.truncate(total)
+            # 残りは Range で並列に取得する（If-Match で途中の更新を検知する）
+            ranges = [
+                (start, min(start + self.part_size, total) - 1)
+                for start in range(len(first), total, self.part_size)
+            ]
+
+            def download(byte_range: tuple[int, int]) -> None:
+                part = self._request_object(
+                    blob_path,
+                    "GET",
+                    headers={"range": f"bytes={byte_range[0]}-{byte_range[1]}", "if-match": etag or "*"},
+                ).content
+                os.pwrite(fo.fileno(), part, byte_range[0])
+
+            list(self._executor.map(download, ranges))
+        os.replace(temp_path, cache_path)
+        self._write_etag(cache_path, etag)
+        self.log(object="fetch", message=f"{blob_path} ({total} bytes, {len(ranges) + 1} requests)")
+        return cache_path
+
+    def _upload_multipart(self, key: str, path: Path, size: int) -> str:
+        response = self._request("POST", key, params={"uploads": ""})
+        upload_id = _find_text(ET.fromstring(response.content), "UploadId") or ""
+        offsets = list(range(0, size, self.part_size))
+
+        def upload_part(part: tuple[int, int]) -> str:
+            part_number, offset = part
+            with open(path, "rb") as fi:
+                content = os.pread(fi.fileno(), self.part_size, offset)
+            response = self._request(
+                "PUT",
+                key,
+                params={"partNumber": str(part_number), "uploadId": upload_id},
+                content=content,
+            )
+            return response.headers["etag"]
+
+        try:
+            etags = list(self._executor.map(upload_part, enumerate(offsets, start=1)))
+        except BaseException:
+            self._request("DELETE", key, params={"uploadId": upload_id})
+            raise
+        body = "".join(
+            f"<Part><PartNumber>{number}</PartNumber><ETag>{etag}</ETag></Part>"
+            for number, etag in enumerate(etags, start=1)
+        )
+        response = self._request(
+            "POST",
+            key,
+            params={"uploadId": upload_id},
+            content=f"<CompleteMultipartUpload>{body}</CompleteMultipartUpload>".encode("utf-8"),
+        )
+        return _find_text(ET.fromstring(response.content), "ETag") or ""
+
+    def upload(self, blob_path: str, path: Path) -> None:
+        """ローカルのファイルをアップロードし、キャッシュとして登録する."""
+        key = self.key_of(blob_path)
+        size = path.stat().st_size
+        if size < self.multipart_threshold:
+            etag = self._request("PUT", key, content=path.read_bytes()).headers.get("etag")
+        else:
+            etag = self._upload_multipart(key, path, size)
+        self._write_etag(path, etag)
+        self.log(object="upload", message=f"{blob_path} ({size} bytes)")
+
+    def _save(self, blob_path: str, write: Callable[[str], None]) -> None:
+        # ローカルのキャッシュに書き込んでからアップロードする（失敗した場合はキャッシュを無効にする）
+        cache_path = self._cache_path(blob_path)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_etag(cache_path, None)
+        write(str(cache_path))
+        self.upload(blob_path, cache_path)
+
+    def _resolve(self, blob_path: str) -> str:
+        return blob_path if self._is_local(blob_path) else str(self.fetch(blob_path))
+
+    def read_blob_as_bytes(self, blob_path: str) -> bytes:
+        self.log(object="read_blob_as_bytes", message=blob_path)
+        return self._local.read_blob_as_bytes(self._resolve(blob_path))
+
+    def read_blob_as_str(self, blob_path: str) -> str:
+        self.log(object="read_blob_as_str", message=blob_path)
+        return self._local.read_blob_as_str(self._resolve(blob_path))
+
+    def read_blob_as_template(self, blob_path: str) -> Template:
+        self.log(object="read_blob_as_template", message=blob_path)
+        return template_registry.get(self, blob_path)
+
+    def read_blob_as_json(
+        self, blob_path: str, schema: type[BaseModel] | None = None
+    ) -> dict | list | BaseModel:
+        self.log(object="read_blob_as_json", message=blob_path)
+        return self._local.read_blob_as_json(self._resolve(blob_path), schema)
+
+    def _segments_prefix(self, blob_path: str) -> str:
+        return self.key_of(blob_path) + SEGMENTS_SUFFIX + "/"
+
+    def _segment_paths(self, blob_path: str) -> list[str]:
+        """追記分（セグメント）のパスを、追記した順に返す."""
+        return sorted(key.removeprefix(self.prefix) for key in self._list(self._segments_prefix(blob_path)))
+
+    def _fetch_segment(self, segment_path: str) -> Path:
+        # セグメントは書き換えないため、キャッシュがあれば確認せずに使う
+        cache_path = self._cache_path(segment_path)
+        if self._read_etag(cache_path) is None:
+            return self.fetch(segment_path)
+        with self._lock:
+            self.hits += 1
+        return cache_path
+
+    def _resolve_jsonl(self, blob_path: str) -> list[str]:
+        if self._is_local(blob_path):
+            return [blob_path]
+        return [
+            str(self.fetch(blob_path)),
+            *(str(self._fetch_segment(path)) for path in self._segment_paths(blob_path)),
+        ]
+
+    def read_blob_as_jsonl(
+        self, blob_path: str, schema: type[BaseModel] | None = None
+    ) -> list[dict] | list[BaseModel]:
+        self.log(object="read_blob_as_jsonl", message=blob_path)
+        return list(self.iter_blob_as_jsonl(blob_path, schema))  # type: ignore
+
+    def iter_blob_as_jsonl(
+        self, blob_path: str, schema: type[BaseModel] | None = None
+    ) -> Iterator[dict | BaseModel]:
+        self.log(object="iter_blob_as_jsonl", message=blob_path)
+        return itertools.chain.from_iterable(
+            self._local.iter_blob_as_jsonl(path, schema) for path in self._resolve_jsonl(blob_path)
+        )
+
+    def save_blob_as_bytes(self, content: bytes, blob_path: str) -> None:
+        self.log(object="save_blob_as_bytes", message=blob_path)
+        self._save(blob_path, lambda path: self._local.save_blob_as_bytes(content, path))
+
+    def save_blob_as_str(self, content: str, blob_path: str) -> None:
+        self.log(object="save_blob_as_str", message=blob_path)
+        self._save(blob_path, lambda path: self._local.save_blob_as_str(content, path))
+
+    def save_blob_as_json(self, content: dict | list, blob_path: str, indent: bool = True) -> None:
+        self.log(object="save_blob_as_json", message=blob_path)
+        self._save(blob_path, lambda path: self._local.save_blob_as_json(content, path, indent))
+
+    def save_blob_as_jsonl(
+        self,
+        content: Iterable[dict | BaseModel],
+        blob_path: str,
+        schema: type[BaseModel] | None = None,
+    ) -> None:
+        self.log(object="save_blob_as_jsonl", message=blob_path)
+        self._save(blob_path, lambda path: self._local.save_blob_as_jsonl(content, path, schema))
+        if not self._is_local(blob_path):
+            # 上書きする場合は、それまでの追記分も取り除く
+            for segment_path in self._segment_paths(blob_path):
+                self._request_object(segment_path, "DELETE")
+
+    def append_blob_as_jsonl(
+        self,
+        content: Iterable[dict | BaseModel],
+        blob_path: str,
+        schema: type[BaseModel] | None = None,
+    ) -> int:
+        self.log(object="append_blob_as_jsonl", message=blob_path)
+        if self._is_local(blob_path):
+            return self._local.append_blob_as_jsonl(content, blob_path, schema)
+        try:
+            self._request_object(blob_path, "HEAD")
+        except FileNotFoundError:
+            # 存在しないブロブへの追記は、追記分をそのままブロブとする
+            segment_path = blob_path
+        else:
+            # 名前順が追記順になるよう、時刻を先頭に付ける（他のノードの追記とは衝突しない）
+            segment_path = (
+                f"{normalize_path(blob_path)}{SEGMENTS_SUFFIX}/{time.time_ns():020d}-{secrets.token_hex(4)}"
+            )
+        cache_path = self._cache_path(segment_path)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.unlink(missing_ok=True)
+        self._write_etag(cache_path, None)
+        num_lines = self._local.append_blob_as_jsonl(content, str(cache_path), schema)
+        self.upload(segment_path, cache_path)
+        return num_lines
+
+    def open_blob_writer(self, blob_path: str) -> S3BlobWriter:
+        self.log(object="open_blob_writer", message=blob_path)
+        cache_path = self._cache_path(blob_path)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_etag(cache_path, None)
+        return S3BlobWriter(self, blob_path, cache_path)
+
+    def mkdir(self, blob_dir_path: str) -> None:
+        # ディレクトリはキーの接頭辞として扱うため、作成するものはない
+        self.log(object="mkdir", message=blob_dir_path)
+
+    def _list(self, prefix: str, max_keys: int = 1000) -> Iterator[str]:
+        """prefix 直下のキーと共通接頭辞（ディレクトリ）をページごとに取得する."""
+        params = {"list-type": "2", "prefix": prefix, "delimiter": "/", "max-keys": str(max_keys)}
+        while True:
+            root = ET.fromstring(self._request("GET", params=params).content)
+            for element in root:
+                match _local_name(element.tag):
+                    case "Contents":
+                        yield _find_text(element, "Key") or ""
+                    case "CommonPrefixes":
+                        yield (_find_text(element, "Prefix") or "").rstrip("/")
+            if _find_text(root, "IsTruncated") != "true":
+                return
+            params["continuation-token"] = _find_text(root, "NextContinuationToken") or ""
+
+    def list_blobs(self, blob_dir_path: str) -> list[str]:
+        self.log(object="list_blobs", message=blob_dir_path)
+        if self._is_local(blob_dir_path):
+            return [str(path) for path in self._local.list_blobs(blob_dir_path)]
+        prefix = self.key_of(blob_dir_path).rstrip("/") + "/"
+        return [
+            key.removeprefix(self.prefix)
+            for key in self._list(prefix)
+            if not key.endswith(SEGMENTS_SUFFIX)
+        ]
+
+    def exists(self, blob_path: str) -> bool:
+        self.log(object="exists", message=blob_path)
+        if self._is_local(blob_path):
+            return self._local.exists(blob_path)
+        try:
+            self._request_object(blob_path, "HEAD")
+        except FileNotFoundError:
+            # ディレクトリ（接頭辞）として存在するか
+            prefix = self.key_of(blob_path).rstrip("/") + "/"
+            return next(self._list(prefix, max_keys=1), None) is not None
+        return True
+
+    def get_blob_mtime(self, blob_path: str) -> float:
+        self.log(object="get_blob_mtime", message=blob_path)
+        if self._is_local(blob_path):
+            return self._local.get_blob_mtime(blob_path)
+        last_modified = self._request_object(blob_path, "HEAD").headers["last-modified"]
+        return email.utils.parsedate_to_datetime(last_modified).timestamp()
@@ -0,0 +1,105 @@
+import threading
+from collections import OrderedDict
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from jinja2 import Environment, FileSystemBytecodeCache, Template
+
+from app.core.config import settings
+from app.core.logging import LogLevel, log
+
+if TYPE_CHECKING:
+    from app.infrastructure.blob_manager.base import BaseBlobManager
+
+
+class TemplateRegistry:
+    """コンパイル済みの jinja2 テンプレートを (パス, 更新時刻) ごとに LRU で保持する.
+
+    すべてのテンプレートを 1 つの Environment で扱い、コンパイル結果（バイトコード）は
+    bytecode_cache_dir に保存してプロセス間・再起動後も再利用する。バイトコードはソースの
+    チェックサムで照合されるため、テンプレートを書き換えた場合は再コンパイルされる。
+    """
+
+    def __init__(
+        self,
+        bytecode_cache_dir: str | None = None,
+        max_size: int = 256,
+        log_level: LogLevel = LogLevel.TRACE,
+    ) -> None:
+        self.log = partial(log, log_level=log_level, subject=self.__name__)
+        self.max_size = max_size
+        self.bytecode_cache_dir = bytecode_cache_dir
+        # Template(source) と同じ既定の設定で、auto_reload は更新時刻で自前に判定する
+        self.environment = Environment(auto_reload=False, cache_size=0)
+        self._bytecode_cache: FileSystemBytecodeCache | None = None
+        self._lock = threading.Lock()
+        self._templates: OrderedDict[str, tuple[float, Template]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def __name__(self) -> str:
+        return str(self.__class__.__name__)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._templates)}
+
+    @property
+    def bytecode_cache(self) -> FileSystemBytecodeCache | None:
+        if self._bytecode_cache is None and self.bytecode_cache_dir:
+            Path(self.bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            self._bytecode_cache = FileSystemBytecodeCache(self.bytecode_cache_dir)
+        return self._bytecode_cache
+
+    def compile(self, source: str, name: str) -> Template:
+        if (bytecode_cache := self.bytecode_cache) is None:
+            code = self.environment.compile(source, name, name)
+        else:
+            bucket = bytecode_cache.get_bucket(self.environment, name, name, source)
+            if (code := bucket.code) is None:
+                code = self.environment.compile(source, name, name)
+                bucket.code = code
+                bytecode_cache.set_bucket(bucket)
+        return self.environment.template_class.from_code(
+            self.environment, code, self.environment.make_globals(None)
+        )
+
+    def get(self, blob_manager: "BaseBlobManager", template_path: str) -> Template:
+        mtime = blob_manager.get_blob_mtime(template_path)
+        with self._lock:
+            cached = self._templates.get(template_path)
+            if cached and cached[0] == mtime:
+                self._templates.move_to_end(template_path)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+        template = self.compile(blob_manager.read_blob_as_str(template_path), template_path)
+        with self._lock:
+            self._templates[template_path] = (mtime, template)
+            self._templates.move_to_end(template_path)
+            while len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+        self.log(object="compile", message=f"{template_path} | {self.stats}")
+        return template
+
+    def warm_up(self, blob_manager: "BaseBlobManager", prompt_dir: str) -> int:
+        """prompt_dir 以下のテンプレート (*.jinja) を事前にコンパイルし、件数を返す."""
+        template_paths = sorted(str(path) for path in Path(prompt_dir).rglob("*.jinja"))
+        for template_path in template_paths:
+            self.get(blob_manager, template_path)
+        self.log(object="warm_up", message=f"{prompt_dir} ({len(template_paths)} templates)")
+        return len(template_paths)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+template_registry = TemplateRegistry(
+    bytecode_cache_dir=settings.TEMPLATE_BYTECODE_CACHE_DIR,
+    max_size=settings.TEMPLATE_CACHE_MAX_SIZE,
+)
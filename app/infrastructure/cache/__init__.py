@@ -0,0 +1,11 @@
+from app.infrastructure.cache.base import BaseCache
+from app.infrastructure.cache.memory import MemoryCache
+from app.infrastructure.cache.sqlite import SqliteCache
+from app.infrastructure.cache.tiered import TieredCache
+
+__all__ = [
+    "BaseCache",
+    "MemoryCache",
+    "SqliteCache",
+    "TieredCache",
+]
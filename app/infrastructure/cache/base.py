@@ -0,0 +1,44 @@
+from abc import ABC, abstractmethod
+from functools import partial
+
+from app.core.logging import LogLevel, log
+
+
+class BaseCache(ABC):
+    def __init__(self, log_level: LogLevel = LogLevel.TRACE) -> None:
+        self.log = partial(log, log_level=log_level, subject=self.__name__)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def __name__(self) -> str:
+        return str(self.__class__.__name__)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @abstractmethod
+    def get(self, key: str) -> str | None:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
@@ -0,0 +1,60 @@
+import threading
+import time
+from collections import OrderedDict
+
+from app.core.logging import LogLevel
+from app.infrastructure.cache.base import BaseCache
+
+
+class MemoryCache(BaseCache):
+    """TTL 付きの LRU キャッシュ（プロセス内）."""
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: float | None = None,
+        log_level: LogLevel = LogLevel.TRACE,
+    ) -> None:
+        super().__init__(log_level)
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # key -> (expires_at, value)
+        self._items: OrderedDict[str, tuple[float | None, str]] = OrderedDict()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, value = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._items[key]
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        expires_at = (
+            time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else None
+        )
+        with self._lock:
+            self._items[key] = (expires_at, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                evicted_key, _ = self._items.popitem(last=False)
+                self.log(object="evict", message=evicted_key)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,134 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from app.core.logging import LogLevel
+from app.infrastructure.cache.base import BaseCache
+
+
+class SqliteCache(BaseCache):
+    """SQLite に永続化する TTL 付き LRU キャッシュ. プロセス再起動後も内容が残る."""
+
+    def __init__(
+        self,
+        db_path: str,
+        max_size: int = 100_000,
+        ttl_seconds: float | None = None,
+        max_bytes: int | None = None,
+        eviction_interval: int = 64,
+        log_level: LogLevel = LogLevel.TRACE,
+    ) -> None:
+        super().__init__(log_level)
+        self.db_path = db_path
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        # 書き込みのたびに件数を数えるのは重いため、一定回数ごとに容量超過分を削除する
+        self.eviction_interval = eviction_interval
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._writes = 0
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL,"
+            " accessed_at REAL NOT NULL"
+            ")"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, now),
+            )
+            self._writes += 1
+            if self._writes % self.eviction_interval == 0:
+                self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute(
+            "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        )
+        (size,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        if (overflow := size - self.max_size) > 0:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN ("
+                " SELECT key FROM cache ORDER BY accessed_at ASC LIMIT ?"
+                ")",
+                (overflow,),
+            )
+            self.log(object="evict", message=f"{overflow} items")
+        if self.max_bytes is not None:
+            self._evict_bytes()
+
+    def _evict_bytes(self) -> None:
+        (total_bytes,) = self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(CAST(value AS BLOB))), 0) FROM cache"
+        ).fetchone()
+        if (overflow := total_bytes - self.max_bytes) <= 0:
+            return
+        stale_keys = []
+        for key, num_bytes in self._conn.execute(
+            "SELECT key, LENGTH(CAST(value AS BLOB)) FROM cache ORDER BY accessed_at ASC"
+        ):
+            if overflow <= 0:
+                break
+            stale_keys.append((key,))
+            overflow -= num_bytes
+        self._conn.executemany("DELETE FROM cache WHERE key = ?", stale_keys)
+        self.log(object="evict", message=f"{len(stale_keys)} items ({total_bytes} bytes)")
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+        return int(size)
@@ -0,0 +1,47 @@
+from app.core.logging import LogLevel
+from app.infrastructure.cache.base import BaseCache
+
+
+class TieredCache(BaseCache):
+    """複数のキャッシュを上位から順に参照し、下位でヒットした値を上位へ書き戻す."""
+
+    def __init__(
+        self,
+        tiers: list[BaseCache],
+        log_level: LogLevel = LogLevel.TRACE,
+    ) -> None:
+        super().__init__(log_level)
+        self.tiers = tiers
+
+    @property
+    def stats(self) -> dict[str, int]:
+        stats = super().stats
+        for tier in self.tiers:
+            for key, value in tier.stats.items():
+                stats[f"{tier.__name__}.{key}"] = value
+        return stats
+
+    def get(self, key: str) -> str | None:
+        for idx, tier in enumerate(self.tiers):
+            if (value := tier.get(key)) is not None:
+                for upper_tier in self.tiers[:idx]:
+                    upper_tier.set(key, value)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        for tier in self.tiers:
+            tier.set(key, value)
+
+    def delete(self, key: str) -> None:
+        for tier in self.tiers:
+            tier.delete(key)
+
+    def clear(self) -> None:
+        for tier in self.tiers:
+            tier.clear()
+
+    def __len__(self) -> int:
+        return max((len(tier) for tier in self.tiers), default=0)
@@ -0,0 +1,10 @@
+from app.infrastructure.cassette.cassette import Cassette, CassetteEntry
+from app.infrastructure.cassette.chat_model import CassetteChatModel
+from app.infrastructure.cassette.factory import get_cassette
+
+__all__ = [
+    "Cassette",
+    "CassetteChatModel",
+    "CassetteEntry",
+    "get_cassette",
+]
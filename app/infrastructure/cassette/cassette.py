@@ -0,0 +1,195 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from app.core.exception import BaseError
+from app.core.logging import LogLevel, log
+from app.infrastructure.blob_manager.base import BaseBlobManager
+from app.infrastructure.cassette.enums import CassetteMode
+
+
+class CassetteEntry(BaseModel):
+    kind: str = Field(title="呼び出し種別 (chat_model/search_web/submit_content 等)")
+    scope: str = Field(title="呼び出し元の識別子 (ノード名やシステムプロンプトのハッシュ)")
+    key: str = Field(title="リクエストの正規化ハッシュ")
+    response: Any = Field(title="応答 (JSON)")
+    latency: float = Field(title="記録時のレイテンシ（秒）")
+
+
+PINNED_KIND = "pinned"
+
+
+def request_key(request: Any) -> str:  # noqa: ANN401
+    canonical = json.dumps(request, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """外部呼び出し（LLM・検索・審査）の応答を記録・再生する.
+
+    応答は (kind, scope, key) の完全一致で探し、同じリクエストが複数回あれば記録順に返す。
+    再生モードで見つからない場合はエラーとする（別の呼び出しの応答を返さない）。
+    記録モードでは既存のカセットに一致する応答があれば再利用し、なければ実際に呼び出して
+    flush_entries 件ごとにカセットの末尾に追記する（途中で異常終了しても追記済みの応答は失われない）。
+    追記はブロブマネージャーによってはカセット全体の書き直しになるため、1 件ずつは書き込まない。
+    プロンプトに含まれる現在時刻や ID など実行ごとに変わる値は pin でカセットに固定し、
+    記録時と再生時で同じリクエストになるようにする。
+    """
+
+    def __init__(
+        self,
+        mode: CassetteMode,
+        blob_manager: BaseBlobManager,
+        cassette_path: str,
+        replay_latency: float | None = None,
+        flush_entries: int = 32,
+        log_level: LogLevel = LogLevel.DEBUG,
+    ) -> None:
+        self.log = partial(log, log_level=log_level, subject=self.__name__)
+        self.mode = mode
+        self.blob_manager = blob_manager
+        self.cassette_path = cassette_path
+        # None の場合は記録時のレイテンシを再現する
+        self.replay_latency = replay_latency
+        self.flush_entries = flush_entries
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._by_key: defaultdict[tuple[str, str, str], deque[CassetteEntry]] = defaultdict(deque)
+        self._scopes: set[tuple[str, str]] = set()
+        self._pinned: dict[str, Any] = {}
+        self._pending: list[CassetteEntry] = []
+        self._num_recorded = 0
+        if mode == CassetteMode.REPLAY or (
+            mode == CassetteMode.RECORD and blob_manager.exists(cassette_path)
+        ):
+            self.load()
+
+    @property
+    def __name__(self) -> str:
+        return str(self.__class__.__name__)
+
+    @property
+    def is_active(self) -> bool:
+        return self.mode != CassetteMode.OFF
+
+    def load(self) -> None:
+        num_entries = 0
+        with self._lock:
+            for entry in self.blob_manager.iter_blob_as_jsonl(
+                self.cassette_path, schema=CassetteEntry
+            ):
+                num_entries += 1
+                if entry.kind == PINNED_KIND:
+                    self._pinned.setdefault(entry.scope, entry.response)  # type: ignore
+                    continue
+                self._by_key[(entry.kind, entry.scope, entry.key)].append(entry)  # type: ignore
+                self._scopes.add((entry.kind, entry.scope))  # type: ignore
+        self.log(object="load", message=f"{self.cassette_path} ({num_entries} entries)")
+
+    def pin(self, name: str, fn: Callable[[], Any]) -> Any:  # noqa: ANN401
+        """実行ごとに変わる値を固定する. 記録時は最初に得た値を記録して以降も返し、再生時は記録した値を返す."""
+        if self.mode == CassetteMode.OFF:
+            return fn()
+        with self._lock:
+            if name in self._pinned:
+                return self._pinned[name]
+            if self.mode == CassetteMode.REPLAY:
+                # 固定した値を持たない古いカセット。以降の呼び出しは一致しない可能性がある
+                log(
+                    LogLevel.WARNING,
+                    subject=self.__name__,
+                    object=PINNED_KIND,
+                    message=f"No pinned value for {name}; using the current value",
+                )
+            value = self._pinned[name] = fn()
+        if self.mode == CassetteMode.RECORD:
+            self._record(PINNED_KIND, name, request_key(name), value, 0.0)
+        return value
+
+    def _lookup(self, kind: str, scope: str, key: str) -> CassetteEntry | None:
+        with self._lock:
+            queue = self._by_key.get((kind, scope, key))
+            return queue.popleft() if queue else None
+
+    def _miss(self, kind: str, scope: str, key: str) -> None:
+        if self.mode == CassetteMode.REPLAY:
+            raise BaseError(self.__name__, kind, f"No recorded response for {scope} | {key}")
+        if (kind, scope) in self._scopes:
+            # 記録済みの呼び出し元でリクエストが変わった（プロンプトの変更など）
+            log(
+                LogLevel.WARNING,
+                subject=self.__name__,
+                object=kind,
+                message=f"No recorded response for {scope} | {key}; calling the live service",
+            )
+
+    def _record(self, kind: str, scope: str, key: str, response: Any, latency: float) -> None:  # noqa: ANN401
+        entry = CassetteEntry(kind=kind, scope=scope, key=key, response=response, latency=latency)
+        with self._write_lock:
+            self._pending.append(entry)
+            if len(self._pending) < self.flush_entries:
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        """記録済みで未書き込みの応答をカセットの末尾に追記する."""
+        with self._write_lock:
+            entries, self._pending = self._pending, []
+            if not entries:
+                return
+            if self._num_recorded == 0:
+                self.blob_manager.mkdir(str(Path(self.cassette_path).parent))
+            self.blob_manager.append_blob_as_jsonl(entries, self.cassette_path)
+            self._num_recorded += len(entries)
+        self.log(object="flush", message=f"{self.cassette_path} ({len(entries)} entries)")
+
+    def _latency(self, entry: CassetteEntry) -> float:
+        return entry.latency if self.replay_latency is None else self.replay_latency
+
+    def call(
+        self,
+        kind: str,
+        scope: str,
+        request: Any,  # noqa: ANN401
+        fn: Callable[[], Any],
+    ) -> Any:  # noqa: ANN401
+        """fn の応答（JSON 化可能な値）を記録、または記録済みの応答を再生する."""
+        if self.mode == CassetteMode.OFF:
+            return fn()
+        key = request_key(request)
+        if (entry := self._lookup(kind, scope, key)) is not None:
+            time.sleep(self._latency(entry))
+            return entry.response
+        self._miss(kind, scope, key)
+        start = time.perf_counter()
+        response = fn()
+        self._record(kind, scope, key, response, time.perf_counter() - start)
+        return response
+
+    async def acall(
+        self,
+        kind: str,
+        scope: str,
+        request: Any,  # noqa: ANN401
+        fn: Callable[[], Awaitable[Any]],
+    ) -> Any:  # noqa: ANN401
+        if self.mode == CassetteMode.OFF:
+            return await fn()
+        key = request_key(request)
+        if (entry := self._lookup(kind, scope, key)) is not None:
+            await asyncio.sleep(self._latency(entry))
+            return entry.response
+        self._miss(kind, scope, key)
+        start = time.perf_counter()
+        response = await fn()
+        self._record(kind, scope, key, response, time.perf_counter() - start)
+        return response
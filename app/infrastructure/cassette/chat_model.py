@@ -0,0 +1,152 @@
+import hashlib
+import json
+from collections.abc import Sequence
+from typing import Any
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import BaseMessage, SystemMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable
+from langchain_core.tools import BaseTool
+from pydantic import PrivateAttr
+
+from app.infrastructure.cassette.cassette import Cassette
+from app.infrastructure.cassette.enums import CassetteMode
+from app.infrastructure.rate_limit import GuardedChatOpenAI
+
+
+class CassetteChatModel(BaseChatModel):
+    """ChatOpenAI の呼び出しをカセットに記録・再生するチャットモデル.
+
+    再生モードでは OpenAI へは一切接続しない。scope を指定しない場合は
+    システムプロンプトのハッシュを scope とする（create_agent のタスクごとの会話を区別するため）。
+    """
+
+    model_name: str
+    temperature: float | None = None
+    scope: str | None = None
+
+    _cassette: Cassette = PrivateAttr()
+    _delegate: GuardedChatOpenAI | None = PrivateAttr(default=None)
+
+    def __init__(self, cassette: Cassette, **kwargs: Any) -> None:  # noqa: ANN401
+        super().__init__(**kwargs)
+        self._cassette = cassette
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette"
+
+    @property
+    def delegate(self) -> GuardedChatOpenAI:
+        if self._delegate is None:
+            kwargs: dict[str, Any] = {"model": self.model_name}
+            if self.temperature is not None:
+                kwargs["temperature"] = self.temperature
+            if self._cassette.mode == CassetteMode.REPLAY:
+                # 再生時は API キーなしで動作させる（リクエストは送信されない）
+                kwargs["api_key"] = "cassette-replay"
+            self._delegate = GuardedChatOpenAI(**kwargs)
+        return self._delegate
+
+    def bind_tools(
+        self,
+        tools: Sequence[dict[str, Any] | type | BaseTool],
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Runnable[LanguageModelInput, BaseMessage]:
+        # ツール定義の変換は ChatOpenAI に任せ、その引数を自身に束縛する
+        bound = self.delegate.bind_tools(tools, **kwargs)
+        return self.bind(**bound.kwargs)  # type: ignore
+
+    def _scope(self, messages: list[BaseMessage]) -> str:
+        if self.scope:
+            return self.scope
+        for message in messages:
+            if isinstance(message, SystemMessage):
+                return hashlib.sha256(str(message.content).encode("utf-8")).hexdigest()
+        return "default"
+
+    def _request(self, messages: list[BaseMessage], kwargs: dict[str, Any]) -> dict:
+        return {
+            "model_name": self.model_name,
+            "temperature": self.temperature,
+            "messages": [
+                [
+                    message.type,
+                    message.content,
+                    [
+                        [tool_call["name"], tool_call["args"]]
+                        for tool_call in getattr(message, "tool_calls", [])
+                    ],
+                ]
+                for message in messages
+            ],
+            "tools": [
+                tool.get("function", {}).get("name", tool.get("type"))
+                for tool in kwargs.get("tools", [])
+            ],
+        }
+
+    @staticmethod
+    def _dump(result: ChatResult) -> dict:
+        generation = result.generations[0]
+        return json.loads(
+            json.dumps(
+                {
+                    "message": message_to_dict(generation.message),
+                    "llm_output": result.llm_output,
+                },
+                ensure_ascii=False,
+                default=str,
+            )
+        )
+
+    @staticmethod
+    def _load(response: dict) -> ChatResult:
+        message = messages_from_dict([response["message"]])[0]
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output=response.get("llm_output"),
+        )
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> ChatResult:
+        response = self._cassette.call(
+            kind="chat_model",
+            scope=self._scope(messages),
+            request=self._request(messages, kwargs),
+            fn=lambda: self._dump(
+                self.delegate._generate(messages, stop=stop, run_manager=run_manager, **kwargs)  # noqa: SLF001
+            ),
+        )
+        return self._load(response)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> ChatResult:
+        async def generate() -> dict:
+            result = await self.delegate._agenerate(  # noqa: SLF001
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            )
+            return self._dump(result)
+
+        response = await self._cassette.acall(
+            kind="chat_model",
+            scope=self._scope(messages),
+            request=self._request(messages, kwargs),
+            fn=generate,
+        )
+        return self._load(response)
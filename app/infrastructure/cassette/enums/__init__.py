@@ -0,0 +1,3 @@
+from .cassette_mode import CassetteMode
+
+__all__ = ["CassetteMode"]
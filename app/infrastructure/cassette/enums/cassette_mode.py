@@ -0,0 +1,7 @@
+from app.domain.enums.base import BaseEnum
+
+
+class CassetteMode(BaseEnum):
+    OFF = "off"  # 記録も再生もしない
+    RECORD = "record"  # 外部呼び出しを実行し、その応答をカセットに記録する
+    REPLAY = "replay"  # 外部呼び出しを行わず、カセットに記録された応答を返す
@@ -0,0 +1,27 @@
+import atexit
+import secrets
+from functools import cache
+
+from app.core.config import settings
+from app.core.utils.nano_id import seed_ids
+from app.infrastructure.blob_manager import create_blob_manager
+from app.infrastructure.cassette.cassette import Cassette
+from app.infrastructure.cassette.enums import CassetteMode
+
+
+@cache
+def get_cassette() -> Cassette:
+    """設定（CASSETTE_MODE）に従い、プロセス全体で共有するカセットを返す."""
+    cassette = Cassette(
+        mode=CassetteMode(settings.CASSETTE_MODE),
+        blob_manager=create_blob_manager(),
+        cassette_path=settings.CASSETTE_PATH,
+        replay_latency=settings.CASSETTE_REPLAY_LATENCY_SECONDS,
+        flush_entries=settings.CASSETTE_FLUSH_ENTRIES,
+    )
+    if cassette.mode == CassetteMode.RECORD:
+        atexit.register(cassette.flush)
+    if cassette.is_active:
+        # 要件収集項目などの ID はプロンプトに含まれるため、記録時と同じ系列で生成する
+        seed_ids(cassette.pin("id_seed", lambda: secrets.randbits(64)))
+    return cassette
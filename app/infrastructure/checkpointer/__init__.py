@@ -0,0 +1,7 @@
+from app.infrastructure.checkpointer.factory import create_checkpointer
+from app.infrastructure.checkpointer.sqlite import SqliteCheckpointSaver
+
+__all__ = [
+    "SqliteCheckpointSaver",
+    "create_checkpointer",
+]
@@ -0,0 +1,3 @@
+from .checkpointer_backend import CheckpointerBackend
+
+__all__ = ["CheckpointerBackend"]
@@ -0,0 +1,6 @@
+from app.domain.enums.base import BaseEnum
+
+
+class CheckpointerBackend(BaseEnum):
+    MEMORY = "memory"  # プロセス内のメモリに保持する（再起動で消える）
+    SQLITE = "sqlite"  # SQLite に永続化し、thread_id を指定して再開できる
@@ -0,0 +1,18 @@
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+
+from app.core.config import settings
+from app.infrastructure.checkpointer.enums import CheckpointerBackend
+from app.infrastructure.checkpointer.sqlite import SqliteCheckpointSaver
+
+
+def create_checkpointer() -> BaseCheckpointSaver:
+    """設定（CHECKPOINTER_BACKEND）に従いチェックポインターを作成する."""
+    match CheckpointerBackend(settings.CHECKPOINTER_BACKEND):
+        case CheckpointerBackend.SQLITE:
+            return SqliteCheckpointSaver(
+                db_path=settings.CHECKPOINTER_SQLITE_PATH,
+                compression_level=settings.CHECKPOINTER_COMPRESSION_LEVEL,
+            )
+        case _:
+            return InMemorySaver()
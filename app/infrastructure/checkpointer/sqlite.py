@@ -0,0 +1,431 @@
+import asyncio
+import hashlib
+import random
+import sqlite3
+import threading
+import zlib
+from collections.abc import AsyncIterator, Iterator, Sequence
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from app.core.logging import LogLevel, log
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS checkpoints ("
+    " thread_id TEXT NOT NULL,"
+    " checkpoint_ns TEXT NOT NULL,"
+    " checkpoint_id TEXT NOT NULL,"
+    " parent_checkpoint_id TEXT,"
+    " checkpoint TEXT NOT NULL,"
+    " metadata TEXT NOT NULL,"
+    " PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)"
+    ")",
+    # チャネルの値はバージョンが変わった場合のみ登録し、内容は blobs を参照する
+    "CREATE TABLE IF NOT EXISTS channel_values ("
+    " thread_id TEXT NOT NULL,"
+    " checkpoint_ns TEXT NOT NULL,"
+    " channel TEXT NOT NULL,"
+    " version TEXT NOT NULL,"
+    " digest TEXT,"
+    " PRIMARY KEY (thread_id, checkpoint_ns, channel, version)"
+    ")",
+    "CREATE TABLE IF NOT EXISTS writes ("
+    " thread_id TEXT NOT NULL,"
+    " checkpoint_ns TEXT NOT NULL,"
+    " checkpoint_id TEXT NOT NULL,"
+    " task_id TEXT NOT NULL,"
+    " idx INTEGER NOT NULL,"
+    " channel TEXT NOT NULL,"
+    " digest TEXT NOT NULL,"
+    " task_path TEXT NOT NULL,"
+    " PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)"
+    ")",
+    # シリアライズ済みの値を内容ハッシュで一意に保持する（圧縮済み）
+    "CREATE TABLE IF NOT EXISTS blobs ("
+    " digest TEXT PRIMARY KEY,"
+    " type TEXT NOT NULL,"
+    " compressed INTEGER NOT NULL,"
+    " data BLOB NOT NULL"
+    ")",
+)
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver[str]):
+    """SQLite (WAL) にチェックポイントを永続化するチェックポインター.
+
+    InMemorySaver と同様にチャネルの値は新しいバージョンのみを保存し、さらに値を内容ハッシュで
+    重複排除・圧縮して保存する。長いスレッドでも変更のないフィールドは再保存されない。
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        serde: SerializerProtocol | None = None,
+        compression_level: int = 6,
+        compression_min_bytes: int = 512,
+        log_level: LogLevel = LogLevel.DEBUG,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.log = partial(log, log_level=log_level, subject=self.__name__)
+        self.db_path = db_path
+        self.compression_level = compression_level
+        # 小さい値は圧縮しても縮まないため、そのまま保存する
+        self.compression_min_bytes = compression_min_bytes
+        self._lock = threading.Lock()
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    @property
+    def __name__(self) -> str:
+        return str(self.__class__.__name__)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _put_blob(self, typed: tuple[str, bytes]) -> str:
+        type_, data = typed
+        digest = hashlib.sha256(type_.encode("utf-8") + b"\0" + data).hexdigest()
+        compressed = len(data) >= self.compression_min_bytes
+        if compressed:
+            data = zlib.compress(data, self.compression_level)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO blobs (digest, type, compressed, data) VALUES (?, ?, ?, ?)",
+            (digest, type_, int(compressed), data),
+        )
+        return digest
+
+    def _get_blob(self, digest: str) -> Any:  # noqa: ANN401
+        type_, compressed, data = self._conn.execute(
+            "SELECT type, compressed, data FROM blobs WHERE digest = ?", (digest,)
+        ).fetchone()
+        return self.serde.loads_typed(
+            (type_, zlib.decompress(data) if compressed else data)
+        )
+
+    def _load_channel_values(
+        self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions
+    ) -> dict[str, Any]:
+        channel_values: dict[str, Any] = {}
+        for channel, version in versions.items():
+            row = self._conn.execute(
+                "SELECT digest FROM channel_values"
+                " WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, str(version)),
+            ).fetchone()
+            # digest が NULL の場合はチャネルが空であることを表す
+            if row is not None and row[0] is not None:
+                channel_values[channel] = self._get_blob(row[0])
+        return channel_values
+
+    def _to_tuple(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        checkpoint_id: str,
+        parent_checkpoint_id: str | None,
+        checkpoint_digest: str,
+        metadata: CheckpointMetadata,
+    ) -> CheckpointTuple:
+        checkpoint: Checkpoint = self._get_blob(checkpoint_digest)
+        writes = self._conn.execute(
+            "SELECT task_id, channel, digest FROM writes"
+            " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?"
+            " ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_channel_values(
+                    thread_id, checkpoint_ns, checkpoint["channel_versions"]
+                ),
+            },
+            metadata=metadata,
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self._get_blob(digest))
+                for task_id, channel, digest in writes
+            ],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        thread_id: str = config["configurable"]["thread_id"]
+        checkpoint_ns: str = config["configurable"].get("checkpoint_ns", "")
+        query = (
+            "SELECT checkpoint_id, parent_checkpoint_id, checkpoint, metadata FROM checkpoints"
+            " WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        params: tuple[str, ...] = (thread_id, checkpoint_ns)
+        if checkpoint_id := get_checkpoint_id(config):
+            query += " AND checkpoint_id = ?"
+            params += (checkpoint_id,)
+        else:
+            query += " ORDER BY checkpoint_id DESC LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+            checkpoint_id, parent_checkpoint_id, checkpoint_digest, metadata_digest = row
+            return self._to_tuple(
+                thread_id,
+                checkpoint_ns,
+                checkpoint_id,
+                parent_checkpoint_id,
+                checkpoint_digest,
+                self._get_blob(metadata_digest),
+            )
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,  # noqa: A002
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,"
+            " checkpoint, metadata FROM checkpoints"
+        )
+        conditions: list[str] = []
+        params: list[str] = []
+        if config:
+            conditions.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                conditions.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                conditions.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_checkpoint_id := get_checkpoint_id(before)):
+            conditions.append("checkpoint_id < ?")
+            params.append(before_checkpoint_id)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY checkpoint_id DESC"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        for (
+            thread_id,
+            checkpoint_ns,
+            checkpoint_id,
+            parent_checkpoint_id,
+            checkpoint_digest,
+            metadata_digest,
+        ) in rows:
+            if limit is not None and limit <= 0:
+                break
+            with self._lock:
+                metadata = self._get_blob(metadata_digest)
+                if filter and not all(
+                    metadata.get(key) == value for key, value in filter.items()
+                ):
+                    continue
+                checkpoint_tuple = self._to_tuple(
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint_id,
+                    parent_checkpoint_id,
+                    checkpoint_digest,
+                    metadata,
+                )
+            if limit is not None:
+                limit -= 1
+            yield checkpoint_tuple
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        c = checkpoint.copy()
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        values: dict[str, Any] = c.pop("channel_values")  # type: ignore[misc]
+        with self._lock:
+            for channel, version in new_versions.items():
+                digest = (
+                    self._put_blob(self.serde.dumps_typed(values[channel]))
+                    if channel in values
+                    else None
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO channel_values"
+                    " (thread_id, checkpoint_ns, channel, version, digest)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, channel, str(version), digest),
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints"
+                " (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,"
+                " checkpoint, metadata)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    self._put_blob(self.serde.dumps_typed(c)),
+                    self._put_blob(
+                        self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+                    ),
+                ),
+            )
+            self._conn.commit()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        with self._lock:
+            for idx, (channel, value) in enumerate(writes):
+                write_idx = WRITES_IDX_MAP.get(channel, idx)
+                # 特殊チャネル（エラー・中断等）は上書きし、通常の書き込みは初回のみ保存する
+                statement = "INSERT OR REPLACE" if write_idx < 0 else "INSERT OR IGNORE"
+                self._conn.execute(
+                    f"{statement} INTO writes"  # noqa: S608
+                    " (thread_id, checkpoint_ns, checkpoint_id, task_id, idx,"
+                    " channel, digest, task_path)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint_id,
+                        task_id,
+                        write_idx,
+                        channel,
+                        self._put_blob(self.serde.dumps_typed(value)),
+                        task_path,
+                    ),
+                )
+            self._conn.commit()
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            for table in ("checkpoints", "channel_values", "writes"):
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE thread_id = ?",  # noqa: S608
+                    (thread_id,),
+                )
+            # どのスレッドからも参照されなくなった値を削除する
+            self._conn.execute(
+                "DELETE FROM blobs WHERE digest NOT IN ("
+                " SELECT checkpoint FROM checkpoints"
+                " UNION SELECT metadata FROM checkpoints"
+                " UNION SELECT digest FROM channel_values WHERE digest IS NOT NULL"
+                " UNION SELECT digest FROM writes"
+                ")"
+            )
+            self._conn.commit()
+        self.log(object="delete_thread", message=thread_id)
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,  # noqa: A002
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        checkpoint_tuples = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint_tuple in checkpoint_tuples:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: str | None, channel: None) -> str:  # noqa: ARG002
+        # InMemorySaver と同じ形式（文字列として比較可能なバージョン）
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"  # noqa: S311
+
+    def stats(self) -> dict[str, int]:
+        """保存件数とディスク上のサイズ（圧縮後）を返す."""
+        with self._lock:
+            checkpoints = self._conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+            blobs, blob_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+            ).fetchone()
+        return {"checkpoints": checkpoints, "blobs": blobs, "blob_bytes": blob_bytes}
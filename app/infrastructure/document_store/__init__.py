@@ -0,0 +1,20 @@
+from app.infrastructure.document_store.factory import get_document_store
+from app.infrastructure.document_store.index import BM25Index, tokenize, tokenize_words
+from app.infrastructure.document_store.scope import (
+    DocumentScope,
+    document_scope,
+    get_document_scope,
+)
+from app.infrastructure.document_store.store import DocumentStore, normalize_url
+
+__all__ = [
+    "BM25Index",
+    "DocumentScope",
+    "DocumentStore",
+    "document_scope",
+    "get_document_scope",
+    "get_document_store",
+    "normalize_url",
+    "tokenize",
+    "tokenize_words",
+]
@@ -0,0 +1,38 @@
+import os
+import threading
+from collections import OrderedDict
+from functools import cache
+
+from app.core.config import settings
+from app.infrastructure.blob_manager import create_blob_manager
+from app.infrastructure.document_store.store import DocumentStore
+
+_lock = threading.Lock()
+# セッション (thread_id) -> 文書ストア。古いセッションから破棄する
+_session_stores: OrderedDict[str | None, DocumentStore] = OrderedDict()
+
+
+@cache
+def get_persistent_document_store() -> DocumentStore:
+    blob_manager = create_blob_manager()
+    blob_manager.mkdir(os.path.dirname(settings.DOCUMENT_STORE_PATH) or ".")
+    return DocumentStore(
+        blob_manager=blob_manager,
+        blob_path=settings.DOCUMENT_STORE_PATH,
+        min_coverage=settings.DOCUMENT_STORE_MIN_COVERAGE,
+    )
+
+
+def get_document_store(session_id: str | None = None) -> DocumentStore:
+    """DOCUMENT_STORE_PATH を指定した場合は全セッションで共有する永続的なストアを、それ以外はセッションごとのストアを返す."""
+    if settings.DOCUMENT_STORE_PATH:
+        return get_persistent_document_store()
+    with _lock:
+        if (store := _session_stores.get(session_id)) is None:
+            store = _session_stores[session_id] = DocumentStore(
+                min_coverage=settings.DOCUMENT_STORE_MIN_COVERAGE
+            )
+        _session_stores.move_to_end(session_id)
+        while len(_session_stores) > settings.DOCUMENT_STORE_MAX_SESSIONS:
+            _session_stores.popitem(last=False)
+        return store
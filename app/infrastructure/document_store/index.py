@@ -0,0 +1,98 @@
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import NamedTuple
+
+# 英数字は単語単位、日本語（かな・漢字）は文字 bigram 単位で索引する
+WORD_PATTERN = re.compile(r"[0-9a-z]+|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+
+
+def tokenize_words(text: str) -> list[list[str]]:
+    """語ごとの索引語（英数字は語そのもの、日本語は bigram）."""
+    words = []
+    for match in WORD_PATTERN.finditer(unicodedata.normalize("NFKC", text).lower()):
+        word = match.group()
+        if word.isascii() or len(word) == 1:
+            words.append([word])
+        else:
+            words.append([word[idx : idx + 2] for idx in range(len(word) - 1)])
+    return words
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for tokens in tokenize_words(text) for token in tokens]
+
+
+class ScoredDocument(NamedTuple):
+    doc_idx: int
+    score: float
+    # クエリの語のうち、文書に含まれる語の割合
+    coverage: float
+
+
+class BM25Index:
+    """追加のみの転置インデックス. 文書は追加順の番号 (doc_idx) で識別する.
+
+    語ごとの BM25 の寄与 (impact) は、文書が追加されるまでキャッシュする。
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        # term -> {doc_idx: 出現回数}
+        self.postings: dict[str, dict[int, int]] = {}
+        self.doc_lengths: list[int] = []
+        self.total_length = 0
+        self._impacts: dict[str, dict[int, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, text: str) -> int:
+        doc_idx = len(self.doc_lengths)
+        terms = tokenize(text)
+        for term, count in Counter(terms).items():
+            self.postings.setdefault(term, {})[doc_idx] = count
+        self.doc_lengths.append(len(terms))
+        self.total_length += len(terms)
+        # 文書数・平均長が変わるため、すべての語の寄与が変わる
+        self._impacts.clear()
+        return doc_idx
+
+    def idf(self, term: str) -> float:
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self) - df + 0.5) / (df + 0.5))
+
+    def _impact(self, term: str) -> dict[int, float]:
+        if (impacts := self._impacts.get(term)) is not None:
+            return impacts
+        posting = self.postings.get(term, {})
+        idf, k1, b = self.idf(term), self.k1, self.b
+        avg_length = self.total_length / len(self) or 1.0
+        doc_lengths = self.doc_lengths
+        impacts = self._impacts[term] = {
+            doc_idx: idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * doc_lengths[doc_idx] / avg_length))
+            for doc_idx, tf in posting.items()
+        }
+        return impacts
+
+    def search(self, query: str, k: int = 10) -> list[ScoredDocument]:
+        query_terms = set(tokenize(query))
+        if not (terms := [term for term in query_terms if term in self.postings]):
+            return []
+        # 最も多くの文書に出現する語の寄与は辞書ごと複製し、残りの語の寄与のみを加算する
+        impacts = sorted((self._impact(term) for term in terms), key=len, reverse=True)
+        scores = dict(impacts[0])
+        for term_impacts in impacts[1:]:
+            for doc_idx, impact in term_impacts.items():
+                scores[doc_idx] = scores.get(doc_idx, 0.0) + impact
+        return [
+            ScoredDocument(
+                doc_idx,
+                score,
+                sum(doc_idx in self.postings[term] for term in terms) / len(query_terms),
+            )
+            for doc_idx, score in heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        ]
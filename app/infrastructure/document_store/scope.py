@@ -0,0 +1,60 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from app.domain.models import ManagedDocument, SearchResult
+from app.infrastructure.document_store.store import DocumentStore, normalize_url
+
+
+class DocumentScope:
+    """1 タスクの実行中に参照した文書を集める. 文書ストアは同じセッションのタスク間で共有する."""
+
+    def __init__(self, store: DocumentStore, task_id: str, local_first: bool = True) -> None:
+        self.store = store
+        self.task_id = task_id
+        self.local_first = local_first
+        self._documents: dict[str, ManagedDocument] = {}
+
+    def _collect(self, documents: list[ManagedDocument]) -> list[ManagedDocument]:
+        for document in documents:
+            self._documents.setdefault(normalize_url(document.url), document)
+        return documents
+
+    def lookup(self, query: str, k: int) -> list[ManagedDocument] | None:
+        if not self.local_first or (documents := self.store.lookup(query, k)) is None:
+            return None
+        return self._collect(documents)
+
+    def add_search_results(self, search_results: list[SearchResult]) -> list[ManagedDocument]:
+        return self._collect(self.store.add_search_results(search_results, self.task_id))
+
+    @property
+    def documents(self) -> list[ManagedDocument]:
+        # 他のタスクで取得した文書も、このタスクの文書として状態に追加する
+        return [
+            document
+            if document.task_id == self.task_id
+            else document.model_copy(update={"task_id": self.task_id})
+            for document in self._documents.values()
+        ]
+
+
+current_document_scope: ContextVar[DocumentScope | None] = ContextVar(
+    "current_document_scope", default=None
+)
+
+
+@contextmanager
+def document_scope(
+    store: DocumentStore, task_id: str, local_first: bool = True
+) -> Iterator[DocumentScope]:
+    scope = DocumentScope(store, task_id, local_first)
+    token = current_document_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        current_document_scope.reset(token)
+
+
+def get_document_scope() -> DocumentScope | None:
+    return current_document_scope.get()
@@ -0,0 +1,130 @@
+import threading
+from collections.abc import Iterable
+from functools import partial
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.core.logging import LogLevel, log
+from app.domain.models import ManagedDocument, SearchResult
+from app.infrastructure.blob_manager import BaseBlobManager
+from app.infrastructure.document_store.index import BM25Index
+from app.infrastructure.metrics import metrics
+
+# 同じ文書を指す URL の揺れとして無視するクエリパラメータ
+TRACKING_PARAMS = {"fbclid", "gclid", "msclkid"}
+
+
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    netloc = parts.netloc.lower().removeprefix("www.").removesuffix(":80").removesuffix(":443")
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+        )
+    )
+    # http/https の違い・末尾のスラッシュ・フラグメントは同じ文書として扱う
+    return urlunsplit(("", netloc, parts.path.rstrip("/") or "/", query, ""))
+
+
+class DocumentStore:
+    """検索結果を ManagedDocument として URL で重複排除して保持し、タイトルとスニペットの BM25 で検索する.
+
+    blob_path を指定した場合は、追加した文書を JSONL に追記し、次回の起動時に読み込む。
+    """
+
+    def __init__(
+        self,
+        blob_manager: BaseBlobManager | None = None,
+        blob_path: str | None = None,
+        min_coverage: float = 0.8,
+        log_level: LogLevel = LogLevel.DEBUG,
+    ) -> None:
+        self.log = partial(log, log_level=log_level, subject=self.__name__)
+        self.blob_manager = blob_manager
+        self.blob_path = blob_path
+        self.min_coverage = min_coverage
+        self._lock = threading.Lock()
+        self._index = BM25Index()
+        self._documents: list[ManagedDocument] = []
+        self._by_url: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        if blob_manager is not None and blob_path and blob_manager.exists(blob_path):
+            self._add(blob_manager.iter_blob_as_jsonl(blob_path, schema=ManagedDocument))  # type: ignore
+            self.log(object="load", message=f"{len(self)} documents from {blob_path}")
+
+    @property
+    def __name__(self) -> str:
+        return str(self.__class__.__name__)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _add(self, documents: Iterable[ManagedDocument]) -> list[ManagedDocument]:
+        added = []
+        with self._lock:
+            for document in documents:
+                if (url := normalize_url(document.url)) in self._by_url:
+                    continue
+                self._by_url[url] = self._index.add(f"{document.title}\n{document.abstract}")
+                self._documents.append(document)
+                added.append(document)
+        return added
+
+    def get(self, url: str) -> ManagedDocument | None:
+        with self._lock:
+            doc_idx = self._by_url.get(normalize_url(url))
+            return None if doc_idx is None else self._documents[doc_idx]
+
+    def add_search_results(
+        self, search_results: list[SearchResult], task_id: str
+    ) -> list[ManagedDocument]:
+        """検索結果を文書として追加し、結果と同じ順で文書を返す（既に保持している URL は既存の文書を返す）."""
+        added = self._add(
+            ManagedDocument(
+                task_id=task_id, title=result.title, url=result.url, abstract=result.snippet
+            )
+            for result in search_results
+        )
+        if added:
+            metrics.inc("document_store_documents_total", {}, len(added))
+            if self.blob_manager is not None and self.blob_path:
+                self.blob_manager.append_blob_as_jsonl(added, self.blob_path, schema=ManagedDocument)
+        return [document for result in search_results if (document := self.get(result.url))]
+
+    def search(self, query: str, k: int = 3) -> list[tuple[ManagedDocument, float, float]]:
+        """(文書, BM25 スコア, クエリの語の被覆率) をスコアの高い順に返す."""
+        with self._lock:
+            return [
+                (self._documents[doc_idx], score, coverage)
+                for doc_idx, score, coverage in self._index.search(query, k)
+            ]
+
+    def lookup(self, query: str, k: int = 3) -> list[ManagedDocument] | None:
+        """クエリの語を min_coverage 以上含む文書が k 件あればそれを返し、なければ None を返す（外部検索が必要）."""
+        documents = [
+            document
+            for document, _, coverage in self.search(query, k)
+            if coverage >= self.min_coverage
+        ]
+        hit = len(documents) >= k
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        metrics.inc("document_store_lookups_total", {"result": "hit" if hit else "miss"})
+        self.log(object="hit" if hit else "miss", message=query)
+        return documents if hit else None
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "documents": len(self),
+            "lookups": lookups,
+            "hits": self.hits,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            # 局所的にヒットした分だけ外部検索を省略している
+            "searches_saved": self.hits,
+        }
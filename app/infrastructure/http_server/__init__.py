@@ -0,0 +1,6 @@
+from app.infrastructure.http_server.server import AsyncHTTPServer, HTTPRequest
+
+__all__ = [
+    "AsyncHTTPServer",
+    "HTTPRequest",
+]
@@ -0,0 +1,177 @@
+import asyncio
+import json
+import re
+from collections.abc import Awaitable, Callable
+from functools import partial
+from http import HTTPStatus
+from typing import Any, NamedTuple
+from urllib.parse import parse_qsl, urlsplit
+
+from app.core.exception import HTTPStatusError
+from app.core.logging import LogLevel, log
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class HTTPRequest(NamedTuple):
+    method: str
+    path: str
+    query: dict[str, str]
+    headers: dict[str, str]
+    body: bytes
+
+    def json(self) -> Any:  # noqa: ANN401
+        if not self.body:
+            return {}
+        try:
+            return json.loads(self.body)
+        except json.JSONDecodeError as e:
+            raise HTTPStatusError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}") from e
+
+
+Handler = Callable[..., Awaitable[tuple[int, Any]]]
+
+
+class Route(NamedTuple):
+    method: str
+    pattern: re.Pattern[str]
+    handler: Handler
+
+
+def compile_path(path: str) -> re.Pattern[str]:
+    # "/sessions/{thread_id}" のような {name} をパスパラメータとして扱う
+    return re.compile("^" + re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", path) + "$")
+
+
+class AsyncHTTPServer:
+    """asyncio のストリーム上で動く、JSON を返す最小限の HTTP/1.1 サーバー.
+
+    ハンドラーは async 関数で (status, JSON 化可能な値) を返す。リクエストの待機中はスレッドを占有しないため、
+    多数の接続・セッションを 1 つのイベントループで扱える。keep-alive に対応する。
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        log_level: LogLevel = LogLevel.DEBUG,
+    ) -> None:
+        self.log = partial(log, log_level=log_level, subject=self.__name__)
+        self.host = host
+        self.port = port
+        self._routes: list[Route] = []
+        self._server: asyncio.Server | None = None
+
+    @property
+    def __name__(self) -> str:
+        return str(self.__class__.__name__)
+
+    @property
+    def address(self) -> tuple[str, int]:
+        if self._server is None:
+            return self.host, self.port
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return host, port
+
+    def route(self, method: str, path: str) -> Callable[[Handler], Handler]:
+        def decorator(handler: Handler) -> Handler:
+            self._routes.append(Route(method.upper(), compile_path(path), handler))
+            return handler
+
+        return decorator
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES
+        )
+        self.log(object="start", message=f"http://{self.address[0]}:{self.address[1]}")
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:  # type: ignore
+            await self._server.serve_forever()  # type: ignore
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> HTTPRequest | None:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+        method, target, _ = request_line.split(" ", 2)
+        headers = {}
+        for line in header_lines:
+            key, _, value = line.partition(":")
+            headers[key.strip().lower()] = value.strip()
+        if (length := int(headers.get("content-length", 0))) > MAX_BODY_BYTES:
+            raise HTTPStatusError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"{length} bytes")
+        body = await reader.readexactly(length) if length else b""
+        url = urlsplit(target)
+        return HTTPRequest(
+            method=method.upper(),
+            path=url.path,
+            query=dict(parse_qsl(url.query)),
+            headers=headers,
+            body=body,
+        )
+
+    async def _dispatch(self, request: HTTPRequest) -> tuple[int, Any]:
+        allowed = False
+        for route in self._routes:
+            if (match := route.pattern.match(request.path)) is None:
+                continue
+            if route.method != request.method:
+                allowed = True
+                continue
+            return await route.handler(request, **match.groupdict())
+        if allowed:
+            raise HTTPStatusError(HTTPStatus.METHOD_NOT_ALLOWED, request.method)
+        raise HTTPStatusError(HTTPStatus.NOT_FOUND, request.path)
+
+    @staticmethod
+    def _write_response(
+        writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool  # noqa: ANN401
+    ) -> None:
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        reason = HTTPStatus(status).phrase
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    if (request := await self._read_request(reader)) is None:
+                        break
+                    keep_alive = request.headers.get("connection", "").lower() != "close"
+                    status, payload = await self._dispatch(request)
+                except HTTPStatusError as e:
+                    status, payload = e.status_code, {"error": e.message}
+                except (ValueError, asyncio.LimitOverrunError) as e:
+                    status, payload = HTTPStatus.BAD_REQUEST, {"error": str(e)}
+                except Exception as e:  # noqa: BLE001
+                    self.log(object="error", message=repr(e))
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": repr(e)}
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
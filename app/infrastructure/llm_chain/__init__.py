@@ -1,7 +1,13 @@
 from .base import BaseChain
+from .chain_cache import ChainCache, default_chain_cache
+from .instruction_cache import InstructionCache, default_instruction_cache
 from .openai_chain import BaseOpenAIChain
 
 __all__ = [
     "BaseChain",
     "BaseOpenAIChain",
+    "ChainCache",
+    "default_chain_cache",
+    "InstructionCache",
+    "default_instruction_cache",
 ]
@@ -0,0 +1,107 @@
+import hashlib
+import threading
+from collections.abc import Callable
+from functools import partial
+from typing import NamedTuple
+
+from langchain_core.runnables import RunnableSequence
+from pydantic import BaseModel
+
+from app.core.logging import LogLevel, log
+from app.infrastructure.blob_manager.base import BaseBlobManager
+
+
+class ChainCacheKey(NamedTuple):
+    model_name: str
+    schema: type[BaseModel] | None
+    temperature: float
+    prompt_path: str
+    prompt_hash: str
+
+
+class CachedPrompt(NamedTuple):
+    mtime: float
+    content_hash: str
+    template: str
+
+
+class ChainCache:
+    """構築済みのチェーン（ChatOpenAI + プロンプト + 構造化出力）を再利用するためのキャッシュ.
+
+    プロンプトファイルは更新時刻（mtime）が変わった場合のみ再読み込みし、
+    内容ハッシュが変わった場合は旧ハッシュで構築されたチェーンを破棄する。
+    """
+
+    def __init__(self, log_level: LogLevel = LogLevel.TRACE) -> None:
+        self.log = partial(log, log_level=log_level, subject=self.__name__)
+        self._lock = threading.Lock()
+        self._prompts: dict[str, CachedPrompt] = {}
+        self._chains: dict[ChainCacheKey, RunnableSequence] = {}
+        # 構築済みチェーンからキー（モデル名・スキーマ等）を逆引きするための索引
+        self._keys: dict[int, ChainCacheKey] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def __name__(self) -> str:
+        return str(self.__class__.__name__)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._chains)}
+
+    def load_prompt(self, blob_manager: BaseBlobManager, prompt_path: str) -> CachedPrompt:
+        mtime = blob_manager.get_blob_mtime(prompt_path)
+        with self._lock:
+            cached = self._prompts.get(prompt_path)
+            if cached and cached.mtime == mtime:
+                return cached
+        template = blob_manager.read_blob_as_str(prompt_path)
+        content_hash = hashlib.sha256(template.encode("utf-8")).hexdigest()
+        prompt = CachedPrompt(mtime=mtime, content_hash=content_hash, template=template)
+        with self._lock:
+            self._prompts[prompt_path] = prompt
+            if cached and cached.content_hash != content_hash:
+                # プロンプトが更新されたため、旧プロンプトで構築したチェーンを破棄する
+                stale_keys = [
+                    key
+                    for key in self._chains
+                    if key.prompt_path == prompt_path and key.prompt_hash != content_hash
+                ]
+                for key in stale_keys:
+                    del self._keys[id(self._chains.pop(key))]
+                self.log(object="invalidate", message=f"{prompt_path} ({len(stale_keys)} chains)")
+        return prompt
+
+    def get_or_build(
+        self,
+        key: ChainCacheKey,
+        builder: Callable[[], RunnableSequence],
+    ) -> RunnableSequence:
+        with self._lock:
+            if (chain := self._chains.get(key)) is not None:
+                self.hits += 1
+                return chain
+            self.misses += 1
+        chain = builder()
+        with self._lock:
+            # 同時に構築された場合は先に登録されたチェーンを優先する
+            chain = self._chains.setdefault(key, chain)
+            self._keys[id(chain)] = key
+        self.log(object="build", message=f"{key.prompt_path} | {self.stats}")
+        return chain
+
+    def key_of(self, chain: RunnableSequence) -> ChainCacheKey | None:
+        with self._lock:
+            return self._keys.get(id(chain))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._prompts.clear()
+            self._chains.clear()
+            self._keys.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+default_chain_cache = ChainCache()
@@ -0,0 +1,81 @@
+import threading
+from functools import partial
+from typing import NamedTuple
+
+from app.core.config import settings
+from app.core.logging import LogLevel, log
+from app.core.utils.datetime_utils import TimeGranularity, get_current_time_bucket
+from app.infrastructure.blob_manager.base import BaseBlobManager
+from app.infrastructure.cassette import get_cassette
+
+
+class RenderedInstruction(NamedTuple):
+    mtime: float
+    time_bucket: str
+    content: str
+
+
+class InstructionCache:
+    """レンダリング済みの global_instruction を保持するキャッシュ.
+
+    テンプレートファイルの更新時刻、または current_date の時間バケットが
+    変わった場合のみ再レンダリングする。同一バケット内ではプロンプトの
+    先頭部分がバイト単位で一致するため、プロバイダ側のプロンプトキャッシュにも効く。
+    """
+
+    def __init__(
+        self,
+        granularity: TimeGranularity = TimeGranularity.MINUTE,
+        log_level: LogLevel = LogLevel.TRACE,
+    ) -> None:
+        self.granularity = granularity
+        self.log = partial(log, log_level=log_level, subject=self.__name__)
+        self._lock = threading.Lock()
+        self._rendered: dict[str, RenderedInstruction] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def __name__(self) -> str:
+        return str(self.__class__.__name__)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _time_bucket(self) -> str:
+        # 記録・再生中は current_date をカセットに固定し、実行時刻によらず同じプロンプトにする
+        return get_cassette().pin(
+            f"current_date:{self.granularity.value}",
+            lambda: get_current_time_bucket(self.granularity),
+        )
+
+    def render(self, blob_manager: BaseBlobManager, template_path: str) -> str:
+        mtime = blob_manager.get_blob_mtime(template_path)
+        time_bucket = self._time_bucket()
+        with self._lock:
+            rendered = self._rendered.get(template_path)
+            if rendered and rendered.mtime == mtime and rendered.time_bucket == time_bucket:
+                self.hits += 1
+                return rendered.content
+            self.misses += 1
+        # コンパイル済みのテンプレートは TemplateRegistry が保持する
+        template = blob_manager.read_blob_as_template(template_path)
+        content = template.render(current_date=time_bucket)
+        with self._lock:
+            self._rendered[template_path] = RenderedInstruction(
+                mtime=mtime, time_bucket=time_bucket, content=content
+            )
+        self.log(object="render", message=f"{template_path} @ {time_bucket}")
+        return content
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rendered.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+default_instruction_cache = InstructionCache(
+    granularity=TimeGranularity(settings.GLOBAL_INSTRUCTION_TIME_GRANULARITY),
+)
@@ -1,19 +1,25 @@
+from collections.abc import AsyncIterator, Iterator
+
 from dotenv import load_dotenv
 from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnableConfig, RunnableSequence
 from langchain_core.tracers.stdout import ConsoleCallbackHandler
-from langchain_openai import ChatOpenAI
 from pydantic import BaseModel
 
 from app.core.config import settings
 from app.core.exception import ChainError
 from app.core.logging import LogLevel, log
-from app.core.utils.datetime_utils import get_current_time
 from app.infrastructure.blob_manager.base import BaseBlobManager
+from app.infrastructure.cassette import CassetteChatModel, get_cassette
 from app.infrastructure.llm_chain.base import BaseChain
+from app.infrastructure.llm_chain.chain_cache import ChainCache, ChainCacheKey, default_chain_cache
 from app.infrastructure.llm_chain.enums import OpenAIModelName
+from app.infrastructure.llm_chain.instruction_cache import InstructionCache, default_instruction_cache
+from app.infrastructure.llm_chain.response_cache import LLMResponseCache, get_response_cache
+from app.infrastructure.rate_limit import GuardedChatOpenAI
 
 load_dotenv()
 
@@ -29,44 +35,128 @@ class BaseOpenAIChain(BaseChain):
         self.model_name = model_name
         self.blob_manager = blob_manager
         self.prompt_path = prompt_path
+        self.chain_cache: ChainCache = default_chain_cache
+        self.instruction_cache: InstructionCache = default_instruction_cache
         super().__init__(log_level)
 
+    def _chain_cache_key(
+        self,
+        schema: type[BaseModel] | None,
+        temperature: float,
+        prompt_hash: str,
+        prompt_path: str | None = None,
+    ) -> ChainCacheKey:
+        return ChainCacheKey(
+            model_name=self.model_name.value,
+            schema=schema,
+            temperature=temperature,
+            prompt_path=prompt_path or self.prompt_path,
+            prompt_hash=prompt_hash,
+        )
+
+    def _build_llm(self, temperature: float) -> BaseChatModel:
+        cassette = get_cassette()
+        if not cassette.is_active:
+            return GuardedChatOpenAI(model_name=self.model_name.value, temperature=temperature)
+        return CassetteChatModel(
+            cassette=cassette,
+            model_name=self.model_name.value,
+            temperature=temperature,
+            scope=self.__name__,
+        )
+
     def _build_structured_chain(
         self,
         schema: BaseModel,
         temperature: float = 0.0,
     ) -> RunnableSequence:
-        llm = ChatOpenAI(model_name=self.model_name.value, temperature=temperature)
-        template = self.blob_manager.read_blob_as_str(self.prompt_path)
-        prompt = ChatPromptTemplate.from_template(template, template_format="jinja2")
-        return prompt | llm.with_structured_output(schema, method="function_calling")  # type: ignore
+        cached_prompt = self.chain_cache.load_prompt(self.blob_manager, self.prompt_path)
+
+        def build() -> RunnableSequence:
+            llm = self._build_llm(temperature)
+            prompt = ChatPromptTemplate.from_template(cached_prompt.template, template_format="jinja2")
+            return prompt | llm.with_structured_output(schema, method="function_calling")  # type: ignore
+
+        key = self._chain_cache_key(schema, temperature, cached_prompt.content_hash)  # type: ignore
+        return self.chain_cache.get_or_build(key, build)
+
+    def _build_chain(
+        self,
+        temperature: float = 0.0,
+        prompt_path: str | None = None,
+    ) -> RunnableSequence:
+        """prompt_path を指定した場合は、ノードの既定とは別のプロンプトでチェーンを構築する."""
+        prompt_path = prompt_path or self.prompt_path
+        cached_prompt = self.chain_cache.load_prompt(self.blob_manager, prompt_path)
 
-    def _build_chain(self, temperature: float = 0.0) -> RunnableSequence:
-        llm = ChatOpenAI(model_name=self.model_name.value, temperature=temperature)
-        template = self.blob_manager.read_blob_as_str(self.prompt_path)
-        prompt = ChatPromptTemplate.from_template(template, template_format="jinja2")
-        return prompt | llm | StrOutputParser()  # type: ignore
+        def build() -> RunnableSequence:
+            llm = self._build_llm(temperature)
+            prompt = ChatPromptTemplate.from_template(cached_prompt.template, template_format="jinja2")
+            return prompt | llm | StrOutputParser()  # type: ignore
+
+        key = self._chain_cache_key(None, temperature, cached_prompt.content_hash, prompt_path)
+        return self.chain_cache.get_or_build(key, build)
 
     @property
     def global_instruction(self) -> str:
-        template = self.blob_manager.read_blob_as_template(
-            settings.GLOBAL_INSTRUCTION_PATH
+        return self.instruction_cache.render(
+            self.blob_manager, settings.GLOBAL_INSTRUCTION_PATH
         )
-        return template.render(current_date=get_current_time())
 
-    def invoke(
+    def _get_response_cache(self) -> LLMResponseCache | None:
+        response_cache = get_response_cache()
+        if response_cache is None or not response_cache.is_enabled(self.__name__):
+            return None
+        return response_cache
+
+    def _lookup_response_cache(
         self,
+        response_cache: LLMResponseCache,
         chain: RunnableSequence,
         inputs: dict,
-        verbose: bool = False,
-    ) -> str | BaseModel:
+    ) -> tuple[str | None, str | BaseModel | None]:
+        if (chain_key := self.chain_cache.key_of(chain)) is None:
+            return None, None
+        # プロンプトをレンダリングし、実際に送信されるメッセージでキーを作る
+        messages = chain.first.invoke(inputs).to_messages()
+        cache_key = response_cache.build_key(chain_key, messages)
+        return cache_key, response_cache.get(self.__name__, cache_key, chain_key.schema)
+
+    @staticmethod
+    def _build_config(verbose: bool) -> RunnableConfig | None:
         callbacks: list[BaseCallbackHandler] = []
         if verbose:
             callbacks.append(ConsoleCallbackHandler())
-        config = RunnableConfig(callbacks=callbacks)
+        # callbacks が空の場合は config を渡さず、グラフ側のコールバック（メトリクス等）を引き継ぐ
+        return RunnableConfig(callbacks=callbacks) if callbacks else None
+
+    def _prepare(
+        self,
+        chain: RunnableSequence,
+        inputs: dict,
+    ) -> tuple[LLMResponseCache | None, str | None, str | BaseModel | None]:
+        inputs["global_instruction"] = self.global_instruction
+        if response_cache := self._get_response_cache():
+            cache_key, cached_response = self._lookup_response_cache(
+                response_cache, chain, inputs
+            )
+            return response_cache, cache_key, cached_response
+        return None, None, None
+
+    def invoke(
+        self,
+        chain: RunnableSequence,
+        inputs: dict,
+        verbose: bool = False,
+    ) -> str | BaseModel:
+        config = self._build_config(verbose)
         try:
-            inputs["global_instruction"] = self.global_instruction
+            response_cache, cache_key, cached_response = self._prepare(chain, inputs)
+            if cached_response is not None:
+                return cached_response
             response = chain.invoke(inputs, config=config)
+            if response_cache and cache_key:
+                response_cache.set(cache_key, response)
             log(
                 LogLevel.DEBUG,
                 subject=self.__name__,
@@ -78,3 +168,76 @@ class BaseOpenAIChain(BaseChain):
             error_message = f"An error occurred while calling the LLM: {e!s}"
             self.log(object="invoke", message=error_message)
             raise ChainError(self.__name__, error_message) from e
+
+    async def ainvoke(
+        self,
+        chain: RunnableSequence,
+        inputs: dict,
+        verbose: bool = False,
+    ) -> str | BaseModel:
+        config = self._build_config(verbose)
+        try:
+            response_cache, cache_key, cached_response = self._prepare(chain, inputs)
+            if cached_response is not None:
+                return cached_response
+            response = await chain.ainvoke(inputs, config=config)
+            if response_cache and cache_key:
+                response_cache.set(cache_key, response)
+            log(
+                LogLevel.DEBUG,
+                subject=self.__name__,
+                object="ainvoke",
+                message=response,
+            )
+            return response  # type: ignore  # noqa: TRY300
+        except Exception as e:
+            error_message = f"An error occurred while calling the LLM: {e!s}"
+            self.log(object="ainvoke", message=error_message)
+            raise ChainError(self.__name__, error_message) from e
+
+    def stream(
+        self,
+        chain: RunnableSequence,
+        inputs: dict,
+        verbose: bool = False,
+    ) -> Iterator[str]:
+        """_build_chain で構築したチェーンの出力を、生成されたチャンクから順に返す."""
+        config = self._build_config(verbose)
+        try:
+            response_cache, cache_key, cached_response = self._prepare(chain, inputs)
+            if cached_response is not None:
+                yield str(cached_response)
+                return
+            chunks = []
+            for chunk in chain.stream(inputs, config=config):
+                chunks.append(chunk)
+                yield chunk
+            if response_cache and cache_key:
+                response_cache.set(cache_key, "".join(chunks))
+        except Exception as e:
+            error_message = f"An error occurred while streaming the LLM: {e!s}"
+            self.log(object="stream", message=error_message)
+            raise ChainError(self.__name__, error_message) from e
+
+    async def astream(
+        self,
+        chain: RunnableSequence,
+        inputs: dict,
+        verbose: bool = False,
+    ) -> AsyncIterator[str]:
+        config = self._build_config(verbose)
+        try:
+            response_cache, cache_key, cached_response = self._prepare(chain, inputs)
+            if cached_response is not None:
+                yield str(cached_response)
+                return
+            chunks = []
+            async for chunk in chain.astream(inputs, config=config):
+                chunks.append(chunk)
+                yield chunk
+            if response_cache and cache_key:
+                response_cache.set(cache_key, "".join(chunks))
+        except Exception as e:
+            error_message = f"An error occurred while streaming the LLM: {e!s}"
+            self.log(object="astream", message=error_message)
+            raise ChainError(self.__name__, error_message) from e
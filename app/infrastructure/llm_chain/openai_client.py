@@ -0,0 +1,34 @@
+import asyncio
+import threading
+from weakref import WeakKeyDictionary
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, OpenAI
+
+load_dotenv()
+
+# プロセス全体で HTTP コネクションプールを共有するための OpenAI クライアント
+# 再試行は OutboundGuard で行うため、SDK 側の再試行は無効にする
+_lock = threading.Lock()
+_client: OpenAI | None = None
+# httpx.AsyncClient はイベントループを跨いで共有できないため、ループごとに保持する
+_async_clients: WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI] = (
+    WeakKeyDictionary()
+)
+
+
+def get_openai_client() -> OpenAI:
+    global _client  # noqa: PLW0603
+    with _lock:
+        if _client is None:
+            _client = OpenAI(max_retries=0)
+        return _client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    loop = asyncio.get_running_loop()
+    with _lock:
+        if (client := _async_clients.get(loop)) is None:
+            client = AsyncOpenAI(max_retries=0)
+            _async_clients[loop] = client
+        return client
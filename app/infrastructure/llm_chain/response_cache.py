@@ -0,0 +1,123 @@
+import hashlib
+import json
+import threading
+from collections import defaultdict
+from enum import Enum
+from functools import cache, partial
+from typing import Any
+
+from langchain_core.messages import BaseMessage
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.logging import LogLevel, log
+from app.infrastructure.cache import BaseCache, SqliteCache
+from app.infrastructure.llm_chain.chain_cache import ChainCacheKey
+
+
+def dump_model_fields(value: Any) -> Any:  # noqa: ANN401
+    """exclude=True のフィールドも含めて、モデルを JSON 化可能な値に変換する.
+
+    ResearchPlan.tasks のように exclude=True のフィールドは model_dump では失われるため、
+    キャッシュから元のモデルを復元できるようにフィールドを直接たどる。
+    """
+    if isinstance(value, BaseModel):
+        return {
+            name: dump_model_fields(getattr(value, name))
+            for name in type(value).model_fields
+        }
+    if isinstance(value, list | tuple):
+        return [dump_model_fields(item) for item in value]
+    if isinstance(value, dict):
+        return {key: dump_model_fields(item) for key, item in value.items()}
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+class LLMResponseCache:
+    """BaseOpenAIChain.invoke の応答を完全一致で再利用する永続キャッシュ.
+
+    キーはモデル名・temperature・レンダリング済みのプロンプト・出力スキーマの正規化ハッシュ。
+    ノード（チェーン名）ごとに有効化でき、ヒット・ミスもノードごとに集計する。
+    """
+
+    def __init__(
+        self,
+        cache: BaseCache,
+        enabled_nodes: set[str],
+        log_level: LogLevel = LogLevel.DEBUG,
+    ) -> None:
+        self.log = partial(log, log_level=log_level, subject=self.__name__)
+        self.cache = cache
+        self.enabled_nodes = enabled_nodes
+        self._lock = threading.Lock()
+        self._stats: defaultdict[str, dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0}
+        )
+
+    @property
+    def __name__(self) -> str:
+        return str(self.__class__.__name__)
+
+    @property
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {node: dict(stats) for node, stats in self._stats.items()}
+
+    def is_enabled(self, node_name: str) -> bool:
+        return "*" in self.enabled_nodes or node_name in self.enabled_nodes
+
+    @staticmethod
+    def build_key(chain_key: ChainCacheKey, messages: list[BaseMessage]) -> str:
+        payload = {
+            "model_name": chain_key.model_name,
+            "temperature": chain_key.temperature,
+            "schema": (
+                chain_key.schema.model_json_schema() if chain_key.schema else None
+            ),
+            "messages": [[message.type, message.content] for message in messages],
+        }
+        canonical = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _count(self, node_name: str, stat: str) -> None:
+        with self._lock:
+            self._stats[node_name][stat] += 1
+
+    def get(
+        self,
+        node_name: str,
+        key: str,
+        schema: type[BaseModel] | None,
+    ) -> str | BaseModel | None:
+        if (value := self.cache.get(key)) is None:
+            self._count(node_name, "misses")
+            return None
+        self._count(node_name, "hits")
+        self.log(object=f"{node_name} #hit", message=key)
+        payload = json.loads(value)
+        if schema is None:
+            return str(payload)
+        return schema.model_validate(payload)
+
+    def set(self, key: str, response: str | BaseModel) -> None:
+        self.cache.set(
+            key, json.dumps(dump_model_fields(response), ensure_ascii=False)
+        )
+
+
+@cache
+def get_response_cache() -> LLMResponseCache | None:
+    """設定で有効化されている場合のみ、プロセス全体で共有する応答キャッシュを返す."""
+    if not settings.LLM_RESPONSE_CACHE_NODES:
+        return None
+    return LLMResponseCache(
+        cache=SqliteCache(
+            db_path=settings.LLM_RESPONSE_CACHE_PATH,
+            max_size=settings.LLM_RESPONSE_CACHE_MAX_SIZE,
+            max_bytes=settings.LLM_RESPONSE_CACHE_MAX_BYTES,
+            eviction_interval=1,
+        ),
+        enabled_nodes=set(settings.LLM_RESPONSE_CACHE_NODES),
+    )
@@ -0,0 +1,10 @@
+from app.infrastructure.metrics.callback import MetricsCallbackHandler
+from app.infrastructure.metrics.registry import MetricsRegistry, metrics
+from app.infrastructure.metrics.server import MetricsServer
+
+__all__ = [
+    "MetricsCallbackHandler",
+    "MetricsRegistry",
+    "MetricsServer",
+    "metrics",
+]
@@ -0,0 +1,158 @@
+import threading
+import time
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langgraph.errors import GraphBubbleUp
+
+from app.infrastructure.metrics.registry import MetricsRegistry, metrics
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """グラフ実行中のイベントから、ノード・ツールごとのメトリクスを集計する.
+
+    ノード配下の LLM・ツール呼び出しは、親の run_id をたどって呼び出し元のノードに帰属させる。
+    """
+
+    run_inline = True
+
+    def __init__(
+        self,
+        node_names: set[str],
+        registry: MetricsRegistry = metrics,
+    ) -> None:
+        self.node_names = node_names
+        self.registry = registry
+        self._lock = threading.Lock()
+        self._run_nodes: dict[UUID, str] = {}
+        self._node_starts: dict[UUID, tuple[str, float]] = {}
+        self._tool_starts: dict[UUID, tuple[str, float]] = {}
+
+    def _register(self, run_id: UUID, parent_run_id: UUID | None) -> str:
+        with self._lock:
+            node = self._run_nodes.get(parent_run_id, "unknown") if parent_run_id else "unknown"
+            self._run_nodes[run_id] = node
+            return node
+
+    def _release(self, run_id: UUID) -> str:
+        with self._lock:
+            return self._run_nodes.pop(run_id, "unknown")
+
+    def on_chain_start(
+        self,
+        serialized: dict[str, Any] | None,  # noqa: ARG002
+        inputs: Any,  # noqa: ANN401, ARG002
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        name = kwargs.get("name")
+        if name in self.node_names and (metadata or {}).get("langgraph_node") == name:
+            with self._lock:
+                self._run_nodes[run_id] = name
+                self._node_starts[run_id] = (name, time.perf_counter())
+            return
+        self._register(run_id, parent_run_id)
+
+    def _finish_node(self, run_id: UUID, error: BaseException | None = None) -> None:
+        self._release(run_id)
+        with self._lock:
+            started = self._node_starts.pop(run_id, None)
+        if started is None:
+            return
+        node, start = started
+        labels = {"node": node}
+        self.registry.inc("node_invocations_total", labels)
+        self.registry.observe("node_duration_seconds", labels, time.perf_counter() - start)
+        # interrupt（ユーザーへの質問）による中断はエラーとして扱わない
+        if error is not None and not isinstance(error, GraphBubbleUp):
+            self.registry.inc("node_errors_total", labels)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: ANN401, ARG002
+        self._finish_node(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: ANN401, ARG002
+        self._finish_node(run_id, error)
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],  # noqa: ARG002
+        messages: Any,  # noqa: ANN401, ARG002
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,  # noqa: ANN401, ARG002
+    ) -> None:
+        self._register(run_id, parent_run_id)
+
+    def on_llm_start(
+        self,
+        serialized: dict[str, Any],  # noqa: ARG002
+        prompts: list[str],  # noqa: ARG002
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,  # noqa: ANN401, ARG002
+    ) -> None:
+        self._register(run_id, parent_run_id)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: ANN401, ARG002
+        labels = {"node": self._release(run_id)}
+        self.registry.inc("llm_calls_total", labels)
+        prompt_tokens, completion_tokens = 0, 0
+        for generations in response.generations:
+            for generation in generations:
+                if usage := getattr(getattr(generation, "message", None), "usage_metadata", None):
+                    prompt_tokens += usage.get("input_tokens", 0)
+                    completion_tokens += usage.get("output_tokens", 0)
+        if not (prompt_tokens or completion_tokens) and response.llm_output:
+            token_usage = response.llm_output.get("token_usage") or {}
+            prompt_tokens = token_usage.get("prompt_tokens", 0)
+            completion_tokens = token_usage.get("completion_tokens", 0)
+        self.registry.inc("llm_prompt_tokens_total", labels, prompt_tokens)
+        self.registry.inc("llm_completion_tokens_total", labels, completion_tokens)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: ANN401, ARG002
+        self.registry.inc("llm_errors_total", {"node": self._release(run_id)})
+
+    def on_tool_start(
+        self,
+        serialized: dict[str, Any] | None,
+        input_str: str,  # noqa: ARG002
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        self._register(run_id, parent_run_id)
+        tool = (serialized or {}).get("name") or kwargs.get("name") or "unknown"
+        with self._lock:
+            self._tool_starts[run_id] = (tool, time.perf_counter())
+
+    def _finish_tool(self, run_id: UUID, error: BaseException | None = None) -> None:
+        self._release(run_id)
+        with self._lock:
+            started = self._tool_starts.pop(run_id, None)
+        if started is None:
+            return
+        tool, start = started
+        labels = {"tool": tool}
+        self.registry.inc("tool_invocations_total", labels)
+        self.registry.observe("tool_duration_seconds", labels, time.perf_counter() - start)
+        if error is not None:
+            self.registry.inc("tool_errors_total", labels)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: ANN401, ARG002
+        self._finish_tool(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: ANN401, ARG002
+        self._finish_tool(run_id, error)
+
+    def on_retry(self, retry_state: Any, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: ANN401, ARG002
+        with self._lock:
+            node = self._run_nodes.get(run_id, "unknown")
+        self.registry.inc("retries_total", {"target": node})
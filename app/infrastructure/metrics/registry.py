@@ -0,0 +1,127 @@
+import bisect
+import math
+import threading
+from collections import defaultdict
+
+Labels = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, math.inf)
+
+
+def to_labels(labels: dict[str, str]) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def format_labels(labels: Labels, extra: dict[str, str] | None = None) -> str:
+    items = list(labels) + list((extra or {}).items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in items) + "}"
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> list[int]:
+        cumulative, total = [], 0
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+
+class MetricsRegistry:
+    """カウンターとヒストグラムを保持し、Prometheus テキスト形式と JSON で出力する."""
+
+    def __init__(self, namespace: str = "research_agent") -> None:
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._counters: defaultdict[str, defaultdict[Labels, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        self._histograms: defaultdict[str, dict[Labels, Histogram]] = defaultdict(dict)
+
+    def inc(self, name: str, labels: dict[str, str], amount: float = 1.0) -> None:
+        with self._lock:
+            self._counters[name][to_labels(labels)] += amount
+
+    def observe(self, name: str, labels: dict[str, str], value: float) -> None:
+        key = to_labels(labels)
+        with self._lock:
+            if (histogram := self._histograms[name].get(key)) is None:
+                histogram = self._histograms[name][key] = Histogram()
+            histogram.observe(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                metric = f"{self.namespace}_{name}"
+                lines.append(f"# TYPE {metric} counter")
+                lines.extend(
+                    f"{metric}{format_labels(labels)} {value:g}"
+                    for labels, value in series.items()
+                )
+            for name, series in sorted(self._histograms.items()):
+                metric = f"{self.namespace}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for labels, histogram in series.items():
+                    for bucket, count in zip(
+                        histogram.buckets, histogram.cumulative_counts(), strict=True
+                    ):
+                        le = "+Inf" if math.isinf(bucket) else f"{bucket:g}"
+                        lines.append(
+                            f"{metric}_bucket{format_labels(labels, {'le': le})} {count}"
+                        )
+                    lines.append(f"{metric}_sum{format_labels(labels)} {histogram.sum:g}")
+                    lines.append(f"{metric}_count{format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "counters": {
+                    name: [
+                        {"labels": dict(labels), "value": value}
+                        for labels, value in series.items()
+                    ]
+                    for name, series in self._counters.items()
+                },
+                "histograms": {
+                    name: [
+                        {
+                            "labels": dict(labels),
+                            "count": histogram.count,
+                            "sum": histogram.sum,
+                            "mean": histogram.sum / histogram.count if histogram.count else 0.0,
+                            "buckets": {
+                                ("+Inf" if math.isinf(bucket) else f"{bucket:g}"): count
+                                for bucket, count in zip(
+                                    histogram.buckets,
+                                    histogram.cumulative_counts(),
+                                    strict=True,
+                                )
+                            },
+                        }
+                        for labels, histogram in series.items()
+                    ]
+                    for name, series in self._histograms.items()
+                },
+            }
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,58 @@
+import threading
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.core.logging import LogLevel, log
+from app.infrastructure.metrics.registry import MetricsRegistry, metrics
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = metrics
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002, ARG002
+        return
+
+
+class MetricsServer:
+    """GET /metrics で Prometheus 形式のメトリクスを返すローカル HTTP サーバー."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 9464,
+        registry: MetricsRegistry = metrics,
+        log_level: LogLevel = LogLevel.INFO,
+    ) -> None:
+        self.log = partial(log, log_level=log_level, subject=self.__name__)
+        handler = type("Handler", (MetricsRequestHandler,), {"registry": registry})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def __name__(self) -> str:
+        return str(self.__class__.__name__)
+
+    @property
+    def address(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> "MetricsServer":
+        self._thread.start()
+        self.log(object="start", message=self.address)
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
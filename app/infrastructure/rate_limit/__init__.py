@@ -0,0 +1,16 @@
+from app.infrastructure.rate_limit.budgets import RateBudgets, get_rate_budgets
+from app.infrastructure.rate_limit.chat_model import GuardedChatOpenAI
+from app.infrastructure.rate_limit.circuit_breaker import CircuitBreaker
+from app.infrastructure.rate_limit.guard import OutboundGuard, get_outbound_guard
+from app.infrastructure.rate_limit.retry import RetryPolicy, parse_retry_after
+
+__all__ = [
+    "CircuitBreaker",
+    "GuardedChatOpenAI",
+    "OutboundGuard",
+    "RateBudgets",
+    "RetryPolicy",
+    "get_outbound_guard",
+    "get_rate_budgets",
+    "parse_retry_after",
+]
@@ -0,0 +1,72 @@
+import threading
+from functools import cache
+from typing import TYPE_CHECKING
+
+from app.core.config import settings
+from app.core.utils.token_bucket import TokenBucket
+
+if TYPE_CHECKING:
+    from app.infrastructure.llm_chain.enums import OpenAIModelName
+
+# 設定にないモデルに適用する既定の上限（分あたり）
+DEFAULT_OPENAI_REQUESTS_PER_MINUTE = 500
+DEFAULT_OPENAI_TOKENS_PER_MINUTE = 30_000
+
+
+class RateBudgets:
+    """外部 API のレート上限（分あたりのリクエスト数・トークン数）をトークンバケットとして保持する.
+
+    OpenAI はモデル（OpenAIModelName）ごと、Perplexity は API 全体で 1 つのバケットを持つ。
+    Perplexity は、タスク開始時に見積もりを予約するバケット（perplexity_requests）と、
+    実際の呼び出しごとに消費するバケット（perplexity_calls）を分ける（同じ呼び出しを二重に数えないため）。
+    """
+
+    def __init__(
+        self,
+        openai_requests_per_minute: dict[str, int],
+        openai_tokens_per_minute: dict[str, int],
+        perplexity_requests_per_minute: int,
+    ) -> None:
+        self.openai_requests_per_minute = openai_requests_per_minute
+        self.openai_tokens_per_minute = openai_tokens_per_minute
+        self._lock = threading.Lock()
+        self._buckets: dict[str, TokenBucket] = {
+            "perplexity:requests": TokenBucket.per_minute(perplexity_requests_per_minute),
+            "perplexity:calls": TokenBucket.per_minute(perplexity_requests_per_minute),
+        }
+
+    def _get_or_create(self, key: str, per_minute: int) -> TokenBucket:
+        with self._lock:
+            if (bucket := self._buckets.get(key)) is None:
+                bucket = self._buckets[key] = TokenBucket.per_minute(per_minute)
+            return bucket
+
+    def openai_requests(self, model_name: "OpenAIModelName | str") -> TokenBucket:
+        model_name = getattr(model_name, "value", model_name)
+        return self._get_or_create(
+            f"openai:{model_name}:requests",
+            self.openai_requests_per_minute.get(model_name, DEFAULT_OPENAI_REQUESTS_PER_MINUTE),
+        )
+
+    def openai_tokens(self, model_name: "OpenAIModelName | str") -> TokenBucket:
+        model_name = getattr(model_name, "value", model_name)
+        return self._get_or_create(
+            f"openai:{model_name}:tokens",
+            self.openai_tokens_per_minute.get(model_name, DEFAULT_OPENAI_TOKENS_PER_MINUTE),
+        )
+
+    def perplexity_requests(self) -> TokenBucket:
+        return self._buckets["perplexity:requests"]
+
+    def perplexity_calls(self) -> TokenBucket:
+        return self._buckets["perplexity:calls"]
+
+
+@cache
+def get_rate_budgets() -> RateBudgets:
+    """プロセス全体で共有するレート上限を返す."""
+    return RateBudgets(
+        openai_requests_per_minute=settings.OPENAI_REQUESTS_PER_MINUTE,
+        openai_tokens_per_minute=settings.OPENAI_TOKENS_PER_MINUTE,
+        perplexity_requests_per_minute=settings.PERPLEXITY_REQUESTS_PER_MINUTE,
+    )
@@ -0,0 +1,102 @@
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_openai import ChatOpenAI
+
+from app.core.utils.token_bucket import TokenBucket
+from app.infrastructure.rate_limit.budgets import get_rate_budgets
+from app.infrastructure.rate_limit.guard import get_outbound_guard
+
+ENDPOINT = "openai:chat"
+
+
+class GuardedChatOpenAI(ChatOpenAI):
+    """OutboundGuard（レート制限・再試行・サーキットブレーカー）を経由して呼び出す ChatOpenAI.
+
+    再試行は OutboundGuard に任せるため、SDK 側の再試行は無効にする。
+    ストリーミングは最初のチャンクを受け取るまでを再試行の対象とする。
+    """
+
+    max_retries: int | None = 0
+
+    @property
+    def _bucket(self) -> TokenBucket:
+        return get_rate_budgets().openai_requests(self.model_name)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> ChatResult:
+        generate = super()._generate
+        if self.streaming:
+            # _stream 側でガードを通す
+            return generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        return get_outbound_guard().call(
+            ENDPOINT,
+            lambda: generate(messages, stop=stop, run_manager=run_manager, **kwargs),
+            self._bucket,
+        )
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> ChatResult:
+        agenerate = super()._agenerate
+        if self.streaming:
+            return await agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        return await get_outbound_guard().acall(
+            ENDPOINT,
+            lambda: agenerate(messages, stop=stop, run_manager=run_manager, **kwargs),
+            self._bucket,
+        )
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Iterator[ChatGenerationChunk]:
+        stream = super()._stream
+
+        def start() -> tuple[Iterator[ChatGenerationChunk], ChatGenerationChunk | None]:
+            chunks = stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+            return chunks, next(chunks, None)
+
+        chunks, first = get_outbound_guard().call(ENDPOINT, start, self._bucket)
+        if first is None:
+            return
+        yield first
+        yield from chunks
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        astream = super()._astream
+
+        async def start() -> tuple[AsyncIterator[ChatGenerationChunk], ChatGenerationChunk | None]:
+            chunks = astream(messages, stop=stop, run_manager=run_manager, **kwargs)
+            return chunks, await anext(chunks, None)
+
+        chunks, first = await get_outbound_guard().acall(ENDPOINT, start, self._bucket)
+        if first is None:
+            return
+        yield first
+        async for chunk in chunks:
+            yield chunk
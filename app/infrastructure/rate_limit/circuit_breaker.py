@@ -0,0 +1,73 @@
+import threading
+import time
+from collections.abc import Callable
+
+from app.infrastructure.rate_limit.enums import CircuitState
+
+
+class CircuitBreaker:
+    """連続して失敗したエンドポイントへの呼び出しを一定時間遮断する.
+
+    failure_threshold 回連続で失敗すると OPEN になり、reset_timeout 秒後に HALF_OPEN として
+    1 件だけ試行を許可する。試行が成功すれば CLOSED に戻り、失敗すれば再び OPEN になる。
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def _refresh(self) -> None:
+        if self._state == CircuitState.OPEN and self.retry_in == 0:
+            self._state = CircuitState.HALF_OPEN
+            self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    @property
+    def retry_in(self) -> float:
+        """OPEN の場合に、試行を再開するまでの秒数."""
+        return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def allow(self) -> bool:
+        with self._lock:
+            self._refresh()
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> bool:
+        """失敗を記録し、これにより OPEN になった場合は True を返す."""
+        with self._lock:
+            self._failures += 1
+            if self._state == CircuitState.OPEN:
+                return False
+            if self._state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = CircuitState.OPEN
+                self._opened_at = self._clock()
+                self._probing = False
+                return True
+            return False
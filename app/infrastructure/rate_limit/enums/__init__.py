@@ -0,0 +1,3 @@
+from .circuit_state import CircuitState
+
+__all__ = ["CircuitState"]
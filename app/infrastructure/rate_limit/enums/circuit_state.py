@@ -0,0 +1,7 @@
+from app.domain.enums.base import BaseEnum
+
+
+class CircuitState(BaseEnum):
+    CLOSED = "closed"  # 通常どおり呼び出す
+    OPEN = "open"  # 呼び出さずに即座に失敗させる
+    HALF_OPEN = "half_open"  # 試行として 1 件だけ呼び出す
@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from functools import cache, partial
+from typing import TypeVar
+
+from app.core.config import settings
+from app.core.exception import CircuitOpenError
+from app.core.logging import LogLevel, log
+from app.core.utils.token_bucket import TokenBucket
+from app.infrastructure.metrics import MetricsRegistry, metrics
+from app.infrastructure.rate_limit.circuit_breaker import CircuitBreaker
+from app.infrastructure.rate_limit.retry import (
+    RetryPolicy,
+    is_retryable,
+    is_server_failure,
+    retry_after_of,
+    status_code_of,
+)
+
+T = TypeVar("T")
+
+
+class OutboundGuard:
+    """外部 API 呼び出しに共通のレート制限・再試行・サーキットブレーカーを適用する.
+
+    呼び出しごとに、エンドポイントの遮断状態を確認し、一時停止（429 の Retry-After）と
+    リクエスト数のバケットを待ってから呼び出す。429 を受けた場合は同じエンドポイントへの
+    すべての呼び出しを Retry-After の間止める。
+    """
+
+    def __init__(
+        self,
+        policy: RetryPolicy,
+        failure_threshold: int,
+        reset_timeout: float,
+        registry: MetricsRegistry = metrics,
+        clock: Callable[[], float] = time.monotonic,
+        log_level: LogLevel = LogLevel.DEBUG,
+    ) -> None:
+        self.log = partial(log, log_level=log_level, subject=self.__name__)
+        self.policy = policy
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.registry = registry
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._paused_until: dict[str, float] = {}
+
+    @property
+    def __name__(self) -> str:
+        return str(self.__class__.__name__)
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            if (breaker := self._breakers.get(endpoint)) is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(
+                    self.failure_threshold, self.reset_timeout, self._clock
+                )
+            return breaker
+
+    def _check_circuit(self, endpoint: str, error: Exception | None) -> None:
+        breaker = self.breaker(endpoint)
+        if breaker.allow():
+            return
+        self.registry.inc("outbound_circuit_rejected_total", {"endpoint": endpoint})
+        raise CircuitOpenError(endpoint, breaker.retry_in) from error
+
+    def _pause_time(self, endpoint: str) -> float:
+        with self._lock:
+            return max(0.0, self._paused_until.get(endpoint, 0.0) - self._clock())
+
+    def _pause(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            paused_until = self._clock() + seconds
+            self._paused_until[endpoint] = max(self._paused_until.get(endpoint, 0.0), paused_until)
+
+    def _on_success(self, endpoint: str, elapsed: float) -> None:
+        self.breaker(endpoint).record_success()
+        self.registry.inc("outbound_requests_total", {"endpoint": endpoint, "status": "ok"})
+        self.registry.observe("outbound_request_seconds", {"endpoint": endpoint}, elapsed)
+
+    def _on_failure(self, endpoint: str, error: Exception, attempt: int) -> float | None:
+        """失敗を記録し、再試行する場合は待機秒数、しない場合は None を返す."""
+        status_code = status_code_of(error)
+        status = str(status_code) if status_code is not None else type(error).__name__
+        self.registry.inc("outbound_requests_total", {"endpoint": endpoint, "status": status})
+        breaker = self.breaker(endpoint)
+        if is_server_failure(error):
+            if breaker.record_failure():
+                self.registry.inc("outbound_circuit_opened_total", {"endpoint": endpoint})
+                self.log(object="circuit_open", message=f"{endpoint} ({status})")
+        else:
+            # 429 や 4xx は相手が応答しているため、遮断の対象としない
+            breaker.record_success()
+        if not is_retryable(error) or attempt >= self.policy.max_attempts:
+            return None
+        retry_after = retry_after_of(error)
+        delay = self.policy.backoff(attempt, retry_after)
+        if status_code == 429:
+            self._pause(endpoint, delay)
+        self.registry.inc("outbound_retries_total", {"endpoint": endpoint, "status": status})
+        self.registry.observe("outbound_backoff_seconds", {"endpoint": endpoint}, delay)
+        self.log(object="retry", message=f"{endpoint} #{attempt} ({status}) in {delay:.2f}s")
+        return delay
+
+    def call(self, endpoint: str, fn: Callable[[], T], bucket: TokenBucket | None = None) -> T:
+        error: Exception | None = None
+        for attempt in range(1, self.policy.max_attempts + 1):
+            self._check_circuit(endpoint, error)
+            start = time.perf_counter()
+            time.sleep(self._pause_time(endpoint))
+            if bucket is not None:
+                bucket.acquire(1)
+            self.registry.observe(
+                "outbound_wait_seconds", {"endpoint": endpoint}, time.perf_counter() - start
+            )
+            start = time.perf_counter()
+            try:
+                result = fn()
+            except Exception as e:
+                if (delay := self._on_failure(endpoint, e, attempt)) is None:
+                    raise
+                error = e
+                time.sleep(delay)
+                continue
+            self._on_success(endpoint, time.perf_counter() - start)
+            return result
+        raise AssertionError  # max_attempts >= 1 の場合は到達しない
+
+    async def acall(
+        self,
+        endpoint: str,
+        fn: Callable[[], Awaitable[T]],
+        bucket: TokenBucket | None = None,
+    ) -> T:
+        error: Exception | None = None
+        for attempt in range(1, self.policy.max_attempts + 1):
+            self._check_circuit(endpoint, error)
+            start = time.perf_counter()
+            await asyncio.sleep(self._pause_time(endpoint))
+            if bucket is not None:
+                await bucket.aacquire(1)
+            self.registry.observe(
+                "outbound_wait_seconds", {"endpoint": endpoint}, time.perf_counter() - start
+            )
+            start = time.perf_counter()
+            try:
+                result = await fn()
+            except Exception as e:
+                if (delay := self._on_failure(endpoint, e, attempt)) is None:
+                    raise
+                error = e
+                await asyncio.sleep(delay)
+                continue
+            self._on_success(endpoint, time.perf_counter() - start)
+            return result
+        raise AssertionError  # max_attempts >= 1 の場合は到達しない
+
+
+@cache
+def get_outbound_guard() -> OutboundGuard:
+    """プロセス全体で共有する外部 API 呼び出しのガードを返す."""
+    return OutboundGuard(
+        policy=RetryPolicy(
+            max_attempts=settings.OUTBOUND_MAX_ATTEMPTS,
+            base_delay=settings.OUTBOUND_BACKOFF_BASE_SECONDS,
+            max_delay=settings.OUTBOUND_BACKOFF_MAX_SECONDS,
+        ),
+        failure_threshold=settings.OUTBOUND_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout=settings.OUTBOUND_CIRCUIT_RESET_SECONDS,
+    )
@@ -0,0 +1,94 @@
+import email.utils
+import random
+import time
+from collections.abc import Callable, Mapping
+
+import httpx
+import openai
+import perplexity
+
+# 再試行する HTTP ステータス（タイムアウト・競合・レート制限・サーバーエラー）
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+# 応答が得られなかった（接続・タイムアウト）エラー
+CONNECTION_ERRORS: tuple[type[Exception], ...] = (
+    openai.APIConnectionError,
+    perplexity.APIConnectionError,
+    httpx.TransportError,
+    TimeoutError,
+    ConnectionError,
+)
+
+
+def status_code_of(error: Exception) -> int | None:
+    if (status_code := getattr(error, "status_code", None)) is not None:
+        return int(status_code)
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def parse_retry_after(
+    headers: Mapping[str, str] | None,
+    now: Callable[[], float] = time.time,
+) -> float | None:
+    """Retry-After（秒数または HTTP 日付）と retry-after-ms から待機秒数を求める."""
+    if not headers:
+        return None
+    if (retry_after_ms := headers.get("retry-after-ms")) is not None:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+    if (retry_after := headers.get("retry-after")) is None:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - now())
+
+
+def retry_after_of(error: Exception) -> float | None:
+    response = getattr(error, "response", None)
+    return parse_retry_after(getattr(response, "headers", None))
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, CONNECTION_ERRORS):
+        return True
+    return status_code_of(error) in RETRYABLE_STATUS_CODES
+
+
+def is_server_failure(error: Exception) -> bool:
+    """サーキットブレーカーで失敗として数えるエラー（429 や 4xx は相手が応答しているため数えない）."""
+    if isinstance(error, CONNECTION_ERRORS):
+        return True
+    status_code = status_code_of(error)
+    return status_code is not None and status_code >= 500
+
+
+class RetryPolicy:
+    """指数バックオフ（フルジッター）で再試行間隔を決める. Retry-After がある場合はそれ以上待つ."""
+
+    def __init__(
+        self,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """attempt 回目（1 始まり）の失敗後に待機する秒数を返す."""
+        delay = self._rng() * min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
@@ -0,0 +1,16 @@
+from app.infrastructure.search_client.base import BaseSearchClient, normalize_query
+from app.infrastructure.search_client.cached import CachedSearchClient
+from app.infrastructure.search_client.factory import get_search_client
+from app.infrastructure.search_client.fake import FakeSearchClient
+from app.infrastructure.search_client.near_duplicate import NearDuplicateSearchClient
+from app.infrastructure.search_client.perplexity_client import PerplexitySearchClient
+
+__all__ = [
+    "BaseSearchClient",
+    "CachedSearchClient",
+    "FakeSearchClient",
+    "NearDuplicateSearchClient",
+    "PerplexitySearchClient",
+    "get_search_client",
+    "normalize_query",
+]
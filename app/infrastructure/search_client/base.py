@@ -0,0 +1,38 @@
+import unicodedata
+from abc import ABC, abstractmethod
+from functools import partial
+
+from app.core.logging import LogLevel, log
+from app.domain.models import SearchResult
+
+
+def normalize_query(query: str) -> str:
+    # 全角・半角や大文字・小文字、空白の揺れを吸収する
+    return " ".join(unicodedata.normalize("NFKC", query).lower().split())
+
+
+class BaseSearchClient(ABC):
+    def __init__(self, log_level: LogLevel = LogLevel.DEBUG) -> None:
+        self.log = partial(log, log_level=log_level, subject=self.__name__)
+
+    @property
+    def __name__(self) -> str:
+        return str(self.__class__.__name__)
+
+    @abstractmethod
+    def search(
+        self,
+        query: str,
+        max_results: int = 3,
+        max_tokens_per_page: int = 512,
+    ) -> list[SearchResult]:
+        pass
+
+    @abstractmethod
+    async def asearch(
+        self,
+        query: str,
+        max_results: int = 3,
+        max_tokens_per_page: int = 512,
+    ) -> list[SearchResult]:
+        pass
@@ -0,0 +1,66 @@
+import json
+
+from pydantic import TypeAdapter
+
+from app.core.logging import LogLevel
+from app.domain.models import SearchResult
+from app.infrastructure.cache import BaseCache
+from app.infrastructure.search_client.base import BaseSearchClient, normalize_query
+
+search_results_adapter = TypeAdapter(list[SearchResult])
+
+
+class CachedSearchClient(BaseSearchClient):
+    """正規化したクエリと検索パラメータをキーに、検索結果をキャッシュする."""
+
+    def __init__(
+        self,
+        client: BaseSearchClient,
+        cache: BaseCache,
+        log_level: LogLevel = LogLevel.DEBUG,
+    ) -> None:
+        super().__init__(log_level)
+        self.client = client
+        self.cache = cache
+
+    @staticmethod
+    def cache_key(query: str, max_results: int, max_tokens_per_page: int) -> str:
+        return json.dumps(
+            [normalize_query(query), max_results, max_tokens_per_page],
+            ensure_ascii=False,
+        )
+
+    def _get(self, key: str) -> list[SearchResult] | None:
+        if (value := self.cache.get(key)) is None:
+            return None
+        self.log(object="hit", message=key)
+        return search_results_adapter.validate_json(value)
+
+    def _set(self, key: str, results: list[SearchResult]) -> None:
+        self.cache.set(key, search_results_adapter.dump_json(results).decode("utf-8"))
+
+    def search(
+        self,
+        query: str,
+        max_results: int = 3,
+        max_tokens_per_page: int = 512,
+    ) -> list[SearchResult]:
+        key = self.cache_key(query, max_results, max_tokens_per_page)
+        if (results := self._get(key)) is not None:
+            return results
+        results = self.client.search(query, max_results, max_tokens_per_page)
+        self._set(key, results)
+        return results
+
+    async def asearch(
+        self,
+        query: str,
+        max_results: int = 3,
+        max_tokens_per_page: int = 512,
+    ) -> list[SearchResult]:
+        key = self.cache_key(query, max_results, max_tokens_per_page)
+        if (results := self._get(key)) is not None:
+            return results
+        results = await self.client.asearch(query, max_results, max_tokens_per_page)
+        self._set(key, results)
+        return results
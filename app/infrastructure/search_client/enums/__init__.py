@@ -0,0 +1,3 @@
+from .search_backend import SearchBackend
+
+__all__ = ["SearchBackend"]
@@ -0,0 +1,6 @@
+from app.domain.enums.base import BaseEnum
+
+
+class SearchBackend(BaseEnum):
+    PERPLEXITY = "perplexity"
+    FAKE = "fake"
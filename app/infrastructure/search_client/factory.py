@@ -0,0 +1,52 @@
+from functools import cache
+
+from app.core.config import settings
+from app.infrastructure.cache import BaseCache, MemoryCache, SqliteCache, TieredCache
+from app.infrastructure.search_client.base import BaseSearchClient
+from app.infrastructure.search_client.cached import CachedSearchClient
+from app.infrastructure.search_client.enums import SearchBackend
+from app.infrastructure.search_client.fake import FakeSearchClient
+from app.infrastructure.search_client.near_duplicate import NearDuplicateSearchClient
+from app.infrastructure.search_client.perplexity_client import PerplexitySearchClient
+
+
+def build_search_cache() -> BaseCache:
+    tiers: list[BaseCache] = [
+        MemoryCache(
+            max_size=settings.SEARCH_CACHE_MAX_SIZE,
+            ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+        )
+    ]
+    if settings.SEARCH_CACHE_SQLITE_PATH:
+        tiers.append(
+            SqliteCache(
+                db_path=settings.SEARCH_CACHE_SQLITE_PATH,
+                max_size=settings.SEARCH_CACHE_SQLITE_MAX_SIZE,
+                ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+            )
+        )
+    return tiers[0] if len(tiers) == 1 else TieredCache(tiers)
+
+
+@cache
+def get_search_client() -> BaseSearchClient:
+    """プロセス全体で共有する検索クライアントを返す."""
+    client: BaseSearchClient
+    match SearchBackend(settings.SEARCH_BACKEND):
+        case SearchBackend.PERPLEXITY:
+            client = PerplexitySearchClient()
+        case SearchBackend.FAKE:
+            client = FakeSearchClient(latency=settings.FAKE_SEARCH_LATENCY_SECONDS)
+    if settings.SEARCH_NEAR_DUPLICATE_ENABLED:
+        # 完全一致のキャッシュで外れたクエリのみ、言い換えとして近いクエリの結果を探す
+        client = NearDuplicateSearchClient(
+            client=client,
+            threshold=settings.SEARCH_NEAR_DUPLICATE_THRESHOLD,
+            max_size=settings.SEARCH_NEAR_DUPLICATE_MAX_SIZE,
+            ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+            bands=settings.SEARCH_NEAR_DUPLICATE_BANDS,
+            rows=settings.SEARCH_NEAR_DUPLICATE_ROWS,
+        )
+    if not settings.SEARCH_CACHE_ENABLED:
+        return client
+    return CachedSearchClient(client=client, cache=build_search_cache())
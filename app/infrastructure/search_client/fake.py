@@ -0,0 +1,64 @@
+import asyncio
+import hashlib
+import threading
+import time
+
+from app.core.logging import LogLevel
+from app.domain.models import SearchResult
+from app.infrastructure.search_client.base import BaseSearchClient
+
+
+class FakeSearchClient(BaseSearchClient):
+    """ネットワークに出ずに決定的な検索結果を返す検索クライアント.
+
+    キャッシュのヒット率やレイテンシ削減をオフラインで検証するために使う。
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        log_level: LogLevel = LogLevel.DEBUG,
+    ) -> None:
+        super().__init__(log_level)
+        self.latency = latency
+        self._lock = threading.Lock()
+        self.num_calls = 0
+
+    def _count_call(self) -> None:
+        with self._lock:
+            self.num_calls += 1
+
+    def _build_results(
+        self, query: str, max_results: int, max_tokens_per_page: int
+    ) -> list[SearchResult]:
+        digest = hashlib.sha256(query.encode("utf-8")).hexdigest()[:8]
+        return [
+            SearchResult(
+                title=f"{query} ({idx + 1})",
+                url=f"https://example.com/{digest}/{idx + 1}",
+                snippet=f"{query} に関する検索結果 {idx + 1}"[: max_tokens_per_page * 4],
+            )
+            for idx in range(max_results)
+        ]
+
+    def search(
+        self,
+        query: str,
+        max_results: int = 3,
+        max_tokens_per_page: int = 512,
+    ) -> list[SearchResult]:
+        self._count_call()
+        if self.latency:
+            time.sleep(self.latency)
+        return self._build_results(query, max_results, max_tokens_per_page)
+
+    async def asearch(
+        self,
+        query: str,
+        max_results: int = 3,
+        max_tokens_per_page: int = 512,
+    ) -> list[SearchResult]:
+        self._count_call()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._build_results(query, max_results, max_tokens_per_page)
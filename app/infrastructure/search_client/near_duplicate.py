@@ -0,0 +1,214 @@
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from typing import NamedTuple
+
+from app.core.logging import LogLevel
+from app.core.utils.minhash import MinHasher
+from app.core.utils.polarity import polarity
+from app.domain.models import SearchResult
+from app.infrastructure.document_store import tokenize_words
+from app.infrastructure.document_store.index import WORD_PATTERN
+from app.infrastructure.metrics import metrics
+from app.infrastructure.search_client.base import BaseSearchClient, normalize_query
+
+# 助詞・送り仮名（ひらがな）は言い換えで増減しやすいため、区切りとして扱う
+HIRAGANA_PATTERN = re.compile(r"[\u3040-\u309f]+")
+
+
+def query_shingles(query: str) -> set[str]:
+    """語順に依存しない、クエリの文字 n-gram（英数字は単語、日本語は bigram）. LSH の候補の検索に使う."""
+    query = normalize_query(query)
+    words = tokenize_words(HIRAGANA_PATTERN.sub(" ", query)) or tokenize_words(query)
+    return {token for tokens in words for token in tokens}
+
+
+def query_words(query: str) -> list[str]:
+    """助詞・送り仮名を除いたクエリの内容語（英数字の単語、かな漢字の連続）.
+
+    1 文字の漢字は「関する」「調べる」のような動詞の語幹であることが多いため除く。
+    """
+    query = normalize_query(query)
+    words = [
+        word
+        for word in WORD_PATTERN.findall(HIRAGANA_PATTERN.sub(" ", query))
+        if word.isascii() or len(word) > 1
+    ]
+    return words or WORD_PATTERN.findall(query)
+
+
+def word_containment(words: list[str], other_words: list[str]) -> float:
+    """words のうち、other_words に含まれる語の割合.
+
+    日本語の語は、複合語の一部として含まれていればよい（「市場規模」と「市場」「規模」）。
+    """
+    if not words:
+        return 0.0
+    other_ascii = {word for word in other_words if word.isascii()}
+    other_text = "".join(word for word in other_words if not word.isascii())
+    found = sum(word in other_ascii if word.isascii() else word in other_text for word in words)
+    return found / len(words)
+
+
+class QueryTerms(NamedTuple):
+    words: list[str]
+    # 年・件数などの数値と、否定・反意の表現. いずれかが異なるクエリは言い換えとみなさない
+    numbers: frozenset[str]
+    polarity: Counter[str]
+
+    @classmethod
+    def from_query(cls, query: str) -> "QueryTerms":
+        words = query_words(query)
+        return cls(
+            words=words,
+            numbers=frozenset(word for word in words if word.isdigit()),
+            polarity=polarity(normalize_query(query)),
+        )
+
+    def similarity(self, other: "QueryTerms") -> float:
+        """両方向の内容語の包含率の小さい方. 数値や否定・反意の表現が異なる場合は 0."""
+        if self.numbers != other.numbers or self.polarity != other.polarity:
+            return 0.0
+        return min(word_containment(self.words, other.words), word_containment(other.words, self.words))
+
+
+# (正規化したクエリ, max_results, max_tokens_per_page)
+NearDuplicateKey = tuple[str, int, int]
+
+
+class NearDuplicateEntry(NamedTuple):
+    terms: QueryTerms
+    bands: tuple[tuple, ...]
+    results: list[SearchResult]
+    expires_at: float | None
+
+
+class NearDuplicateSearchClient(BaseSearchClient):
+    """言い換え・語順違いのクエリに、過去の検索結果を返す.
+
+    クエリの n-gram 集合の MinHash を bands × rows に分けた LSH で候補を引き（候補のみを比較するため、件数によらず速い）、
+    内容語が両方向に threshold 以上の割合で含まれ、数値と否定・反意の表現が一致する最も近いクエリの結果を返す。
+    """
+
+    def __init__(
+        self,
+        client: BaseSearchClient,
+        threshold: float = 0.9,
+        max_size: int = 200_000,
+        ttl_seconds: float | None = None,
+        bands: int = 16,
+        rows: int = 4,
+        log_level: LogLevel = LogLevel.DEBUG,
+    ) -> None:
+        super().__init__(log_level)
+        self.client = client
+        self.threshold = threshold
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.rows = rows
+        self.hasher = MinHasher(num_perm=bands * rows)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[NearDuplicateKey, NearDuplicateEntry] = OrderedDict()
+        # (検索パラメータ, バンド番号, バンドのハッシュ値) -> クエリ
+        self._buckets: defaultdict[tuple, set[NearDuplicateKey]] = defaultdict(set)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _bands(self, shingles: set[str], params: tuple[int, int]) -> tuple[tuple, ...]:
+        return tuple((params, *band) for band in self.hasher.bands(shingles, self.rows))
+
+    def _remove(self, key: NearDuplicateKey) -> None:
+        entry = self._entries.pop(key)
+        for band in entry.bands:
+            if (bucket := self._buckets.get(band)) is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band]
+
+    def _get(
+        self, query: str, terms: QueryTerms, bands: tuple[tuple, ...]
+    ) -> list[SearchResult] | None:
+        now = time.monotonic()
+        best, best_similarity, results = None, self.threshold, None
+        with self._lock:
+            candidates = set().union(*(self._buckets.get(band, ()) for band in bands))
+            for candidate in candidates:
+                entry = self._entries[candidate]
+                if entry.expires_at is not None and entry.expires_at <= now:
+                    self._remove(candidate)
+                    continue
+                if (similarity := terms.similarity(entry.terms)) >= best_similarity:
+                    best, best_similarity = candidate, similarity
+            if best is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(best)
+                results = self._entries[best].results
+        metrics.inc("search_near_duplicate_total", {"result": "miss" if best is None else "hit"})
+        if best is not None:
+            self.log(object="hit", message=f"{query} ~ {best[0]} ({best_similarity:.2f})")
+        return results
+
+    def _set(
+        self,
+        key: NearDuplicateKey,
+        terms: QueryTerms,
+        bands: tuple[tuple, ...],
+        results: list[SearchResult],
+    ) -> None:
+        expires_at = (
+            time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else None
+        )
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = NearDuplicateEntry(terms, bands, results, expires_at)
+            for band in bands:
+                self._buckets[band].add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def _prepare(
+        self, query: str, max_results: int, max_tokens_per_page: int
+    ) -> tuple[NearDuplicateKey, QueryTerms, tuple[tuple, ...]] | None:
+        if not (shingles := query_shingles(query)):
+            return None
+        # 検索パラメータが異なる場合は、別のクエリとして扱う
+        params = (max_results, max_tokens_per_page)
+        key = (normalize_query(query), *params)
+        return key, QueryTerms.from_query(query), self._bands(shingles, params)
+
+    def search(
+        self,
+        query: str,
+        max_results: int = 3,
+        max_tokens_per_page: int = 512,
+    ) -> list[SearchResult]:
+        if (prepared := self._prepare(query, max_results, max_tokens_per_page)) is None:
+            return self.client.search(query, max_results, max_tokens_per_page)
+        key, terms, bands = prepared
+        if (results := self._get(query, terms, bands)) is not None:
+            return results
+        results = self.client.search(query, max_results, max_tokens_per_page)
+        self._set(key, terms, bands, results)
+        return results
+
+    async def asearch(
+        self,
+        query: str,
+        max_results: int = 3,
+        max_tokens_per_page: int = 512,
+    ) -> list[SearchResult]:
+        if (prepared := self._prepare(query, max_results, max_tokens_per_page)) is None:
+            return await self.client.asearch(query, max_results, max_tokens_per_page)
+        key, terms, bands = prepared
+        if (results := self._get(query, terms, bands)) is not None:
+            return results
+        results = await self.client.asearch(query, max_results, max_tokens_per_page)
+        self._set(key, terms, bands, results)
+        return results
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+from weakref import WeakKeyDictionary
+
+from dotenv import load_dotenv
+from perplexity import AsyncPerplexity, Perplexity
+from perplexity.types.search_create_response import SearchCreateResponse
+
+from app.core.logging import LogLevel
+from app.domain.models import SearchResult
+from app.infrastructure.rate_limit import get_outbound_guard, get_rate_budgets
+from app.infrastructure.search_client.base import BaseSearchClient
+
+load_dotenv()
+
+ENDPOINT = "perplexity:search"
+
+
+def to_search_results(search_create_response: SearchCreateResponse) -> list[SearchResult]:
+    return [
+        SearchResult(title=result.title, url=result.url, snippet=result.snippet)
+        for result in search_create_response.results
+    ]
+
+
+class PerplexitySearchClient(BaseSearchClient):
+    """プロセス全体で HTTP コネクションを共有する Perplexity 検索クライアント.
+
+    再試行は OutboundGuard で行うため、SDK 側の再試行は無効にする。
+    """
+
+    def __init__(self, log_level: LogLevel = LogLevel.DEBUG) -> None:
+        super().__init__(log_level)
+        self._lock = threading.Lock()
+        self._client: Perplexity | None = None
+        # httpx.AsyncClient はイベントループを跨いで共有できないため、ループごとに保持する
+        self._async_clients: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, AsyncPerplexity
+        ] = WeakKeyDictionary()
+
+    @property
+    def client(self) -> Perplexity:
+        with self._lock:
+            if self._client is None:
+                self._client = Perplexity(max_retries=0)
+            return self._client
+
+    @property
+    def async_client(self) -> AsyncPerplexity:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if (client := self._async_clients.get(loop)) is None:
+                client = AsyncPerplexity(max_retries=0)
+                self._async_clients[loop] = client
+            return client
+
+    def search(
+        self,
+        query: str,
+        max_results: int = 3,
+        max_tokens_per_page: int = 512,
+    ) -> list[SearchResult]:
+        self.log(object="search", message=query)
+        search_create_response: SearchCreateResponse = get_outbound_guard().call(
+            ENDPOINT,
+            lambda: self.client.search.create(
+                query=query, max_results=max_results, max_tokens_per_page=max_tokens_per_page
+            ),
+            get_rate_budgets().perplexity_calls(),
+        )
+        return to_search_results(search_create_response)
+
+    async def asearch(
+        self,
+        query: str,
+        max_results: int = 3,
+        max_tokens_per_page: int = 512,
+    ) -> list[SearchResult]:
+        self.log(object="asearch", message=query)
+        search_create_response: SearchCreateResponse = await get_outbound_guard().acall(
+            ENDPOINT,
+            lambda: self.async_client.search.create(
+                query=query, max_results=max_results, max_tokens_per_page=max_tokens_per_page
+            ),
+            get_rate_budgets().perplexity_calls(),
+        )
+        return to_search_results(search_create_response)
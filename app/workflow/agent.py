@@ -1,16 +1,21 @@
-from copy import deepcopy
+from collections.abc import Callable, Mapping
 
-from langgraph.checkpoint.memory import InMemorySaver, MemorySaver
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import StateGraph
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.types import Command
 
 from app.domain.enums import ManagedTaskStatus
 from app.domain.base_agent import LangGraphAgent
+from app.core.config import settings
 from app.core.logging import LogLevel
-from app.infrastructure.blob_manager import BaseBlobManager, LocalBlobManager
+from app.infrastructure.blob_manager import BaseBlobManager, create_blob_manager
+from app.infrastructure.cassette import get_cassette
+from app.infrastructure.checkpointer import create_checkpointer
 from app.infrastructure.llm_chain.enums import OpenAIModelName
 from app.workflow.enums import Node
+from app.workflow.models import ExecuteTaskState, ManagedInquiryItem
 from app.workflow.models.state import (
     ResearchAgentState,
     ResearchAgentInputState,
@@ -30,9 +35,10 @@ class ResearchAgent(LangGraphAgent):
     def __init__(
         self,
         blob_manager: BaseBlobManager,
-        checkpointer: MemorySaver | None = None,
+        checkpointer: BaseCheckpointSaver | None = None,
         log_level: LogLevel = LogLevel.INFO,
         recursion_limit: int = 1000,
+        report_output_path: str | None = None,
     ) -> None:
         self.gather_requirements_node = GatherRequirementsNode(
             model_name=OpenAIModelName.GPT_5_NANO,
@@ -58,6 +64,12 @@ class ResearchAgent(LangGraphAgent):
             blob_manager=blob_manager,
             log_level=log_level,
             prompt_path="storage/prompts/research_agent/nodes/generate_report.jinja",
+            output_path=report_output_path,
+            map_reduce_threshold=settings.REPORT_MAP_REDUCE_THRESHOLD_CHARS,
+            max_concurrency=settings.REPORT_SECTION_MAX_CONCURRENCY,
+            max_tasks_per_section=settings.REPORT_SECTION_MAX_TASKS,
+            dedup_threshold=settings.REPORT_DEDUP_THRESHOLD,
+            dedup_min_chars=settings.REPORT_DEDUP_MIN_CHARS,
         )
         super().__init__(
             log_level=log_level,
@@ -80,59 +92,143 @@ class ResearchAgent(LangGraphAgent):
         workflow.add_node(
             Node.BUILD_RESEARCH_PLAN.value, self.build_research_plan_node
         )
-        workflow.add_node(Node.EXECUTE_TASK.value, self.execute_task_node)
-        workflow.add_node(Node.GENERATE_REPORT.value, self.generate_report_node)
+        # 同期実行（invoke）と非同期実行（ainvoke）の両方に対応させる
+        workflow.add_node(
+            Node.EXECUTE_TASK.value,
+            RunnableLambda(
+                self.execute_task_node,
+                afunc=self.execute_task_node.acall,
+                name=Node.EXECUTE_TASK.value,
+            ),
+            input_schema=ExecuteTaskState,
+            destinations=(Node.GENERATE_REPORT.value,),
+        )
+        workflow.add_node(
+            Node.GENERATE_REPORT.value,
+            RunnableLambda(
+                self.generate_report_node,
+                afunc=self.generate_report_node.acall,
+                name=Node.GENERATE_REPORT.value,
+            ),
+            input_schema=ResearchAgentState,
+        )
         workflow.set_entry_point(Node.GATHER_REQUIREMENTS.value)
         workflow.set_finish_point(Node.GENERATE_REPORT.value)
         return workflow.compile(checkpointer=self.checkpointer)
 
 
-def create_graph() -> CompiledStateGraph:
-    checkpointer = InMemorySaver()
-    blob_manager = LocalBlobManager()
+def create_graph(
+    checkpointer: BaseCheckpointSaver | None = None,
+    stream_report: bool | None = None,
+) -> CompiledStateGraph:
+    checkpointer = checkpointer or create_checkpointer()
+    # None の場合は設定 (REPORT_STREAMING) に従う
+    stream_report = settings.REPORT_STREAMING if stream_report is None else stream_report
+    blob_manager = create_blob_manager()
     agent = ResearchAgent(
         blob_manager=blob_manager,
         checkpointer=checkpointer,
         log_level=LogLevel.DEBUG,
         recursion_limit=1000,
+        report_output_path=settings.REPORT_OUTPUT_PATH if stream_report else None,
     )
     return agent.graph
 
 
+def apply_answers(
+    inquiry_items: list[ManagedInquiryItem],
+    answers: Mapping[str, str],
+) -> dict[str, ManagedInquiryItem]:
+    """未回答の質問に {ID: 回答} を反映し、FeedbackRequirementsNode に返す {ID: 質問} を作る."""
+    answered_items = {}
+    for inquiry_item in inquiry_items:
+        if inquiry_item.status in [ManagedTaskStatus.NOT_STARTED]:
+            inquiry_item = inquiry_item.model_copy(
+                update={
+                    "answer": answers.get(inquiry_item.id) or "NO ANSWER NEEDED",
+                    "status": ManagedTaskStatus.COMPLETED,
+                }
+            )
+        answered_items[inquiry_item.id] = inquiry_item
+    return answered_items
+
+
+def answer_inquiry_items(interrupt_data: dict) -> dict:
+    inquiry_items = interrupt_data.get("inquiry_items", [])
+    answers = {}
+    # 未回答の質問のみを対象に、ユーザーに回答を求める
+    for inquiry_item in inquiry_items:
+        if inquiry_item.status in [ManagedTaskStatus.NOT_STARTED]:
+            question = inquiry_item.question
+            answers[inquiry_item.id] = get_cassette().call(
+                kind="user_input",
+                scope="invoke_graph",
+                request={"question": question},
+                fn=lambda question=question: str(input(f"{question} > ")),
+            )
+    # ユーザーからの回答データを {ID: 回答} の形式で FeedbackRequirementsNode に返す
+    return apply_answers(inquiry_items, answers)
+
+
+def get_resume_command(result: dict) -> Command | None:
+    for interrupt in result.get("__interrupt__", []):
+        if interrupt_data := getattr(interrupt, "value", None):
+            match interrupt_data.get("node"):
+                case Node.FEEDBACK_REQUIREMENTS.value:
+                    # Command(resume=...) で、ワークフローを再開する
+                    return Command(resume=answer_inquiry_items(interrupt_data))
+                case _:
+                    error_message = f"Unknown node: {interrupt_data.get('node')}"
+                    raise ValueError(error_message)
+    return None
+
+
 def invoke_graph(
     graph: CompiledStateGraph,
-    input_data: dict | Command,
+    input_data: dict | Command | None,
     config: dict,
 ) -> dict:
     result = graph.invoke(
         input=input_data,
         config=config,
     )
-    for interrupt in result.get("__interrupt__", []):
-        if interrupt_data := getattr(interrupt, "value", None):
-            match interrupt_data.get("node"):
-                case Node.FEEDBACK_REQUIREMENTS.value:
-                    inquiry_items = deepcopy(interrupt_data.get("inquiry_items", []))
-                    # 質問リスト（inquiry_items）をイテレーション
-                    for idx, inquiry_item in enumerate(inquiry_items):
-                        # 未回答の質問のみを対象に、ユーザーに回答を求める
-                        if inquiry_item.status in [ManagedTaskStatus.NOT_STARTED]:
-                            question = inquiry_item.question
-                            user_input = str(input(f"{question} > "))
-                            # 回答を得たら、answer, status をそれぞれ更新する
-                            inquiry_items[idx].answer = user_input or "NO ANSWER NEEDED"
-                            inquiry_items[idx].status = ManagedTaskStatus.COMPLETED
+    if resume_command := get_resume_command(result):
+        return invoke_graph(graph=graph, input_data=resume_command, config=config)
+    return result
 
-                    # Command(resume=...) で、ワークフローを再開する
-                    return invoke_graph(
-                        graph=graph,
-                        input_data=Command(
-                            # ユーザーからの回答データを {ID: 回答} の形式で FeedbackRequirementsNode に返す
-                            resume={item.id: item for item in inquiry_items}
-                        ),
-                        config=config,
-                    )
-                case _:
-                    error_message = f"Unknown node: {interrupt_data.get('node')}"
-                    raise ValueError(error_message)
+
+async def ainvoke_graph(
+    graph: CompiledStateGraph,
+    input_data: dict | Command | None,
+    config: dict,
+) -> dict:
+    result = await graph.ainvoke(
+        input=input_data,
+        config=config,
+    )
+    if resume_command := get_resume_command(result):
+        return await ainvoke_graph(graph=graph, input_data=resume_command, config=config)
     return result
+
+
+def stream_graph(
+    graph: CompiledStateGraph,
+    input_data: dict | Command | None,
+    config: dict,
+    on_token: Callable[[str, str], None],
+) -> dict:
+    """invoke_graph と同様に実行しつつ、LLM の出力トークンを (ノード名, テキスト) で on_token に渡す."""
+    resume_command = None
+    for mode, chunk in graph.stream(
+        input=input_data,
+        config=config,
+        stream_mode=["messages", "updates"],
+    ):
+        if mode == "messages":
+            message, metadata = chunk
+            on_token(metadata.get("langgraph_node", ""), message.text)
+        elif "__interrupt__" in chunk:
+            resume_command = get_resume_command(chunk)
+    if resume_command:
+        return stream_graph(graph=graph, input_data=resume_command, config=config, on_token=on_token)
+    return graph.get_state(config).values
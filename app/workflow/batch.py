@@ -0,0 +1,284 @@
+import asyncio
+import re
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from functools import cache, partial
+from pathlib import Path
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import HumanMessage
+from langgraph.graph.state import CompiledStateGraph
+from langgraph.types import Command, StateSnapshot
+
+from app.core.config import settings
+from app.core.logging import LogLevel, log
+from app.core.utils.datetime_utils import get_current_time
+from app.domain.enums import ManagedTaskStatus
+from app.infrastructure.blob_manager import BaseBlobManager, create_blob_manager
+from app.workflow.agent import apply_answers, create_graph
+from app.workflow.enums import AutoAnswerPolicy, Node, SessionStatus
+from app.workflow.models import BatchRequest, BatchResult, ManagedInquiryItem
+
+
+def iter_batch_requests(
+    input_path: str, blob_manager: BaseBlobManager | None = None
+) -> Iterator[BatchRequest]:
+    """JSONL を 1 行ずつ読み込む（ファイル全体をメモリに載せない）."""
+    blob_manager = blob_manager or create_blob_manager()
+    yield from blob_manager.iter_blob_as_jsonl(input_path, schema=BatchRequest)  # type: ignore
+
+
+def auto_answers(
+    inquiry_items: list[ManagedInquiryItem],
+    request: BatchRequest,
+    policy: AutoAnswerPolicy,
+) -> dict[str, str]:
+    """要件収集の質問に、方針に従って {質問 ID: 回答} を返す."""
+    unanswered = [
+        item for item in inquiry_items if item.status in [ManagedTaskStatus.NOT_STARTED]
+    ]
+    match policy:
+        case AutoAnswerPolicy.SKIP:
+            return {item.id: "/skip" for item in unanswered}
+        case AutoAnswerPolicy.NO_ANSWER:
+            return {}
+        case AutoAnswerPolicy.REQUEST:
+            if isinstance(request.answers, list):
+                return {
+                    item.id: answer
+                    for item, answer in zip(unanswered, request.answers, strict=False)
+                }
+            return {
+                item.id: request.answers[item.question]
+                for item in unanswered
+                if item.question in request.answers
+            }
+
+
+class BatchRunner:
+    """JSONL のリクエストを、リクエストごとの thread_id・出力先で並行に実行する.
+
+    実行結果は status.jsonl に 1 行ずつ追記し、再実行時は完了済みの ID を読み飛ばす。
+    チェックポイントが残っている場合（CHECKPOINTER_BACKEND=sqlite）は途中から再開する。
+    """
+
+    def __init__(
+        self,
+        graph: CompiledStateGraph | None,
+        output_dir: str,
+        policy: AutoAnswerPolicy = AutoAnswerPolicy.SKIP,
+        max_interrupts: int = 2,
+        recursion_limit: int = 1000,
+        callbacks: list[BaseCallbackHandler] | None = None,
+        blob_manager: BaseBlobManager | None = None,
+        log_level: LogLevel = LogLevel.INFO,
+    ) -> None:
+        self.log = partial(log, log_level=log_level, subject=self.__name__)
+        # プロセスプールで実行する場合、グラフは各ワーカープロセスで構築する
+        self.graph = graph
+        self.output_dir = output_dir
+        self.policy = policy
+        self.max_interrupts = max_interrupts
+        self.recursion_limit = recursion_limit
+        self.callbacks = callbacks or []
+        self.blob_manager = blob_manager or create_blob_manager()
+        self._lock = threading.Lock()
+
+    @property
+    def __name__(self) -> str:
+        return str(self.__class__.__name__)
+
+    @property
+    def status_path(self) -> str:
+        return f"{self.output_dir}/status.jsonl"
+
+    def output_path(self, request: BatchRequest) -> str:
+        # ID をファイル名として使えるようにする
+        file_name = re.sub(r"[^\w.-]", "_", request.id)
+        return f"{self.output_dir}/reports/{file_name}.md"
+
+    @staticmethod
+    def thread_id(request: BatchRequest) -> str:
+        return f"batch:{request.id}"
+
+    def _config(self, request: BatchRequest) -> dict:
+        return {
+            "recursion_limit": self.recursion_limit,
+            "configurable": {"thread_id": self.thread_id(request)},
+            "callbacks": self.callbacks,
+        }
+
+    def completed_ids(self) -> set[str]:
+        if not self.blob_manager.exists(self.status_path):
+            return set()
+        latest = {}
+        for result in self.blob_manager.iter_blob_as_jsonl(self.status_path, schema=BatchResult):
+            latest[result.id] = result.status  # type: ignore
+        return {id_ for id_, status in latest.items() if status == SessionStatus.COMPLETED}
+
+    def record(self, result: BatchResult) -> None:
+        with self._lock:
+            self.blob_manager.append_blob_as_jsonl([result], self.status_path)
+        self.log(
+            object=result.status.value,
+            message=f"{result.id} ({result.latency_seconds:.1f}s) {result.error or ''}",
+        )
+
+    def _next_input(
+        self, snapshot: StateSnapshot, request: BatchRequest, num_interrupts: int
+    ) -> dict | Command | None:
+        if not snapshot.values:
+            return {"messages": [HumanMessage(content=request.message)]}
+        for interrupt in snapshot.interrupts:
+            if interrupt.value.get("node") == Node.FEEDBACK_REQUIREMENTS.value:
+                # 上限を超えた場合は要件収集を打ち切る
+                policy = (
+                    self.policy if num_interrupts < self.max_interrupts else AutoAnswerPolicy.SKIP
+                )
+                inquiry_items = interrupt.value.get("inquiry_items", [])
+                answers = auto_answers(inquiry_items, request, policy)
+                return Command(resume=apply_answers(inquiry_items, answers))
+        # 途中のチェックポイントから再開する
+        return None
+
+    def _result(
+        self,
+        request: BatchRequest,
+        start: float,
+        num_interrupts: int,
+        error: Exception | None = None,
+    ) -> BatchResult:
+        return BatchResult(
+            id=request.id,
+            thread_id=self.thread_id(request),
+            status=SessionStatus.FAILED if error else SessionStatus.COMPLETED,
+            output_path=None if error else self.output_path(request),
+            latency_seconds=time.perf_counter() - start,
+            num_interrupts=num_interrupts,
+            error=repr(error) if error else None,
+            finished_at=get_current_time(settings.TIMEZONE),
+        )
+
+    def _save_report(self, request: BatchRequest, values: dict) -> None:
+        output_path = self.output_path(request)
+        self.blob_manager.mkdir(str(Path(output_path).parent))
+        self.blob_manager.save_blob_as_str(values.get("research_report", ""), output_path)
+
+    def run_one(self, request: BatchRequest) -> BatchResult:
+        graph = self.graph or get_worker_graph()
+        config = self._config(request)
+        start, num_interrupts = time.perf_counter(), 0
+        try:
+            while (snapshot := graph.get_state(config)).next or not snapshot.values:
+                input_data = self._next_input(snapshot, request, num_interrupts)
+                num_interrupts += isinstance(input_data, Command)
+                graph.invoke(input=input_data, config=config)
+            self._save_report(request, snapshot.values)
+        except Exception as e:  # noqa: BLE001
+            return self._result(request, start, num_interrupts, e)
+        return self._result(request, start, num_interrupts)
+
+    async def arun_one(self, request: BatchRequest) -> BatchResult:
+        graph = self.graph or get_worker_graph()
+        config = self._config(request)
+        start, num_interrupts = time.perf_counter(), 0
+        try:
+            while (snapshot := await graph.aget_state(config)).next or not snapshot.values:
+                input_data = self._next_input(snapshot, request, num_interrupts)
+                num_interrupts += isinstance(input_data, Command)
+                await graph.ainvoke(input=input_data, config=config)
+            self._save_report(request, snapshot.values)
+        except Exception as e:  # noqa: BLE001
+            return self._result(request, start, num_interrupts, e)
+        return self._result(request, start, num_interrupts)
+
+    def _pending(self, requests: Iterable[BatchRequest]) -> Iterator[BatchRequest]:
+        self.blob_manager.mkdir(self.output_dir)
+        completed_ids = self.completed_ids()
+        for request in requests:
+            if request.id in completed_ids:
+                self.log(object="skip", message=f"{request.id} (completed)")
+                continue
+            yield request
+
+    async def arun(self, requests: Iterable[BatchRequest], workers: int) -> list[BatchResult]:
+        """単一のイベントループ上で、最大 workers 件を並行に実行する."""
+        semaphore = asyncio.Semaphore(workers)
+        results: list[BatchResult] = []
+
+        async def run(request: BatchRequest) -> None:
+            try:
+                result = await self.arun_one(request)
+                self.record(result)
+                results.append(result)
+            finally:
+                semaphore.release()
+
+        tasks = set()
+        for request in self._pending(requests):
+            # 実行枠が空くまで次のリクエストを読み込まない
+            await semaphore.acquire()
+            task = asyncio.create_task(run(request))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+        return results
+
+    def run_processes(self, requests: Iterable[BatchRequest], workers: int) -> list[BatchResult]:
+        """workers 個のプロセスで並列に実行する. 各プロセスはグラフを 1 度だけ構築する."""
+        results: list[BatchResult] = []
+
+        def collect(futures: set[Future]) -> None:
+            for future in futures:
+                result = BatchResult.model_validate(future.result())
+                self.record(result)
+                results.append(result)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: set[Future] = set()
+            for request in self._pending(requests):
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending.add(
+                    executor.submit(
+                        run_in_worker,
+                        request.model_dump(),
+                        self.output_dir,
+                        self.policy.value,
+                        self.max_interrupts,
+                    )
+                )
+            collect(wait(pending).done)
+        return results
+
+
+@cache
+def get_worker_graph() -> CompiledStateGraph:
+    # レポートはリクエストごとの出力先に保存するため、共通の出力先へのストリーミングは無効にする
+    return create_graph(stream_report=False)
+
+
+def run_in_worker(request: dict, output_dir: str, policy: str, max_interrupts: int) -> dict:
+    """プロセスプールのワーカーで 1 件を実行する（引数・戻り値は pickle 可能な値にする）."""
+    runner = BatchRunner(
+        graph=None,
+        output_dir=output_dir,
+        policy=AutoAnswerPolicy(policy),
+        max_interrupts=max_interrupts,
+    )
+    return runner.run_one(BatchRequest.model_validate(request)).model_dump(mode="json")
+
+
+def summarize(results: list[BatchResult]) -> dict:
+    latencies = sorted(result.latency_seconds for result in results)
+    return {
+        "total": len(results),
+        "completed": sum(result.status == SessionStatus.COMPLETED for result in results),
+        "failed": sum(result.status == SessionStatus.FAILED for result in results),
+        "latency_p50": latencies[len(latencies) // 2] if latencies else 0.0,
+        "latency_max": latencies[-1] if latencies else 0.0,
+    }
+
@@ -0,0 +1,221 @@
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from app.core.middleware.compact_context import CHARS_PER_TOKEN
+from app.core.utils.minhash import MinHasher
+from app.core.utils.polarity import polarity
+from app.domain.models import ManagedDocument
+from app.infrastructure.document_store import normalize_url
+from app.workflow.models.build_research_plan import ManagedTask
+from app.workflow.models.citation_packing import PackedTaskExecutions, Source
+
+URL = r"https?://[^\s<>()\[\]「」『』（）、。，]+"
+MARKDOWN_LINK_PATTERN = re.compile(rf"\[([^\[\]\n]*)\]\(<?({URL})>?\)")
+BARE_URL_PATTERN = re.compile(rf"<?({URL})>?")
+# 「[1] タイトル https://...」のような、タスクごとの参考文献一覧の行
+REFERENCE_LINE_PATTERN = re.compile(r"^\s*(?:[-*]\s*)?\[(\d{1,3})\][:：.]?\s*(.*)$")
+CITATION_PATTERN = re.compile(r"\[(\d{1,3})\](?!\()")
+SOURCE_HEADING_PATTERN = re.compile(
+    r"^\s*(?:#+\s*)?\**(?:参考文献|参考資料|参考|出典|引用|References|Sources)\**\s*[:：]?\s*$", re.IGNORECASE
+)
+LIST_ITEM_PATTERN = re.compile(r"^\s*(?:[-*+]|\d+[.)]|\|)\s*")
+# 段落の重複判定では、出典番号・空白・記号を無視する
+NORMALIZE_PATTERN = re.compile(r"\[\d+\]|\W+")
+NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+class SourceList:
+    """URL（正規化）ごとに、出現順の番号を振る."""
+
+    def __init__(self, documents: list[ManagedDocument] | None = None) -> None:
+        self._titles = {normalize_url(document.url): document.title for document in documents or []}
+        self._numbers: dict[str, int] = {}
+        self.sources: list[Source] = []
+
+    def cite(self, url: str, title: str = "") -> int:
+        url = url.rstrip(".,;:")
+        key = normalize_url(url)
+        if (number := self._numbers.get(key)) is None:
+            number = self._numbers[key] = len(self.sources) + 1
+            self.sources.append(
+                Source(number=number, url=url, title=self._titles.get(key) or title.strip())
+            )
+        elif title.strip() and not self.sources[number - 1].title:
+            self.sources[number - 1].title = title.strip()
+        return number
+
+
+def _title_of(text: str) -> str:
+    # 参考文献の行から URL と区切り記号を除いた残り
+    return BARE_URL_PATTERN.sub("", MARKDOWN_LINK_PATTERN.sub(r"\1", text)).strip(" -–—:：,、")
+
+
+def replace_citations(text: str, source_list: SourceList) -> str:
+    """URL を共有の出典番号 [n] に置き換え、タスク内の参考文献一覧の行を取り除く."""
+    local_numbers: dict[str, int] = {}
+    lines = []
+    for line in text.splitlines():
+        match = REFERENCE_LINE_PATTERN.match(line)
+        url_match = MARKDOWN_LINK_PATTERN.search(line) or BARE_URL_PATTERN.search(line)
+        if match and url_match:
+            url = url_match.group(2 if url_match.re is MARKDOWN_LINK_PATTERN else 1)
+            local_numbers[match.group(1)] = source_list.cite(url, _title_of(match.group(2)))
+            continue
+        if SOURCE_HEADING_PATTERN.match(line):
+            continue
+        lines.append(line)
+    text = "\n".join(lines)
+    # タスク内の番号を、共有の出典番号に付け替える
+    text = CITATION_PATTERN.sub(
+        lambda m: f"[{local_numbers[m.group(1)]}]" if m.group(1) in local_numbers else m.group(0),
+        text,
+    )
+    text = MARKDOWN_LINK_PATTERN.sub(
+        lambda m: f"{m.group(1)}[{source_list.cite(m.group(2), m.group(1))}]", text
+    )
+    text = BARE_URL_PATTERN.sub(lambda m: f"[{source_list.cite(m.group(1))}]", text)
+    return text.strip()
+
+
+@dataclass
+class Paragraph:
+    task_idx: int
+    text: str
+    prefix: str = ""
+    # 同じ内容の段落で引用されていた出典番号
+    extra_citations: list[str] = field(default_factory=list)
+    duplicate_of: "Paragraph | None" = None
+
+
+def split_paragraphs(task_idx: int, text: str) -> list[Paragraph | str]:
+    """段落（箇条書き・表は 1 行ずつ）に分ける. 見出しと空行は比較しない文字列として残す."""
+    units: list[Paragraph | str] = []
+    for block in re.split(r"\n\s*\n", text):
+        lines = [line for line in block.splitlines() if line.strip()]
+        if not lines:
+            continue
+        if all(LIST_ITEM_PATTERN.match(line) for line in lines):
+            for line in lines:
+                prefix = LIST_ITEM_PATTERN.match(line).group(0)  # type: ignore
+                units.append(Paragraph(task_idx, line[len(prefix) :], prefix))
+        elif lines[0].lstrip().startswith("#"):
+            units.append(lines[0])
+            if rest := "\n".join(lines[1:]):
+                units.append(Paragraph(task_idx, rest))
+        else:
+            units.append(Paragraph(task_idx, "\n".join(lines)))
+        units.append("")
+    return units
+
+
+def _bigrams(text: str) -> set[str]:
+    normalized = NORMALIZE_PATTERN.sub("", text.lower())
+    return {normalized[idx : idx + 2] for idx in range(len(normalized) - 1)}
+
+
+def _signature(text: str) -> tuple[frozenset[str], frozenset[tuple[str, int]]]:
+    # 数値や否定・反意の表現が異なる段落は、文面が似ていても同内容とはみなさない
+    # (「寄与し…抑えられる」と「寄与せず…抑えられない」など)
+    text = CITATION_PATTERN.sub("", text)
+    return frozenset(NUMBER_PATTERN.findall(text)), frozenset(polarity(text).items())
+
+
+def _render(unit: Paragraph | str, executed_tasks: list[ManagedTask]) -> str:
+    if isinstance(unit, str):
+        return unit
+    if unit.duplicate_of is not None:
+        title = executed_tasks[unit.duplicate_of.task_idx].title
+        return f"{unit.prefix}（{title} と同内容）"
+    return f"{unit.prefix}{unit.text}{''.join(unit.extra_citations)}"
+
+
+def pack_citations(
+    executed_tasks: list[ManagedTask],
+    documents: list[ManagedDocument] | None = None,
+    threshold: float = 0.8,
+    min_chars: int = 40,
+    bands: int = 16,
+    rows: int = 4,
+) -> PackedTaskExecutions:
+    """タスク横断で出典を共有の番号付き一覧にまとめ、ほぼ同じ段落は 2 回目以降を参照に置き換える.
+
+    段落の類似度は文字 bi-gram の Jaccard 類似度で測り、MinHash の LSH で候補を絞る。
+    min_chars 未満の段落と、含まれる数値や否定・反意の表現が異なる段落は同内容とみなさない。
+    """
+    source_list = SourceList(documents)
+    hasher = MinHasher(num_perm=bands * rows)
+    buckets: defaultdict[tuple, list[tuple[Paragraph, set[str], tuple]]] = defaultdict(list)
+    task_units: list[list[Paragraph | str]] = []
+    num_duplicates = 0
+    for task_idx, task in enumerate(executed_tasks):
+        units = split_paragraphs(task_idx, replace_citations(task.deliverable or "", source_list))
+        for paragraph in units:
+            if isinstance(paragraph, str) or len(paragraph.text) < min_chars:
+                continue
+            if not (grams := _bigrams(paragraph.text)):
+                continue
+            signature = _signature(paragraph.text)
+            paragraph_bands = hasher.bands(grams, rows)
+            candidates = {
+                id(entry[0]): entry for band in paragraph_bands for entry in buckets[band]
+            }
+            original = next(
+                (
+                    other
+                    for other, other_grams, other_signature in candidates.values()
+                    if other_signature == signature
+                    and len(grams & other_grams) / len(grams | other_grams) >= threshold
+                ),
+                None,
+            )
+            if original is None:
+                for band in paragraph_bands:
+                    buckets[band].append((paragraph, grams, signature))
+                continue
+            # 重複する段落の出典は、残す段落に引き継ぐ
+            for citation in CITATION_PATTERN.findall(paragraph.text):
+                marker = f"[{citation}]"
+                if marker not in original.text and marker not in original.extra_citations:
+                    original.extra_citations.append(marker)
+            paragraph.duplicate_of = original
+            num_duplicates += 1
+        task_units.append(units)
+    return PackedTaskExecutions(
+        executed_tasks=[
+            task.model_copy(
+                update={
+                    "deliverable": (
+                        "\n".join(_render(unit, executed_tasks) for unit in units).strip()
+                        if task.deliverable is not None
+                        else None
+                    )
+                }
+            )
+            for task, units in zip(executed_tasks, task_units, strict=True)
+        ],
+        sources=source_list.sources,
+        num_duplicates=num_duplicates,
+    )
+
+
+def count_tokens(text: str) -> int:
+    """プロンプトのトークン数の概算（コンテキスト圧縮と同じ文字数換算）."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def format_sources(sources: list[Source]) -> str:
+    return "\n".join(source.to_string() for source in sources)
+
+
+def format_references(sources: list[Source]) -> str:
+    """レポート末尾に付ける出典一覧（Markdown）."""
+    if not sources:
+        return ""
+    lines = [
+        f"- [{source.number}] [{source.title or urlsplit(source.url).netloc}]({source.url})"
+        for source in sources
+    ]
+    return "\n\n## 出典\n\n" + "\n".join(lines) + "\n"
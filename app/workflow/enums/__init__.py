@@ -1,5 +1,9 @@
+from .auto_answer_policy import AutoAnswerPolicy
 from .node import Node
+from .session_status import SessionStatus
 
 __all__ = [
+    "AutoAnswerPolicy",
     "Node",
+    "SessionStatus",
 ]
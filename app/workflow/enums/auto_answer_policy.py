@@ -0,0 +1,7 @@
+from app.domain.enums import BaseEnum
+
+
+class AutoAnswerPolicy(BaseEnum):
+    SKIP = "skip"  # 「/skip」と回答し、要件収集を打ち切って調査を始める
+    NO_ANSWER = "no_answer"  # 回答せずに進める（CLI で空欄のまま Enter を押した場合と同じ）
+    REQUEST = "request"  # リクエストの answers を使う（質問文または質問の順番で照合し、ない場合は回答しない）
@@ -0,0 +1,8 @@
+from app.domain.enums import BaseEnum
+
+
+class SessionStatus(BaseEnum):
+    RUNNING = "running"  # グラフを実行中
+    WAITING = "waiting"  # ユーザーの回答待ち（interrupt で中断中）
+    COMPLETED = "completed"  # レポートの生成まで完了
+    FAILED = "failed"  # 実行中にエラーが発生
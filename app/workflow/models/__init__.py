@@ -1,3 +1,5 @@
+from .batch import BatchRequest, BatchResult
+from .citation_packing import PackedTaskExecutions, Source
 from .decompose_query import DecomposedTasks
 from .execute_task import ExecuteTaskState
 from .gather_requirements import ManagedInquiryItem, GatherRequirements
@@ -8,17 +10,23 @@ from .state import (
     ResearchAgentOutputState,
 )
 from .build_research_plan import ResearchPlan, Task, ManagedTask
+from .session import ResearchSession
 
 __all__ = [
+    "BatchRequest",
+    "BatchResult",
     "DecomposedTasks",
     "ExecuteTaskState",
     "GatherRequirements",
     "ManagedInquiryItem",
     "ManagedTask",
+    "PackedTaskExecutions",
     "ResearchAgentInputState",
     "ResearchAgentOutputState",
     "ResearchAgentPrivateState",
     "ResearchAgentState",
     "ResearchPlan",
+    "ResearchSession",
+    "Source",
     "Task",
 ]
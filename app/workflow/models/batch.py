@@ -0,0 +1,30 @@
+from pydantic import AliasChoices, BaseModel, Field
+
+from app.workflow.enums import SessionStatus
+
+
+class BatchRequest(BaseModel):
+    id: str = Field(
+        title="リクエスト ID",
+        validation_alias=AliasChoices("id", "request_id"),
+    )
+    message: str = Field(
+        title="調査の依頼内容",
+        validation_alias=AliasChoices("message", "initial_message", "body"),
+    )
+    answers: dict[str, str] | list[str] = Field(
+        title="要件収集の質問への回答",
+        description="{質問文: 回答} または質問の順番どおりの回答のリスト（auto_answer_policy=request の場合に使う）",
+        default_factory=dict,
+    )
+
+
+class BatchResult(BaseModel):
+    id: str = Field(title="リクエスト ID")
+    thread_id: str = Field(title="スレッド ID")
+    status: SessionStatus = Field(title="実行結果 (completed/failed)")
+    output_path: str | None = Field(title="レポートの保存先", default=None)
+    latency_seconds: float = Field(title="実行時間（秒）")
+    num_interrupts: int = Field(title="要件収集で自動回答した回数", default=0)
+    error: str | None = Field(title="エラー内容", default=None)
+    finished_at: str = Field(title="終了時刻")
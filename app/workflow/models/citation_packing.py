@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+
+from app.workflow.models.build_research_plan import ManagedTask
+
+
+class Source(BaseModel):
+    number: int = Field(title="出典番号", description="調査結果・レポート中の [番号] に対応する")
+    url: str = Field(title="URL")
+    title: str = Field(title="タイトル", default="")
+
+    def to_string(self) -> str:
+        return f"[{self.number}] {self.title} {self.url}" if self.title else f"[{self.number}] {self.url}"
+
+
+class PackedTaskExecutions(BaseModel):
+    executed_tasks: list[ManagedTask] = Field(
+        title="出典を番号に置き換え、重複する段落を参照に置き換えたタスク"
+    )
+    sources: list[Source] = Field(title="共有の出典一覧", default_factory=list)
+    num_duplicates: int = Field(title="参照に置き換えた段落の数", default=0)
+    skipped_tasks: list[ManagedTask] = Field(
+        title="実行枠に空きがなく保留となったタスク（レポート末尾に記載する）", default_factory=list
+    )
+
+    def cited_sources(self, executed_tasks: list[ManagedTask]) -> list[Source]:
+        """指定したタスクの調査結果で引用している出典."""
+        text = "\n".join(task.deliverable or "" for task in executed_tasks)
+        return [source for source in self.sources if f"[{source.number}]" in text]
@@ -9,6 +9,11 @@ from app.workflow.models.build_research_plan import (
 class ExecuteTaskState(BaseModel):
     goal: str | None = Field(title="goal", default=None)
     task: ManagedTask = Field(title="task")
+    required: bool = Field(
+        title="必須タスクかどうか",
+        description="False の場合は、実行枠・レート上限に空きがあるときのみ実行する",
+        default=True,
+    )
 
 
 class TaskExecution(BaseModel):
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+
+from app.workflow.enums import SessionStatus
+from app.workflow.models.gather_requirements import ManagedInquiryItem
+
+
+class ResearchSession(BaseModel):
+    thread_id: str = Field(title="セッション（チェックポイントのスレッド）ID")
+    status: SessionStatus = Field(title="セッションの状況")
+    inquiry_items: list[ManagedInquiryItem] = Field(
+        title="ユーザーへの確認項目",
+        description="status が waiting の場合に、回答を求める質問の一覧",
+        default_factory=list,
+    )
+    research_report: str | None = Field(title="調査レポート", default=None)
+    error: str | None = Field(title="エラー内容", default=None)
@@ -3,6 +3,7 @@ from typing import Annotated
 
 from pydantic import BaseModel, Field
 from langchain_core.messages import AnyMessage
+from langgraph.graph import add_messages
 
 from app.workflow.models import ManagedInquiryItem
 from app.workflow.models.build_research_plan import (
@@ -12,12 +13,25 @@ from app.workflow.models.build_research_plan import (
 from app.domain.models import ManagedDocument
 
 
+def upsert_by_id(
+    left: list[ManagedInquiryItem],
+    right: list[ManagedInquiryItem],
+) -> list[ManagedInquiryItem]:
+    """ID が一致する項目は置き換え、新しい項目は末尾に追加する（ノードは変更分のみを返せばよい）."""
+    merged = {item.id: item for item in left}
+    for item in right:
+        merged[item.id] = item
+    return list(merged.values())
+
+
 class ResearchAgentInputState(BaseModel):
-    messages: list[AnyMessage] = Field(default_factory=list)
+    messages: Annotated[list[AnyMessage], add_messages] = Field(default_factory=list)
 
 
 class ResearchAgentPrivateState(BaseModel):
-    inquiry_items: list[ManagedInquiryItem] = Field(default_factory=list)
+    inquiry_items: Annotated[list[ManagedInquiryItem], upsert_by_id] = Field(
+        default_factory=list
+    )
     goal: str = Field(title="goal", default="")
     tasks: list[ManagedTask] = Field(default_factory=list)
     executed_tasks: Annotated[list[ManagedTask], operator.add] = Field(
@@ -23,10 +23,13 @@ class BuildResearchPlanNode(BaseOpenAIChain):
         model_name: OpenAIModelName,
         blob_manager: BaseBlobManager,
         target_priority: Priority = Priority.HIGH,
+        optional_priority: Priority | None = Priority.LOW,
         log_level: LogLevel = LogLevel.DEBUG,
         prompt_path: str = "storage/prompts/research_agent/nodes/build_research_plan.jinja",
     ) -> None:
+        # target_priority までのタスクは必ず実行し、optional_priority までのタスクは空きがある場合のみ実行する
         self.target_priority = target_priority
+        self.optional_priority = optional_priority or target_priority
         super().__init__(model_name, blob_manager, log_level, prompt_path)
 
     def __call__(self, state: ResearchAgentState) -> Command[Literal[Node.EXECUTE_TASK.value]]:
@@ -34,17 +37,26 @@ class BuildResearchPlanNode(BaseOpenAIChain):
             messages=state.messages,
             inquiry_items=state.inquiry_items,
         )
-        state.goal = research_plan.goal
-        state.tasks = research_plan.managed_tasks
-        state.storyline = research_plan.storyline
+        managed_tasks = research_plan.managed_tasks
         gotos = []
-        for managed_task in state.tasks:
+        for managed_task in managed_tasks:
             goto = Send(
                 Node.EXECUTE_TASK.value,
-                ExecuteTaskState(goal=state.goal, task=managed_task),
+                ExecuteTaskState(
+                    goal=research_plan.goal,
+                    task=managed_task,
+                    required=managed_task.priority in Priority.up_to(self.target_priority),
+                ),
             )
             gotos.append(goto)
-        return Command(goto=gotos, update=state)
+        return Command(
+            goto=gotos,
+            update={
+                "goal": research_plan.goal,
+                "tasks": managed_tasks,
+                "storyline": research_plan.storyline,
+            },
+        )
 
     def run(
         self,
@@ -59,9 +71,13 @@ class BuildResearchPlanNode(BaseOpenAIChain):
             "conversation_history": messages,
         }
         research_plan = self.invoke(chain, inputs, verbose)
-        research_plan.tasks = [
-            task
-            for task in research_plan.tasks
-            if task.priority in Priority.up_to(self.target_priority)
-        ]
+        # 優先度の高いタスクから実行が開始されるように並べる
+        research_plan.tasks = sorted(
+            (
+                task
+                for task in research_plan.tasks
+                if task.priority in Priority.up_to(self.optional_priority)
+            ),
+            key=lambda task: task.priority.rank,
+        )
         return research_plan
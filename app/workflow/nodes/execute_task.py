@@ -1,24 +1,45 @@
 import traceback
+from contextlib import AbstractContextManager
 from typing import Literal
 
 from langchain.agents import create_agent
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AnyMessage
+from langchain_core.runnables import ensure_config
+from langgraph.graph.state import CompiledStateGraph
 from langgraph.types import Command
 from langchain_core.tools.structured import StructuredTool
 
+from app.core.config import settings
 from app.core.logging import LogLevel, log
-from app.core.middleware import handle_tool_errors, validate_output
+from app.core.middleware import (
+    CoalesceToolCallsMiddleware,
+    compact_context,
+    handle_tool_errors,
+    validate_output,
+)
+from app.core.utils.scheduler import Costs, PriorityScheduler
 from app.domain.enums import TaskStatus
 from app.infrastructure.blob_manager import BaseBlobManager
+from app.infrastructure.cassette import CassetteChatModel, get_cassette
+from app.infrastructure.document_store import DocumentScope, document_scope, get_document_store
 from app.infrastructure.llm_chain import BaseChain
 from app.infrastructure.llm_chain.enums import OpenAIModelName
+from app.infrastructure.rate_limit import GuardedChatOpenAI, get_rate_budgets
 from app.workflow.enums import Node
 from app.workflow.models.build_research_plan import TaskType
-from app.workflow.tools import search_web, submit_content
+from app.workflow.tools import ingest_search_results, search_web, submit_content
 from app.workflow.models.build_research_plan import ManagedTask
 from app.workflow.models import (
     ExecuteTaskState,
 )
 
+# 全 ExecuteTaskNode で共有し、同時実行数・レート上限の範囲で優先度の高いタスクから開始する
+execute_task_scheduler = PriorityScheduler(settings.EXECUTE_TASK_MAX_CONCURRENCY)
+# 他のタスクの search_web に合流した場合も、検索結果を自身のタスクの文書として取り込む
+coalesce_tool_calls = CoalesceToolCallsMiddleware(
+    on_coalesced={search_web.name: ingest_search_results}
+)
 
 
 class ExecuteTaskNode(BaseChain):
@@ -29,6 +50,7 @@ class ExecuteTaskNode(BaseChain):
         log_level: LogLevel = LogLevel.DEBUG,
         prompt_path: str = "storage/prompts/research_agent/nodes/execute_task.jinja",
     ) -> None:
+        self.openai_model_name = model_name
         self.model_name = f"openai:{model_name.value}"
         self.blob_manager = blob_manager
         self.prompt_path = prompt_path
@@ -40,19 +62,99 @@ class ExecuteTaskNode(BaseChain):
             TaskType.SEARCH: search_web,
         }
 
+    def _costs(self, managed_task: ManagedTask) -> Costs:
+        # タスク 1 件で消費する見積もりを、開始時にレート上限から予約する
+        budgets = get_rate_budgets()
+        costs = [
+            (budgets.openai_tokens(self.openai_model_name), settings.EXECUTE_TASK_ESTIMATED_TOKENS),
+        ]
+        if TaskType.SEARCH in managed_task.required_capabilities:
+            costs.append(
+                (budgets.perplexity_requests(), settings.EXECUTE_TASK_ESTIMATED_SEARCHES)
+            )
+        return costs
+
+    def _settle_tokens(self, messages: list[AnyMessage]) -> None:
+        # 開始時に予約した見積もりを、実際に消費したトークン数（usage_metadata）で精算する
+        used_tokens = sum(
+            message.usage_metadata["total_tokens"]
+            for message in messages
+            if isinstance(message, AIMessage) and message.usage_metadata
+        )
+        execute_task_scheduler.settle(
+            get_rate_budgets().openai_tokens(self.openai_model_name),
+            settings.EXECUTE_TASK_ESTIMATED_TOKENS,
+            used_tokens,
+        )
+
+    @staticmethod
+    def _deliverable(messages: list[AnyMessage]) -> str:
+        # content はモデルによって文字列またはブロック（推論・テキスト等）のリストになるため、テキストのみを取り出す
+        last_message = messages[-1]
+        if not isinstance(last_message, AIMessage) or not (deliverable := last_message.text):
+            error_message = f"Agent finished without a deliverable (last message: {last_message.type})"
+            raise ValueError(error_message)
+        return deliverable
+
+    @staticmethod
+    def _timeout(state: ExecuteTaskState) -> float | None:
+        return None if state.required else settings.EXECUTE_TASK_OPTIONAL_WAIT_SECONDS
+
+    def _document_scope(self, state: ExecuteTaskState) -> AbstractContextManager[DocumentScope]:
+        # search_web で取得した文書を、同じセッション (thread_id) のタスク間で共有する
+        session_id = ensure_config().get("configurable", {}).get("thread_id")
+        return document_scope(
+            get_document_store(session_id), state.task.id, settings.DOCUMENT_STORE_LOCAL_FIRST
+        )
+
+    def _skip(self, state: ExecuteTaskState) -> ManagedTask:
+        self.log(object="skip", message=f"{state.task.title} ({state.task.priority.value})")
+        return self._to_managed_task(state.task, TaskStatus.PENDING, None)
+
     def __call__(
         self,
         state: ExecuteTaskState
     ) -> Command[Literal[Node.GENERATE_REPORT.value]]:
-        managed_task_execution = self.run(state)
-        return Command(
-            goto=Node.GENERATE_REPORT.value,
-            update={
-                "executed_tasks": [managed_task_execution],
-            },
+        with execute_task_scheduler.hold(
+            state.task.priority.rank, self._costs(state.task), self._timeout(state)
+        ) as admitted:
+            with self._document_scope(state) as scope:
+                managed_task_execution = self.run(state) if admitted else self._skip(state)
+        return self._command(managed_task_execution, scope)
+
+    async def acall(
+        self,
+        state: ExecuteTaskState
+    ) -> Command[Literal[Node.GENERATE_REPORT.value]]:
+        async with execute_task_scheduler.ahold(
+            state.task.priority.rank, self._costs(state.task), self._timeout(state)
+        ) as admitted:
+            with self._document_scope(state) as scope:
+                managed_task_execution = await self.arun(state) if admitted else self._skip(state)
+        return self._command(managed_task_execution, scope)
+
+    @staticmethod
+    def _command(
+        managed_task: ManagedTask, scope: DocumentScope
+    ) -> Command[Literal[Node.GENERATE_REPORT.value]]:
+        update: dict = {"executed_tasks": [managed_task]}
+        # 文書を取得しなかったタスクは managed_documents を更新しない
+        if documents := scope.documents:
+            update["managed_documents"] = documents
+        return Command(goto=Node.GENERATE_REPORT.value, update=update)
+
+    def _build_model(self) -> str | BaseChatModel:
+        cassette = get_cassette()
+        if not isinstance(self.model_name, str):
+            return self.model_name
+        if not cassette.is_active:
+            return GuardedChatOpenAI(model_name=self.openai_model_name.value)
+        return CassetteChatModel(
+            cassette=cassette,
+            model_name=self.model_name.removeprefix("openai:"),
         )
 
-    def run(self, state: ExecuteTaskState) -> ManagedTask:
+    def _create_agent(self, state: ExecuteTaskState) -> CompiledStateGraph:
         managed_task = state.task
         selected_tools = [submit_content]
         for key in managed_task.required_capabilities:
@@ -66,45 +168,67 @@ class ExecuteTaskNode(BaseChain):
             objective=managed_task.objective,
             research_scope=managed_task.research_scope,
         )
-        agent = create_agent(
-            model=self.model_name,
+        return create_agent(
+            model=self._build_model(),
             tools=selected_tools,
             system_prompt=prompt,
             middleware=[
                 handle_tool_errors,
+                coalesce_tool_calls,
+                compact_context,
                 validate_output,
             ],
         ).with_config({"recursion_limit": 50})
+
+    def _to_managed_task(
+        self,
+        managed_task: ManagedTask,
+        status: TaskStatus,
+        deliverable: str | None,
+    ) -> ManagedTask:
+        return ManagedTask(
+            id=managed_task.id,
+            status=status.value,  # Use the value (str), not enum object
+            deliverable=deliverable,
+            title=managed_task.title,
+            overview=managed_task.overview,
+            objective=managed_task.objective,
+            research_scope=managed_task.research_scope,
+            priority=managed_task.priority,
+            required_capabilities=managed_task.required_capabilities,
+        )
+
+    def _log_error(self, e: Exception) -> None:
+        error_message = f"Error executing task: {e!s}\n{traceback.format_exc()}"
+        log(
+            LogLevel.ERROR,
+            subject="ExecuteTaskNode",
+            object="run",
+            message=error_message,
+        )
+
+    def run(self, state: ExecuteTaskState) -> ManagedTask:
+        managed_task = state.task
+        agent = self._create_agent(state)
         try:
             response = agent.invoke({})
-            response_content = response["messages"][-1].content  # TODO
-            return ManagedTask(
-                id=managed_task.id,
-                status=TaskStatus.COMPLETED.value,  # Use the value (str), not enum object
-                deliverable=str(response_content),
-                title=managed_task.title,
-                overview=managed_task.overview,
-                objective=managed_task.objective,
-                research_scope=managed_task.research_scope,
-                priority=managed_task.priority,
-                required_capabilities=managed_task.required_capabilities,
+            self._settle_tokens(response["messages"])
+            return self._to_managed_task(
+                managed_task, TaskStatus.COMPLETED, self._deliverable(response["messages"])
             )
         except Exception as e:  # noqa: BLE001
-            error_message = f"Error executing task: {e!s}\n{traceback.format_exc()}"
-            log(
-                LogLevel.ERROR,
-                subject="ExecuteTaskNode",
-                object="run",
-                message=error_message,
-            )
-            return ManagedTask(
-                id=managed_task.id,
-                status=TaskStatus.FAILED.value,
-                deliverable=None,
-                title=managed_task.title,
-                overview=managed_task.overview,
-                objective=managed_task.objective,
-                research_scope=managed_task.research_scope,
-                priority=managed_task.priority,
-                required_capabilities=managed_task.required_capabilities,
+            self._log_error(e)
+            return self._to_managed_task(managed_task, TaskStatus.FAILED, None)
+
+    async def arun(self, state: ExecuteTaskState) -> ManagedTask:
+        managed_task = state.task
+        agent = self._create_agent(state)
+        try:
+            response = await agent.ainvoke({})
+            self._settle_tokens(response["messages"])
+            return self._to_managed_task(
+                managed_task, TaskStatus.COMPLETED, self._deliverable(response["messages"])
             )
+        except Exception as e:  # noqa: BLE001
+            self._log_error(e)
+            return self._to_managed_task(managed_task, TaskStatus.FAILED, None)
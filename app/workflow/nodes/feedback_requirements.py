@@ -24,12 +24,16 @@ class FeedbackRequirementsNode(BaseChain):
             "inquiry_items": state.inquiry_items,
         })
         # ユーザーから回答が返ってきたらIDで照合された質問のステータスを更新
-        for idx, previous_item in enumerate(state.inquiry_items):
+        inquiry_items, messages = [], []
+        for previous_item in state.inquiry_items:
             if current_item := feedback_items.get(previous_item.id):
-                state.inquiry_items[idx] = current_item
+                inquiry_items.append(current_item)
                 # 対話履歴に Q&A （質問とユーザーからの回答）を追加
-                state.messages.extend([
+                messages.extend([
                     AIMessage(content=current_item.question),
                     HumanMessage(content=current_item.answer),
                 ])
-        return Command(goto=Node.GATHER_REQUIREMENTS.value, update=state)
+        return Command(
+            goto=Node.GATHER_REQUIREMENTS.value,
+            update={"inquiry_items": inquiry_items, "messages": messages},
+        )
@@ -30,19 +30,25 @@ class GatherRequirementsNode(BaseOpenAIChain):
         state: ResearchAgentState
     ) -> Command[Literal[Node.FEEDBACK_REQUIREMENTS.value, Node.BUILD_RESEARCH_PLAN.value]]:
         gather_requirements = self.run(state.messages, state.inquiry_items)
-        # 既存の要件収集項目のステータスを更新
-        state.inquiry_items = gather_requirements.update_inquiry_items(
-            state.inquiry_items
-        )
+        # 既存の要件収集項目のステータスを更新し、変更のあった項目のみを返す
+        updated_inquiry_items = [
+            updated_item
+            for previous_item, updated_item in zip(
+                state.inquiry_items,
+                gather_requirements.update_inquiry_items(state.inquiry_items),
+                strict=True,
+            )
+            if updated_item != previous_item
+        ]
         # 新しい要件収集項目を追加
-        state.inquiry_items += gather_requirements.inquiry_items
+        updated_inquiry_items += gather_requirements.inquiry_items
         return Command(
             goto=(
                 Node.BUILD_RESEARCH_PLAN.value
                 if gather_requirements.is_completed
                 else Node.FEEDBACK_REQUIREMENTS.value
             ),
-            update=state,
+            update={"inquiry_items": updated_inquiry_items},
         )
 
     def run(
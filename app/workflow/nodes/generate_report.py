@@ -1,5 +1,10 @@
+import asyncio
+import re
+from pathlib import Path
 from typing import Literal
 
+from langchain_core.runnables import ensure_config
+from langchain_core.runnables.config import ContextThreadPoolExecutor
 from langgraph.graph import END
 from langgraph.types import Command
 
@@ -11,9 +16,65 @@ from app.workflow.models.build_research_plan import (
     ManagedTask,
 )
 from app.core.logging import LogLevel
-from app.infrastructure.blob_manager.base import BaseBlobManager
+from app.domain.enums import ManagedTaskStatus
+from app.domain.models import ManagedDocument
+from app.infrastructure.blob_manager.base import BaseBlobManager, BaseBlobWriter
 from app.infrastructure.llm_chain.openai_chain import BaseOpenAIChain
 from app.infrastructure.llm_chain.enums import OpenAIModelName
+from app.infrastructure.metrics import metrics
+from app.workflow.citation_packing import (
+    count_tokens,
+    format_references,
+    format_sources,
+    pack_citations,
+)
+from app.workflow.models.citation_packing import PackedTaskExecutions
+
+
+def resolve_output_path(output_path: str, thread_id: str | None) -> str:
+    """出力先の {thread_id} を、ファイル名として使える形に置き換える."""
+    return output_path.format(thread_id=re.sub(r"[^\w.-]", "_", thread_id or "default"))
+
+
+def _char_bigrams(text: str) -> set[str]:
+    # 日本語は単語で区切れないため、文字 bi-gram で重なりを測る
+    normalized = re.sub(r"\s+", "", text.lower())
+    return {normalized[idx : idx + 2] for idx in range(len(normalized) - 1)}
+
+
+def assign_tasks_to_sections(
+    storyline: list[ReportSection],
+    executed_tasks: list[ManagedTask],
+    max_tasks_per_section: int,
+) -> list[list[ManagedTask]]:
+    """各セクションの執筆に使うタスクを、セクションとタスクの文字 bi-gram の類似度で選ぶ.
+
+    各タスクは最も類似するセクションに必ず割り当て、残りの枠は類似度の高い順に埋める。
+    """
+    section_grams = [
+        _char_bigrams(f"{section.section} {section.description}") for section in storyline
+    ]
+    task_grams = [
+        _char_bigrams(f"{task.title} {task.overview} {task.objective}") for task in executed_tasks
+    ]
+    scores = [
+        [len(section & task) / (len(section | task) or 1) for task in task_grams]
+        for section in section_grams
+    ]
+    assigned: list[set[int]] = [set() for _ in storyline]
+    for task_idx in range(len(executed_tasks)):
+        best = max(range(len(storyline)), key=lambda section_idx: scores[section_idx][task_idx])
+        assigned[best].add(task_idx)
+    for section_idx, task_indices in enumerate(assigned):
+        ranked = sorted(
+            range(len(executed_tasks)), key=lambda task_idx: -scores[section_idx][task_idx]
+        )
+        for task_idx in ranked:
+            if len(task_indices) >= max_tasks_per_section:
+                break
+            if scores[section_idx][task_idx] > 0 or not task_indices:
+                task_indices.add(task_idx)
+    return [[executed_tasks[idx] for idx in sorted(task_indices)] for task_indices in assigned]
 
 
 class GenerateReportNode(BaseOpenAIChain):
@@ -23,7 +84,26 @@ class GenerateReportNode(BaseOpenAIChain):
         blob_manager: BaseBlobManager,
         log_level: LogLevel = LogLevel.DEBUG,
         prompt_path: str = "storage/prompts/research_agent/nodes/generate_report.jinja",
+        output_path: str | None = None,
+        section_prompt_path: str = "storage/prompts/research_agent/nodes/draft_report_section.jinja",
+        merge_prompt_path: str = "storage/prompts/research_agent/nodes/merge_report_sections.jinja",
+        map_reduce_threshold: int | None = None,
+        max_concurrency: int = 4,
+        max_tasks_per_section: int = 8,
+        dedup_threshold: float | None = None,
+        dedup_min_chars: int = 40,
     ) -> None:
+        # 指定した場合は、生成されたチャンクを順次 output_path に書き込む（{thread_id} は実行中のスレッドに置き換える）
+        self.output_path = output_path
+        self.section_prompt_path = section_prompt_path
+        self.merge_prompt_path = merge_prompt_path
+        # 調査結果の文字数がこの値を超える場合は、セクションごとに並行して執筆してから統合する
+        self.map_reduce_threshold = map_reduce_threshold
+        self.max_concurrency = max_concurrency
+        self.max_tasks_per_section = max_tasks_per_section
+        # 指定した場合は、タスク横断で出典を番号付きの一覧にまとめ、類似度がこの値以上の段落を参照に置き換える
+        self.dedup_threshold = dedup_threshold
+        self.dedup_min_chars = dedup_min_chars
         super().__init__(model_name, blob_manager, log_level, prompt_path)
 
     def __call__(self, state: ResearchAgentState) -> Command[Literal[END]]:
@@ -31,9 +111,149 @@ class GenerateReportNode(BaseOpenAIChain):
             goal=state.goal,
             storyline=state.storyline,
             executed_tasks=state.executed_tasks,
+            documents=state.managed_documents,
+        )
+        return Command(goto=END, update={"research_report": report})
+
+    async def acall(self, state: ResearchAgentState) -> Command[Literal[END]]:
+        report = await self.arun(
+            goal=state.goal,
+            storyline=state.storyline,
+            executed_tasks=state.executed_tasks,
+            documents=state.managed_documents,
+        )
+        return Command(goto=END, update={"research_report": report})
+
+    @staticmethod
+    def _format_storyline(storyline: list[ReportSection]) -> str:
+        return "\n".join(
+            f"[{report_section.section}] {report_section.description}"
+            for report_section in storyline
+        )
+
+    @staticmethod
+    def _format_task_execution(executed_tasks: list[ManagedTask]) -> str:
+        return "\n\n".join(
+            (
+                f"### {managed_task.title}]\n"
+                f"#### タスク概要\n{managed_task.overview}\n"
+                f"#### 調査結果\n{managed_task.deliverable}"
+            )
+            for managed_task in executed_tasks
+        )
+
+    def _pack(
+        self, executed_tasks: list[ManagedTask], documents: list[ManagedDocument] | None
+    ) -> PackedTaskExecutions:
+        # 実行枠に空きがなく保留となったタスクは、調査結果に含めずレポート末尾に記載する
+        skipped_tasks = [task for task in executed_tasks if task.status == ManagedTaskStatus.PENDING]
+        executed_tasks = [task for task in executed_tasks if task.status != ManagedTaskStatus.PENDING]
+        if skipped_tasks:
+            self.log(object="skipped_tasks", message=", ".join(task.title for task in skipped_tasks))
+        if self.dedup_threshold is None:
+            return PackedTaskExecutions(executed_tasks=executed_tasks, skipped_tasks=skipped_tasks)
+        packed = pack_citations(
+            executed_tasks,
+            documents=documents,
+            threshold=self.dedup_threshold,
+            min_chars=self.dedup_min_chars,
+        )
+        packed.skipped_tasks = skipped_tasks
+        num_tokens = count_tokens(self._format_task_execution(executed_tasks))
+        packed_num_tokens = count_tokens(
+            self._format_task_execution(packed.executed_tasks) + format_sources(packed.sources)
+        )
+        metrics.inc("report_prompt_tokens_removed_total", {}, num_tokens - packed_num_tokens)
+        self.log(
+            object="pack_citations",
+            message=(
+                f"{num_tokens} -> {packed_num_tokens} tokens"
+                f" ({len(packed.sources)} sources, {packed.num_duplicates} duplicates)"
+            ),
+        )
+        return packed
+
+    def _build_inputs(
+        self,
+        goal: str,
+        storyline: list[ReportSection],
+        packed: PackedTaskExecutions,
+    ) -> dict:
+        return {
+            "user_request": goal,
+            "storyline": self._format_storyline(storyline),
+            "task_execution": self._format_task_execution(packed.executed_tasks),
+            "sources": format_sources(packed.sources),
+        }
+
+    def use_map_reduce(self, inputs: dict, storyline: list[ReportSection]) -> bool:
+        return (
+            self.map_reduce_threshold is not None
+            and len(storyline) > 1
+            and len(inputs["task_execution"]) > self.map_reduce_threshold
+        )
+
+    def _build_section_inputs(
+        self,
+        goal: str,
+        storyline: list[ReportSection],
+        packed: PackedTaskExecutions,
+    ) -> list[dict]:
+        section_tasks = assign_tasks_to_sections(
+            storyline, packed.executed_tasks, self.max_tasks_per_section
         )
-        state.research_report = report
-        return Command(goto=END, update=state)
+        return [
+            {
+                "user_request": goal,
+                "storyline": self._format_storyline(storyline),
+                "section": report_section.section,
+                "description": report_section.description,
+                "task_execution": self._format_task_execution(tasks),
+                # セクションの調査結果で引用している出典のみを渡す
+                "sources": format_sources(packed.cited_sources(tasks)),
+            }
+            for report_section, tasks in zip(storyline, section_tasks, strict=True)
+        ]
+
+    @staticmethod
+    def _build_merge_inputs(goal: str, storyline_text: str, section_drafts: list[str]) -> dict:
+        return {
+            "user_request": goal,
+            "storyline": storyline_text,
+            "section_drafts": "\n\n".join(section_drafts),
+        }
+
+    @staticmethod
+    def _format_appendix(packed: PackedTaskExecutions) -> str:
+        """レポート末尾に付ける出典一覧と、保留となったタスクの一覧（Markdown）."""
+        appendix = format_references(packed.sources)
+        if packed.skipped_tasks:
+            lines = [f"- {task.title} ({task.priority.value})" for task in packed.skipped_tasks]
+            appendix += (
+                "\n\n## 未実施の調査\n\n"
+                "以下のタスクは実行枠に空きがなく、待機時間内に開始できなかったため保留としました。\n\n"
+                + "\n".join(lines)
+                + "\n"
+            )
+        return appendix
+
+    def _write(self, writer: BaseBlobWriter | None, chunks: list[str], chunk: str) -> None:
+        if writer is not None:
+            writer.write(chunk)
+        chunks.append(chunk)
+
+    def _resolve_output_path(self) -> str | None:
+        if self.output_path is None:
+            return None
+        thread_id = ensure_config().get("configurable", {}).get("thread_id")
+        output_path = resolve_output_path(self.output_path, thread_id)
+        self.blob_manager.mkdir(str(Path(output_path).parent))
+        return output_path
+
+    def _open_writer(self) -> BaseBlobWriter | None:
+        if (output_path := self._resolve_output_path()) is None:
+            return None
+        return self.blob_manager.open_blob_writer(output_path)
 
     def run(
         self,
@@ -41,21 +261,113 @@ class GenerateReportNode(BaseOpenAIChain):
         storyline: list[ReportSection],
         executed_tasks: list[ManagedTask],
         verbose: bool = False,
+        documents: list[ManagedDocument] | None = None,
     ) -> str:
+        packed = self._pack(executed_tasks, documents)
+        inputs = self._build_inputs(goal, storyline, packed)
+        if self.use_map_reduce(inputs, storyline):
+            return self.run_map_reduce(goal, storyline, packed, verbose)
         chain = self._build_chain()
-        inputs = {
-            "user_request": goal,
-            "storyline": "\n".join(
-                f"[{report_section.section}] {report_section.description}"
-                for report_section in storyline
-            ),
-            "task_execution": "\n\n".join(
-                (
-                    f"### {managed_task.title}]\n"
-                    f"#### タスク概要\n{managed_task.overview}\n"
-                    f"#### 調査結果\n{managed_task.deliverable}"
+        chunks: list[str] = []
+        writer = self._open_writer()
+        try:
+            for chunk in self.stream(chain, inputs, verbose):
+                self._write(writer, chunks, chunk)
+            self._write(writer, chunks, self._format_appendix(packed))
+        finally:
+            if writer is not None:
+                writer.close()
+        return "".join(chunks)
+
+    def run_map_reduce(
+        self,
+        goal: str,
+        storyline: list[ReportSection],
+        packed: PackedTaskExecutions,
+        verbose: bool = False,
+    ) -> str:
+        self.log(object="run_map_reduce", message=f"{len(storyline)} sections")
+        section_chain = self._build_chain(prompt_path=self.section_prompt_path)
+        section_inputs = self._build_section_inputs(goal, storyline, packed)
+        # コールバック（メトリクス・ストリーミング）を引き継ぐため、コンテキストごとスレッドに渡す
+        with ContextThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            section_drafts = list(
+                executor.map(
+                    lambda inputs: str(self.invoke(section_chain, inputs, verbose)),
+                    section_inputs,
                 )
-                for managed_task in executed_tasks
-            ),
-        }
-        return self.invoke(chain, inputs, verbose)
+            )
+        merge_chain = self._build_chain(prompt_path=self.merge_prompt_path)
+        merge_inputs = self._build_merge_inputs(
+            goal, section_inputs[0]["storyline"], section_drafts
+        )
+        chunks: list[str] = []
+        writer = self._open_writer()
+        try:
+            for chunk in self.stream(merge_chain, merge_inputs, verbose):
+                self._write(writer, chunks, chunk)
+            for section_draft in section_drafts:
+                self._write(writer, chunks, f"\n\n{section_draft}")
+            self._write(writer, chunks, self._format_appendix(packed))
+        finally:
+            if writer is not None:
+                writer.close()
+        return "".join(chunks)
+
+    async def arun(
+        self,
+        goal: str,
+        storyline: list[ReportSection],
+        executed_tasks: list[ManagedTask],
+        verbose: bool = False,
+        documents: list[ManagedDocument] | None = None,
+    ) -> str:
+        packed = self._pack(executed_tasks, documents)
+        inputs = self._build_inputs(goal, storyline, packed)
+        if self.use_map_reduce(inputs, storyline):
+            return await self.arun_map_reduce(goal, storyline, packed, verbose)
+        chain = self._build_chain()
+        chunks: list[str] = []
+        writer = self._open_writer()
+        try:
+            async for chunk in self.astream(chain, inputs, verbose):
+                self._write(writer, chunks, chunk)
+            self._write(writer, chunks, self._format_appendix(packed))
+        finally:
+            if writer is not None:
+                writer.close()
+        return "".join(chunks)
+
+    async def arun_map_reduce(
+        self,
+        goal: str,
+        storyline: list[ReportSection],
+        packed: PackedTaskExecutions,
+        verbose: bool = False,
+    ) -> str:
+        self.log(object="arun_map_reduce", message=f"{len(storyline)} sections")
+        section_chain = self._build_chain(prompt_path=self.section_prompt_path)
+        section_inputs = self._build_section_inputs(goal, storyline, packed)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def draft(inputs: dict) -> str:
+            async with semaphore:
+                return str(await self.ainvoke(section_chain, inputs, verbose))
+
+        section_drafts = await asyncio.gather(*(draft(inputs) for inputs in section_inputs))
+        merge_chain = self._build_chain(prompt_path=self.merge_prompt_path)
+        merge_inputs = self._build_merge_inputs(
+            goal, section_inputs[0]["storyline"], list(section_drafts)
+        )
+        chunks: list[str] = []
+        writer = self._open_writer()
+        try:
+            async for chunk in self.astream(merge_chain, merge_inputs, verbose):
+                self._write(writer, chunks, chunk)
+            for section_draft in section_drafts:
+                self._write(writer, chunks, f"\n\n{section_draft}")
+            self._write(writer, chunks, self._format_appendix(packed))
+        finally:
+            if writer is not None:
+                writer.close()
+        return "".join(chunks)
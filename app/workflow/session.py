@@ -0,0 +1,183 @@
+import asyncio
+from collections.abc import Mapping
+from functools import partial
+from http import HTTPStatus
+from typing import Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import HumanMessage
+from langgraph.graph.state import CompiledStateGraph
+from langgraph.types import Command
+
+from app.core.config import settings
+from app.core.exception import HTTPStatusError
+from app.core.logging import LogLevel, log
+from app.core.utils.nano_id import generate_id
+from app.infrastructure.http_server import AsyncHTTPServer, HTTPRequest
+from app.workflow.agent import apply_answers
+from app.workflow.enums import Node, SessionStatus
+from app.workflow.models import ResearchSession
+
+
+class ResearchSessionManager:
+    """1 つのコンパイル済みグラフを、thread_id ごとの複数セッションで共有する.
+
+    グラフは interrupt（FeedbackRequirementsNode）で中断した時点でチェックポイントに保存され、
+    回答を待つ間はタスクもスレッドも保持しない。回答は resume で Command(resume=...) として渡す。
+    """
+
+    def __init__(
+        self,
+        graph: CompiledStateGraph,
+        recursion_limit: int = 1000,
+        callbacks: list[BaseCallbackHandler] | None = None,
+        log_level: LogLevel = LogLevel.DEBUG,
+    ) -> None:
+        self.log = partial(log, log_level=log_level, subject=self.__name__)
+        self.graph = graph
+        self.recursion_limit = recursion_limit
+        self.callbacks = callbacks or []
+        self._runs: dict[str, asyncio.Task] = {}
+        self._errors: dict[str, str] = {}
+
+    @property
+    def __name__(self) -> str:
+        return str(self.__class__.__name__)
+
+    @property
+    def running(self) -> int:
+        return len(self._runs)
+
+    def _config(self, thread_id: str) -> dict:
+        return {
+            "recursion_limit": self.recursion_limit,
+            "configurable": {"thread_id": thread_id},
+            "callbacks": self.callbacks,
+        }
+
+    async def get(self, thread_id: str) -> ResearchSession:
+        if thread_id in self._runs:
+            return ResearchSession(thread_id=thread_id, status=SessionStatus.RUNNING)
+        if error := self._errors.get(thread_id):
+            return ResearchSession(thread_id=thread_id, status=SessionStatus.FAILED, error=error)
+        snapshot = await self.graph.aget_state(self._config(thread_id))
+        if not snapshot.values:
+            raise HTTPStatusError(HTTPStatus.NOT_FOUND, f"Unknown session: {thread_id}")
+        for interrupt in snapshot.interrupts:
+            if interrupt.value.get("node") == Node.FEEDBACK_REQUIREMENTS.value:
+                return ResearchSession(
+                    thread_id=thread_id,
+                    status=SessionStatus.WAITING,
+                    inquiry_items=interrupt.value.get("inquiry_items", []),
+                )
+        if snapshot.next:
+            # 実行中にプロセスが停止した場合など
+            return ResearchSession(
+                thread_id=thread_id,
+                status=SessionStatus.FAILED,
+                error=f"Run stopped before {', '.join(snapshot.next)}",
+            )
+        return ResearchSession(
+            thread_id=thread_id,
+            status=SessionStatus.COMPLETED,
+            research_report=snapshot.values.get("research_report"),
+        )
+
+    async def start(
+        self,
+        message: str,
+        thread_id: str | None = None,
+        wait: float | None = None,
+    ) -> ResearchSession:
+        thread_id = thread_id or generate_id()
+        snapshot = await self.graph.aget_state(self._config(thread_id))
+        if snapshot.values or thread_id in self._runs:
+            raise HTTPStatusError(HTTPStatus.CONFLICT, f"Session already exists: {thread_id}")
+        self._launch(thread_id, {"messages": [HumanMessage(content=message)]})
+        return await self.wait(thread_id, wait)
+
+    async def resume(
+        self,
+        thread_id: str,
+        answers: Mapping[str, str],
+        wait: float | None = None,
+    ) -> ResearchSession:
+        session = await self.get(thread_id)
+        if session.status != SessionStatus.WAITING or thread_id in self._runs:
+            raise HTTPStatusError(
+                HTTPStatus.CONFLICT, f"Session is not waiting for answers: {session.status.value}"
+            )
+        self._launch(thread_id, Command(resume=apply_answers(session.inquiry_items, answers)))
+        return await self.wait(thread_id, wait)
+
+    async def wait(self, thread_id: str, wait: float | None = None) -> ResearchSession:
+        """実行中の場合は、次の中断・完了まで最大 wait 秒待ってから状況を返す."""
+        if task := self._runs.get(thread_id):
+            timeout = settings.SESSION_WAIT_SECONDS if wait is None else wait
+            await asyncio.wait({task}, timeout=timeout)
+        return await self.get(thread_id)
+
+    def _launch(self, thread_id: str, input_data: dict | Command) -> None:
+        self._errors.pop(thread_id, None)
+        self._runs[thread_id] = asyncio.create_task(self._run(thread_id, input_data))
+
+    async def _run(self, thread_id: str, input_data: dict | Command) -> None:
+        try:
+            await self.graph.ainvoke(input=input_data, config=self._config(thread_id))
+        except Exception as e:  # noqa: BLE001
+            self._errors[thread_id] = repr(e)
+            self.log(object="error", message=f"{thread_id}: {e!r}")
+        finally:
+            del self._runs[thread_id]
+
+
+def _wait_param(request: HTTPRequest, body: dict) -> float | None:
+    wait = body.get("wait", request.query.get("wait"))
+    return None if wait is None else float(wait)
+
+
+def _dump(session: ResearchSession) -> dict[str, Any]:
+    return session.model_dump(mode="json")
+
+
+def build_session_server(
+    manager: ResearchSessionManager,
+    host: str = settings.SESSION_SERVER_HOST,
+    port: int = settings.SESSION_SERVER_PORT,
+) -> AsyncHTTPServer:
+    """セッションの開始・状況確認・再開を HTTP で公開する.
+
+    POST /sessions                     {"message": str, "thread_id"?: str, "wait"?: float}
+    GET  /sessions/{thread_id}?wait=   状況（waiting の場合は inquiry_items）を返す
+    POST /sessions/{thread_id}/resume  {"answers": {質問 ID: 回答}, "wait"?: float}
+    """
+    server = AsyncHTTPServer(host=host, port=port)
+
+    @server.route("GET", "/health")
+    async def health(request: HTTPRequest) -> tuple[int, Any]:  # noqa: ARG001
+        return HTTPStatus.OK, {"status": "ok", "running": manager.running}
+
+    @server.route("POST", "/sessions")
+    async def start(request: HTTPRequest) -> tuple[int, Any]:
+        body = request.json()
+        if not isinstance(message := body.get("message"), str) or not message:
+            raise HTTPStatusError(HTTPStatus.BAD_REQUEST, "message is required")
+        session = await manager.start(
+            message, thread_id=body.get("thread_id"), wait=_wait_param(request, body)
+        )
+        return HTTPStatus.CREATED, _dump(session)
+
+    @server.route("GET", "/sessions/{thread_id}")
+    async def get(request: HTTPRequest, thread_id: str) -> tuple[int, Any]:
+        session = await manager.wait(thread_id, _wait_param(request, {}) or 0)
+        return HTTPStatus.OK, _dump(session)
+
+    @server.route("POST", "/sessions/{thread_id}/resume")
+    async def resume(request: HTTPRequest, thread_id: str) -> tuple[int, Any]:
+        body = request.json()
+        if not isinstance(answers := body.get("answers", {}), dict):
+            raise HTTPStatusError(HTTPStatus.BAD_REQUEST, "answers must be an object")
+        session = await manager.resume(thread_id, answers, wait=_wait_param(request, body))
+        return HTTPStatus.OK, _dump(session)
+
+    return server
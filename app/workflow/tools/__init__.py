@@ -1,7 +1,8 @@
-from .search_web import search_web
+from .search_web import ingest_search_results, search_web
 from .submit_content import submit_content
 
 __all__ = [
+    "ingest_search_results",
     "search_web",
     "submit_content",
 ]
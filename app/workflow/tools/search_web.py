@@ -1,16 +1,62 @@
 import json
 
-from dotenv import load_dotenv
-from langchain_core.tools import tool
-from perplexity.types.search_create_response import SearchCreateResponse
-from perplexity import Perplexity
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import StructuredTool
+from pydantic import TypeAdapter
 
+from app.domain.models import Document, SearchResult
+from app.infrastructure.cassette import get_cassette
+from app.infrastructure.document_store import get_document_scope
+from app.infrastructure.search_client import get_search_client
 
-load_dotenv()
+MAX_RESULTS = 3
 
+search_results_adapter = TypeAdapter(list[SearchResult])
 
-@tool
-def search_web(search_view: str) -> str:
+
+def _format_results(search_results: list[SearchResult]) -> str:
+    return json.dumps(
+        [
+            {
+                "title": result.title,
+                "url": result.url,
+                "snippet": result.snippet,
+            }
+            for result in search_results
+        ],
+        ensure_ascii=False,
+    )
+
+
+def _format_documents(documents: list[Document]) -> str:
+    return _format_results(
+        [
+            SearchResult(title=document.title, url=document.url, snippet=document.abstract)
+            for document in documents
+        ]
+    )
+
+
+def _lookup_local(search_view: str) -> str | None:
+    """同じセッションで取得済みの文書で足りる場合は、外部検索を省略する."""
+    if (scope := get_document_scope()) is None:
+        return None
+    if (documents := scope.lookup(search_view, MAX_RESULTS)) is None:
+        return None
+    return _format_documents(documents)
+
+
+def _ingest(response: str) -> None:
+    if (scope := get_document_scope()) is not None:
+        scope.add_search_results(search_results_adapter.validate_json(response))
+
+
+def ingest_search_results(message: ToolMessage) -> None:
+    """他のタスクの呼び出しに合流して受け取った検索結果を、このタスクの文書として取り込む."""
+    _ingest(str(message.content))
+
+
+def _search_web(search_view: str) -> str:
     """指定されたキーワードでWeb検索を行い、検索結果を返します.
 
     Args:
@@ -19,21 +65,46 @@ def search_web(search_view: str) -> str:
 
     Returns:
     -------
-        SearchCreateResponse: 検索結果。
+        str: 検索結果（title, url, snippet を持つオブジェクトの配列）の JSON 文字列。
 
     """  # noqa: E501
-    client = Perplexity()
-    search_create_response: SearchCreateResponse = client.search.create(
-        query=search_view, max_results=3, max_tokens_per_page=512
+    if (response := _lookup_local(search_view)) is not None:
+        return response
+    response = get_cassette().call(
+        kind="search_web",
+        scope="search_web",
+        request={"search_view": search_view},
+        fn=lambda: _format_results(
+            get_search_client().search(
+                query=search_view, max_results=MAX_RESULTS, max_tokens_per_page=512
+            )
+        ),
     )
-    return json.dumps(
-        [
-            {
-                "title": result.title,
-                "url": result.url,
-                "snippet": result.snippet,
-            }
-            for result in search_create_response.results
-        ],
-        ensure_ascii=False,
+    _ingest(response)
+    return response
+
+
+async def _asearch_web(search_view: str) -> str:
+    async def search() -> str:
+        search_results = await get_search_client().asearch(
+            query=search_view, max_results=MAX_RESULTS, max_tokens_per_page=512
+        )
+        return _format_results(search_results)
+
+    if (response := _lookup_local(search_view)) is not None:
+        return response
+    response = await get_cassette().acall(
+        kind="search_web",
+        scope="search_web",
+        request={"search_view": search_view},
+        fn=search,
     )
+    _ingest(response)
+    return response
+
+
+search_web = StructuredTool.from_function(
+    func=_search_web,
+    coroutine=_asearch_web,
+    name="search_web",
+)
@@ -1,13 +1,24 @@
+import hashlib
+import json
+from functools import cache
 from typing import cast, TYPE_CHECKING
 
 from dotenv import load_dotenv
-from langchain_core.tools import tool
-from openai import OpenAI
+from langchain_core.tools import StructuredTool
 from pydantic import BaseModel, Field, computed_field
 
-from app.core.logging import LogLevel
+from app.core.config import settings
+from app.core.logging import LogLevel, log
 from app.domain.enums import BaseEnum
 from app.infrastructure.blob_manager import LocalBlobManager
+from app.infrastructure.cache import MemoryCache
+from app.infrastructure.cassette import get_cassette
+from app.infrastructure.llm_chain.openai_client import (
+    get_async_openai_client,
+    get_openai_client,
+)
+from app.infrastructure.metrics import metrics
+from app.infrastructure.rate_limit import get_outbound_guard, get_rate_budgets
 
 if TYPE_CHECKING:
     from openai.types.responses.parsed_response import ParsedResponse
@@ -50,9 +61,103 @@ class Submission(BaseModel):
 
 blob_manager = LocalBlobManager(log_level=LogLevel.TRACE)
 
+GRADER_CONFIG = {
+    "model": "gpt-5-nano",
+    "reasoning": {"effort": "low"},
+    "text": {"verbosity": "low"},
+}
 
-@tool
-def submit_content(content: str) -> dict[str, str | bool | None]:
+GRADER_ENDPOINT = "openai:responses"
+
+# 提出物の内容ハッシュ + 審査設定をキーに、審査結果を保持する
+verdict_cache = MemoryCache(max_size=settings.SUBMIT_CONTENT_CACHE_MAX_SIZE)
+
+
+@cache
+def _build_system_instruction() -> str:
+    system_instruction_template = blob_manager.read_blob_as_template(
+        "storage/prompts/research_agent/tools/submit_content.jinja"
+    )
+    return system_instruction_template.render(
+        output_format=Submission.model_json_schema()
+    )
+
+
+def _build_request(content: str) -> dict:
+    return {
+        **GRADER_CONFIG,
+        "input": [
+            {"role": "system", "content": _build_system_instruction()},
+            {"role": "user", "content": content},
+        ],
+        "text_format": Submission,
+    }
+
+
+@cache
+def _grader_fingerprint() -> str:
+    grader = json.dumps(
+        [GRADER_CONFIG, _build_system_instruction()], ensure_ascii=False, sort_keys=True
+    )
+    return hashlib.sha256(grader.encode()).hexdigest()
+
+
+def _verdict_cache_key(content: str) -> str:
+    content_hash = hashlib.sha256(content.encode()).hexdigest()
+    return f"{_grader_fingerprint()}:{content_hash}"
+
+
+def _get_cached_verdict(key: str) -> dict[str, str | bool | None] | None:
+    if (verdict := verdict_cache.get(key)) is None:
+        return None
+    log(LogLevel.DEBUG, subject="submit_content", object="verdict_cache", message=key)
+    return json.loads(verdict)
+
+
+def _cache_verdict(key: str, submission: Submission) -> dict[str, str | bool | None]:
+    verdict = submission.model_dump(mode="json")
+    verdict_cache.set(key, json.dumps(verdict, ensure_ascii=False))
+    return verdict
+
+
+def _record_usage(result: "ParsedResponse[Submission]") -> None:
+    # 審査は LangChain を経由しないため、トークン使用量をここで記録する
+    labels = {"node": "submit_content"}
+    metrics.inc("llm_calls_total", labels)
+    if result.usage is not None:
+        metrics.inc("llm_prompt_tokens_total", labels, result.usage.input_tokens)
+        metrics.inc("llm_completion_tokens_total", labels, result.usage.output_tokens)
+
+
+def _grade(content: str) -> dict[str, str | bool | None]:
+    key = _verdict_cache_key(content)
+    if (verdict := _get_cached_verdict(key)) is not None:
+        return verdict
+    result: ParsedResponse[Submission] = get_outbound_guard().call(
+        GRADER_ENDPOINT,
+        lambda: get_openai_client().responses.parse(**_build_request(content)),
+        get_rate_budgets().openai_requests(GRADER_CONFIG["model"]),
+    )
+    _record_usage(result)
+    submission: Submission = cast("Submission", result.output_parsed)
+    return _cache_verdict(key, submission)
+
+
+async def _agrade(content: str) -> dict[str, str | bool | None]:
+    key = _verdict_cache_key(content)
+    if (verdict := _get_cached_verdict(key)) is not None:
+        return verdict
+    result: ParsedResponse[Submission] = await get_outbound_guard().acall(
+        GRADER_ENDPOINT,
+        lambda: get_async_openai_client().responses.parse(**_build_request(content)),
+        get_rate_budgets().openai_requests(GRADER_CONFIG["model"]),
+    )
+    _record_usage(result)
+    submission: Submission = cast("Submission", result.output_parsed)
+    return _cache_verdict(key, submission)
+
+
+def _submit_content(content: str) -> dict[str, str | bool | None]:
     """指定された提出物の内容を審査し、受け入れ可否および理由を返します。
     提出物はマークダウン形式で記述してください。本関数は、その内容が所定の要件や期待を満たしているかどうかを判定し、
     判定結果（受け入れ可否）および詳細な理由や改善点（または称賛ポイント）を返します。.
@@ -68,22 +173,25 @@ def submit_content(content: str) -> dict[str, str | bool | None]:
             reason（str）: 受け入れ可否の根拠や詳細な理由。非受理の場合は改善ポイント、受理の場合は称賛コメントなどを含みます。
 
     """  # noqa: D205
-    client = OpenAI()
-    system_instruction_template = blob_manager.read_blob_as_template(
-        "storage/prompts/research_agent/tools/submit_content.jinja"
-    )
-    system_instruction = system_instruction_template.render(
-        output_format=Submission.model_json_schema()
+    return get_cassette().call(
+        kind="submit_content",
+        scope="submit_content",
+        request={"content": content},
+        fn=lambda: _grade(content),
     )
-    result: ParsedResponse[Submission] = client.responses.parse(
-        model="gpt-5-nano",
-        input=[
-            {"role": "system", "content": system_instruction},
-            {"role": "user", "content": content},
-        ],
-        text_format=Submission,
-        reasoning={"effort": "low"},
-        text={"verbosity": "low"},
+
+
+async def _asubmit_content(content: str) -> dict[str, str | bool | None]:
+    return await get_cassette().acall(
+        kind="submit_content",
+        scope="submit_content",
+        request={"content": content},
+        fn=lambda: _agrade(content),
     )
-    submission: Submission = cast("Submission", result.output_parsed)
-    return submission.model_dump()
+
+
+submit_content = StructuredTool.from_function(
+    func=_submit_content,
+    coroutine=_asubmit_content,
+    name="submit_content",
+)
@@ -1,14 +1,25 @@
 import argparse
+import asyncio
+import sys
+from pathlib import Path
 
 from langchain_core.messages import HumanMessage
 from loguru import logger
 import weave
 
 from app.core.config import settings
+from app.core.utils.datetime_utils import get_current_time
+from app.infrastructure.blob_manager import create_blob_manager
 from app.infrastructure.blob_manager.local import LocalBlobManager
+from app.infrastructure.blob_manager.template_registry import template_registry
+from app.infrastructure.metrics import MetricsCallbackHandler, MetricsServer, metrics
+from app.workflow.enums import Node
 from app.workflow.agent import create_graph
 from app.workflow.models.state import ResearchAgentState, ResearchAgentOutputState
-from app.workflow.agent import invoke_graph
+from app.workflow.agent import ainvoke_graph, invoke_graph, stream_graph
+from app.workflow.batch import BatchRunner, iter_batch_requests, summarize
+from app.workflow.enums import AutoAnswerPolicy
+from app.workflow.nodes.generate_report import resolve_output_path
 
 
 def parse_args() -> argparse.Namespace:
@@ -19,30 +30,124 @@ def parse_args() -> argparse.Namespace:
         type=str,
         default="AIエージェントの登場によりBPOが注目されるようになっていますが、今後注目される領域やビジネスモデルはどのようなものがあると考えられますか？",
     )
+    parser.add_argument(
+        "--use-async",
+        action="store_true",
+        help="ExecuteTaskNode を非同期（単一のイベントループ上）で並行実行する",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="生成中のレポートを標準出力に逐次表示する",
+    )
+    parser.add_argument("--thread-id", type=str, default="default")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="--thread-id のスレッドを最後のチェックポイントから再開する (CHECKPOINTER_BACKEND=sqlite)",
+    )
+    batch = parser.add_argument_group("batch", "JSONL のリクエストをまとめて実行する")
+    batch.add_argument(
+        "--batch",
+        type=str,
+        default=None,
+        help="1 行 1 リクエスト ({id, message, answers?}) の JSONL。指定した場合はバッチ実行する",
+    )
+    batch.add_argument("--batch-output-dir", type=str, default=settings.BATCH_OUTPUT_DIR)
+    batch.add_argument("--workers", type=int, default=settings.BATCH_WORKERS)
+    batch.add_argument(
+        "--executor",
+        choices=["async", "process"],
+        default="async",
+        help="async: 単一のイベントループで並行実行 / process: プロセスプールで並列実行",
+    )
+    batch.add_argument(
+        "--auto-answer",
+        choices=AutoAnswerPolicy.to_list(),
+        default=settings.BATCH_AUTO_ANSWER_POLICY,
+        help="要件収集の質問への自動回答の方針",
+    )
     return parser.parse_args()
 
 
+def run_batch(args: argparse.Namespace) -> None:
+    # 完了済みの ID は status.jsonl から判定して読み飛ばすため、同じコマンドで再開できる
+    requests = iter_batch_requests(args.batch)
+    runner = BatchRunner(
+        graph=None if args.executor == "process" else create_graph(stream_report=False),
+        output_dir=args.batch_output_dir,
+        policy=AutoAnswerPolicy(args.auto_answer),
+        max_interrupts=settings.BATCH_MAX_INTERRUPTS,
+        callbacks=[MetricsCallbackHandler(node_names=set(Node.to_list()))],
+    )
+    if args.executor == "process":
+        results = runner.run_processes(requests, workers=args.workers)
+    else:
+        results = asyncio.run(runner.arun(requests, workers=args.workers))
+    logger.success(f"Batch finished: {summarize(results)} (status: {runner.status_path})")
+
+
 def main() -> None:
     # weave.init(settings.WANDB_PROJECT)
 
     args = parse_args()
-    blob_manager = LocalBlobManager()
+    if settings.TEMPLATE_WARMUP_DIR:
+        template_registry.warm_up(LocalBlobManager(), settings.TEMPLATE_WARMUP_DIR)
+    if args.batch:
+        run_batch(args)
+        return
+
+    blob_manager = create_blob_manager()
     graph = create_graph()
 
-    input_data = ResearchAgentState(
+    if settings.METRICS_PORT is not None:
+        MetricsServer(port=settings.METRICS_PORT).start()
+
+    config = {
+        "recursion_limit": 1000,
+        "thread_id": args.thread_id,
+        "callbacks": [MetricsCallbackHandler(node_names=set(Node.to_list()))],
+    }
+    input_data: ResearchAgentState | None = ResearchAgentState(
         messages=[HumanMessage(content=args.initial_message)],
     )
+    if args.resume:
+        if not graph.get_state(config).next:
+            logger.error(f"No resumable checkpoint found for thread: {args.thread_id}")
+            return
+        # 入力に None を渡すと、最後のチェックポイントから実行を再開する
+        input_data = None
 
-    result: ResearchAgentOutputState = invoke_graph(
-        graph=graph,
-        input_data=input_data,
-        config={"recursion_limit": 1000, "thread_id": "default"},
-    )
+    if args.stream:
+
+        def print_report_token(node: str, token: str) -> None:
+            if node == Node.GENERATE_REPORT.value:
+                sys.stdout.write(token)
+                sys.stdout.flush()
 
-    output_file = "storage/outputs/research_report.md"
-    blob_manager.save_blob_as_str(result["research_report"], output_file)
+        result: ResearchAgentOutputState = stream_graph(
+            graph=graph, input_data=input_data, config=config, on_token=print_report_token
+        )
+    elif args.use_async:
+        result = asyncio.run(
+            ainvoke_graph(graph=graph, input_data=input_data, config=config)
+        )
+    else:
+        result = invoke_graph(graph=graph, input_data=input_data, config=config)
+
+    output_file = resolve_output_path(settings.REPORT_OUTPUT_PATH, args.thread_id)
+    # ストリーミング時は GenerateReportNode が生成しながら書き込み済み
+    if not settings.REPORT_STREAMING:
+        blob_manager.mkdir(str(Path(output_file).parent))
+        blob_manager.save_blob_as_str(result["research_report"], output_file)
     logger.success(f"Research report saved to {output_file}")
 
+    run_id = get_current_time(settings.TIMEZONE, fmt="%Y%m%d_%H%M%S")
+    metrics_file = f"{settings.METRICS_SUMMARY_DIR}/{run_id}.json"
+    blob_manager.mkdir(settings.METRICS_SUMMARY_DIR)
+    blob_manager.save_blob_as_json(metrics.summary(), metrics_file)
+    logger.success(f"Metrics summary saved to {metrics_file}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,134 @@
+"""生成したレポート群を LocalBlobManager と ContentAddressedBlobManager に保存し、ディスク使用量と読み書きの速度を比較する.
+
+--runs 回の実行を想定し、各実行で --reports 件のレポート（Markdown）と検索結果（JSON）を保存する。
+実行間で内容が変わらない成果物の割合を --repeat-ratio で指定する（同じ内容は CAS では 1 度しか保存されない）。
+
+実行例:
+    PYTHONPATH=. uv run python scripts/benchmarks/blob_store.py --runs 5 --reports 200 --repeat-ratio 0.7
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from app.infrastructure.blob_manager import (
+    BaseBlobManager,
+    ContentAddressedBlobManager,
+    LocalBlobManager,
+)
+
+SUBJECTS = ["AIエージェント", "BPO 事業者", "国内市場", "金融業界", "自治体", "コールセンター", "経理部門"]
+TOPICS = ["定型業務", "上流工程", "データ整備", "規制対応", "成果報酬型の契約", "業務設計", "品質管理"]
+PREDICATES = ["が拡大している", "の単価が下落している", "の需要が高まっている", "が外部化されつつある"]
+
+
+def generate_sentence(rng: random.Random) -> str:
+    return (
+        f"{rng.choice(SUBJECTS)}では{rng.choice(TOPICS)}{rng.choice(PREDICATES)}"
+        f"（{rng.randint(2020, 2030)} 年、前年比 {rng.uniform(-20, 40):.1f}%、出典 {rng.randint(1, 999)}）。"
+    )
+
+
+def generate_report(rng: random.Random, idx: int, num_sections: int) -> str:
+    sections = []
+    for section in range(num_sections):
+        body = "".join(generate_sentence(rng) for _ in range(rng.randint(20, 60)))
+        sections.append(f"## {section + 1}. 論点 {idx}-{section}\n\n{body}\n")
+    return f"# リサーチレポート {idx}\n\n" + "\n".join(sections)
+
+
+def generate_search_results(rng: random.Random, idx: int) -> list[dict]:
+    return [
+        {
+            "query": f"BPO 市場 {idx}",
+            "url": f"https://example.com/{idx}/{i}",
+            "snippet": "".join(generate_sentence(rng) for _ in range(5)),
+        }
+        for i in range(10)
+    ]
+
+
+def generate_corpus(args: argparse.Namespace) -> list[list[tuple[str, str, object]]]:
+    """実行ごとの (種別, パス, 内容) のリスト. 繰り返し分は前の実行と同じ内容になる."""
+    runs, previous = [], None
+    for run in range(args.runs):
+        rng = random.Random(run)
+        artifacts = []
+        for idx in range(args.reports):
+            if previous is not None and rng.random() < args.repeat_ratio:
+                _, _, report = previous[idx * 2]
+                _, _, results = previous[idx * 2 + 1]
+            else:
+                report = generate_report(rng, idx, args.sections)
+                results = generate_search_results(rng, idx)
+            artifacts.append(("str", f"runs/{run}/reports/{idx}.md", report))
+            artifacts.append(("json", f"runs/{run}/search/{idx}.json", results))
+        runs.append(artifacts)
+        previous = artifacts
+    return runs
+
+
+def disk_usage(root: Path) -> int:
+    return sum(path.stat().st_size for path in root.rglob("*") if path.is_file())
+
+
+def run(
+    name: str, blob_manager: BaseBlobManager, root: Path, disk_root: Path, corpus: list
+) -> None:
+    logical_bytes = 0
+    start = time.perf_counter()
+    for artifacts in corpus:
+        for kind, path, content in artifacts:
+            blob_path = str(root / path)
+            blob_manager.mkdir(str(Path(blob_path).parent))
+            if kind == "str":
+                blob_manager.save_blob_as_str(content, blob_path)
+                logical_bytes += len(content.encode("utf-8"))
+            else:
+                blob_manager.save_blob_as_json(content, blob_path)
+    write_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    read_bytes = 0
+    for artifacts in corpus:
+        for kind, path, _ in artifacts:
+            if kind == "str":
+                read_bytes += len(blob_manager.read_blob_as_str(str(root / path)).encode("utf-8"))
+            else:
+                blob_manager.read_blob_as_json(str(root / path))
+    read_elapsed = time.perf_counter() - start
+
+    num_blobs = sum(len(artifacts) for artifacts in corpus)
+    print(
+        f"{name:>6}: disk={disk_usage(disk_root) / 1024 / 1024:.1f}MB"
+        f" (reports {logical_bytes / 1024 / 1024:.1f}MB)"
+        f" write={num_blobs / write_elapsed:.0f} blobs/s"
+        f" read={num_blobs / read_elapsed:.0f} blobs/s ({read_bytes / 1024 / 1024 / read_elapsed:.0f}MB/s)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--reports", type=int, default=200)
+    parser.add_argument("--sections", type=int, default=8)
+    parser.add_argument("--repeat-ratio", type=float, default=0.7)
+    parser.add_argument("--compression-level", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args)
+    with tempfile.TemporaryDirectory() as local_dir, tempfile.TemporaryDirectory() as cas_dir:
+        run("local", LocalBlobManager(), Path(local_dir), Path(local_dir), corpus)
+        # CAS ではパスは索引のキーとしてのみ使う
+        cas = ContentAddressedBlobManager(
+            root_dir=cas_dir, compression_level=args.compression_level
+        )
+        run("cas", cas, Path(cas_dir) / "logical", Path(cas_dir), corpus)
+        print(f"{'':>6}  {cas.stats()} deduplicated={cas.deduplicated}")
+        cas.close()
+
+
+if __name__ == "__main__":
+    main()
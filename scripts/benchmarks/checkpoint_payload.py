@@ -0,0 +1,129 @@
+"""各ノードが書き込む状態更新（チェックポイントへの書き込み）のサイズを計測する.
+
+LLM を呼び出さずに固定の出力を返すようにした ResearchAgent を実行し、ノードごとの更新サイズと
+その時点の状態全体のサイズを比較する。ノードが想定外のフィールドを更新した場合は異常終了する。
+
+実行例:
+    PYTHONPATH=. uv run python scripts/benchmarks/checkpoint_payload.py --num-tasks 10
+"""
+
+import argparse
+import sys
+from typing import Any
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.types import Command
+
+from app.domain.enums import ManagedTaskStatus, Priority
+from app.infrastructure.blob_manager import LocalBlobManager
+from app.workflow.agent import ResearchAgent
+from app.workflow.enums import Node
+from app.workflow.models import GatherRequirements, ManagedTask, ResearchPlan, Task
+from app.workflow.models.build_research_plan import ReportSection, TaskType
+from app.workflow.models.gather_requirements import AdditionalQuestion, ManagedItem
+
+# ノードごとに更新してよいフィールド
+EXPECTED_UPDATES = {
+    Node.GATHER_REQUIREMENTS.value: {"inquiry_items"},
+    Node.FEEDBACK_REQUIREMENTS.value: {"inquiry_items", "messages"},
+    Node.BUILD_RESEARCH_PLAN.value: {"goal", "tasks", "storyline"},
+    Node.EXECUTE_TASK.value: {"executed_tasks", "managed_documents"},
+    Node.GENERATE_REPORT.value: {"research_report"},
+}
+
+
+def build_agent(num_tasks: int, deliverable_size: int) -> ResearchAgent:
+    agent = ResearchAgent(blob_manager=LocalBlobManager(), checkpointer=InMemorySaver())
+
+    def gather_requirements(messages: list, inquiry_items: list, verbose: bool = False) -> GatherRequirements:  # noqa: ARG001
+        if not inquiry_items:
+            return GatherRequirements(
+                additional_questions=[
+                    AdditionalQuestion(question=f"質問 {idx}", priority=Priority.HIGH)
+                    for idx in range(3)
+                ]
+            )
+        return GatherRequirements(
+            inquiry_items_evaluation=[
+                ManagedItem(id=item.id, status=ManagedTaskStatus.COMPLETED, answer=item.answer)
+                for item in inquiry_items
+            ]
+        )
+
+    def build_research_plan(messages: list, inquiry_items: list, verbose: bool = False) -> ResearchPlan:  # noqa: ARG001
+        return ResearchPlan(
+            goal="AIエージェントと BPO の今後",
+            acceptance_criteria="主要な領域が網羅されていること",
+            storyline=[ReportSection(section="概要", description="全体の概要")],
+            tasks=[
+                Task(
+                    title=f"タスク {idx}",
+                    overview="overview",
+                    objective="objective",
+                    research_scope="scope",
+                    priority=Priority.HIGH,
+                    required_capabilities=[TaskType.THINKING],
+                )
+                for idx in range(num_tasks)
+            ],
+        )
+
+    def execute_task(state: Any) -> ManagedTask:  # noqa: ANN401
+        return state.task.model_copy(
+            update={"status": ManagedTaskStatus.COMPLETED, "deliverable": "成果物" * deliverable_size}
+        )
+
+    agent.gather_requirements_node.run = gather_requirements  # type: ignore
+    agent.build_research_plan_node.run = build_research_plan  # type: ignore
+    agent.execute_task_node.run = execute_task  # type: ignore
+    agent.generate_report_node.run = lambda **kwargs: "# レポート"  # type: ignore  # noqa: ARG005
+    return agent
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-tasks", type=int, default=10)
+    parser.add_argument("--deliverable-size", type=int, default=2_000)
+    parser.add_argument("--message-size", type=int, default=2_000)
+    args = parser.parse_args()
+
+    serde = JsonPlusSerializer()
+    graph = build_agent(args.num_tasks, args.deliverable_size).graph
+    config = {"configurable": {"thread_id": "checkpoint_payload"}}
+    input_data: Any = {"messages": [HumanMessage(content="調査" * args.message_size)]}
+
+    unexpected = []
+    print(f"{'node':>24} | {'update (KB)':>11} | {'state (KB)':>10} | fields")
+    while input_data is not None:
+        resume = None
+        for chunk in graph.stream(input_data, config, stream_mode="updates"):
+            for node, update in chunk.items():
+                if node == "__interrupt__":
+                    items = update[0].value["inquiry_items"]
+                    resume = {
+                        item.id: item.model_copy(
+                            update={"answer": "回答", "status": ManagedTaskStatus.COMPLETED}
+                        )
+                        for item in items
+                    }
+                    continue
+                fields = set(update or {})
+                state_size = len(serde.dumps_typed(graph.get_state(config).values)[1])
+                update_size = len(serde.dumps_typed(update)[1])
+                print(
+                    f"{node:>24} | {update_size / 1024:>11.1f} | {state_size / 1024:>10.1f}"
+                    f" | {', '.join(sorted(fields))}"
+                )
+                if extra := fields - EXPECTED_UPDATES[node]:
+                    unexpected.append((node, extra))
+        input_data = Command(resume=resume) if resume else None
+
+    if unexpected:
+        print(f"unexpected updates: {unexpected}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
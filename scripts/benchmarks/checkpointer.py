@@ -0,0 +1,99 @@
+"""チェックポインターの書き込み・読み込みレイテンシと保存サイズを、状態サイズごとに計測するベンチマーク.
+
+各ステップで messages に 1 件追加し、大きな documents フィールドは変更しないグラフを実行する。
+SqliteCheckpointSaver では変更のない documents が再保存されないことを blob_bytes で確認できる。
+
+実行例:
+    PYTHONPATH=. uv run python scripts/benchmarks/checkpointer.py --steps 50
+"""
+
+import argparse
+import operator
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated
+
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, StateGraph, add_messages
+from pydantic import BaseModel, Field
+
+from app.infrastructure.checkpointer import SqliteCheckpointSaver
+
+
+class BenchmarkState(BaseModel):
+    messages: Annotated[list, add_messages] = Field(default_factory=list)
+    documents: list[str] = Field(default_factory=list)
+    steps: Annotated[int, operator.add] = 0
+
+
+def build_graph(checkpointer: BaseCheckpointSaver, num_steps: int, message_size: int):  # noqa: ANN201
+    def step(state: BenchmarkState) -> dict:
+        return {"messages": [AIMessage(content="x" * message_size)], "steps": 1}
+
+    def route(state: BenchmarkState) -> str:
+        return END if state.steps >= num_steps else "step"
+
+    workflow = StateGraph(BenchmarkState)
+    workflow.add_node("step", step)
+    workflow.add_edge(START, "step")
+    workflow.add_conditional_edges("step", route, ["step", END])
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def run(
+    checkpointer: BaseCheckpointSaver,
+    num_steps: int,
+    document_size: int,
+    message_size: int,
+) -> tuple[float, float]:
+    graph = build_graph(checkpointer, num_steps, message_size)
+    config = {"configurable": {"thread_id": "benchmark"}, "recursion_limit": num_steps * 2 + 10}
+    # 文書ごとに内容を変え、圧縮が過大評価されないようにする
+    documents = [f"{idx:08d}" + "文書" * (document_size // 6) for idx in range(8)]
+    start = time.perf_counter()
+    graph.invoke({"documents": documents}, config)
+    write_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(10):
+        graph.get_state(config)
+    read_elapsed = (time.perf_counter() - start) / 10
+    return write_elapsed / num_steps, read_elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--message-size", type=int, default=2_000)
+    parser.add_argument("--document-sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print(
+        f"{'document size':>13} | {'checkpointer':>12} | {'write/step (ms)':>15}"
+        f" | {'read (ms)':>9} | {'stored (KB)':>11}"
+    )
+    for document_size in args.document_sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            checkpointers: dict[str, BaseCheckpointSaver] = {
+                "memory": InMemorySaver(),
+                "sqlite": SqliteCheckpointSaver(str(Path(tmp_dir) / "checkpoints.sqlite3")),
+            }
+            for name, checkpointer in checkpointers.items():
+                write, read = run(checkpointer, args.steps, document_size, args.message_size)
+                stored = (
+                    checkpointer.stats()["blob_bytes"] / 1024
+                    if isinstance(checkpointer, SqliteCheckpointSaver)
+                    else float("nan")
+                )
+                print(
+                    f"{document_size:>13} | {name:>12} | {write * 1000:>15.2f}"
+                    f" | {read * 1000:>9.2f} | {stored:>11.1f}"
+                )
+                if isinstance(checkpointer, SqliteCheckpointSaver):
+                    checkpointer.close()
+
+
+if __name__ == "__main__":
+    main()
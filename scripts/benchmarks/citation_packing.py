@@ -0,0 +1,124 @@
+"""レポート生成の前段で、タスク横断の重複段落と出典をまとめた場合のプロンプトのトークン数と処理時間を計測する.
+
+各タスクの調査結果は、タスク固有の段落と、複数のタスクで繰り返し調べられる共通の事実（語尾や出典番号の揺れあり）、
+タスクごとの参考文献一覧（URL のクエリ文字列の揺れあり）で構成する。
+レポートの生成には report_map_reduce.py の擬似チャットモデルを使うため、API キーは不要。
+
+実行例:
+    PYTHONPATH=. uv run python scripts/benchmarks/citation_packing.py --num-tasks 10 20 40
+"""
+
+import argparse
+import random
+import time
+
+from app.core.logging import LogLevel
+from app.domain.enums import ManagedTaskStatus, Priority
+from app.infrastructure.blob_manager import LocalBlobManager
+from app.infrastructure.llm_chain.enums import OpenAIModelName
+from app.infrastructure.metrics import metrics
+from app.workflow.citation_packing import count_tokens, format_sources, pack_citations
+from app.workflow.models import ManagedTask
+from app.workflow.models.build_research_plan import ReportSection, TaskType
+from app.workflow.nodes import GenerateReportNode
+from scripts.benchmarks.report_map_reduce import LatencyChatModel
+
+SUBJECTS = ["BPO", "AIエージェント", "コールセンター", "経理アウトソーシング", "RPA", "生成AI"]
+FACTS = ["市場規模", "年平均成長率", "導入企業の割合", "人材不足の状況", "主要ベンダーのシェア", "価格の動向"]
+ENDINGS = ["である。", "となっている。", "と報告されている。"]
+KANJI = [chr(code) for code in range(0x4E00, 0x4E00 + 3000)]
+
+
+def fact_paragraph(rng: random.Random, fact_idx: int, citation: int) -> str:
+    subject = SUBJECTS[fact_idx % len(SUBJECTS)]
+    fact = FACTS[fact_idx % len(FACTS)]
+    return (
+        f"{subject}の{fact}は、2024年度に{100 + fact_idx * 7}億円規模に達し、"
+        f"前年から{3 + fact_idx % 5}.{fact_idx % 10}%増加した。調査会社は、需要の拡大が2027年まで続くと見込んでおり、"
+        f"特に中堅企業での導入が進む{rng.choice(ENDINGS)}[{citation}]"
+    )
+
+
+def build_tasks(
+    rng: random.Random, num_tasks: int, num_facts: int, own_paragraphs: int
+) -> list[ManagedTask]:
+    tasks = []
+    for task_idx in range(num_tasks):
+        fact_indices = rng.sample(range(num_facts), 3)
+        paragraphs = [fact_paragraph(rng, fact_idx, number) for number, fact_idx in enumerate(fact_indices, 1)]
+        paragraphs += [
+            "".join(rng.choices(KANJI, k=200)) + f"[{rng.randint(1, 3)}]" for _ in range(own_paragraphs)
+        ]
+        references = [
+            f"[{number}] {FACTS[fact_idx % len(FACTS)]}の調査 https://example.com/facts/{fact_idx}"
+            + rng.choice(["", f"?utm_source=task{task_idx}"])
+            for number, fact_idx in enumerate(fact_indices, 1)
+        ]
+        tasks.append(
+            ManagedTask(
+                id=f"t{task_idx}",
+                status=ManagedTaskStatus.COMPLETED,
+                title=f"{SUBJECTS[task_idx % len(SUBJECTS)]}の調査 {task_idx}",
+                overview=f"{SUBJECTS[task_idx % len(SUBJECTS)]}に関する調査",
+                objective="objective",
+                research_scope="scope",
+                priority=Priority.HIGH,
+                required_capabilities=[TaskType.SEARCH],
+                deliverable="\n\n".join(paragraphs) + "\n\n## 参考文献\n" + "\n".join(references),
+            )
+        )
+    return tasks
+
+
+def run(dedup_threshold: float | None, storyline: list[ReportSection], tasks: list[ManagedTask]) -> int:
+    node = GenerateReportNode(
+        model_name=OpenAIModelName.GPT_5_NANO,
+        blob_manager=LocalBlobManager(),
+        log_level=LogLevel.TRACE,
+        dedup_threshold=dedup_threshold,
+    )
+    model = LatencyChatModel(num_sections=len(storyline), decode_seconds_per_char=0.0)
+    node._build_llm = lambda temperature: model  # type: ignore  # noqa: ARG005, SLF001
+    node.chain_cache.clear()
+    node.run(goal="AIエージェントと BPO の今後", storyline=storyline, executed_tasks=tasks)
+    return sum(model.prompt_chars)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-tasks", type=int, nargs="+", default=[10, 20, 40])
+    parser.add_argument("--num-facts", type=int, default=12)
+    parser.add_argument("--own-paragraphs", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    args = parser.parse_args()
+
+    storyline = [ReportSection(section="市場動向", description="市場動向の分析")]
+    print(
+        f"{'tasks':>5} | {'tokens':>7} | {'packed':>7} | {'removed':>7} | {'duplicates':>10}"
+        f" | {'sources':>7} | {'pack (ms)':>9} | {'prompt chars (off -> on)':>24}"
+    )
+    for num_tasks in args.num_tasks:
+        tasks = build_tasks(random.Random(num_tasks), num_tasks, args.num_facts, args.own_paragraphs)
+        start = time.perf_counter()
+        packed = pack_citations(tasks, threshold=args.threshold)
+        elapsed = time.perf_counter() - start
+        num_tokens = count_tokens(GenerateReportNode._format_task_execution(tasks))  # noqa: SLF001
+        packed_num_tokens = count_tokens(
+            GenerateReportNode._format_task_execution(packed.executed_tasks)  # noqa: SLF001
+            + format_sources(packed.sources)
+        )
+        prompt_chars = run(None, storyline, tasks)
+        packed_prompt_chars = run(args.threshold, storyline, tasks)
+        print(
+            f"{num_tasks:>5} | {num_tokens:>7,} | {packed_num_tokens:>7,}"
+            f" | {1 - packed_num_tokens / num_tokens:>7.0%} | {packed.num_duplicates:>10}"
+            f" | {len(packed.sources):>7} | {elapsed * 1e3:>9.1f}"
+            f" | {prompt_chars:>11,} -> {packed_prompt_chars:>9,}"
+        )
+    (removed,) = metrics.summary()["counters"]["report_prompt_tokens_removed_total"]
+    # GenerateReportNode で計上した削減トークン数（dedup を有効にした実行の合計）
+    print(f"report_prompt_tokens_removed_total={removed['value']:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""ExecuteTaskNode のエージェントループを模擬し、ターンごとのプロンプトサイズを圧縮の有無で比較する.
+
+各ターンで search_web を呼び出し（URL の一部は既出）、数ターンごとに submit_content で下書きを提出する。
+
+実行例:
+    PYTHONPATH=. uv run python scripts/benchmarks/context_compaction.py --turns 30
+"""
+
+import argparse
+import json
+import random
+
+from langchain_core.messages import AIMessage, AnyMessage, ToolMessage
+
+from app.core.middleware.compact_context import CompactContextMiddleware, count_tokens
+
+
+def search_turn(turn: int, rng: random.Random, num_urls: int, snippet_chars: int) -> list[AnyMessage]:
+    tool_call_id = f"search_{turn}"
+    results = [
+        {
+            "title": f"記事 {url_id}",
+            "url": f"https://example.com/{url_id}",
+            "snippet": f"{url_id} の要約。" * (snippet_chars // 8),
+        }
+        for url_id in rng.sample(range(num_urls), 3)
+    ]
+    return [
+        AIMessage(
+            content="",
+            tool_calls=[{"id": tool_call_id, "name": "search_web", "args": {"search_view": f"観点 {turn}"}}],
+        ),
+        ToolMessage(content=json.dumps(results, ensure_ascii=False), tool_call_id=tool_call_id),
+    ]
+
+
+def submit_turn(turn: int, draft_chars: int) -> list[AnyMessage]:
+    tool_call_id = f"submit_{turn}"
+    return [
+        AIMessage(
+            content="",
+            tool_calls=[{"id": tool_call_id, "name": "submit_content", "args": {"content": "下書き" * (draft_chars // 3)}}],
+        ),
+        ToolMessage(
+            content=json.dumps({"status": "improvable", "reason_for_rejection": "根拠を追加してください。" * 10}, ensure_ascii=False),
+            tool_call_id=tool_call_id,
+        ),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--submit-every", type=int, default=5)
+    parser.add_argument("--num-urls", type=int, default=20)
+    parser.add_argument("--snippet-chars", type=int, default=400)
+    parser.add_argument("--draft-chars", type=int, default=3_000)
+    parser.add_argument("--token-budget", type=int, default=8_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    middleware = CompactContextMiddleware(token_budget=args.token_budget)
+    messages: list[AnyMessage] = []
+    print(f"{'turn':>4} | {'raw tokens':>10} | {'compacted tokens':>16}")
+    for turn in range(1, args.turns + 1):
+        if turn % args.submit_every == 0:
+            messages += submit_turn(turn, args.draft_chars)
+        else:
+            messages += search_turn(turn, rng, args.num_urls, args.snippet_chars)
+        compacted = middleware.compact(messages)
+        print(f"{turn:>4} | {count_tokens(messages):>10,} | {count_tokens(compacted):>16,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""search_web の前に DocumentStore を引いた場合の、外部検索の削減数と局所検索の速度を計測する.
+
+1 セッションで --tasks 件のタスクがそれぞれ --queries 件の検索を行う。検索語は共通の論点から選び、
+語順や表記（全角・半角）の揺れを加える（正規化したクエリをキーとする検索キャッシュではヒットしない揺れ）。
+
+実行例:
+    PYTHONPATH=. uv run python scripts/benchmarks/document_store.py --sessions 20 --tasks 8 --queries 4 --index-size 100000
+"""
+
+import argparse
+import random
+import time
+import unicodedata
+
+from app.core.logging import LogLevel
+from app.infrastructure.document_store import DocumentStore
+from app.infrastructure.search_client import FakeSearchClient, normalize_query
+
+SUBJECTS = ["BPO", "AIエージェント", "コールセンター", "経理アウトソーシング", "RPA", "生成AI"]
+ASPECTS = ["市場規模", "導入事例", "価格動向", "規制", "人材不足", "競合"]
+REGIONS = ["国内", "米国", "アジア"]
+
+
+def generate_query(rng: random.Random) -> str:
+    words = [rng.choice(SUBJECTS), rng.choice(ASPECTS), rng.choice(REGIONS)]
+    rng.shuffle(words)
+    query = " ".join(words)
+    # 半角・全角の揺れ
+    return unicodedata.normalize("NFKC", query) if rng.random() < 0.5 else query.replace("AI", "ＡＩ")
+
+
+def run_sessions(args: argparse.Namespace) -> None:
+    rng = random.Random(0)
+    client = FakeSearchClient()
+    # 検索キャッシュ（正規化したクエリがキー）はプロセス全体で共有、文書ストアはセッションごと
+    cache_keys: set[str] = set()
+    searches, cache_only, combined = 0, 0, 0
+    for _ in range(args.sessions):
+        store = DocumentStore(min_coverage=args.min_coverage, log_level=LogLevel.TRACE)
+        for task_idx in range(args.tasks):
+            for _ in range(args.queries):
+                query = generate_query(rng)
+                searches += 1
+                cached = normalize_query(query) in cache_keys
+                cache_keys.add(normalize_query(query))
+                cache_only += not cached
+                if store.lookup(query, k=3) is not None:
+                    continue
+                combined += not cached
+                store.add_search_results(client.search(query, max_results=3), task_id=str(task_idx))
+    print(
+        f"searches={searches} external: query cache={cache_only}"
+        f" query cache + document store={combined} ({1 - combined / cache_only:.0%} fewer)"
+    )
+
+
+def bench_index(args: argparse.Namespace) -> None:
+    rng = random.Random(1)
+    store = DocumentStore(log_level=LogLevel.TRACE)
+    client = FakeSearchClient()
+    start = time.perf_counter()
+    for idx in range(args.index_size // 3):
+        store.add_search_results(
+            client.search(f"{generate_query(rng)} {idx}", max_results=3), task_id=str(idx)
+        )
+    elapsed = time.perf_counter() - start
+    print(f"index: {len(store)} documents in {elapsed:.1f}s ({len(store) / elapsed:.0f} docs/s)")
+    queries = [generate_query(rng) for _ in range(200)]
+    start = time.perf_counter()
+    for query in queries:
+        store.search(query, k=3)
+    elapsed = time.perf_counter() - start
+    print(f"search: {elapsed / len(queries) * 1000:.2f}ms/query")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--tasks", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=4)
+    parser.add_argument("--min-coverage", type=float, default=0.8)
+    parser.add_argument("--index-size", type=int, default=100_000)
+    args = parser.parse_args()
+    run_sessions(args)
+    bench_index(args)
+
+
+if __name__ == "__main__":
+    main()
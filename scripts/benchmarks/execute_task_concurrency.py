@@ -0,0 +1,123 @@
+"""ExecuteTaskNode の同期（スレッド）実行と非同期実行の壁時計時間を比較するベンチマーク.
+
+実行例:
+    PYTHONPATH=. uv run python scripts/benchmarks/execute_task_concurrency.py --latency 0.5
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.core.config import settings
+from app.domain.enums import ManagedTaskStatus, Priority
+from app.infrastructure.blob_manager import LocalBlobManager
+from app.infrastructure.llm_chain.enums import OpenAIModelName
+from app.workflow.models import ExecuteTaskState, ManagedTask
+from app.workflow.models.build_research_plan import TaskType
+from app.workflow.nodes import ExecuteTaskNode
+
+
+class SleepyChatModel(BaseChatModel):
+    """固定レイテンシで応答する、ネットワークに出ないチャットモデル."""
+
+    latency: float = 0.5
+
+    @property
+    def _llm_type(self) -> str:
+        return "sleepy"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "SleepyChatModel":  # noqa: ANN401, ARG002
+        return self
+
+    def _result(self) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="deliverable"))])
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],  # noqa: ARG002
+        stop: list[str] | None = None,  # noqa: ARG002
+        run_manager: CallbackManagerForLLMRun | None = None,  # noqa: ARG002
+        **kwargs: Any,  # noqa: ANN401, ARG002
+    ) -> ChatResult:
+        time.sleep(self.latency)
+        return self._result()
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],  # noqa: ARG002
+        stop: list[str] | None = None,  # noqa: ARG002
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,  # noqa: ARG002
+        **kwargs: Any,  # noqa: ANN401, ARG002
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._result()
+
+
+def build_states(num_tasks: int) -> list[ExecuteTaskState]:
+    return [
+        ExecuteTaskState(
+            goal="benchmark",
+            task=ManagedTask(
+                id=f"t{idx}",
+                status=ManagedTaskStatus.NOT_STARTED,
+                title=f"task {idx}",
+                overview="overview",
+                objective="objective",
+                research_scope="scope",
+                priority=Priority.HIGH,
+                required_capabilities=[TaskType.THINKING],
+            ),
+        )
+        for idx in range(num_tasks)
+    ]
+
+
+def run_sync(node: ExecuteTaskNode, states: list[ExecuteTaskState]) -> float:
+    # LangGraph の同期実行と同様に、タスクごとにスレッドを割り当てる
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(states)) as executor:
+        list(executor.map(node, states))
+    return time.perf_counter() - start
+
+
+async def run_async(node: ExecuteTaskNode, states: list[ExecuteTaskState]) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(node.acall(state) for state in states))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--num-tasks", type=int, nargs="+", default=[1, 2, 5, 10, 20])
+    args = parser.parse_args()
+
+    # 同時実行数の比較のみを行うため、トークン数の見積もりによる待機は発生させない
+    settings.EXECUTE_TASK_ESTIMATED_TOKENS = 0
+
+    node = ExecuteTaskNode(
+        model_name=OpenAIModelName.GPT_5_NANO,
+        blob_manager=LocalBlobManager(),
+    )
+    node.model_name = SleepyChatModel(latency=args.latency)  # type: ignore
+
+    print(f"{'tasks':>5} | {'sync (s)':>9} | {'async (s)':>9}")
+    for num_tasks in args.num_tasks:
+        states = build_states(num_tasks)
+        sync_elapsed = run_sync(node, states)
+        async_elapsed = asyncio.run(run_async(node, states))
+        print(f"{num_tasks:>5} | {sync_elapsed:>9.3f} | {async_elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
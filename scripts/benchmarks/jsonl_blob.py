@@ -0,0 +1,105 @@
+"""大きな JSONL（カセット・ログ）の書き込み・読み込みの速度と最大メモリ使用量を計測する.
+
+CassetteEntry と同じ形の行を append_blob_as_jsonl で --size-mb まで書き込み、読み込み方ごとに
+別プロセスで全行を走査する。list（read_blob_as_jsonl で全行をリストにする）以外はメモリ使用量が
+ファイルサイズに依存しないことを確認する。数 GB の場合は --modes から list を外すこと。
+
+実行例:
+    PYTHONPATH=. uv run python scripts/benchmarks/jsonl_blob.py --size-mb 2048 --modes iter_json iter_orjson mmap
+"""
+
+import argparse
+import random
+import resource
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.utils import json_codec
+from app.infrastructure.blob_manager import LocalBlobManager
+
+MODES = ["list", "iter_json", "iter_orjson", "mmap"]
+
+
+def generate_entries(size_bytes: int, response_chars: int) -> Iterator[dict]:
+    written, idx = 0, 0
+    while written < size_bytes:
+        entry = {
+            "kind": random.choice(["chat_model", "search_web", "submit_content"]),
+            "scope": f"scope-{idx % 50}",
+            "key": f"{random.getrandbits(256):064x}",
+            "response": {
+                "content": "AIエージェントと BPO の今後について。" * (response_chars // 20),
+                "citations": [f"https://example.com/{idx}/{i}" for i in range(5)],
+            },
+            "latency": random.random(),
+        }
+        # 行の大きさの目安（UTF-8 の日本語は 3 バイト）
+        written += len(str(entry)) + response_chars * 2
+        idx += 1
+        yield entry
+
+
+def max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def write(path: str, size_bytes: int, response_chars: int) -> tuple[int, float, float]:
+    start = time.perf_counter()
+    num_lines = LocalBlobManager().append_blob_as_jsonl(
+        generate_entries(size_bytes, response_chars), path
+    )
+    return num_lines, time.perf_counter() - start, max_rss_mb()
+
+
+def read(path: str, mode: str) -> tuple[int, float, float]:
+    if mode == "iter_json":
+        json_codec.orjson = None
+    # mmap 以外はメモリマップを使わない
+    settings.BLOB_MMAP_MIN_BYTES = 0 if mode == "mmap" else 1 << 62
+    blob_manager = LocalBlobManager()
+    start = time.perf_counter()
+    if mode == "list":
+        num_lines = len(blob_manager.read_blob_as_jsonl(path))
+    else:
+        num_lines = sum(1 for _ in blob_manager.iter_blob_as_jsonl(path))
+    return num_lines, time.perf_counter() - start, max_rss_mb()
+
+
+def run_isolated(fn, *args) -> tuple[int, float, float]:  # noqa: ANN001
+    # 最大メモリ使用量を計測ごとに分けるため、新しいプロセスで実行する
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(fn, *args).result()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--path", default="storage/benchmarks/jsonl_blob.jsonl")
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--response-chars", type=int, default=2000)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--keep", action="store_true", help="計測後もファイルを残す")
+    args = parser.parse_args()
+
+    Path(args.path).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.path).unlink(missing_ok=True)
+    num_lines, elapsed, rss = run_isolated(
+        write, args.path, args.size_mb * 1024 * 1024, args.response_chars
+    )
+    size_mb = Path(args.path).stat().st_size / 1024 / 1024
+    print(f"{'write':>12}: lines={num_lines} size={size_mb:.0f}MB elapsed={elapsed:.2f}s "
+          f"({size_mb / elapsed:.0f}MB/s) max_rss={rss:.0f}MB")
+    try:
+        for mode in args.modes:
+            num_lines, elapsed, rss = run_isolated(read, args.path, mode)
+            print(f"{mode:>12}: lines={num_lines} elapsed={elapsed:.2f}s "
+                  f"({size_mb / elapsed:.0f}MB/s) max_rss={rss:.0f}MB")
+    finally:
+        if not args.keep:
+            Path(args.path).unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
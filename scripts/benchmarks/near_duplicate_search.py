@@ -0,0 +1,116 @@
+"""NearDuplicateSearchClient による外部検索の削減数と、キャッシュ件数に対する検索速度を計測する.
+
+- paraphrase: 同じ意図のクエリを語順・助詞・表記（全角・半角）を変えて発行し、完全一致のキャッシュと比較する
+  （別の意図のクエリの結果を返した件数を false_merges として数える）
+- scale: --size 件のクエリを登録し、LSH による検索と全件比較の 1 件あたりの時間を比較する
+
+実行例:
+    PYTHONPATH=. uv run python scripts/benchmarks/near_duplicate_search.py --intents 300 --paraphrases 6 --size 200000
+"""
+
+import argparse
+import random
+import time
+
+from app.core.logging import LogLevel
+from app.infrastructure.search_client import FakeSearchClient, NearDuplicateSearchClient, normalize_query
+from app.infrastructure.search_client.near_duplicate import QueryTerms
+
+SUBJECTS = ["BPO", "AIエージェント", "コールセンター", "経理アウトソーシング", "RPA", "生成AI", "SaaS", "人材派遣"]
+ASPECTS = ["市場規模", "導入事例", "価格動向", "規制", "人材不足", "競合", "成長率", "課題"]
+REGIONS = ["国内", "米国", "欧州", "アジア", "2024年", "2025年"]
+PARTICLES = ["の", "における", "に関する", "について", "と"]
+SUFFIXES = ["", "", "について", "とは", "を調べる"]
+
+
+def paraphrase(rng: random.Random, words: list[str]) -> str:
+    words = words.copy()
+    rng.shuffle(words)
+    query = "".join(
+        word + (rng.choice(PARTICLES) if idx < len(words) - 1 and rng.random() < 0.5 else " ")
+        for idx, word in enumerate(words)
+    ).strip() + rng.choice(SUFFIXES)
+    # 全角英字の揺れ
+    return query.replace("AI", "ＡＩ").replace("BPO", "ＢＰＯ") if rng.random() < 0.3 else query
+
+
+def bench_paraphrase(args: argparse.Namespace) -> None:
+    rng = random.Random(0)
+    intents = [[rng.choice(SUBJECTS), rng.choice(ASPECTS), rng.choice(REGIONS)] for _ in range(args.intents)]
+    queries = [
+        (intent_idx, paraphrase(rng, intent))
+        for intent_idx, intent in enumerate(intents)
+        for _ in range(args.paraphrases)
+    ]
+    rng.shuffle(queries)
+
+    exact_keys = {normalize_query(query) for _, query in queries}
+    fake = FakeSearchClient()
+    client = NearDuplicateSearchClient(fake, threshold=args.threshold, log_level=LogLevel.TRACE)
+    intent_of = {}
+    false_merges = 0
+    for intent_idx, query in queries:
+        results = client.search(query)
+        # FakeSearchClient の結果のタイトルは「クエリ (番号)」
+        source = results[0].title.rsplit(" (", 1)[0]
+        intent_of.setdefault(source, intent_idx)
+        false_merges += frozenset(intents[intent_of[source]]) != frozenset(intents[intent_idx])
+    distinct_intents = len({frozenset(intent) for intent in intents})
+    print(
+        f"queries={len(queries)} intents={distinct_intents}"
+        f" external: exact cache={len(exact_keys)} near-duplicate={fake.num_calls}"
+        f" ({1 - fake.num_calls / len(exact_keys):.0%} fewer) false_merges={false_merges}"
+    )
+
+
+def random_query(rng: random.Random, vocabulary: list[str]) -> str:
+    return " ".join(rng.sample(vocabulary, rng.randint(3, 5)))
+
+
+def bench_scale(args: argparse.Namespace) -> None:
+    rng = random.Random(1)
+    kanji = [chr(code) for code in range(0x4E00, 0x4E00 + 2000)]
+    vocabulary = ["".join(rng.sample(kanji, 2)) for _ in range(5000)] + [f"w{idx}" for idx in range(5000)]
+    client = NearDuplicateSearchClient(
+        FakeSearchClient(), threshold=args.threshold, max_size=args.size, log_level=LogLevel.TRACE
+    )
+    queries = [random_query(rng, vocabulary) for _ in range(args.size)]
+    start = time.perf_counter()
+    for query in queries:
+        client.search(query, max_results=1)
+    elapsed = time.perf_counter() - start
+    print(f"fill: {len(client)} queries in {elapsed:.1f}s ({elapsed / args.size * 1e6:.0f}us/query)")
+
+    probes = [
+        " ".join(reversed(query.split())) for query in rng.sample(queries, 500)
+    ] + [random_query(rng, vocabulary) for _ in range(500)]
+    start = time.perf_counter()
+    for probe in probes:
+        client.search(probe, max_results=1)
+    lsh_elapsed = (time.perf_counter() - start) / len(probes)
+
+    query_terms = [QueryTerms.from_query(query) for query in queries]
+    start = time.perf_counter()
+    for probe in probes[:20]:
+        terms = QueryTerms.from_query(probe)
+        max((terms.similarity(other) for other in query_terms), default=0.0)
+    linear_elapsed = (time.perf_counter() - start) / 20
+    print(
+        f"lookup at {len(client)}: lsh={lsh_elapsed * 1e6:.0f}us/query"
+        f" linear scan={linear_elapsed * 1e6:.0f}us/query hits={client.hits}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--intents", type=int, default=300)
+    parser.add_argument("--paraphrases", type=int, default=6)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--size", type=int, default=200_000)
+    args = parser.parse_args()
+    bench_paraphrase(args)
+    bench_scale(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""S3BlobManager の転送速度を、スタブのオブジェクトストレージ（object_store_server.py）に対して計測する.
+
+- small: 多数の小さなブロブを並列に保存・読み込みする。コネクションを都度張る場合（プールなし）と比較する
+- large: 少数の大きなブロブを 1 リクエストで転送する場合と、パートに分けて並列に転送する場合を比較する
+  （--bandwidth-mbps でコネクションごとの帯域を制限し、並列転送の効果を確認する）
+- cached: 2 回目以降の読み込み（ETag が一致すれば 304 を返し、ローカルのキャッシュを使う）
+
+実行例:
+    PYTHONPATH=. uv run python scripts/benchmarks/object_store.py --small 2000 --large 4 --large-mb 64 --bandwidth-mbps 400
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from app.infrastructure.blob_manager import S3BlobManager
+from scripts.benchmarks.object_store_server import start_object_store_server
+
+
+def build_manager(url: str, cache_dir: str, multipart: bool, args: argparse.Namespace) -> S3BlobManager:
+    return S3BlobManager(
+        endpoint_url=url,
+        bucket="benchmark",
+        cache_dir=cache_dir,
+        max_connections=args.threads,
+        # multipart=False の場合は大きなブロブも 1 リクエストで転送する
+        multipart_threshold=args.part_mb * 1024 * 1024 if multipart else 1 << 62,
+        part_size=args.part_mb * 1024 * 1024 if multipart else 1 << 62,
+        max_concurrency=args.concurrency,
+    )
+
+
+def timed(fn, items: list, threads: int) -> float:  # noqa: ANN001
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(fn, items))
+    return time.perf_counter() - start
+
+
+def bench_small(url: str, store, args: argparse.Namespace) -> None:  # noqa: ANN001
+    payload = os.urandom(args.small_kb * 1024)
+    paths = [f"small/{idx:06d}.bin" for idx in range(args.small)]
+
+    def put_without_pool(path: str) -> None:
+        # コネクションを都度張る（プールなし）
+        with httpx.Client() as client:
+            client.put(f"{url}/benchmark/unpooled/{path}", content=payload).raise_for_status()
+
+    connections = store.connections
+    elapsed = timed(put_without_pool, paths, args.threads)
+    print(f"{'small put (no pool)':>22}: {args.small / elapsed:.0f} blobs/s connections={store.connections - connections}")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        blob_manager = build_manager(url, cache_dir, True, args)
+        connections = store.connections
+        elapsed = timed(lambda path: blob_manager.save_blob_as_bytes(payload, path), paths, args.threads)
+        print(f"{'small put (pooled)':>22}: {args.small / elapsed:.0f} blobs/s connections={store.connections - connections}")
+        elapsed = timed(blob_manager.read_blob_as_bytes, paths, args.threads)
+        print(f"{'small get (cached)':>22}: {args.small / elapsed:.0f} blobs/s {blob_manager.stats}")
+        blob_manager.close()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        blob_manager = build_manager(url, cache_dir, True, args)
+        elapsed = timed(blob_manager.read_blob_as_bytes, paths, args.threads)
+        print(f"{'small get (cold)':>22}: {args.small / elapsed:.0f} blobs/s {blob_manager.stats}")
+        blob_manager.close()
+
+
+def bench_large(url: str, args: argparse.Namespace) -> None:
+    size = args.large_mb * 1024 * 1024
+    with tempfile.TemporaryDirectory() as source_dir:
+        source = os.path.join(source_dir, "large.bin")
+        with open(source, "wb") as fo:
+            fo.write(os.urandom(size))
+        paths = [f"large/{idx}.bin" for idx in range(args.large)]
+        total_mb = args.large_mb * args.large
+        for multipart in [False, True]:
+            name = "parallel" if multipart else "single"
+            with tempfile.TemporaryDirectory() as cache_dir:
+                blob_manager = build_manager(url, cache_dir, multipart, args)
+                content = open(source, "rb").read()  # noqa: SIM115
+                elapsed = timed(
+                    lambda path: blob_manager.save_blob_as_bytes(content, path), paths, 1  # noqa: B023
+                )
+                print(f"{'large put (' + name + ')':>22}: {total_mb / elapsed:.0f}MB/s")
+                blob_manager.close()
+            with tempfile.TemporaryDirectory() as cache_dir:
+                blob_manager = build_manager(url, cache_dir, multipart, args)
+                elapsed = timed(blob_manager.fetch, paths, 1)
+                print(f"{'large get (' + name + ')':>22}: {total_mb / elapsed:.0f}MB/s")
+                if multipart:
+                    elapsed = timed(blob_manager.fetch, paths, 1)
+                    print(f"{'large get (cached)':>22}: {total_mb / elapsed:.0f}MB/s {blob_manager.stats}")
+                blob_manager.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--small", type=int, default=2000)
+    parser.add_argument("--small-kb", type=int, default=8)
+    parser.add_argument("--large", type=int, default=4)
+    parser.add_argument("--large-mb", type=int, default=64)
+    parser.add_argument("--part-mb", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.002)
+    parser.add_argument("--bandwidth-mbps", type=float, default=400)
+    args = parser.parse_args()
+
+    bandwidth = args.bandwidth_mbps * 1024 * 1024 / 8 if args.bandwidth_mbps else None
+    server, store = start_object_store_server(latency=args.latency, bandwidth=bandwidth)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    bench_small(url, store, args)
+    bench_large(url, args)
+    print(f"requests={store.requests} connections={store.connections}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
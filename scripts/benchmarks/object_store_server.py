@@ -0,0 +1,238 @@
+"""S3BlobManager の動作確認・ベンチマーク用の、S3 互換 API の最小限のスタブサーバー（メモリ上に保持する）.
+
+対応する操作: PutObject / GetObject (Range, If-None-Match, If-Match) / HeadObject / DeleteObject /
+ListObjectsV2 (prefix, delimiter, max-keys, continuation-token) / マルチパートアップロード。
+署名は検証しない。--latency でリクエストごとの遅延、--bandwidth-mbps でコネクションごとの帯域を模擬する。
+
+実行例:
+    PYTHONPATH=. uv run python scripts/benchmarks/object_store_server.py --port 9000
+    BLOB_BACKEND=s3 S3_ENDPOINT_URL=http://127.0.0.1:9000 uv run python main.py
+"""
+
+import argparse
+import hashlib
+import threading
+import time
+import xml.etree.ElementTree as ET
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+from xml.sax.saxutils import escape
+
+XMLNS = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+
+class StoredObject(NamedTuple):
+    content: bytes
+    etag: str
+    last_modified: float
+
+
+class ObjectStore:
+    def __init__(self, latency: float = 0.0, bandwidth: float | None = None) -> None:
+        self.latency = latency
+        # コネクションごとの帯域（バイト/秒）
+        self.bandwidth = bandwidth
+        self.lock = threading.Lock()
+        self.objects: dict[tuple[str, str], StoredObject] = {}
+        self.uploads: dict[str, dict[int, bytes]] = {}
+        self.requests = 0
+        self.connections = 0
+
+    def transfer(self, num_bytes: int) -> None:
+        if self.bandwidth:
+            time.sleep(num_bytes / self.bandwidth)
+
+
+class ObjectStoreHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    store: ObjectStore
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+    def setup(self) -> None:
+        super().setup()
+        with self.store.lock:
+            self.store.connections += 1
+
+    def _parse(self) -> tuple[str, str, dict[str, str]]:
+        url = urlsplit(self.path)
+        bucket, _, key = unquote(url.path).lstrip("/").partition("/")
+        return bucket, key, dict(parse_qsl(url.query, keep_blank_values=True))
+
+    def _body(self) -> bytes:
+        body = self.rfile.read(int(self.headers.get("content-length", 0)))
+        self.store.transfer(len(body))
+        return body
+
+    def _send(self, status: int, body: bytes = b"", headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        if "Content-Length" not in (headers or {}):
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.store.transfer(len(body))
+            self.wfile.write(body)
+
+    def _xml(self, status: int, root: str, body: str) -> None:
+        xml = f'<?xml version="1.0" encoding="UTF-8"?><{root} xmlns="{XMLNS}">{body}</{root}>'
+        self._send(status, xml.encode("utf-8"), {"Content-Type": "application/xml"})
+
+    def _error(self, status: int, code: str) -> None:
+        self._xml(status, "Error", f"<Code>{code}</Code>")
+
+    def _handle(self) -> None:
+        with self.store.lock:
+            self.store.requests += 1
+        time.sleep(self.store.latency)
+        bucket, key, query = self._parse()
+        match self.command:
+            case "GET" if not key:
+                self._list(bucket, query)
+            case "GET" | "HEAD":
+                self._get(bucket, key)
+            case "PUT" if "uploadId" in query:
+                body = self._body()
+                with self.store.lock:
+                    self.store.uploads[query["uploadId"]][int(query["partNumber"])] = body
+                self._send(200, headers={"ETag": f'"{hashlib.md5(body).hexdigest()}"'})
+            case "PUT":
+                self._put(bucket, key, self._body())
+            case "POST" if "uploads" in query:
+                upload_id = hashlib.md5(f"{key}{time.time_ns()}".encode()).hexdigest()
+                with self.store.lock:
+                    self.store.uploads[upload_id] = {}
+                self._xml(
+                    200,
+                    "InitiateMultipartUploadResult",
+                    f"<Bucket>{bucket}</Bucket><Key>{escape(key)}</Key><UploadId>{upload_id}</UploadId>",
+                )
+            case "POST" if "uploadId" in query:
+                part_numbers = [
+                    int(element.text or 0)
+                    for element in ET.fromstring(self._body()).iter("PartNumber")
+                ]
+                with self.store.lock:
+                    parts = self.store.uploads.pop(query["uploadId"])
+                content = b"".join(parts[number] for number in part_numbers)
+                etag = self._put(bucket, key, content, respond=False)
+                self._xml(
+                    200,
+                    "CompleteMultipartUploadResult",
+                    f"<Key>{escape(key)}</Key><ETag>{escape(etag)}</ETag>",
+                )
+            case "DELETE":
+                with self.store.lock:
+                    if "uploadId" in query:
+                        self.store.uploads.pop(query["uploadId"], None)
+                    else:
+                        self.store.objects.pop((bucket, key), None)
+                self._send(204)
+            case _:
+                self._error(405, "MethodNotAllowed")
+
+    do_GET = do_HEAD = do_PUT = do_POST = do_DELETE = _handle  # noqa: N815
+
+    def _put(self, bucket: str, key: str, content: bytes, respond: bool = True) -> str:
+        etag = f'"{hashlib.md5(content).hexdigest()}"'
+        with self.store.lock:
+            self.store.objects[(bucket, key)] = StoredObject(content, etag, time.time())
+        if respond:
+            self._send(200, headers={"ETag": etag})
+        return etag
+
+    def _get(self, bucket: str, key: str) -> None:
+        with self.store.lock:
+            stored = self.store.objects.get((bucket, key))
+        if stored is None:
+            self._error(404, "NoSuchKey")
+            return
+        headers = {
+            "ETag": stored.etag,
+            "Last-Modified": formatdate(stored.last_modified, usegmt=True),
+            "Accept-Ranges": "bytes",
+        }
+        if self.headers.get("if-none-match") == stored.etag:
+            self._send(304, headers=headers)
+            return
+        if (if_match := self.headers.get("if-match")) not in (None, "*", stored.etag):
+            self._error(412, "PreconditionFailed")
+            return
+        size = len(stored.content)
+        if self.command == "HEAD":
+            self._send(200, headers={**headers, "Content-Length": str(size)})
+            return
+        if (byte_range := self.headers.get("range")) is None:
+            self._send(200, stored.content, headers)
+            return
+        start_text, _, end_text = byte_range.removeprefix("bytes=").partition("-")
+        start, end = int(start_text), min(int(end_text or size - 1), size - 1)
+        if start >= size:
+            self._send(416, headers={"Content-Range": f"bytes */{size}"})
+            return
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        self._send(206, stored.content[start : end + 1], headers)
+
+    def _list(self, bucket: str, query: dict[str, str]) -> None:
+        prefix, delimiter = query.get("prefix", ""), query.get("delimiter", "")
+        max_keys = int(query.get("max-keys", 1000))
+        with self.store.lock:
+            keys = sorted(key for b, key in self.store.objects if b == bucket and key.startswith(prefix))
+        entries: list[tuple[str, bool]] = []
+        for key in keys:
+            rest = key[len(prefix) :]
+            if delimiter and delimiter in rest:
+                common_prefix = prefix + rest.split(delimiter, 1)[0] + delimiter
+                if not entries or entries[-1] != (common_prefix, True):
+                    entries.append((common_prefix, True))
+            else:
+                entries.append((key, False))
+        token = query.get("continuation-token")
+        start = next((i for i, (name, _) in enumerate(entries) if name > token), len(entries)) if token else 0
+        page = entries[start : start + max_keys]
+        truncated = start + max_keys < len(entries)
+        body = "".join(
+            f"<CommonPrefixes><Prefix>{escape(name)}</Prefix></CommonPrefixes>"
+            if is_prefix
+            else f"<Contents><Key>{escape(name)}</Key></Contents>"
+            for name, is_prefix in page
+        )
+        body += f"<IsTruncated>{'true' if truncated else 'false'}</IsTruncated>"
+        if truncated:
+            body += f"<NextContinuationToken>{escape(page[-1][0])}</NextContinuationToken>"
+        self._xml(200, "ListBucketResult", f"<Name>{bucket}</Name><KeyCount>{len(page)}</KeyCount>{body}")
+
+
+def start_object_store_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency: float = 0.0,
+    bandwidth: float | None = None,
+) -> tuple[ThreadingHTTPServer, ObjectStore]:
+    store = ObjectStore(latency=latency, bandwidth=bandwidth)
+    handler = type("Handler", (ObjectStoreHandler,), {"store": store})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, store
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--bandwidth-mbps", type=float, default=None)
+    args = parser.parse_args()
+    bandwidth = args.bandwidth_mbps * 1024 * 1024 / 8 if args.bandwidth_mbps else None
+    server, _ = start_object_store_server(args.host, args.port, args.latency, bandwidth)
+    print(f"listening on http://{args.host}:{server.server_address[1]}")
+    threading.Event().wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""429 と 5xx を注入するスタブ HTTP サーバーに対し、OutboundGuard の再試行・サーキットブレーカーを検証する.
+
+OpenAI（ChatOpenAI / OpenAI クライアント）と Perplexity の SDK の接続先をスタブサーバーに向け、
+ガードなし（SDK の再試行も無効）とガードありで、成功・失敗した呼び出しの数を比較する。
+最後に、常に 503 を返すエンドポイントでサーキットブレーカーが開き、以降の呼び出しが
+即座に失敗することを確認する。
+
+実行例:
+    PYTHONPATH=. uv run python scripts/benchmarks/outbound_retry.py --calls 30 --rate-limit-ratio 0.3 --server-error-ratio 0.2
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.core.config import settings
+from app.core.exception import CircuitOpenError
+from app.infrastructure.metrics import metrics
+
+
+class FaultInjectingHandler(BaseHTTPRequestHandler):
+    """一定の割合で 429（Retry-After 付き）と 5xx を返す、OpenAI・Perplexity 互換のスタブ."""
+
+    server: "StubServer"
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002, ARG002
+        pass
+
+    def _send(self, status: int, body: dict, headers: dict[str, str] | None = None) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        fault = self.server.next_fault(self.path)
+        self.server.status_counts[fault or 200] += 1
+        if fault == 429:
+            self._send(
+                429,
+                {"error": {"message": "rate limited", "type": "rate_limit_error"}},
+                {"Retry-After": str(self.server.retry_after)},
+            )
+            return
+        if fault is not None:
+            self._send(fault, {"error": {"message": "unavailable", "type": "server_error"}})
+            return
+        if self.path.endswith("/chat/completions"):
+            self._send(
+                200,
+                {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": "gpt-5-nano",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": "ok"},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                },
+            )
+            return
+        self._send(
+            200,
+            {
+                "id": "search-stub",
+                "results": [
+                    {"title": "stub", "url": "https://example.com/stub", "snippet": "stub"}
+                ],
+            },
+        )
+
+
+class StubServer(ThreadingHTTPServer):
+    def __init__(
+        self,
+        rate_limit_ratio: float,
+        server_error_ratio: float,
+        retry_after: float,
+        seed: int,
+    ) -> None:
+        super().__init__(("127.0.0.1", 0), FaultInjectingHandler)
+        self.rate_limit_ratio = rate_limit_ratio
+        self.server_error_ratio = server_error_ratio
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.status_counts: Counter[int] = Counter()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def next_fault(self, path: str) -> int | None:
+        if path.startswith("/down"):
+            return 503
+        with self.lock:
+            value = self.rng.random()
+        if value < self.rate_limit_ratio:
+            return 429
+        if value < self.rate_limit_ratio + self.server_error_ratio:
+            return self.rng.choice([500, 502, 503])
+        return None
+
+
+def run_calls(name: str, calls: int, fn: Callable[[], object]) -> None:
+    outcomes: Counter[str] = Counter()
+    start = time.perf_counter()
+    for _ in range(calls):
+        try:
+            fn()
+            outcomes["ok"] += 1
+        except Exception as e:  # noqa: BLE001
+            outcomes[type(e).__name__] += 1
+    elapsed = time.perf_counter() - start
+    print(f"{name:>28} | {elapsed:>7.2f}s | {dict(outcomes)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=30)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.3)
+    parser.add_argument("--server-error-ratio", type=float, default=0.2)
+    parser.add_argument("--retry-after", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = StubServer(args.rate_limit_ratio, args.server_error_ratio, args.retry_after, args.seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # SDK の接続先をスタブに向け、バックオフを短くする
+    os.environ["OPENAI_BASE_URL"] = f"{server.base_url}/v1"
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["PERPLEXITY_BASE_URL"] = server.base_url
+    os.environ["PERPLEXITY_API_KEY"] = "stub"
+    settings.OUTBOUND_BACKOFF_BASE_SECONDS = 0.02
+    settings.OUTBOUND_BACKOFF_MAX_SECONDS = 1.0
+    settings.OUTBOUND_CIRCUIT_FAILURE_THRESHOLD = 3
+    settings.OUTBOUND_CIRCUIT_RESET_SECONDS = 60.0
+    settings.PERPLEXITY_REQUESTS_PER_MINUTE = 6000
+
+    from openai import OpenAI
+
+    from app.infrastructure.rate_limit import GuardedChatOpenAI, get_outbound_guard
+    from app.infrastructure.search_client import PerplexitySearchClient
+
+    raw_client = OpenAI(max_retries=0)
+    chat_model = GuardedChatOpenAI(model_name="gpt-5-nano")
+    search_client = PerplexitySearchClient()
+    guard = get_outbound_guard()
+
+    def chat_completion() -> object:
+        return raw_client.chat.completions.create(
+            model="gpt-5-nano", messages=[{"role": "user", "content": "ping"}]
+        )
+
+    print(f"stub: {server.base_url} (429={args.rate_limit_ratio}, 5xx={args.server_error_ratio})")
+    print(f"{'scenario':>28} | {'elapsed':>8} | outcomes")
+    run_calls("OpenAI (no guard)", args.calls, chat_completion)
+    run_calls("OpenAI (guard)", args.calls, lambda: guard.call("openai:stub", chat_completion))
+    run_calls("ChatOpenAI (guard)", args.calls, lambda: chat_model.invoke("ping"))
+    run_calls("Perplexity (guard)", args.calls, lambda: search_client.search("ping"))
+
+    # 常に 503 を返すエンドポイントでは、連続失敗でサーキットが開き、以降は即座に失敗する
+    down_client = OpenAI(base_url=f"{server.base_url}/down/v1", max_retries=0)
+    run_calls(
+        "always 503 (guard)",
+        args.calls,
+        lambda: guard.call(
+            "openai:down",
+            lambda: down_client.chat.completions.create(
+                model="gpt-5-nano", messages=[{"role": "user", "content": "ping"}]
+            ),
+        ),
+    )
+    try:
+        guard.call("openai:down", lambda: None)
+    except CircuitOpenError as e:
+        print(f"circuit: {e}")
+
+    print(f"stub status counts: {dict(server.status_counts)}")
+    counters = metrics.summary()["counters"]
+    for name in ["outbound_retries_total", "outbound_circuit_opened_total"]:
+        for series in counters.get(name, []):
+            print(f"{name} {series['labels']} {series['value']:g}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
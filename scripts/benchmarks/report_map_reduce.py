@@ -0,0 +1,138 @@
+"""GenerateReportNode の単発生成とセクションごとの map-reduce 生成のレイテンシ・プロンプトサイズを比較する.
+
+プロンプト長と出力長に比例して待機する擬似チャットモデルを使うため、API キーは不要。
+
+実行例:
+    PYTHONPATH=. uv run python scripts/benchmarks/report_map_reduce.py --num-tasks 10 20 40
+"""
+
+import argparse
+import threading
+import time
+from typing import Any
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+from app.domain.enums import ManagedTaskStatus, Priority
+from app.infrastructure.blob_manager import LocalBlobManager
+from app.infrastructure.llm_chain.enums import OpenAIModelName
+from app.workflow.models import ManagedTask
+from app.workflow.models.build_research_plan import ReportSection, TaskType
+from app.workflow.nodes import GenerateReportNode
+
+
+class LatencyChatModel(BaseChatModel):
+    """プロンプト長（prefill）と出力長（decode）に比例したレイテンシで応答する擬似モデル."""
+
+    prefill_seconds_per_char: float = 2e-6
+    decode_seconds_per_char: float = 2e-4
+    section_chars: int = 1_500
+    summary_chars: int = 400
+    num_sections: int = 5
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _prompt_chars: list[int] = PrivateAttr(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "latency"
+
+    @property
+    def prompt_chars(self) -> list[int]:
+        return self._prompt_chars
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,  # noqa: ARG002
+        run_manager: CallbackManagerForLLMRun | None = None,  # noqa: ARG002
+        **kwargs: Any,  # noqa: ANN401, ARG002
+    ) -> ChatResult:
+        prompt = "".join(str(message.content) for message in messages)
+        if "担当セクション" in prompt:
+            output_chars = self.section_chars
+        elif "レポートの統合" in prompt:
+            output_chars = self.summary_chars
+        else:
+            output_chars = self.section_chars * self.num_sections + self.summary_chars
+        with self._lock:
+            self._prompt_chars.append(len(prompt))
+        time.sleep(
+            len(prompt) * self.prefill_seconds_per_char
+            + output_chars * self.decode_seconds_per_char
+        )
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="あ" * output_chars))])
+
+
+def build_inputs(
+    num_sections: int, num_tasks: int, deliverable_chars: int
+) -> tuple[list[ReportSection], list[ManagedTask]]:
+    topics = ["市場動向", "技術基盤", "業務プロセス", "規制と倫理", "ビジネスモデル", "人材と組織"]
+    storyline = [
+        ReportSection(section=topics[idx % len(topics)], description=f"{topics[idx % len(topics)]}の分析")
+        for idx in range(num_sections)
+    ]
+    tasks = [
+        ManagedTask(
+            id=f"t{idx}",
+            status=ManagedTaskStatus.COMPLETED,
+            title=f"{topics[idx % num_sections % len(topics)]}の調査 {idx}",
+            overview=f"{topics[idx % num_sections % len(topics)]}に関する調査",
+            objective="objective",
+            research_scope="scope",
+            priority=Priority.HIGH,
+            required_capabilities=[TaskType.SEARCH],
+            deliverable="調査結果" * (deliverable_chars // 4),
+        )
+        for idx in range(num_tasks)
+    ]
+    return storyline, tasks
+
+
+def run(
+    threshold: int | None,
+    storyline: list[ReportSection],
+    tasks: list[ManagedTask],
+) -> tuple[float, int, int, int]:
+    node = GenerateReportNode(
+        model_name=OpenAIModelName.GPT_5_NANO,
+        blob_manager=LocalBlobManager(),
+        map_reduce_threshold=threshold,
+        max_concurrency=len(storyline),
+    )
+    model = LatencyChatModel(num_sections=len(storyline))
+    node._build_llm = lambda temperature: model  # type: ignore  # noqa: ARG005, SLF001
+    node.chain_cache.clear()
+    start = time.perf_counter()
+    node.run(goal="AIエージェントと BPO の今後", storyline=storyline, executed_tasks=tasks)
+    elapsed = time.perf_counter() - start
+    return elapsed, len(model.prompt_chars), sum(model.prompt_chars), max(model.prompt_chars)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-sections", type=int, default=5)
+    parser.add_argument("--num-tasks", type=int, nargs="+", default=[10, 20, 40])
+    parser.add_argument("--deliverable-chars", type=int, default=4_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'tasks':>5} | {'mode':>10} | {'elapsed (s)':>11} | {'calls':>5}"
+        f" | {'prompt chars':>12} | {'max prompt':>10}"
+    )
+    for num_tasks in args.num_tasks:
+        storyline, tasks = build_inputs(args.num_sections, num_tasks, args.deliverable_chars)
+        for mode, threshold in (("single", None), ("map-reduce", 0)):
+            elapsed, calls, total, largest = run(threshold, storyline, tasks)
+            print(
+                f"{num_tasks:>5} | {mode:>10} | {elapsed:>11.2f} | {calls:>5}"
+                f" | {total:>12,} | {largest:>10,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
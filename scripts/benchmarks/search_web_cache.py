@@ -0,0 +1,72 @@
+"""search_web の結果キャッシュによるヒット率とレイテンシ削減をオフラインで計測するベンチマーク.
+
+実行例:
+    PYTHONPATH=. uv run python scripts/benchmarks/search_web_cache.py --latency 0.05
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from app.infrastructure.cache import BaseCache, MemoryCache, SqliteCache, TieredCache
+from app.infrastructure.search_client import (
+    BaseSearchClient,
+    CachedSearchClient,
+    FakeSearchClient,
+)
+
+
+def build_queries(num_queries: int, num_topics: int, seed: int) -> list[str]:
+    # 並列タスクが同じ話題を表記揺れ付きで検索する状況を模擬する
+    rng = random.Random(seed)
+    topics = [f"AIエージェント BPO 動向 {idx}" for idx in range(num_topics)]
+    weights = [1 / (rank + 1) for rank in range(num_topics)]
+    variants = [str.upper, str.lower, lambda q: f"  {q} ", lambda q: q.replace(" ", "　")]
+    return [
+        rng.choice(variants)(rng.choices(topics, weights=weights)[0])
+        for _ in range(num_queries)
+    ]
+
+
+def run(client: BaseSearchClient, queries: list[str]) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        client.search(query)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--num-queries", type=int, default=200)
+    parser.add_argument("--num-topics", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    queries = build_queries(args.num_queries, args.num_topics, args.seed)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "search_cache.sqlite3")
+        caches: dict[str, BaseCache | None] = {
+            "none": None,
+            "memory": MemoryCache(max_size=1024, ttl_seconds=3600),
+            "memory+sqlite": TieredCache(
+                [MemoryCache(max_size=1024), SqliteCache(db_path=db_path)]
+            ),
+            # プロセス再起動を模擬し、ディスク層のみが温まった状態で計測する
+            "sqlite (restart)": TieredCache(
+                [MemoryCache(max_size=1024), SqliteCache(db_path=db_path)]
+            ),
+        }
+        print(f"{'cache':>16} | {'elapsed (s)':>11} | {'backend calls':>13} | {'hit rate':>8}")
+        for name, cache in caches.items():
+            backend = FakeSearchClient(latency=args.latency)
+            client = backend if cache is None else CachedSearchClient(backend, cache)
+            elapsed = run(client, queries)
+            hit_rate = cache.hit_rate if cache else 0.0
+            print(f"{name:>16} | {elapsed:>11.3f} | {backend.num_calls:>13} | {hit_rate:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
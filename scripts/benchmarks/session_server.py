@@ -0,0 +1,157 @@
+"""複数セッションを扱う HTTP サーバーに、N 個の擬似セッションを同時に実行させる負荷試験.
+
+LLM を呼び出さない ResearchAgent（checkpoint_payload.py の build_agent）でサーバーを起動し、
+各セッションが「開始 → 質問（inquiry_items）を受け取る → 考える時間だけ待つ → 回答して再開 → レポート完了」
+を行う。全セッションが回答待ちの時点でのスレッド数・実行中のグラフ数も表示する。
+
+実行例:
+    PYTHONPATH=. uv run python scripts/benchmarks/session_server.py --sessions 1000 --think-time 2
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import statistics
+import threading
+import time
+from typing import Any
+
+from app.core.config import settings
+from app.workflow.enums import SessionStatus
+from app.workflow.session import ResearchSessionManager, build_session_server
+from scripts.benchmarks.checkpoint_payload import build_agent
+
+
+def build_manager(num_tasks: int, latency: float) -> ResearchSessionManager:
+    agent = build_agent(num_tasks=num_tasks, deliverable_size=100)
+    execute_task = agent.execute_task_node.run
+
+    async def aexecute_task(state: Any) -> Any:  # noqa: ANN401
+        await asyncio.sleep(latency)
+        return execute_task(state)
+
+    async def agenerate_report(**kwargs: Any) -> str:  # noqa: ANN401, ARG001
+        await asyncio.sleep(latency)
+        return "# レポート"
+
+    agent.execute_task_node.arun = aexecute_task  # type: ignore
+    agent.generate_report_node.arun = agenerate_report  # type: ignore
+    return ResearchSessionManager(graph=agent.graph)
+
+
+class SessionClient:
+    """接続ごとに 1 リクエストを送る、負荷試験用の最小限の HTTP クライアント."""
+
+    def __init__(self, host: str, port: int, max_connections: int) -> None:
+        self.host = host
+        self.port = port
+        self._semaphore = asyncio.Semaphore(max_connections)
+
+    async def request(self, method: str, path: str, body: dict | None = None) -> dict:
+        payload = json.dumps(body or {}).encode("utf-8")
+        head = (
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nConnection: close\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n"
+        )
+        async with self._semaphore:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            writer.write(head.encode("latin-1") + payload)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        return json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+def percentile(values: list[float], ratio: float) -> float:
+    return sorted(values)[min(len(values) - 1, int(len(values) * ratio))] if values else 0.0
+
+
+async def run_session(
+    client: SessionClient,
+    think_time: float,
+    all_waiting: asyncio.Event,
+    waiting: list[str],
+    num_sessions: int,
+    latencies: dict[str, list[float]],
+) -> SessionStatus:
+    start = time.perf_counter()
+    session = await client.request("POST", "/sessions", {"message": "AIエージェントと BPO の今後"})
+    latencies["start"].append(time.perf_counter() - start)
+    if session["status"] != SessionStatus.WAITING.value:
+        return SessionStatus(session["status"])
+
+    waiting.append(session["thread_id"])
+    if len(waiting) == num_sessions:
+        all_waiting.set()
+    # 人が回答を考えている間、サーバー側では何も実行されない
+    await asyncio.sleep(random.uniform(0, think_time))
+    await all_waiting.wait()
+
+    answers = {item["id"]: f"回答 {item['question']}" for item in session["inquiry_items"]}
+    start = time.perf_counter()
+    session = await client.request(
+        "POST", f"/sessions/{session['thread_id']}/resume", {"answers": answers}
+    )
+    latencies["resume"].append(time.perf_counter() - start)
+    while session["status"] == SessionStatus.RUNNING.value:
+        session = await client.request("GET", f"/sessions/{session['thread_id']}?wait=5")
+    return SessionStatus(session["status"])
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    settings.EXECUTE_TASK_ESTIMATED_TOKENS = 0
+    settings.EXECUTE_TASK_ESTIMATED_SEARCHES = 0
+    manager = build_manager(args.num_tasks, args.latency)
+    server = build_session_server(manager, host="127.0.0.1", port=0)
+    await server.start()
+    host, port = server.address
+
+    all_waiting = asyncio.Event()
+    waiting: list[str] = []
+    latencies: dict[str, list[float]] = {"start": [], "resume": []}
+    client = SessionClient(host, port, args.max_connections)
+
+    async def report_waiting() -> None:
+        await all_waiting.wait()
+        print(
+            f"all {len(waiting)} sessions waiting: threads={threading.active_count()}"
+            f" running_graphs={manager.running}"
+        )
+
+    reporter = asyncio.create_task(report_waiting())
+    start = time.perf_counter()
+    statuses = await asyncio.gather(
+        *(
+            run_session(client, args.think_time, all_waiting, waiting, args.sessions, latencies)
+            for _ in range(args.sessions)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    reporter.cancel()
+    await server.stop()
+
+    counts = {status.value: statuses.count(status) for status in set(statuses)}
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"sessions={args.sessions} elapsed={elapsed:.2f}s statuses={counts} max_rss={max_rss:.0f}MB")
+    for name, values in latencies.items():
+        print(
+            f"{name:>6}: mean={statistics.fmean(values) if values else 0:.3f}s"
+            f" p50={percentile(values, 0.5):.3f}s p95={percentile(values, 0.95):.3f}s"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--think-time", type=float, default=1.0)
+    parser.add_argument("--num-tasks", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--max-connections", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""レート上限のある擬似バックエンドに対し、タスクを一斉に開始する場合と PriorityScheduler を比較するシミュレーション.
+
+擬似バックエンドはサーバー側のトークンバケットを超えたリクエストに 429 を返す。
+一斉に開始する場合は 429 を受けるたびに短い間隔で再試行し、スケジューラーを使う場合は
+開始時にタスクのリクエスト数をクライアント側のバケットから予約する。
+
+実行例:
+    PYTHONPATH=. uv run python scripts/benchmarks/task_scheduler.py --num-tasks 30 --requests-per-second 20
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+from app.core.utils.scheduler import PriorityScheduler
+from app.core.utils.token_bucket import TokenBucket
+from app.domain.enums import Priority
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class FakeBackend:
+    """サーバー側のレート上限（トークンバケット）を超えると 429 を返す擬似 API."""
+
+    def __init__(self, requests_per_second: float, latency: float) -> None:
+        self.bucket = TokenBucket(rate_per_second=requests_per_second, capacity=requests_per_second)
+        self.latency = latency
+        self.status_counts: Counter[int] = Counter()
+
+    async def request(self) -> None:
+        if not self.bucket.try_consume(1):
+            self.status_counts[429] += 1
+            raise RateLimitError
+        self.status_counts[200] += 1
+        await asyncio.sleep(self.latency)
+
+
+@dataclass
+class Task:
+    id: int
+    priority: Priority
+    num_requests: int
+
+
+@dataclass
+class Result:
+    elapsed: float
+    status_counts: Counter[int]
+    start_order: list[Priority]
+
+
+async def run_task(backend: FakeBackend, task: Task, retry_interval: float) -> None:
+    for _ in range(task.num_requests):
+        while True:
+            try:
+                await backend.request()
+                break
+            except RateLimitError:
+                await asyncio.sleep(retry_interval)
+
+
+async def run_naive(tasks: list[Task], args: argparse.Namespace) -> Result:
+    backend = FakeBackend(args.requests_per_second, args.latency)
+    start_order: list[Priority] = []
+
+    async def run(task: Task) -> None:
+        start_order.append(task.priority)
+        await run_task(backend, task, args.retry_interval)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(task) for task in tasks))
+    return Result(time.perf_counter() - start, backend.status_counts, start_order)
+
+
+async def run_scheduled(tasks: list[Task], args: argparse.Namespace) -> Result:
+    backend = FakeBackend(args.requests_per_second, args.latency)
+    scheduler = PriorityScheduler(args.max_concurrency)
+    # サーバー側の上限を超えないよう、クライアント側のバケットは少し控えめにする
+    bucket = TokenBucket(
+        rate_per_second=args.requests_per_second * 0.9,
+        capacity=args.requests_per_second * 0.9,
+    )
+    start_order: list[Priority] = []
+
+    async def run(task: Task) -> None:
+        async with scheduler.ahold(task.priority.rank, [(bucket, task.num_requests)]):
+            start_order.append(task.priority)
+            await run_task(backend, task, args.retry_interval)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(task) for task in tasks))
+    return Result(time.perf_counter() - start, backend.status_counts, start_order)
+
+
+def build_tasks(num_tasks: int, seed: int) -> list[Task]:
+    rng = random.Random(seed)
+    return [
+        Task(
+            id=idx,
+            priority=rng.choice(list(Priority)),
+            num_requests=rng.randint(1, 5),
+        )
+        for idx in range(num_tasks)
+    ]
+
+
+def mean_start_position(result: Result, priority: Priority) -> float:
+    positions = [idx for idx, p in enumerate(result.start_order) if p == priority]
+    return sum(positions) / len(positions) if positions else float("nan")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-tasks", type=int, default=30)
+    parser.add_argument("--requests-per-second", type=float, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--retry-interval", type=float, default=0.01)
+    parser.add_argument("--max-concurrency", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tasks = build_tasks(args.num_tasks, args.seed)
+    total_requests = sum(task.num_requests for task in tasks)
+    print(f"tasks={len(tasks)} requests={total_requests} limit={args.requests_per_second}/s")
+    print(
+        f"{'mode':>9} | {'elapsed (s)':>11} | {'200':>5} | {'429':>5} | "
+        + " | ".join(f"{p.value:>6}" for p in Priority)
+    )
+    for mode, runner in [("naive", run_naive), ("scheduled", run_scheduled)]:
+        result = asyncio.run(runner(tasks, args))
+        positions = " | ".join(
+            f"{mean_start_position(result, priority):>6.1f}" for priority in Priority
+        )
+        print(
+            f"{mode:>9} | {result.elapsed:>11.3f} | {result.status_counts[200]:>5} | "
+            f"{result.status_counts[429]:>5} | {positions}"
+        )
+    print("(優先度ごとの列は、開始順の平均位置。小さいほど先に開始)")
+
+
+if __name__ == "__main__":
+    main()
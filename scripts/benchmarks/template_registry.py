@@ -0,0 +1,92 @@
+"""プロンプトテンプレートの読み込み（コンパイル）にかかる時間を、TemplateRegistry の有無で比較する.
+
+storage/prompts 以下の全テンプレートを --iterations 回ずつ読み込んでレンダリングする。
+- source: 呼び出しごとに jinja2.Template(source) を構築する（従来の read_blob_as_template）
+- cold: バイトコードのない状態で TemplateRegistry を通す（初回のみコンパイル）
+- bytecode: 別プロセスが保存したバイトコードから読み込む（再起動・プロセスプールのワーカーを想定）
+レンダリング結果がすべての方式で一致することも確認する。
+
+実行例:
+    PYTHONPATH=. uv run python scripts/benchmarks/template_registry.py --iterations 200
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from jinja2 import Template, UndefinedError
+
+from app.infrastructure.blob_manager import LocalBlobManager, TemplateRegistry
+
+CONTEXT = {
+    "current_date": "2025-10-30 10:00",
+    "goal": "AIエージェントと BPO の今後",
+    "title": "市場規模",
+    "overview": "BPO 市場の動向",
+    "objective": "主要な領域を把握する",
+    "research_scope": "国内",
+    "output_format": {"type": "object"},
+}
+
+
+def render(template: Template) -> str:
+    try:
+        return template.render(**CONTEXT)
+    except UndefinedError as e:
+        # ノード固有の変数を使うテンプレートは、エラーの内容で比較する
+        return repr(e)
+
+
+def render_all(load, template_paths: list[str], iterations: int) -> tuple[float, list[str]]:  # noqa: ANN001
+    start = time.perf_counter()
+    for _ in range(iterations):
+        rendered = [render(load(template_path)) for template_path in template_paths]
+    return time.perf_counter() - start, rendered
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--prompt-dir", default="storage/prompts")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    blob_manager = LocalBlobManager()
+    template_paths = sorted(str(path) for path in Path(args.prompt_dir).rglob("*.jinja"))
+    num_loads = len(template_paths) * args.iterations
+
+    with tempfile.TemporaryDirectory() as bytecode_cache_dir:
+        results = {
+            "source": render_all(
+                lambda path: Template(blob_manager.read_blob_as_str(path)),
+                template_paths,
+                args.iterations,
+            )
+        }
+        registry = TemplateRegistry(bytecode_cache_dir=bytecode_cache_dir)
+        results["cold"] = render_all(
+            lambda path: registry.get(blob_manager, path), template_paths, args.iterations
+        )
+        # 新しいプロセスと同じく LRU は空で、バイトコードだけが残っている状態
+        compile_start = time.perf_counter()
+        TemplateRegistry(bytecode_cache_dir=None).warm_up(blob_manager, args.prompt_dir)
+        compile_elapsed = time.perf_counter() - compile_start
+        bytecode_start = time.perf_counter()
+        TemplateRegistry(bytecode_cache_dir=bytecode_cache_dir).warm_up(
+            blob_manager, args.prompt_dir
+        )
+        bytecode_elapsed = time.perf_counter() - bytecode_start
+
+    expected = results["source"][1]
+    for name, (elapsed, rendered) in results.items():
+        assert rendered == expected, f"{name}: rendered output differs"
+        print(f"{name:>8}: {elapsed:.3f}s ({elapsed / num_loads * 1e6:.0f}us / load+render)")
+    print(f"{'hits':>8}: {registry.stats}")
+    print(
+        f"warm_up ({len(template_paths)} templates): compile={compile_elapsed * 1e3:.1f}ms"
+        f" bytecode={bytecode_elapsed * 1e3:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+import asyncio
+
+from app.core.config import settings
+from app.infrastructure.blob_manager.local import LocalBlobManager
+from app.infrastructure.blob_manager.template_registry import template_registry
+from app.infrastructure.metrics import MetricsCallbackHandler, MetricsServer
+from app.workflow.agent import create_graph
+from app.workflow.enums import Node
+from app.workflow.session import ResearchSessionManager, build_session_server
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve research agent sessions over HTTP")
+    parser.add_argument("--host", type=str, default=settings.SESSION_SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SESSION_SERVER_PORT)
+    return parser.parse_args()
+
+
+async def serve(host: str, port: int) -> None:
+    # すべてのセッションで 1 つのコンパイル済みグラフ（とチェックポインター）を共有する
+    # (ストリーミングするレポートは、REPORT_OUTPUT_PATH の {thread_id} でセッションごとのファイルに分ける)
+    manager = ResearchSessionManager(
+        graph=create_graph(),
+        callbacks=[MetricsCallbackHandler(node_names=set(Node.to_list()))],
+    )
+    await build_session_server(manager, host=host, port=port).serve_forever()
+
+
+def main() -> None:
+    args = parse_args()
+    if settings.TEMPLATE_WARMUP_DIR:
+        template_registry.warm_up(LocalBlobManager(), settings.TEMPLATE_WARMUP_DIR)
+    if settings.METRICS_PORT is not None:
+        MetricsServer(port=settings.METRICS_PORT).start()
+    asyncio.run(serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
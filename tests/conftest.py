@@ -0,0 +1,51 @@
+import re
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+
+from app.infrastructure.llm_chain.chain_cache import ChainCache
+from app.infrastructure.llm_chain.openai_chain import BaseOpenAIChain
+
+USER_REQUEST_PATTERN = re.compile(r"### ユーザー要求\n\n(.+)")
+
+
+class EchoChatModel(BaseChatModel):
+    """プロンプト中のユーザー要求を見出しにして返す擬似モデル. 受け取ったプロンプトを記録する."""
+
+    prompts: list[str] = Field(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "echo"
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,  # noqa: ARG002
+        run_manager: CallbackManagerForLLMRun | None = None,  # noqa: ARG002
+        **kwargs: Any,  # noqa: ANN401, ARG002
+    ) -> ChatResult:
+        prompt = "".join(str(message.content) for message in messages)
+        self.prompts.append(prompt)
+        match = USER_REQUEST_PATTERN.search(prompt)
+        content = f"# {match.group(1) if match else ''}\n\n本文 [1]"
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+
+@pytest.fixture
+def use_echo_llm() -> Callable[[BaseOpenAIChain], EchoChatModel]:
+    """ノードの LLM を EchoChatModel に差し替える（チェーンのキャッシュはノードごとに分ける）."""
+
+    def attach(node: BaseOpenAIChain) -> EchoChatModel:
+        model = EchoChatModel()
+        node.chain_cache = ChainCache()
+        node._build_llm = lambda temperature: model  # type: ignore  # noqa: ARG005, SLF001
+        return model
+
+    return attach
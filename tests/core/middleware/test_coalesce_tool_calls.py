@@ -0,0 +1,40 @@
+import asyncio
+
+from langchain.tools.tool_node import ToolCallRequest
+from langchain_core.messages import ToolMessage
+
+from app.core.middleware import CoalesceToolCallsMiddleware
+from app.core.utils.single_flight import SingleFlight
+from app.infrastructure.metrics import MetricsRegistry
+
+
+def build_request(tool_call_id: str, name: str = "search_web") -> ToolCallRequest:
+    tool_call = {"name": name, "args": {"search_view": "BPO"}, "id": tool_call_id, "type": "tool_call"}
+    return ToolCallRequest(tool_call=tool_call, tool=None, state={}, runtime=None)
+
+
+def test_coalesced_calls_are_counted() -> None:
+    registry = MetricsRegistry()
+    middleware = CoalesceToolCallsMiddleware(single_flight=SingleFlight(), registry=registry)
+
+    async def run() -> list[ToolMessage]:
+        gate = asyncio.Event()
+
+        async def handler(request: ToolCallRequest) -> ToolMessage:
+            await gate.wait()
+            return ToolMessage(content="result", tool_call_id=request.tool_call["id"])
+
+        calls = [
+            asyncio.create_task(middleware.awrap_tool_call(build_request(f"call_{idx}"), handler))
+            for idx in range(3)
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        return await asyncio.gather(*calls)
+
+    responses = asyncio.run(run())
+    # 合流した呼び出し元には、自身の tool_call_id を付けた結果を返す
+    assert [response.tool_call_id for response in responses] == ["call_0", "call_1", "call_2"]
+    assert registry.summary()["counters"]["tool_calls_coalesced_total"] == [
+        {"labels": {"tool": "search_web"}, "value": 2}
+    ]
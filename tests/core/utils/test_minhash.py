@@ -0,0 +1,29 @@
+from app.core.utils.minhash import MERSENNE_PRIME, MinHasher
+
+
+def test_signature_agreement_estimates_jaccard() -> None:
+    left = {f"s{idx}" for idx in range(200)}
+    right = {f"s{idx}" for idx in range(100, 300)}
+    hasher = MinHasher(num_perm=512)
+    agreement = sum(
+        a == b for a, b in zip(hasher.signature(left), hasher.signature(right), strict=True)
+    ) / 512
+    # Jaccard 類似度は 100 / 300
+    assert abs(agreement - 1 / 3) < 0.06
+
+
+def test_permutations_are_independent_affine_hashes() -> None:
+    hasher = MinHasher(num_perm=64)
+    assert len(set(hasher.permutations)) == 64
+    assert all(0 < a < MERSENNE_PRIME and 0 <= b < MERSENNE_PRIME for a, b in hasher.permutations)
+    # 異なる並べ替えの最小値は、互いにほぼ独立に決まる
+    signature = MinHasher(num_perm=64).signature({f"s{idx}" for idx in range(50)})
+    assert len(set(signature)) > 60
+
+
+def test_bands() -> None:
+    hasher = MinHasher(num_perm=16)
+    bands = hasher.bands({"a", "b"}, rows=4)
+    assert [idx for idx, _ in bands] == [0, 1, 2, 3]
+    assert all(len(band) == 4 for _, band in bands)
+    assert hasher.bands({"b", "a"}, rows=4) == bands
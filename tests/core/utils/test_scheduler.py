@@ -0,0 +1,186 @@
+import asyncio
+import random
+import selectors
+from collections import Counter
+
+from app.core.utils.scheduler import PriorityScheduler
+from app.core.utils.token_bucket import TokenBucket
+from app.domain.enums import Priority
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class VirtualTimeSelector(selectors.DefaultSelector):
+    """待機する代わりに仮想時刻を進めるセレクター.
+
+    実時間と同じく、イベントループが 1 周するたびに tick 秒進める（丸め誤差による 0 秒に近い待機が
+    時刻の進まないまま繰り返されないようにするため）。
+    """
+
+    def __init__(self, clock: FakeClock, tick: float = 1e-6) -> None:
+        super().__init__()
+        self.clock = clock
+        self.tick = tick
+
+    def select(self, timeout: float | None = None) -> list:
+        self.clock.now += (timeout or 0.0) + self.tick
+        return super().select(0)
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """asyncio.sleep やタイムアウトを実時間で待たずに、FakeClock を進めて実行するイベントループ."""
+
+    def __init__(self, clock: FakeClock) -> None:
+        super().__init__(selector=VirtualTimeSelector(clock))
+        self.clock = clock
+
+    def time(self) -> float:
+        return self.clock.now
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class FakeBackend:
+    """サーバー側のレート上限（トークンバケット）を超えたリクエストに 429 を返す擬似 API."""
+
+    def __init__(self, clock: FakeClock, requests_per_second: float, latency: float = 0.05) -> None:
+        self.bucket = TokenBucket(rate_per_second=requests_per_second, capacity=requests_per_second, clock=clock)
+        self.latency = latency
+        self.status_counts: Counter[int] = Counter()
+
+    async def request(self) -> None:
+        if not self.bucket.try_consume(1):
+            self.status_counts[429] += 1
+            raise RateLimitError
+        self.status_counts[200] += 1
+        await asyncio.sleep(self.latency)
+
+    async def run_task(self, num_requests: int) -> None:
+        for _ in range(num_requests):
+            while True:
+                try:
+                    await self.request()
+                    break
+                except RateLimitError:
+                    await asyncio.sleep(0.01)
+
+
+def simulate(use_scheduler: bool) -> tuple[FakeBackend, list[Priority], float]:
+    """レート上限 20 req/s のバックエンドに 30 タスクを一斉に投入し、(バックエンド, 開始順, 所要秒数) を返す."""
+    rng = random.Random(0)
+    tasks = [(rng.choice(list(Priority)), rng.randint(1, 5)) for _ in range(30)]
+    clock = FakeClock()
+    backend = FakeBackend(clock, requests_per_second=20)
+    scheduler = PriorityScheduler(limit=10)
+    # サーバー側の上限を超えないよう、クライアント側のバケットは少し控えめにする
+    bucket = TokenBucket(rate_per_second=18, capacity=18, clock=clock)
+    started: list[Priority] = []
+
+    async def run(priority: Priority, num_requests: int) -> None:
+        if not use_scheduler:
+            started.append(priority)
+            await backend.run_task(num_requests)
+            return
+        async with scheduler.ahold(priority.rank, [(bucket, num_requests)]):
+            started.append(priority)
+            await backend.run_task(num_requests)
+
+    async def run_all() -> None:
+        # すべての枠を埋めておき、すべてのタスクが待機してから開始させる
+        for _ in range(scheduler.limit):
+            await scheduler.aacquire(0)
+        waiters = [asyncio.create_task(run(*task)) for task in tasks]
+        while use_scheduler and scheduler.waiting < len(waiters):
+            await asyncio.sleep(0)
+        for _ in range(scheduler.limit):
+            scheduler.release()
+        await asyncio.gather(*waiters)
+
+    loop = VirtualTimeEventLoop(clock)
+    try:
+        loop.run_until_complete(run_all())
+    finally:
+        loop.close()
+    assert backend.status_counts[200] == sum(num_requests for _, num_requests in tasks)
+    return backend, started, clock.now
+
+
+def test_scheduler_avoids_429_storms() -> None:
+    naive, _, _ = simulate(use_scheduler=False)
+    scheduled, started, elapsed = simulate(use_scheduler=True)
+    # 一斉に開始すると再試行のたびに 429 を受ける
+    assert naive.status_counts[429] > 1_000
+    assert scheduled.status_counts[429] == 0
+    # 高い優先度のタスクから開始する
+    ranks = [priority.rank for priority in started]
+    assert ranks == sorted(ranks)
+    assert started[0] == Priority.HIGH
+    assert started[-1] == Priority.LOW
+    # クライアント側の上限 (18 req/s) に近い速度で処理する
+    assert elapsed < scheduled.status_counts[200] / 18 + 1
+
+
+def test_waiters_start_in_priority_order() -> None:
+    scheduler = PriorityScheduler(limit=1)
+    started: list[int] = []
+
+    async def run(rank: int) -> None:
+        # timeout を指定しないタスクは、空きが出るまで待って必ず実行する
+        async with scheduler.ahold(rank) as admitted:
+            assert admitted
+            started.append(rank)
+            await asyncio.sleep(0)
+
+    async def run_all() -> None:
+        await scheduler.aacquire(0)
+        waiters = [asyncio.create_task(run(rank)) for rank in [2, 0, 1]]
+        while scheduler.waiting < len(waiters):
+            await asyncio.sleep(0)
+        assert started == []
+        scheduler.release()
+        await asyncio.gather(*waiters)
+
+    asyncio.run(run_all())
+    assert started == [0, 1, 2]
+    assert (scheduler.active, scheduler.waiting) == (0, 0)
+
+
+def test_waits_for_budget() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_second=10, capacity=100, clock=clock)
+    scheduler = PriorityScheduler(limit=2)
+    assert scheduler.acquire(0, [(bucket, 100)])
+    # 予算が補充されるまで開始できない
+    assert not scheduler.acquire(0, [(bucket, 50)], timeout=0)
+    assert scheduler.waiting == 0
+    clock.now += 5
+    assert scheduler.acquire(0, [(bucket, 50)], timeout=0)
+    assert bucket.available == 0
+
+
+def test_settle_reconciles_estimate_with_actual_usage() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_second=1, capacity=1_000, clock=clock)
+    scheduler = PriorityScheduler(limit=2)
+    with scheduler.hold(0, [(bucket, 400)]):
+        assert bucket.available == 600
+        # 見積もりを超えた分を追加で消費する
+        scheduler.settle(bucket, estimate=400, actual=700)
+    assert bucket.available == 300
+    with scheduler.hold(0, [(bucket, 200)]):
+        # 見積もりより少なかった分は返却する
+        scheduler.settle(bucket, estimate=200, actual=50)
+    assert bucket.available == 250
+    # capacity を超える見積もりは capacity だけ予約しているため、返却も capacity までとする
+    clock.now += 1_000
+    with scheduler.hold(0, [(bucket, 5_000)]):
+        scheduler.settle(bucket, estimate=5_000, actual=0)
+    assert bucket.available == 1_000
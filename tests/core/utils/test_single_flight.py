@@ -0,0 +1,140 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.utils.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution() -> None:
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    results: list[tuple[str, bool]] = []
+
+    def slow() -> str:
+        started.set()
+        release.wait()
+        return "result"
+
+    def call() -> None:
+        results.append(flight.do("key", slow))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=call) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    while flight.num_coalesced < len(followers):
+        pass
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+    assert sorted(results) == [("result", False)] + [("result", True)] * 3
+    assert flight.stats == {"calls": 4, "executions": 1, "coalesced": 3}
+    # 完了した呼び出しの結果は保持しない
+    assert flight.do("key", lambda: "next") == ("next", False)
+
+
+def test_errors_are_shared() -> None:
+    flight = SingleFlight()
+
+    async def run() -> list[BaseException | tuple[str, bool]]:
+        gate = asyncio.Event()
+
+        async def fail() -> str:
+            await gate.wait()
+            raise ValueError("failed")
+
+        calls = [asyncio.create_task(flight.ado("key", fail)) for _ in range(2)]
+        await asyncio.sleep(0)
+        gate.set()
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    assert [type(result) for result in asyncio.run(run())] == [ValueError, ValueError]
+    assert flight.stats == {"calls": 2, "executions": 1, "coalesced": 1}
+
+
+def test_followers_re_execute_when_leader_is_cancelled() -> None:
+    flight = SingleFlight()
+    executions: list[str] = []
+
+    async def run() -> list[tuple[str, bool]]:
+        gate = asyncio.Event()
+
+        async def search(name: str) -> str:
+            executions.append(name)
+            await gate.wait()
+            return f"result of {name}"
+
+        leader = asyncio.create_task(flight.ado("key", lambda: search("leader")))
+        await asyncio.sleep(0)
+        followers = [
+            asyncio.create_task(flight.ado("key", lambda name=name: search(name)))
+            for name in ["a", "b"]
+        ]
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        while flight.num_executions < 2 or flight.num_coalesced < 1:
+            await asyncio.sleep(0)
+        gate.set()
+        return await asyncio.gather(*followers)
+
+    results = asyncio.run(run())
+    # 合流していた呼び出し元のうち 1 件が実行し直し、残りはその結果を共有する
+    assert executions == ["leader", "a"]
+    assert results == [("result of a", False), ("result of a", True)]
+    assert flight.stats == {"calls": 3, "executions": 2, "coalesced": 1}
+
+
+def test_cancelled_follower_does_not_affect_leader() -> None:
+    flight = SingleFlight()
+
+    async def run() -> tuple[str, bool]:
+        gate = asyncio.Event()
+
+        async def search() -> str:
+            await gate.wait()
+            return "result"
+
+        leader = asyncio.create_task(flight.ado("key", search))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.ado("key", search))
+        await asyncio.sleep(0)
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        gate.set()
+        return await leader
+
+    assert asyncio.run(run()) == ("result", False)
+
+
+def test_sync_followers_re_execute_when_leader_is_interrupted() -> None:
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    results: list[tuple[str, bool]] = []
+
+    def interrupted() -> str:
+        started.set()
+        release.wait()
+        raise KeyboardInterrupt
+
+    def leader() -> None:
+        with pytest.raises(KeyboardInterrupt):
+            flight.do("key", interrupted)
+
+    leader_thread = threading.Thread(target=leader)
+    leader_thread.start()
+    started.wait()
+    follower = threading.Thread(target=lambda: results.append(flight.do("key", lambda: "result")))
+    follower.start()
+    while flight.num_coalesced < 1:
+        pass
+    release.set()
+    for thread in [leader_thread, follower]:
+        thread.join()
+    assert results == [("result", False)]
+    assert flight.stats == {"calls": 2, "executions": 2, "coalesced": 0}
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from app.core.logging import LogLevel
+from app.infrastructure.blob_manager import ContentAddressedBlobManager
+
+
+def build_blob_manager(root_dir: Path) -> ContentAddressedBlobManager:
+    return ContentAddressedBlobManager(root_dir=str(root_dir), log_level=LogLevel.TRACE)
+
+
+def test_append_stores_only_the_new_lines(tmp_path: Path) -> None:
+    blob_manager = build_blob_manager(tmp_path)
+    for idx in range(50):
+        assert blob_manager.append_blob_as_jsonl([{"idx": idx}], "runs/status.jsonl") == 1
+    assert [item["idx"] for item in blob_manager.iter_blob_as_jsonl("runs/status.jsonl")] == list(range(50))
+    stats = blob_manager.stats()
+    # 追記のたびに既存の内容を書き直さない（重複排除前の大きさ = ブロブの大きさ）
+    assert stats["blobs"] == 1
+    assert stats["objects"] == 50
+    assert stats["unique_bytes"] == stats["logical_bytes"] == len(blob_manager.read_blob_as_bytes("runs/status.jsonl"))
+    # 追記分も参照されているオブジェクトとして残す
+    assert blob_manager.collect_garbage(min_age_seconds=0) == 0
+    blob_manager.close()
+
+    reopened = build_blob_manager(tmp_path)
+    assert len(reopened.read_blob_as_jsonl("runs/status.jsonl")) == 50
+
+
+def test_save_replaces_appended_segments(tmp_path: Path) -> None:
+    blob_manager = build_blob_manager(tmp_path)
+    blob_manager.save_blob_as_jsonl([{"idx": 0}], "a.jsonl")
+    blob_manager.append_blob_as_jsonl([{"idx": 1}, {"idx": 2}], "a.jsonl")
+    assert blob_manager.append_blob_as_jsonl([], "a.jsonl") == 0
+    assert blob_manager.read_blob_as_jsonl("a.jsonl") == [{"idx": 0}, {"idx": 1}, {"idx": 2}]
+    blob_manager.save_blob_as_jsonl([{"idx": 3}], "a.jsonl")
+    assert blob_manager.read_blob_as_jsonl("a.jsonl") == [{"idx": 3}]
+    assert blob_manager.collect_garbage(min_age_seconds=0) == 2
+    # 存在しないブロブへの追記は、新しいブロブになる
+    blob_manager.append_blob_as_jsonl([], "empty.jsonl")
+    assert blob_manager.exists("empty.jsonl")
+    assert blob_manager.read_blob_as_jsonl("empty.jsonl") == []
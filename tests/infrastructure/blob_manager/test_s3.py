@@ -0,0 +1,274 @@
+import datetime
+import hashlib
+import hmac
+import itertools
+from collections.abc import Iterator
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, quote, urlsplit
+
+import httpx
+import pytest
+
+from app.infrastructure.blob_manager import S3BlobManager
+from app.infrastructure.blob_manager import s3 as s3_module
+from app.infrastructure.blob_manager.s3 import sign_v4
+from app.infrastructure.metrics import MetricsRegistry
+from app.infrastructure.rate_limit import OutboundGuard, RetryPolicy
+from scripts.benchmarks.object_store_server import ObjectStore, start_object_store_server
+
+ACCESS_KEY_ID = "AKIDEXAMPLE"
+SECRET_ACCESS_KEY = "wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY"
+REGION = "ap-northeast-1"
+
+bucket_ids = itertools.count()
+
+
+def expected_signature(method: str, raw_path: str, headers: dict[str, str]) -> str:
+    """受信したリクエストから、AWS Signature Version 4 の署名を計算し直す."""
+    url = urlsplit(raw_path)
+    query = "&".join(
+        f"{quote(key, safe='-_.~')}={quote(value, safe='-_.~')}"
+        for key, value in sorted(parse_qsl(url.query, keep_blank_values=True))
+    )
+    signed = {key: headers[key] for key in ["host", "x-amz-content-sha256", "x-amz-date"]}
+    canonical_request = "\n".join(
+        [
+            method,
+            url.path,
+            query,
+            "".join(f"{key}:{value}\n" for key, value in signed.items()),
+            ";".join(signed),
+            headers["x-amz-content-sha256"],
+        ]
+    )
+    date = headers["x-amz-date"][:8]
+    string_to_sign = "\n".join(
+        [
+            "AWS4-HMAC-SHA256",
+            headers["x-amz-date"],
+            f"{date}/{REGION}/s3/aws4_request",
+            hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+        ]
+    )
+    key = hmac.new(f"AWS4{SECRET_ACCESS_KEY}".encode(), date.encode(), hashlib.sha256).digest()
+    for part in [REGION, "s3", "aws4_request"]:
+        key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+    return hmac.new(key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+@pytest.fixture(scope="module")
+def object_store() -> Iterator[tuple[ThreadingHTTPServer, ObjectStore]]:
+    server, store = start_object_store_server()
+    handler = server.RequestHandlerClass
+
+    class VerifyingHandler(handler):  # type: ignore
+        """署名が一致しないリクエストを 403 で拒否する."""
+
+        def _handle(self) -> None:
+            headers = {key.lower(): value for key, value in self.headers.items()}
+            credential, signed_headers, signature = headers.get("authorization", "").split(", ")
+            if not (
+                credential.endswith(f"{ACCESS_KEY_ID}/{headers['x-amz-date'][:8]}/{REGION}/s3/aws4_request")
+                and signed_headers == "SignedHeaders=host;x-amz-content-sha256;x-amz-date"
+                and signature == f"Signature={expected_signature(self.command, self.path, headers)}"
+            ):
+                self._error(403, "SignatureDoesNotMatch")
+                return
+            super()._handle()
+
+        do_GET = do_HEAD = do_PUT = do_POST = do_DELETE = _handle  # noqa: N815
+
+    server.RequestHandlerClass = VerifyingHandler
+    try:
+        yield server, store
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def guard(monkeypatch: pytest.MonkeyPatch) -> OutboundGuard:
+    # 失敗を待たずに確認するため、再試行しないガードに差し替える
+    guard = OutboundGuard(
+        policy=RetryPolicy(max_attempts=1, base_delay=0.0, max_delay=0.0),
+        failure_threshold=100,
+        reset_timeout=1.0,
+        registry=MetricsRegistry(),
+    )
+    monkeypatch.setattr(s3_module, "get_outbound_guard", lambda: guard)
+    return guard
+
+
+def build_manager(
+    object_store: tuple[ThreadingHTTPServer, ObjectStore],
+    cache_dir: Path,
+    bucket: str | None = None,
+    secret_access_key: str = SECRET_ACCESS_KEY,
+) -> S3BlobManager:
+    server, _ = object_store
+    host, port = server.server_address[:2]
+    return S3BlobManager(
+        endpoint_url=f"http://{host!s}:{port}",
+        bucket=bucket or f"bucket-{next(bucket_ids)}",
+        prefix="research",
+        region=REGION,
+        access_key_id=ACCESS_KEY_ID,
+        secret_access_key=secret_access_key,
+        cache_dir=str(cache_dir),
+        multipart_threshold=1024,
+        part_size=256,
+        max_concurrency=4,
+    )
+
+
+def test_sign_v4_headers() -> None:
+    now = datetime.datetime(2025, 10, 30, 12, 0, tzinfo=datetime.UTC)
+    headers = sign_v4(
+        "GET", "s3.example.com", "/bucket/a.txt", "", ACCESS_KEY_ID, SECRET_ACCESS_KEY, REGION, now
+    )
+    assert headers["x-amz-date"] == "20251030T120000Z"
+    assert headers["x-amz-content-sha256"] == "UNSIGNED-PAYLOAD"
+    assert "host" not in headers
+    signature = expected_signature(
+        "GET", "/bucket/a.txt", {**headers, "host": "s3.example.com"}
+    )
+    assert headers["authorization"] == (
+        f"AWS4-HMAC-SHA256 Credential={ACCESS_KEY_ID}/20251030/{REGION}/s3/aws4_request,"
+        f" SignedHeaders=host;x-amz-content-sha256;x-amz-date, Signature={signature}"
+    )
+
+
+def test_signed_round_trip(
+    object_store: tuple[ThreadingHTTPServer, ObjectStore], tmp_path: Path, guard: OutboundGuard  # noqa: ARG001
+) -> None:
+    manager = build_manager(object_store, tmp_path / "cache")
+    # キーの日本語・空白も、署名したパスと送信したパスで一致する
+    manager.save_blob_as_str("本文", "outputs/レポート 1.md")
+    manager.save_blob_as_json({"a": 1}, "outputs/meta.json")
+    manager.save_blob_as_bytes(b"", "outputs/empty.bin")
+    reader = build_manager(object_store, tmp_path / "reader", bucket=manager.bucket)
+    assert reader.read_blob_as_str("outputs/レポート 1.md") == "本文"
+    assert reader.read_blob_as_json("outputs/meta.json") == {"a": 1}
+    assert reader.read_blob_as_bytes("outputs/empty.bin") == b""
+    assert sorted(reader.list_blobs("outputs")) == [
+        "outputs/empty.bin",
+        "outputs/meta.json",
+        "outputs/レポート 1.md",
+    ]
+    assert reader.exists("outputs")
+    assert not reader.exists("outputs/missing.md")
+
+
+def test_invalid_signature_is_rejected(
+    object_store: tuple[ThreadingHTTPServer, ObjectStore], tmp_path: Path, guard: OutboundGuard  # noqa: ARG001
+) -> None:
+    manager = build_manager(object_store, tmp_path / "cache", secret_access_key="wrong")
+    with pytest.raises(httpx.HTTPStatusError) as exc_info:
+        manager.save_blob_as_str("本文", "outputs/report.md")
+    assert exc_info.value.response.status_code == 403
+
+
+def test_multipart_upload_and_parallel_download(
+    object_store: tuple[ThreadingHTTPServer, ObjectStore], tmp_path: Path, guard: OutboundGuard  # noqa: ARG001
+) -> None:
+    _, store = object_store
+    manager = build_manager(object_store, tmp_path / "cache")
+    content = bytes(range(256)) * 12 + b"tail"
+    requests = store.requests
+    manager.save_blob_as_bytes(content, "large.bin")
+    # 開始 + 13 パート + 完了
+    assert store.requests - requests == 15
+    assert store.objects[(manager.bucket, "research/large.bin")].content == content
+    assert not store.uploads
+
+    reader = build_manager(object_store, tmp_path / "reader", bucket=manager.bucket)
+    requests = store.requests
+    assert reader.read_blob_as_bytes("large.bin") == content
+    # 先頭のパートを取得してから、残りを Range で並列に取得する
+    assert store.requests - requests == 13
+    assert reader.read_range("large.bin", 256, 259) == bytes(range(4))
+    # 2 回目は ETag で変更がないことを確認してキャッシュを使う
+    requests = store.requests
+    assert reader.read_blob_as_bytes("large.bin") == content
+    assert store.requests - requests == 1
+    assert reader.stats == {"hits": 1, "misses": 1}
+
+
+def test_failed_multipart_upload_is_aborted(
+    object_store: tuple[ThreadingHTTPServer, ObjectStore],
+    tmp_path: Path,
+    guard: OutboundGuard,  # noqa: ARG001
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _, store = object_store
+    manager = build_manager(object_store, tmp_path / "cache")
+    request = manager._request  # noqa: SLF001
+
+    def fail_third_part(method: str, key: str = "", params: dict | None = None, **kwargs: object) -> httpx.Response:
+        if (params or {}).get("partNumber") == "3":
+            raise httpx.ConnectError("connection reset")
+        return request(method, key, params, **kwargs)  # type: ignore
+
+    monkeypatch.setattr(manager, "_request", fail_third_part)
+    with pytest.raises(httpx.ConnectError):
+        manager.save_blob_as_bytes(b"x" * 2048, "large.bin")
+    # 途中まで送ったパートは破棄し、オブジェクトもキャッシュの ETag も残さない
+    assert not store.uploads
+    assert (manager.bucket, "research/large.bin") not in store.objects
+    assert manager._read_etag(manager._cache_path("large.bin")) is None  # noqa: SLF001
+
+
+def test_missing_blob_and_pagination(
+    object_store: tuple[ThreadingHTTPServer, ObjectStore], tmp_path: Path, guard: OutboundGuard  # noqa: ARG001
+) -> None:
+    manager = build_manager(object_store, tmp_path / "cache")
+    with pytest.raises(FileNotFoundError):
+        manager.read_blob_as_str("missing.md")
+    with pytest.raises(FileNotFoundError):
+        manager.get_blob_mtime("missing.md")
+    for idx in range(5):
+        manager.save_blob_as_str(str(idx), f"logs/{idx}.txt")
+    manager.save_blob_as_str("nested", "logs/sub/a.txt")
+    # 1 ページ 2 件で、続きのページを continuation-token で取得する
+    assert list(manager._list("research/logs/", max_keys=2)) == [  # noqa: SLF001
+        *(f"research/logs/{idx}.txt" for idx in range(5)),
+        "research/logs/sub",
+    ]
+    assert manager.append_blob_as_jsonl([{"a": 1}], "logs/events.jsonl") == 1
+    assert manager.append_blob_as_jsonl([{"a": 2}], "logs/events.jsonl") == 1
+    reader = build_manager(object_store, tmp_path / "reader", bucket=manager.bucket)
+    assert reader.read_blob_as_jsonl("logs/events.jsonl") == [{"a": 1}, {"a": 2}]
+
+
+def test_append_uploads_only_the_new_lines(
+    object_store: tuple[ThreadingHTTPServer, ObjectStore], tmp_path: Path, guard: OutboundGuard  # noqa: ARG001
+) -> None:
+    _, store = object_store
+    manager = build_manager(object_store, tmp_path / "cache")
+    manager.save_blob_as_jsonl([{"idx": 0}], "runs/status.jsonl")
+    for idx in range(1, 20):
+        requests = store.requests
+        assert manager.append_blob_as_jsonl([{"idx": idx}], "runs/status.jsonl") == 1
+        # 存在の確認と追記分のアップロードのみ（既存の内容は取得・再送しない）
+        assert store.requests - requests == 2
+    segments = [
+        stored.content
+        for (bucket, key), stored in store.objects.items()
+        if bucket == manager.bucket and key.startswith("research/runs/status.jsonl.segments/")
+    ]
+    assert len(segments) == 19
+    assert all(content.count(b"\n") == 1 for content in segments)
+
+    reader = build_manager(object_store, tmp_path / "reader", bucket=manager.bucket)
+    assert [item["idx"] for item in reader.iter_blob_as_jsonl("runs/status.jsonl")] == list(range(20))
+    # 2 回目は追記分を一覧するだけで、書き換えないセグメントはキャッシュを使う
+    requests = store.requests
+    assert len(reader.read_blob_as_jsonl("runs/status.jsonl")) == 20
+    assert store.requests - requests == 2
+    assert reader.list_blobs("runs") == ["runs/status.jsonl"]
+
+    # 上書きすると追記分も取り除く
+    manager.save_blob_as_jsonl([{"idx": 100}], "runs/status.jsonl")
+    assert reader.read_blob_as_jsonl("runs/status.jsonl") == [{"idx": 100}]
+    assert not any(key.startswith("research/runs/status.jsonl.segments/") for _, key in store.objects)
@@ -0,0 +1,109 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app.core.exception import BaseError
+from app.core.logging import LogLevel
+from app.infrastructure.blob_manager import LocalBlobManager
+from app.infrastructure.cassette import Cassette
+from app.infrastructure.cassette import cassette as cassette_module
+from app.infrastructure.cassette.enums import CassetteMode
+
+
+def build_cassette(mode: CassetteMode, cassette_path: Path, flush_entries: int = 1) -> Cassette:
+    return Cassette(
+        mode=mode,
+        blob_manager=LocalBlobManager(log_level=LogLevel.TRACE),
+        cassette_path=str(cassette_path),
+        replay_latency=0,
+        flush_entries=flush_entries,
+        log_level=LogLevel.TRACE,
+    )
+
+
+def test_record_appends_in_batches(tmp_path: Path) -> None:
+    cassette_path = tmp_path / "cassettes" / "a.jsonl"
+    cassette = build_cassette(CassetteMode.RECORD, cassette_path, flush_entries=2)
+
+    def num_lines() -> int:
+        return len(cassette_path.read_text(encoding="utf-8").splitlines()) if cassette_path.exists() else 0
+
+    assert cassette.call("search_web", "s", {"q": "a"}, lambda: "A") == "A"
+    assert num_lines() == 0
+    # 終了を待たず、flush_entries 件ごとにまとめて追記する
+    assert asyncio.run(cassette.acall("search_web", "s", {"q": "b"}, lambda: asyncio.sleep(0, "B"))) == "B"
+    assert num_lines() == 2
+    cassette.call("search_web", "s", {"q": "c"}, lambda: "C")
+    assert num_lines() == 2
+    cassette.flush()
+    assert num_lines() == 3
+    cassette.flush()
+    assert num_lines() == 3
+
+
+def test_replay_matches_exact_request(tmp_path: Path) -> None:
+    cassette_path = tmp_path / "a.jsonl"
+    recorder = build_cassette(CassetteMode.RECORD, cassette_path)
+    for response in ["A1", "A2"]:
+        recorder.call("search_web", "s", {"q": "a"}, lambda response=response: response)
+    recorder.call("search_web", "s", {"q": "b"}, lambda: "B")
+
+    def live() -> str:
+        raise AssertionError("replay must not call the live service")
+
+    player = build_cassette(CassetteMode.REPLAY, cassette_path)
+    assert player.call("search_web", "s", {"q": "b"}, live) == "B"
+    # 同じリクエストは記録順に返す
+    assert player.call("search_web", "s", {"q": "a"}, live) == "A1"
+    assert player.call("search_web", "s", {"q": "a"}, live) == "A2"
+    # 一致しないリクエストに、同じ呼び出し元の別の応答を返さない
+    with pytest.raises(BaseError):
+        player.call("search_web", "s", {"q": "a"}, live)
+    with pytest.raises(BaseError):
+        asyncio.run(player.acall("search_web", "s", {"q": "c"}, live))
+
+
+def test_record_reuses_existing_cassette(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cassette_path = tmp_path / "a.jsonl"
+    build_cassette(CassetteMode.RECORD, cassette_path).call("search_web", "s", {"q": "a"}, lambda: "A")
+
+    calls = []
+
+    def live(response: str) -> str:
+        calls.append(response)
+        return response
+
+    warnings = []
+    monkeypatch.setattr(
+        cassette_module,
+        "log",
+        lambda log_level, **kwargs: log_level == LogLevel.WARNING and warnings.append(kwargs["message"]),
+    )
+    recorder = build_cassette(CassetteMode.RECORD, cassette_path)
+    assert recorder.call("search_web", "s", {"q": "a"}, lambda: live("A'")) == "A"
+    assert recorder.call("search_web", "s", {"q": "b"}, lambda: live("B")) == "B"
+    # 記録済みの呼び出し元でリクエストが変わった場合は警告し、実際に呼び出して追記する
+    assert calls == ["B"]
+    assert len(warnings) == 1
+    player = build_cassette(CassetteMode.REPLAY, cassette_path)
+    assert [player.call("search_web", "s", {"q": q}, lambda: None) for q in "ab"] == ["A", "B"]
+
+
+def test_off_mode_does_not_touch_cassette(tmp_path: Path) -> None:
+    cassette_path = tmp_path / "a.jsonl"
+    cassette = build_cassette(CassetteMode.OFF, cassette_path)
+    assert cassette.call("search_web", "s", {"q": "a"}, lambda: "A") == "A"
+    assert not cassette_path.exists()
+
+
+def test_pinned_value_is_fixed_for_record_and_replay(tmp_path: Path) -> None:
+    cassette_path = tmp_path / "a.jsonl"
+    values = iter(["09:00", "09:01", "09:02"])
+    recorder = build_cassette(CassetteMode.RECORD, cassette_path)
+    # 記録中も最初の値に固定する
+    assert recorder.pin("current_date", lambda: next(values)) == "09:00"
+    assert recorder.pin("current_date", lambda: next(values)) == "09:00"
+    player = build_cassette(CassetteMode.REPLAY, cassette_path)
+    assert player.pin("current_date", lambda: next(values)) == "09:00"
+    assert next(values) == "09:01"
@@ -0,0 +1,111 @@
+import asyncio
+import operator
+from pathlib import Path
+from typing import Annotated, Any, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.state import CompiledStateGraph
+from langgraph.types import Command, interrupt
+
+from app.core.logging import LogLevel
+from app.infrastructure.checkpointer import SqliteCheckpointSaver
+
+CONFIG = {"configurable": {"thread_id": "thread-1"}}
+DOCUMENT = "調査資料 " * 1000
+
+
+class State(TypedDict, total=False):
+    document: str
+    steps: Annotated[list[str], operator.add]
+    answer: str
+
+
+def build_graph(db_path: Path) -> tuple[CompiledStateGraph, SqliteCheckpointSaver]:
+    """document を一度だけ書き込み、ask で中断して回答を待つグラフ."""
+
+    def load(state: State) -> dict[str, Any]:  # noqa: ARG001
+        return {"document": DOCUMENT, "steps": ["load"]}
+
+    def ask(state: State) -> dict[str, Any]:  # noqa: ARG001
+        return {"answer": interrupt("対象地域は？"), "steps": ["ask"]}
+
+    def summarize(state: State) -> dict[str, Any]:
+        return {"steps": [f"summarize:{state['answer']}"]}
+
+    workflow = StateGraph(State)
+    workflow.add_node("load", load)
+    workflow.add_node("ask", ask)
+    workflow.add_node("summarize", summarize)
+    workflow.add_edge(START, "load")
+    workflow.add_edge("load", "ask")
+    workflow.add_edge("ask", "summarize")
+    workflow.add_edge("summarize", END)
+    checkpointer = SqliteCheckpointSaver(str(db_path), log_level=LogLevel.TRACE)
+    return workflow.compile(checkpointer=checkpointer), checkpointer
+
+
+def count_channel_values(checkpointer: SqliteCheckpointSaver, channel: str) -> int:
+    return checkpointer._conn.execute(  # noqa: SLF001
+        "SELECT COUNT(*) FROM channel_values WHERE channel = ?", (channel,)
+    ).fetchone()[0]
+
+
+def test_resume_with_a_fresh_saver(tmp_path: Path) -> None:
+    db_path = tmp_path / "checkpoints.db"
+    graph, checkpointer = build_graph(db_path)
+    result = graph.invoke({"steps": []}, CONFIG)
+    assert result["__interrupt__"][0].value == "対象地域は？"
+    checkpointer.close()
+
+    # プロセスの再起動と同じく、新しいチェックポインターで同じ DB から再開する
+    graph, checkpointer = build_graph(db_path)
+    assert graph.get_state(CONFIG).next == ("ask",)
+    result = graph.invoke(Command(resume="関東"), CONFIG)
+    assert result["steps"] == ["load", "ask", "summarize:関東"]
+    assert result["document"] == DOCUMENT
+
+    # 変更のないチャネルは、ステップが進んでも再保存しない
+    assert count_channel_values(checkpointer, "document") == 1
+    assert count_channel_values(checkpointer, "steps") == 4
+    stats = checkpointer.stats()
+    assert stats["blob_bytes"] < len(DOCUMENT.encode("utf-8"))
+
+    history = list(graph.get_state_history(CONFIG))
+    assert [snapshot.next for snapshot in history] == [(), ("summarize",), ("ask",), ("load",), ("__start__",)]
+    assert all(snapshot.values.get("document") == DOCUMENT for snapshot in history[:-2])
+    checkpoint_tuples = list(checkpointer.list(CONFIG))
+    assert [checkpoint_tuple.config for checkpoint_tuple in checkpoint_tuples] == [
+        snapshot.config for snapshot in history
+    ]
+    assert [checkpoint_tuple.metadata["step"] for checkpoint_tuple in checkpoint_tuples] == [3, 2, 1, 0, -1]
+    assert len(list(checkpointer.list(CONFIG, limit=2))) == 2
+    assert len(list(checkpointer.list(CONFIG, before=checkpoint_tuples[1].config))) == 3
+    assert [
+        checkpoint_tuple.metadata["step"] for checkpoint_tuple in checkpointer.list(CONFIG, filter={"source": "input"})
+    ] == [-1]
+    assert list(checkpointer.list({"configurable": {"thread_id": "thread-2"}})) == []
+    checkpointer.close()
+
+
+def test_aresume_with_a_fresh_saver(tmp_path: Path) -> None:
+    db_path = tmp_path / "checkpoints.db"
+
+    async def run() -> tuple[dict[str, Any], list[Any]]:
+        graph, checkpointer = build_graph(db_path)
+        result = await graph.ainvoke({"steps": []}, CONFIG)
+        assert "__interrupt__" in result
+        checkpointer.close()
+
+        graph, checkpointer = build_graph(db_path)
+        result = await graph.ainvoke(Command(resume="関西"), CONFIG)
+        history = [snapshot async for snapshot in graph.aget_state_history(CONFIG)]
+        assert [checkpoint_tuple.config async for checkpoint_tuple in checkpointer.alist(CONFIG)] == [
+            snapshot.config for snapshot in history
+        ]
+        assert count_channel_values(checkpointer, "document") == 1
+        checkpointer.close()
+        return result, history
+
+    result, history = asyncio.run(run())
+    assert result["steps"] == ["load", "ask", "summarize:関西"]
+    assert len(history) == 5
@@ -0,0 +1,181 @@
+import asyncio
+import email.utils
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.core.exception import CircuitOpenError
+from app.infrastructure.metrics import MetricsRegistry
+from app.infrastructure.rate_limit import OutboundGuard, RetryPolicy, parse_retry_after
+from app.infrastructure.rate_limit.enums import CircuitState
+
+ENDPOINT = "stub"
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """パスごとに指定した順でステータスを返す（指定がなくなれば 200）. /down は常に 503 を返す."""
+
+    server: "ScriptedServer"
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002, ARG002
+        pass
+
+    def do_POST(self) -> None:  # noqa: N802
+        status, headers = self.server.next_response(self.path)
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+
+
+class ScriptedServer(ThreadingHTTPServer):
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), ScriptedHandler)
+        self.lock = threading.Lock()
+        self.scripts: dict[str, list[tuple[int, dict[str, str]]]] = {}
+        self.requests: list[str] = []
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def next_response(self, path: str) -> tuple[int, dict[str, str]]:
+        with self.lock:
+            self.requests.append(path)
+            if path == "/down":
+                return 503, {}
+            script = self.scripts.get(path)
+            return script.pop(0) if script else (200, {})
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def server() -> Iterator[ScriptedServer]:
+    server = ScriptedServer()
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def build_guard(
+    max_attempts: int = 4,
+    failure_threshold: int = 5,
+    clock: FakeClock | None = None,
+) -> OutboundGuard:
+    # ジッターを 0 にして、待機秒数を Retry-After のみで決める
+    policy = RetryPolicy(max_attempts=max_attempts, base_delay=0.01, max_delay=1.0, rng=lambda: 0.0)
+    return OutboundGuard(
+        policy=policy,
+        failure_threshold=failure_threshold,
+        reset_timeout=30.0,
+        registry=MetricsRegistry(),
+        **({"clock": clock} if clock is not None else {}),
+    )
+
+
+def post(client: httpx.Client, path: str) -> httpx.Response:
+    return client.post(path).raise_for_status()
+
+
+def counter(guard: OutboundGuard, name: str) -> dict[str, float]:
+    return {
+        item["labels"].get("status", ""): item["value"]
+        for item in guard.registry.summary()["counters"].get(name, [])
+    }
+
+
+def test_retries_server_errors(server: ScriptedServer) -> None:
+    server.scripts["/flaky"] = [(500, {}), (503, {})]
+    guard = build_guard()
+    with httpx.Client(base_url=server.base_url) as client:
+        response = guard.call(ENDPOINT, lambda: post(client, "/flaky"))
+    assert response.status_code == 200
+    assert server.requests == ["/flaky"] * 3
+    assert counter(guard, "outbound_retries_total") == {"500": 1, "503": 1}
+    assert counter(guard, "outbound_requests_total") == {"500": 1, "503": 1, "ok": 1}
+
+
+def test_rate_limit_honors_retry_after(server: ScriptedServer) -> None:
+    server.scripts["/limited"] = [(429, {"retry-after-ms": "50"}), (429, {"Retry-After": "0"})]
+    guard = build_guard()
+
+    async def run() -> httpx.Response:
+        async with httpx.AsyncClient(base_url=server.base_url) as client:
+
+            async def apost() -> httpx.Response:
+                return (await client.post("/limited")).raise_for_status()
+
+            return await guard.acall(ENDPOINT, apost)
+
+    assert asyncio.run(run()).status_code == 200
+    assert server.requests == ["/limited"] * 3
+    [backoff] = guard.registry.summary()["histograms"]["outbound_backoff_seconds"]
+    assert backoff["count"] == 2
+    assert backoff["sum"] == pytest.approx(0.05)
+    # 429 は相手が応答しているため、遮断の対象としない
+    assert guard.breaker(ENDPOINT).state == CircuitState.CLOSED
+
+
+def test_client_errors_are_not_retried(server: ScriptedServer) -> None:
+    server.scripts["/bad"] = [(400, {})]
+    guard = build_guard()
+    with httpx.Client(base_url=server.base_url) as client, pytest.raises(httpx.HTTPStatusError):
+        guard.call(ENDPOINT, lambda: post(client, "/bad"))
+    assert server.requests == ["/bad"]
+
+
+def test_circuit_opens_and_half_opens(server: ScriptedServer) -> None:
+    clock = FakeClock()
+    guard = build_guard(max_attempts=1, failure_threshold=2, clock=clock)
+    breaker = guard.breaker(ENDPOINT)
+    with httpx.Client(base_url=server.base_url) as client:
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                guard.call(ENDPOINT, lambda: post(client, "/down"))
+        assert breaker.state == CircuitState.OPEN
+        # 遮断中はスタブサーバーに到達せずに失敗する
+        with pytest.raises(CircuitOpenError) as exc_info:
+            guard.call(ENDPOINT, lambda: post(client, "/ok"))
+        assert exc_info.value.retry_in == 30.0
+        assert server.requests == ["/down"] * 2
+
+        # reset_timeout 後の試行が失敗すれば再び遮断する
+        clock.now += 30
+        assert breaker.state == CircuitState.HALF_OPEN
+        with pytest.raises(httpx.HTTPStatusError):
+            guard.call(ENDPOINT, lambda: post(client, "/down"))
+        assert breaker.state == CircuitState.OPEN
+        with pytest.raises(CircuitOpenError):
+            guard.call(ENDPOINT, lambda: post(client, "/ok"))
+
+        # reset_timeout 後の試行が成功すれば元に戻る
+        clock.now += 30
+        assert guard.call(ENDPOINT, lambda: post(client, "/ok")).status_code == 200
+        assert breaker.state == CircuitState.CLOSED
+    assert server.requests == ["/down"] * 3 + ["/ok"]
+    assert counter(guard, "outbound_circuit_rejected_total") == {"": 2}
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after({"retry-after": "3"}) == 3.0
+    assert parse_retry_after({"retry-after-ms": "250", "retry-after": "3"}) == 0.25
+    http_date = email.utils.formatdate(1_000_010, usegmt=True)
+    assert parse_retry_after({"retry-after": http_date}, now=lambda: 1_000_000) == 10.0
+    assert parse_retry_after({"retry-after": "invalid"}) is None
+    assert parse_retry_after(None) is None
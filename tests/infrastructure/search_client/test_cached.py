@@ -0,0 +1,69 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app.infrastructure.cache import MemoryCache, SqliteCache, TieredCache
+from app.infrastructure.cache import memory as memory_cache
+from app.infrastructure.search_client import CachedSearchClient, FakeSearchClient
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def test_hits_normalized_query() -> None:
+    backend = FakeSearchClient()
+    client = CachedSearchClient(client=backend, cache=MemoryCache())
+    results = client.search("BPO 市場規模")
+    # 全角・大文字小文字・空白の揺れは同じクエリとして扱う
+    assert client.search("ｂｐｏ　 市場規模") == results
+    assert asyncio.run(client.asearch("bpo 市場規模")) == results
+    assert backend.num_calls == 1
+    assert client.cache.stats["hits"] == 2
+
+
+def test_search_params_are_part_of_key() -> None:
+    backend = FakeSearchClient()
+    client = CachedSearchClient(client=backend, cache=MemoryCache())
+    assert len(client.search("BPO", max_results=3)) == 3
+    assert len(client.search("BPO", max_results=5)) == 5
+    client.search("BPO", max_results=3, max_tokens_per_page=128)
+    assert backend.num_calls == 3
+
+
+def test_ttl_and_lru_eviction(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake_time = FakeTime()
+    monkeypatch.setattr(memory_cache, "time", fake_time)
+    backend = FakeSearchClient()
+    client = CachedSearchClient(client=backend, cache=MemoryCache(max_size=2, ttl_seconds=60))
+    client.search("a")
+    client.search("b")
+    client.search("a")
+    # 最も長く参照されていない "b" を追い出す
+    client.search("c")
+    assert backend.num_calls == 3
+    client.search("a")
+    client.search("b")
+    assert backend.num_calls == 4
+    fake_time.now += 61
+    client.search("b")
+    assert backend.num_calls == 5
+
+
+def test_sqlite_tier_survives_restart(tmp_path: Path) -> None:
+    db_path = str(tmp_path / "search_cache.sqlite3")
+
+    def build(backend: FakeSearchClient) -> CachedSearchClient:
+        cache = TieredCache([MemoryCache(), SqliteCache(db_path=db_path)])
+        return CachedSearchClient(client=backend, cache=cache)
+
+    first_backend, second_backend = FakeSearchClient(), FakeSearchClient()
+    results = build(first_backend).search("BPO 市場規模")
+    # プロセスを再起動した想定で、メモリ上のキャッシュを作り直す
+    assert build(second_backend).search("BPO 市場規模") == results
+    assert (first_backend.num_calls, second_backend.num_calls) == (1, 0)
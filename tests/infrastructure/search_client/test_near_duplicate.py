@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from app.core.config import Settings
+from app.infrastructure.search_client import FakeSearchClient, NearDuplicateSearchClient
+
+
+def test_disabled_by_default() -> None:
+    assert Settings.model_fields["SEARCH_NEAR_DUPLICATE_ENABLED"].default is False
+
+
+@pytest.mark.parametrize(
+    ("cached", "query"),
+    [
+        ("BPOの市場規模", "BPO市場の規模"),
+        ("AIエージェントの導入事例", "導入事例 ＡＩエージェント"),
+        ("国内に関する BPO 市場規模", "BPO 市場規模 国内について"),
+    ],
+)
+def test_paraphrase_hits(cached: str, query: str) -> None:
+    fake = FakeSearchClient()
+    client = NearDuplicateSearchClient(fake)
+    expected = client.search(cached)
+    assert client.search(query) == expected
+    assert fake.num_calls == 1
+    assert client.hits == 1
+
+
+@pytest.mark.parametrize(
+    ("cached", "query"),
+    [
+        # 反意語
+        ("AIエージェント 導入 メリット", "AIエージェント 導入 デメリット"),
+        ("BPO 市場 拡大", "BPO 市場 縮小"),
+        # 否定
+        ("生成AIで人件費を削減できる", "生成AIで人件費を削減できない"),
+        # 数値・地域の違い
+        ("BPO 市場規模 2024年", "BPO 市場規模 2025年"),
+        ("国内 BPO 市場規模", "米国 BPO 市場規模"),
+        # 語の追加
+        ("BPO 市場規模", "BPO 市場規模 成長率"),
+    ],
+)
+def test_different_question_misses(cached: str, query: str) -> None:
+    fake = FakeSearchClient()
+    client = NearDuplicateSearchClient(fake)
+    client.search(cached)
+    results = client.search(query)
+    assert fake.num_calls == 2
+    assert results[0].title.startswith(query)
+
+
+def test_search_params_are_part_of_key() -> None:
+    fake = FakeSearchClient()
+    client = NearDuplicateSearchClient(fake)
+    client.search("BPOの市場規模", max_results=3)
+    assert len(client.search("BPO市場の規模", max_results=5)) == 5
+    assert fake.num_calls == 2
+
+
+def test_ttl_and_max_size() -> None:
+    fake = FakeSearchClient()
+    client = NearDuplicateSearchClient(fake, max_size=1, ttl_seconds=0)
+    client.search("BPOの市場規模")
+    client.search("BPO市場の規模")
+    assert fake.num_calls == 2
+    assert len(client) == 1
+
+
+def test_asearch() -> None:
+    fake = FakeSearchClient()
+    client = NearDuplicateSearchClient(fake)
+
+    async def run() -> None:
+        await client.asearch("BPOの市場規模")
+        await client.asearch("BPO市場の規模")
+
+    asyncio.run(run())
+    assert fake.num_calls == 1
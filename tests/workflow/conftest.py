@@ -0,0 +1,85 @@
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+
+from app.core.config import settings
+from app.core.logging import LogLevel
+from app.domain.enums import ManagedTaskStatus, Priority
+from app.infrastructure.blob_manager import LocalBlobManager
+from app.workflow.agent import ResearchAgent
+from app.workflow.models import GatherRequirements, ManagedTask, ResearchPlan, Task
+from app.workflow.models.build_research_plan import ReportSection, TaskType
+from app.workflow.models.gather_requirements import AdditionalQuestion, ManagedItem
+
+
+@pytest.fixture
+def build_stub_agent(
+    monkeypatch: pytest.MonkeyPatch, use_echo_llm: Callable
+) -> Callable[..., ResearchAgent]:
+    """要件収集・計画・タスク実行を固定の出力に差し替えた ResearchAgent を作る.
+
+    レポート生成は実際の GenerateReportNode を EchoChatModel で実行する（ユーザー要求 = 最初のメッセージ）。
+    """
+    # タスクの開始をレート上限で待たないようにする
+    monkeypatch.setattr(settings, "EXECUTE_TASK_ESTIMATED_TOKENS", 0)
+    monkeypatch.setattr(settings, "EXECUTE_TASK_ESTIMATED_SEARCHES", 0)
+
+    def build(num_tasks: int = 2, report_output_path: str | None = None) -> ResearchAgent:
+        agent = ResearchAgent(
+            blob_manager=LocalBlobManager(log_level=LogLevel.TRACE),
+            checkpointer=InMemorySaver(),
+            log_level=LogLevel.TRACE,
+            report_output_path=report_output_path,
+        )
+
+        def gather_requirements(messages: list, inquiry_items: list, verbose: bool = False) -> GatherRequirements:  # noqa: ARG001
+            if not inquiry_items:
+                return GatherRequirements(
+                    additional_questions=[
+                        AdditionalQuestion(question=f"質問 {idx}", priority=Priority.HIGH)
+                        for idx in range(2)
+                    ]
+                )
+            return GatherRequirements(
+                inquiry_items_evaluation=[
+                    ManagedItem(id=item.id, status=ManagedTaskStatus.COMPLETED, answer=item.answer)
+                    for item in inquiry_items
+                ]
+            )
+
+        def build_research_plan(messages: list, inquiry_items: list, verbose: bool = False) -> ResearchPlan:  # noqa: ARG001
+            return ResearchPlan(
+                goal=str(messages[0].content),
+                acceptance_criteria="主要な領域が網羅されていること",
+                storyline=[ReportSection(section="概要", description="全体の概要")],
+                tasks=[
+                    Task(
+                        title=f"タスク {idx}",
+                        overview="overview",
+                        objective="objective",
+                        research_scope="scope",
+                        priority=Priority.HIGH,
+                        required_capabilities=[TaskType.THINKING],
+                    )
+                    for idx in range(num_tasks)
+                ],
+            )
+
+        def execute_task(state: Any) -> ManagedTask:  # noqa: ANN401
+            return state.task.model_copy(
+                update={"status": ManagedTaskStatus.COMPLETED, "deliverable": f"{state.task.title} の成果物"}
+            )
+
+        async def aexecute_task(state: Any) -> ManagedTask:  # noqa: ANN401
+            return execute_task(state)
+
+        agent.gather_requirements_node.run = gather_requirements  # type: ignore
+        agent.build_research_plan_node.run = build_research_plan  # type: ignore
+        agent.execute_task_node.run = execute_task  # type: ignore
+        agent.execute_task_node.arun = aexecute_task  # type: ignore
+        use_echo_llm(agent.generate_report_node)
+        return agent
+
+    return build
@@ -0,0 +1,155 @@
+import asyncio
+from collections.abc import Sequence
+from typing import Any
+
+import pytest
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.core.config import settings
+from app.core.logging import LogLevel
+from app.core.utils.scheduler import PriorityScheduler
+from app.core.utils.token_bucket import TokenBucket
+from app.domain.enums import ManagedTaskStatus, Priority
+from app.infrastructure.blob_manager import LocalBlobManager
+from app.infrastructure.llm_chain.enums import OpenAIModelName
+from app.infrastructure.rate_limit import budgets
+from app.workflow.models import ExecuteTaskState, ManagedTask
+from app.workflow.models.build_research_plan import TaskType
+from app.workflow.nodes import execute_task
+from app.workflow.nodes.execute_task import ExecuteTaskNode
+
+MODEL_NAME = OpenAIModelName.GPT_5_NANO
+USED_TOKENS = 1_200
+
+
+class UsageChatModel(BaseChatModel):
+    """ツールを呼ばずに成果物を返し、usage_metadata に固定のトークン数を記録する擬似モデル."""
+
+    content: str | list[str | dict] = "成果物"
+
+    @property
+    def _llm_type(self) -> str:
+        return "usage"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "UsageChatModel":  # noqa: ANN401, ARG002
+        return self
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],  # noqa: ARG002
+        stop: list[str] | None = None,  # noqa: ARG002
+        run_manager: CallbackManagerForLLMRun | None = None,  # noqa: ARG002
+        **kwargs: Any,  # noqa: ANN401, ARG002
+    ) -> ChatResult:
+        message = AIMessage(
+            content=self.content,
+            usage_metadata={
+                "input_tokens": USED_TOKENS - 200,
+                "output_tokens": 200,
+                "total_tokens": USED_TOKENS,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def token_bucket(monkeypatch: pytest.MonkeyPatch) -> TokenBucket:
+    """時刻を進めない OpenAI のトークン数のバケットと、専用のスケジューラーに差し替える."""
+    rate_budgets = budgets.RateBudgets(
+        openai_requests_per_minute={},
+        openai_tokens_per_minute={},
+        perplexity_requests_per_minute=60,
+    )
+    bucket = TokenBucket(rate_per_second=500, capacity=30_000, clock=FakeClock())
+    rate_budgets._buckets[f"openai:{MODEL_NAME.value}:tokens"] = bucket  # noqa: SLF001
+    monkeypatch.setattr(execute_task, "get_rate_budgets", lambda: rate_budgets)
+    monkeypatch.setattr(execute_task, "execute_task_scheduler", PriorityScheduler(limit=1))
+    return bucket
+
+
+def build_state(required: bool = True) -> ExecuteTaskState:
+    task = ManagedTask(
+        id="t0",
+        status=ManagedTaskStatus.PENDING,
+        title="市場規模の調査",
+        overview="概要",
+        objective="objective",
+        research_scope="scope",
+        priority=Priority.HIGH if required else Priority.LOW,
+        required_capabilities=[TaskType.THINKING],
+    )
+    return ExecuteTaskState(goal="BPO 市場の調査", task=task, required=required)
+
+
+def build_node(content: str | list[str | dict] = "成果物") -> ExecuteTaskNode:
+    node = ExecuteTaskNode(
+        model_name=MODEL_NAME,
+        blob_manager=LocalBlobManager(log_level=LogLevel.TRACE),
+        log_level=LogLevel.TRACE,
+    )
+    node._build_model = lambda: UsageChatModel(content=content)  # type: ignore  # noqa: SLF001
+    return node
+
+
+def test_estimate_is_settled_with_actual_usage(token_bucket: TokenBucket) -> None:
+    command = build_node()(build_state())
+    [managed_task] = command.update["executed_tasks"]
+    assert managed_task.status == ManagedTaskStatus.COMPLETED
+    assert managed_task.deliverable == "成果物"
+    # 予約した見積もり（EXECUTE_TASK_ESTIMATED_TOKENS）ではなく、実際の使用量だけ消費する
+    assert settings.EXECUTE_TASK_ESTIMATED_TOKENS != USED_TOKENS
+    assert token_bucket.available == token_bucket.capacity - USED_TOKENS
+
+
+def test_optional_task_waits_until_capacity_frees(token_bucket: TokenBucket) -> None:
+    assert settings.EXECUTE_TASK_OPTIONAL_WAIT_SECONDS is None
+    scheduler = execute_task.execute_task_scheduler
+
+    async def run() -> ManagedTask:
+        await scheduler.aacquire(0)
+        pending = asyncio.create_task(build_node().acall(build_state(required=False)))
+        while scheduler.waiting == 0:
+            await asyncio.sleep(0)
+        scheduler.release()
+        command = await pending
+        return command.update["executed_tasks"][0]
+
+    managed_task = asyncio.run(run())
+    assert managed_task.status == ManagedTaskStatus.COMPLETED
+    assert token_bucket.available == token_bucket.capacity - USED_TOKENS
+
+
+def test_optional_task_is_skipped_after_wait(
+    monkeypatch: pytest.MonkeyPatch, token_bucket: TokenBucket
+) -> None:
+    monkeypatch.setattr(settings, "EXECUTE_TASK_OPTIONAL_WAIT_SECONDS", 0)
+    execute_task.execute_task_scheduler.acquire(0)
+    command = build_node()(build_state(required=False))
+    [managed_task] = command.update["executed_tasks"]
+    assert managed_task.status == ManagedTaskStatus.PENDING
+    # 保留となったタスクは予算を消費しない
+    assert token_bucket.available == token_bucket.capacity
+
+
+def test_deliverable_is_the_text_of_the_final_message(token_bucket: TokenBucket) -> None:  # noqa: ARG001
+    blocks = [{"type": "reasoning", "summary": []}, {"type": "text", "text": "成果物"}]
+    [managed_task] = build_node(blocks)(build_state()).update["executed_tasks"]
+    assert managed_task.deliverable == "成果物"
+    [managed_task] = asyncio.run(build_node(blocks).acall(build_state())).update["executed_tasks"]
+    assert managed_task.deliverable == "成果物"
+
+    # テキストのない応答は成果物として扱わない
+    [managed_task] = build_node("")(build_state()).update["executed_tasks"]
+    assert managed_task.status == ManagedTaskStatus.FAILED
+    assert managed_task.deliverable is None
@@ -0,0 +1,114 @@
+import asyncio
+from collections.abc import AsyncIterator, Callable, Iterator
+from pathlib import Path
+
+from langchain_core.runnables import RunnableLambda
+
+from app.core.logging import LogLevel
+from app.domain.enums import ManagedTaskStatus, Priority
+from app.infrastructure.blob_manager import LocalBlobManager
+from app.infrastructure.llm_chain.enums import OpenAIModelName
+from app.workflow.models import ManagedTask
+from app.workflow.models.build_research_plan import ReportSection, TaskType
+from app.workflow.nodes import GenerateReportNode
+from app.workflow.nodes.generate_report import resolve_output_path
+
+STORYLINE = [ReportSection(section="市場動向", description="市場動向の分析")]
+
+
+def build_task(idx: int, deliverable: str) -> ManagedTask:
+    return ManagedTask(
+        id=f"t{idx}",
+        status=ManagedTaskStatus.COMPLETED,
+        title=f"調査 {idx}",
+        overview="概要",
+        objective="objective",
+        research_scope="scope",
+        priority=Priority.HIGH,
+        required_capabilities=[TaskType.SEARCH],
+        deliverable=deliverable,
+    )
+
+
+def build_node(**kwargs: object) -> GenerateReportNode:
+    return GenerateReportNode(
+        model_name=OpenAIModelName.GPT_5_NANO,
+        blob_manager=LocalBlobManager(log_level=LogLevel.TRACE),
+        log_level=LogLevel.TRACE,
+        **kwargs,  # type: ignore
+    )
+
+
+def test_resolve_output_path() -> None:
+    assert resolve_output_path("out/{thread_id}/report.md", "batch:a/b") == "out/batch_a_b/report.md"
+    assert resolve_output_path("out/{thread_id}.md", None) == "out/default.md"
+    assert resolve_output_path("out/report.md", "a") == "out/report.md"
+
+
+def test_concurrent_threads_stream_to_separate_files(
+    tmp_path: Path, use_echo_llm: Callable
+) -> None:
+    node = build_node(output_path=str(tmp_path / "{thread_id}" / "report.md"))
+    use_echo_llm(node)
+    tasks = [build_task(0, "調査結果")]
+
+    # グラフのノードと同様に、実行中のスレッドの config の中で呼び出す
+    async def run(goal: str) -> str:
+        return await node.arun(goal=goal, storyline=STORYLINE, executed_tasks=tasks)
+
+    async def run_all() -> list[str]:
+        runnable = RunnableLambda(run)
+        return await asyncio.gather(
+            *(
+                runnable.ainvoke(goal, config={"configurable": {"thread_id": goal}})
+                for goal in ["a", "b", "c"]
+            )
+        )
+
+    reports = asyncio.run(run_all())
+    for goal, report in zip(["a", "b", "c"], reports, strict=True):
+        assert report.startswith(f"# {goal}\n")
+        assert (tmp_path / goal / "report.md").read_text(encoding="utf-8") == report
+
+
+def test_skipped_tasks_are_listed_in_report(use_echo_llm: Callable) -> None:
+    node = build_node()
+    model = use_echo_llm(node)
+    skipped = build_task(1, "").model_copy(
+        update={"status": ManagedTaskStatus.PENDING, "deliverable": None, "priority": Priority.LOW}
+    )
+    report = node.run(
+        goal="a", storyline=STORYLINE, executed_tasks=[build_task(0, "調査結果"), skipped]
+    )
+    # 保留となったタスクは調査結果として渡さず、レポート末尾に記載する
+    assert "調査 1" not in model.prompts[0]
+    assert "\n\n## 未実施の調査\n\n" in report
+    assert report.endswith("\n\n- 調査 1 (low)\n")
+
+
+def test_run_and_arun_stream_the_same_report(tmp_path: Path, use_echo_llm: Callable) -> None:
+    tasks = [build_task(0, "調査結果 [1]\n\n[1] https://example.com/a")]
+    for output_path in [None, str(tmp_path / "{thread_id}" / "report.md")]:
+        node = build_node(output_path=output_path)
+        use_echo_llm(node)
+        streamed: list[str] = []
+
+        def stream(chain: object, inputs: object, verbose: bool) -> Iterator[str]:  # noqa: ARG001
+            streamed.append("run")
+            yield from ["# a\n", "本文"]
+
+        async def astream(chain: object, inputs: object, verbose: bool) -> AsyncIterator[str]:  # noqa: ARG001
+            streamed.append("arun")
+            for chunk in ["# a\n", "本文"]:
+                yield chunk
+
+        node.stream = stream  # type: ignore
+        node.astream = astream  # type: ignore
+        report = node.run(goal="a", storyline=STORYLINE, executed_tasks=tasks)
+        areport = asyncio.run(node.arun(goal="a", storyline=STORYLINE, executed_tasks=tasks))
+        # 出力先の有無にかかわらず、同期・非同期とも同じ経路でストリーミングする
+        assert streamed == ["run", "arun"]
+        assert report == areport
+        assert report.startswith("# a\n本文")
+        if output_path is not None:
+            assert (tmp_path / "default" / "report.md").read_text(encoding="utf-8") == report
@@ -0,0 +1,160 @@
+import json
+import re
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+import pytest
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.types import Command
+
+from app.core.config import settings
+from app.core.logging import LogLevel
+from app.core.utils.nano_id import seed_ids
+from app.domain.enums import ManagedTaskStatus
+from app.infrastructure.blob_manager import LocalBlobManager
+from app.infrastructure.cassette import CassetteChatModel, get_cassette
+from app.infrastructure.llm_chain import ChainCache, instruction_cache
+from app.workflow.agent import ResearchAgent
+from app.workflow.models import ManagedTask
+
+INQUIRY_ID_PATTERN = re.compile(r'name="([^"]+)"')
+
+
+class FakeOpenAI(BaseChatModel):
+    """ChatOpenAI の代わりに、ツール（構造化出力）の名前に応じた固定の応答を返す."""
+
+    live: bool = True
+    num_calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-openai"
+
+    def bind_tools(
+        self,
+        tools: Sequence[dict[str, Any] | type | BaseTool],
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Runnable[LanguageModelInput, BaseMessage]:
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,  # noqa: ARG002
+        run_manager: CallbackManagerForLLMRun | None = None,  # noqa: ARG002
+        **kwargs: Any,  # noqa: ANN401
+    ) -> ChatResult:
+        assert self.live, "replay must not call OpenAI"
+        self.num_calls += 1
+        prompt = "".join(str(message.content) for message in messages)
+        tools = kwargs.get("tools", [])
+        if not tools:
+            num_tasks = sum(f"タスク {idx} の調査結果" in prompt for idx in range(2))
+            message = AIMessage(content=f"# BPO 市場の調査\n\n{num_tasks} 件のタスクの調査結果")
+            return ChatResult(generations=[ChatGeneration(message=message)])
+        name = tools[0]["function"]["name"]
+        if name == "GatherRequirements":
+            # 2 回目以降は、プロンプトに含まれる要件収集項目の ID を参照して回答済みとする
+            inquiry_ids = INQUIRY_ID_PATTERN.findall(prompt)
+            args: dict = (
+                {
+                    "inquiry_items_evaluation": [
+                        {"id": inquiry_id, "status": "completed", "answer": "回答"}
+                        for inquiry_id in inquiry_ids
+                    ]
+                }
+                if inquiry_ids
+                else {"additional_questions": [{"question": "対象地域は？", "priority": "high"}]}
+            )
+        else:
+            task = {
+                "overview": "overview",
+                "objective": "objective",
+                "research_scope": "scope",
+                "priority": "high",
+                "required_capabilities": ["THINKING"],
+            }
+            args = {
+                "goal": "BPO 市場の調査",
+                "acceptance_criteria": "主要な領域が網羅されていること",
+                "storyline": [{"section": "概要", "description": "全体の概要"}],
+                "tasks": [{"title": f"タスク {idx}", **task} for idx in range(2)],
+            }
+        message = AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": "call_0"}])
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+@pytest.fixture
+def use_cassette(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Iterator[FakeOpenAI]:
+    monkeypatch.setattr(settings, "CASSETTE_PATH", str(tmp_path / "cassettes" / "run.jsonl"))
+    monkeypatch.setattr(settings, "EXECUTE_TASK_ESTIMATED_TOKENS", 0)
+    monkeypatch.setattr(settings, "EXECUTE_TASK_ESTIMATED_SEARCHES", 0)
+    fake_openai = FakeOpenAI()
+    monkeypatch.setattr(CassetteChatModel, "delegate", property(lambda self: fake_openai))  # noqa: ARG005
+    yield fake_openai
+    get_cassette.cache_clear()
+    seed_ids(None)
+
+
+def run_graph(
+    monkeypatch: pytest.MonkeyPatch, mode: str, current_date: str
+) -> tuple[str, list[str]]:
+    """カセットを mode で開き直し、current_date の時刻でグラフを最後まで実行する."""
+    # 前の実行で記録した応答を書き込んでから開き直す（プロセスの終了時と同じ）
+    get_cassette().flush()
+    monkeypatch.setattr(settings, "CASSETTE_MODE", mode)
+    get_cassette.cache_clear()
+    monkeypatch.setattr(instruction_cache, "get_current_time_bucket", lambda granularity: current_date)  # noqa: ARG005
+    agent = ResearchAgent(
+        blob_manager=LocalBlobManager(log_level=LogLevel.TRACE),
+        checkpointer=InMemorySaver(),
+        log_level=LogLevel.TRACE,
+    )
+    for node in [agent.gather_requirements_node, agent.build_research_plan_node, agent.generate_report_node]:
+        node.chain_cache = ChainCache()
+        node.instruction_cache.clear()
+
+    def execute_task(state: Any) -> ManagedTask:  # noqa: ANN401
+        return state.task.model_copy(
+            update={"status": ManagedTaskStatus.COMPLETED, "deliverable": f"{state.task.title} の調査結果"}
+        )
+
+    agent.execute_task_node.run = execute_task  # type: ignore
+    config = {"configurable": {"thread_id": "replay"}}
+    input_data: Any = {"messages": [HumanMessage(content="BPO 市場の調査")]}
+    inquiry_ids: list[str] = []
+    while True:
+        result = agent.graph.invoke(input_data, config)
+        if not (interrupts := result.get("__interrupt__")):
+            return result["research_report"], inquiry_ids
+        inquiry_items = interrupts[0].value["inquiry_items"]
+        inquiry_ids += [item.id for item in inquiry_items]
+        input_data = Command(
+            resume={
+                item.id: item.model_copy(update={"answer": "関東", "status": ManagedTaskStatus.COMPLETED})
+                for item in inquiry_items
+            }
+        )
+
+
+def test_replay_after_the_clock_moves(monkeypatch: pytest.MonkeyPatch, use_cassette: FakeOpenAI) -> None:
+    report, inquiry_ids = run_graph(monkeypatch, "record", "2025-01-01 09:00")
+    assert use_cassette.num_calls == 4
+    assert report.startswith("# BPO 市場の調査\n\n2 件のタスクの調査結果")
+
+    # 時刻のバケットと要件収集項目の ID が変わっても、OpenAI を呼ばずに同じレポートを再生する
+    use_cassette.live = False
+    assert run_graph(monkeypatch, "replay", "2025-01-01 09:01") == (report, inquiry_ids)
+    entries = [
+        json.loads(line) for line in Path(settings.CASSETTE_PATH).read_text(encoding="utf-8").splitlines()
+    ]
+    pinned = {entry["scope"]: entry["response"] for entry in entries if entry["kind"] == "pinned"}
+    assert pinned["current_date:minute"] == "2025-01-01 09:00"
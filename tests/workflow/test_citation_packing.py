@@ -0,0 +1,75 @@
+from app.core.config import Settings
+from app.domain.enums import ManagedTaskStatus, Priority
+from app.workflow.citation_packing import _bigrams, format_references, pack_citations
+from app.workflow.models import ManagedTask
+from app.workflow.models.build_research_plan import TaskType
+
+POSITIVE = (
+    "国内の中堅企業では、生成AIを活用したバックオフィス業務の自動化が業務効率の改善に大きく寄与し、"
+    "外部委託の費用も抑えられるとの見方が調査会社の間で広がっている。"
+)
+NEGATIVE = (
+    "国内の中堅企業では、生成AIを活用したバックオフィス業務の自動化が業務効率の改善に大きく寄与せず、"
+    "外部委託の費用も抑えられないとの見方が調査会社の間で広がっている。"
+)
+
+
+def build_task(idx: int, deliverable: str) -> ManagedTask:
+    return ManagedTask(
+        id=f"t{idx}",
+        status=ManagedTaskStatus.COMPLETED,
+        title=f"調査 {idx}",
+        overview="概要",
+        objective="objective",
+        research_scope="scope",
+        priority=Priority.HIGH,
+        required_capabilities=[TaskType.SEARCH],
+        deliverable=deliverable,
+    )
+
+
+def jaccard(left: str, right: str) -> float:
+    left_grams, right_grams = _bigrams(left), _bigrams(right)
+    return len(left_grams & right_grams) / len(left_grams | right_grams)
+
+
+def test_disabled_by_default() -> None:
+    assert Settings.model_fields["REPORT_DEDUP_THRESHOLD"].default is None
+
+
+def test_duplicate_paragraph_is_replaced_and_citations_are_shared() -> None:
+    tasks = [
+        build_task(0, f"{POSITIVE}[1]\n\n## 参考文献\n[1] 調査レポート https://example.com/a"),
+        build_task(
+            1,
+            f"{POSITIVE.replace('広がっている', '広がりつつある')}[1][2]\n\n"
+            "[1] https://example.com/a?utm_source=x\n[2] https://example.com/b",
+        ),
+    ]
+    packed = pack_citations(tasks, threshold=0.8)
+    assert packed.num_duplicates == 1
+    assert [source.url for source in packed.sources] == [
+        "https://example.com/a",
+        "https://example.com/b",
+    ]
+    assert packed.sources[0].title == "調査レポート"
+    # 重複する段落の出典は、残した段落に引き継ぐ
+    assert packed.executed_tasks[0].deliverable == f"{POSITIVE}[1][2]"
+    assert packed.executed_tasks[1].deliverable == "（調査 0 と同内容）"
+    assert "- [2] [example.com](https://example.com/b)" in format_references(packed.sources)
+
+
+def test_negated_paragraph_is_kept() -> None:
+    # 文字 bi-gram では閾値を超えるが、否定の有無で結論が逆になる
+    assert jaccard(POSITIVE, NEGATIVE) >= 0.8
+    tasks = [build_task(0, f"{POSITIVE}[1]"), build_task(1, f"{NEGATIVE}[1]")]
+    packed = pack_citations(tasks, threshold=0.8)
+    assert packed.num_duplicates == 0
+    assert packed.executed_tasks[1].deliverable == f"{NEGATIVE}[1]"
+
+
+def test_paragraphs_with_different_numbers_are_kept() -> None:
+    first = "国内 BPO 市場は 2024 年度に 5 兆円規模に達し、前年比 3.5% で成長したと矢野経済研究所は推計している。"
+    second = first.replace("3.5%", "4.1%")
+    packed = pack_citations([build_task(0, first), build_task(1, second)], threshold=0.8)
+    assert packed.num_duplicates == 0
@@ -0,0 +1,75 @@
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import httpx
+
+from app.workflow.enums import SessionStatus
+from app.workflow.session import ResearchSessionManager, build_session_server
+
+
+@asynccontextmanager
+async def serve(manager: ResearchSessionManager) -> AsyncIterator[httpx.AsyncClient]:
+    server = build_session_server(manager, host="127.0.0.1", port=0)
+    await server.start()
+    host, port = server.address
+    try:
+        async with httpx.AsyncClient(base_url=f"http://{host}:{port}", timeout=30) as client:
+            yield client
+    finally:
+        await server.stop()
+
+
+async def run_session(client: httpx.AsyncClient, message: str) -> dict:
+    response = await client.post("/sessions", json={"message": message, "wait": 10})
+    assert response.status_code == 201
+    session = response.json()
+    assert session["status"] == SessionStatus.WAITING.value
+    answers = {item["id"]: f"{message} への回答" for item in session["inquiry_items"]}
+    response = await client.post(
+        f"/sessions/{session['thread_id']}/resume", json={"answers": answers, "wait": 10}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_concurrent_sessions_share_one_graph(tmp_path: Path, build_stub_agent: Callable) -> None:
+    agent = build_stub_agent(report_output_path=str(tmp_path / "{thread_id}" / "report.md"))
+    manager = ResearchSessionManager(graph=agent.graph)
+    messages = [f"依頼 {idx}" for idx in range(8)]
+
+    async def run() -> list[dict]:
+        async with serve(manager) as client:
+            return await asyncio.gather(*(run_session(client, message) for message in messages))
+
+    sessions = asyncio.run(run())
+    assert len({session["thread_id"] for session in sessions}) == len(messages)
+    for message, session in zip(messages, sessions, strict=True):
+        assert session["status"] == SessionStatus.COMPLETED.value
+        assert session["research_report"].startswith(f"# {message}\n")
+        # 同時に実行したセッションのレポートが、互いに上書きされない
+        report_path = tmp_path / session["thread_id"] / "report.md"
+        assert report_path.read_text(encoding="utf-8") == session["research_report"]
+    assert manager.running == 0
+
+
+def test_session_errors(build_stub_agent: Callable) -> None:
+    manager = ResearchSessionManager(graph=build_stub_agent().graph)
+
+    async def run() -> None:
+        async with serve(manager) as client:
+            assert (await client.get("/sessions/unknown")).status_code == 404
+            assert (await client.post("/sessions", json={})).status_code == 400
+            body = {"message": "依頼", "thread_id": "t1", "wait": 10}
+            assert (await client.post("/sessions", json=body)).status_code == 201
+            assert (await client.post("/sessions", json=body)).status_code == 409
+            response = await client.get("/sessions/t1")
+            assert response.json()["status"] == SessionStatus.WAITING.value
+            response = await client.post("/sessions/t1/resume", json={"answers": {}, "wait": 10})
+            assert response.json()["status"] == SessionStatus.COMPLETED.value
+            # 完了したセッションは再開できない
+            response = await client.post("/sessions/t1/resume", json={"answers": {}})
+            assert response.status_code == 409
+
+    asyncio.run(run())
@@ -0,0 +1,104 @@
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Any
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.types import Command
+
+from app.domain.enums import ManagedTaskStatus
+from app.domain.models import SearchResult
+from app.infrastructure.document_store import get_document_scope
+from app.workflow.agent import ResearchAgent
+from app.workflow.enums import Node
+
+CONFIG = {"configurable": {"thread_id": "state_updates"}}
+
+
+def stream_updates(agent: ResearchAgent, message: str = "BPO 市場の調査") -> list[tuple[str, dict]]:
+    """グラフを最後まで実行し、(ノード名, ノードが返した状態の更新) を実行順に返す."""
+    input_data: Any = {"messages": [HumanMessage(content=message)]}
+    updates = []
+    while input_data is not None:
+        resume = None
+        for chunk in agent.graph.stream(input_data, CONFIG, stream_mode="updates"):
+            for node, update in chunk.items():
+                if node == "__interrupt__":
+                    resume = {
+                        item.id: item.model_copy(
+                            update={"answer": "回答", "status": ManagedTaskStatus.COMPLETED}
+                        )
+                        for item in update[0].value["inquiry_items"]
+                    }
+                    continue
+                updates.append((node, update or {}))
+        input_data = Command(resume=resume) if resume else None
+    return updates
+
+
+def test_nodes_return_only_changed_fields(build_stub_agent: Callable) -> None:
+    agent = build_stub_agent(num_tasks=3)
+    execute_task = agent.execute_task_node.run
+
+    def search_then_execute(state: Any) -> Any:  # noqa: ANN401
+        # 最初のタスクだけ文書を取得する
+        if state.task.title == "タスク 0":
+            get_document_scope().add_search_results(
+                [SearchResult(title="BPO 白書", url="https://example.com/bpo")]
+            )
+        return execute_task(state)
+
+    agent.execute_task_node.run = search_then_execute  # type: ignore
+    updates = [(node, set(update)) for node, update in stream_updates(agent)]
+    assert [node for node, _ in updates] == [
+        Node.GATHER_REQUIREMENTS.value,
+        Node.FEEDBACK_REQUIREMENTS.value,
+        Node.GATHER_REQUIREMENTS.value,
+        Node.BUILD_RESEARCH_PLAN.value,
+        *[Node.EXECUTE_TASK.value] * 3,
+        Node.GENERATE_REPORT.value,
+    ]
+    expected = {
+        Node.GATHER_REQUIREMENTS.value: [{"inquiry_items"}],
+        Node.FEEDBACK_REQUIREMENTS.value: [{"inquiry_items", "messages"}],
+        Node.BUILD_RESEARCH_PLAN.value: [{"goal", "tasks", "storyline"}],
+        # 文書を取得したタスクのみ managed_documents を更新する
+        Node.EXECUTE_TASK.value: [{"executed_tasks", "managed_documents"}, {"executed_tasks"}],
+        Node.GENERATE_REPORT.value: [{"research_report"}],
+    }
+    for node, fields in updates:
+        assert fields in expected[node], node
+    execute_fields = [fields for node, fields in updates if node == Node.EXECUTE_TASK.value]
+    assert sorted(map(sorted, execute_fields)) == [
+        ["executed_tasks"],
+        ["executed_tasks"],
+        ["executed_tasks", "managed_documents"],
+    ]
+
+
+def payload_sizes(agent: ResearchAgent, message: str) -> dict[str, list[int]]:
+    """ノードごとに、チェックポイントに書き込まれる更新のサイズ（バイト）を実行順に返す."""
+    serde = JsonPlusSerializer()
+    sizes = defaultdict(list)
+    for node, update in stream_updates(agent, message):
+        sizes[node].append(len(serde.dumps_typed(update)[1]))
+    return sizes
+
+
+def test_update_payload_does_not_grow_with_the_thread(build_stub_agent: Callable) -> None:
+    short = payload_sizes(build_stub_agent(num_tasks=2), "BPO 市場の調査")
+    # 長い会話履歴と多数のタスク（executed_tasks が伸びていくスレッド）
+    agent = build_stub_agent(num_tasks=20)
+    long = payload_sizes(agent, "BPO 市場の調査\n" + "背景" * 50_000)
+    state_size = len(JsonPlusSerializer().dumps_typed(agent.graph.get_state(CONFIG).values)[1])
+    assert state_size > 100_000
+    for node, sizes in long.items():
+        if node == Node.BUILD_RESEARCH_PLAN.value:
+            # 計画はタスク数とユーザー要求（goal）の長さに比例する
+            continue
+        # 状態全体ではなく差分のみを書き込むため、会話履歴やタスク数によらず一定の大きさに収まる
+        assert max(sizes) < 2_000, node
+        assert max(sizes) - max(short[node]) < 64, node
+    execute_sizes = long[Node.EXECUTE_TASK.value]
+    assert len(execute_sizes) == 20
+    assert max(execute_sizes) - min(execute_sizes) < 64
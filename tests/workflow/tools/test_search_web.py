@@ -0,0 +1,111 @@
+import asyncio
+import importlib
+import json
+
+import pytest
+from langchain.tools.tool_node import ToolCallRequest
+from langchain_core.messages import ToolMessage
+
+from app.core.config import Settings, settings
+from app.core.middleware import CoalesceToolCallsMiddleware
+from app.core.utils.single_flight import SingleFlight
+from app.domain.models import SearchResult
+from app.infrastructure.document_store import DocumentStore, document_scope
+from app.infrastructure.search_client import CachedSearchClient, FakeSearchClient, get_search_client
+from app.workflow.tools import ingest_search_results, search_web
+
+# app.workflow.tools.search_web はツールを指すため、モジュールは import_module で取得する
+search_web_module = importlib.import_module("app.workflow.tools.search_web")
+
+
+class GatedSearchClient(FakeSearchClient):
+    """gate が開くまで非同期の検索結果を返さない（同時に発生した呼び出しを合流させるため）."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gate = asyncio.Event()
+
+    async def asearch(
+        self, query: str, max_results: int = 3, max_tokens_per_page: int = 512
+    ) -> list[SearchResult]:
+        await self.gate.wait()
+        return await super().asearch(query, max_results, max_tokens_per_page)
+
+
+@pytest.fixture
+def search_client(monkeypatch: pytest.MonkeyPatch) -> GatedSearchClient:
+    client = GatedSearchClient()
+    monkeypatch.setattr(search_web_module, "get_search_client", lambda: client)
+    return client
+
+
+def test_returns_search_results_as_json(search_client: GatedSearchClient) -> None:
+    search_client.gate.set()
+    response = search_web.invoke({"search_view": "BPO 市場"})
+    results = json.loads(response)
+    assert len(results) == search_web_module.MAX_RESULTS
+    assert [set(result) for result in results] == [{"title", "url", "snippet"}] * len(results)
+    assert results[0]["title"] == "BPO 市場 (1)"
+    assert asyncio.run(search_web.ainvoke({"search_view": "BPO 市場"})) == response
+
+
+def test_fake_backend_with_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "SEARCH_BACKEND", "fake")
+    monkeypatch.setattr(settings, "SEARCH_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "SEARCH_CACHE_SQLITE_PATH", None)
+    monkeypatch.setattr(settings, "SEARCH_NEAR_DUPLICATE_ENABLED", False)
+    get_search_client.cache_clear()
+    try:
+        client = get_search_client()
+        assert isinstance(client, CachedSearchClient)
+        assert isinstance(client.client, FakeSearchClient)
+        first = search_web.invoke({"search_view": "BPO 市場"})
+        # 表記の揺れだけが異なるクエリは、キャッシュから返す
+        assert search_web.invoke({"search_view": "ＢＰＯ  市場"}) == first
+        assert asyncio.run(search_web.ainvoke({"search_view": "bpo 市場"})) == first
+        assert search_web.invoke({"search_view": "BPO 市場規模"}) != first
+        assert client.client.num_calls == 2
+    finally:
+        get_search_client.cache_clear()
+
+
+def test_local_first_is_disabled_by_default() -> None:
+    assert Settings.model_fields["DOCUMENT_STORE_LOCAL_FIRST"].default is False
+
+
+def test_coalesced_results_are_ingested_into_each_task(search_client: GatedSearchClient) -> None:
+    middleware = CoalesceToolCallsMiddleware(
+        single_flight=SingleFlight(), on_coalesced={search_web.name: ingest_search_results}
+    )
+    store = DocumentStore()
+
+    async def handler(request: ToolCallRequest) -> ToolMessage:
+        return await search_web.ainvoke(request.tool_call)
+
+    async def call(task_id: str) -> tuple[ToolMessage, list[str]]:
+        tool_call = {
+            "name": search_web.name,
+            "args": {"search_view": "BPO 市場"},
+            "id": task_id,
+            "type": "tool_call",
+        }
+        request = ToolCallRequest(tool_call=tool_call, tool=search_web, state={}, runtime=None)
+        with document_scope(store, task_id) as scope:
+            response = await middleware.awrap_tool_call(request, handler)
+            return response, [document.task_id for document in scope.documents]
+
+    async def run() -> list[tuple[ToolMessage, list[str]]]:
+        calls = [asyncio.create_task(call(task_id)) for task_id in ["t0", "t1"]]
+        while middleware.single_flight.num_calls < len(calls):
+            await asyncio.sleep(0)
+        search_client.gate.set()
+        return await asyncio.gather(*calls)
+
+    (first, first_documents), (second, second_documents) = asyncio.run(run())
+    assert search_client.num_calls == 1
+    assert (first.tool_call_id, second.tool_call_id) == ("t0", "t1")
+    assert first.content == second.content
+    # 合流した呼び出し元のタスクにも、検索結果の文書を取り込む
+    assert first_documents == ["t0"] * search_web_module.MAX_RESULTS
+    assert second_documents == ["t1"] * search_web_module.MAX_RESULTS
+    assert len(store.search("BPO 市場")) == search_web_module.MAX_RESULTS